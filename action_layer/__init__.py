@@ -12,6 +12,7 @@ Consume datos enriquecidos de la Capa 2 (Intelligence Core) y:
 Components:
     - NotificationDispatcher: Gestiona envío de alertas omnicanal
     - DataObserver: Observa y distribuye datos procesados
+    - SharedState: Buffer y estadísticas compartidos entre workers
     - DashboardAPI: Endpoints para el frontend React
 
 Author: Flow-Monitor Team
@@ -27,6 +28,8 @@ from .models import (
 )
 from .notification_dispatcher import NotificationDispatcher
 from .data_observer import DataObserver
+from .history import ReadingHistory
+from .shared_state import SharedState
 
 __all__ = [
     "DashboardReading",
@@ -36,6 +39,8 @@ __all__ = [
     "AlertStatus",
     "NotificationDispatcher",
     "DataObserver",
+    "ReadingHistory",
+    "SharedState",
 ]
 
 __version__ = "1.0.0"
@@ -15,6 +15,10 @@ Usage:
     
     o con uvicorn:
     uvicorn action_layer.api:app --reload --port 8001
+    
+    Varios workers con estado compartido (ver action_layer/shared_state.py):
+    export FLOW_MONITOR_SHARED_STATE=/dev/shm/flow-monitor.state
+    uvicorn action_layer.api:app --port 8001 --workers 4
 
 Author: Flow-Monitor Team
 Project: Flow-Monitor (MVP Semilla Inicia)
@@ -23,14 +27,19 @@ Project: Flow-Monitor (MVP Semilla Inicia)
 import logging
 import asyncio
 import json
-from datetime import datetime
+import os
 from typing import Any, Dict, List, Optional
 
 from fastapi import FastAPI, HTTPException, status, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
+from observability import metrics
+from observability.admin import router as admin_router
+from observability.logs import configure_logging, sampled_logger
+from timebase import format_iso, now_ns
+
 from .data_observer import DataObserver, get_observer
 from .notification_dispatcher import NotificationDispatcher
 from .models import DashboardReading, AlertNotification
@@ -40,11 +49,10 @@ from .models import DashboardReading, AlertNotification
 # Configuración de Logging
 # ═══════════════════════════════════════════════════════════════════════════════
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(message)s"
-)
+# Cola + listener, 1 de cada N lecturas (ver observability.logs)
+configure_logging()
 logger = logging.getLogger("action_layer.api")
+reading_log = sampled_logger("action_layer.api")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -66,6 +74,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Perfilado en vivo y spans por etapa (/api/admin/profile, /api/admin/spans)
+app.include_router(admin_router)
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # Pydantic Models
@@ -110,6 +121,16 @@ class HealthResponse(BaseModel):
 # Usamos la instancia singleton del observer
 observer = get_observer()
 
+# Persistencia SQLite opcional (FLOW_MONITOR_DB=/ruta/flow_monitor.db)
+if os.getenv("FLOW_MONITOR_DB"):
+    from storage import SQLiteStore
+    observer.attach_store(SQLiteStore(os.environ["FLOW_MONITOR_DB"]))
+
+# Métricas (GET /metrics); las de etapas las registran observer y dispatcher
+SSE_SUBSCRIBERS = metrics.gauge("flowmonitor_sse_subscribers", "Clientes SSE conectados")
+metrics.gauge("flowmonitor_sse_queue_depth", "Eventos pendientes en la cola SSE",
+              function=lambda: observer.event_queue_depth)
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # Endpoints - Health & Info
@@ -137,11 +158,17 @@ async def health_check():
     return HealthResponse(
         status="healthy",
         layer="3 - Action Layer",
-        timestamp=datetime.now().isoformat(),
+        timestamp=format_iso(now_ns()),
         stats=observer.get_stats()
     )
 
 
+@app.get("/metrics", tags=["Health"])
+async def prometheus_metrics():
+    """📈 Métricas del proceso en formato de exposición Prometheus."""
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Endpoints - Dashboard Data
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -190,6 +217,24 @@ async def get_readings(
     }
 
 
+@app.get("/api/dashboard/history", tags=["Dashboard"])
+async def get_history(
+    limit: int = Query(1000, ge=1, le=100000),
+    sensor_id: Optional[str] = Query(None, description="Filtrar por sensor"),
+    risk_level: Optional[str] = Query(None, description="Filtrar por nivel de riesgo")
+):
+    """
+    🗃️ Obtiene lecturas del historial largo (FLOW_MONITOR_HISTORY_SIZE > 0).
+    """
+    readings = observer.get_history(
+        limit, sensor_id, risk_level.upper() if risk_level else None
+    )
+    return {
+        "total": len(readings),
+        "readings": readings
+    }
+
+
 @app.get("/api/dashboard/alerts", tags=["Dashboard"])
 async def get_alerts(limit: int = Query(50, ge=1, le=200)):
     """
@@ -232,7 +277,7 @@ async def process_enriched_data(data: EnrichedDataInput):
             "data_original": data.data_original,
             "risk_level": data.risk_level,
             "prediction_alert": data.prediction_alert,
-            "processed_at": data.processed_at or datetime.now().isoformat()
+            "processed_at": data.processed_at or format_iso(now_ns())
         }
         
         # Procesar con el observer
@@ -242,21 +287,24 @@ async def process_enriched_data(data: EnrichedDataInput):
         alerts = observer.get_alerts(limit=1)
         notification_sent = len(alerts) > 0 and alerts[-1].get("sensor_id") == reading.sensor_id
         
-        logger.info(f"📥 Processed: {reading.risk_emoji} [{reading.sensor_id}] = {reading.value}{reading.unit}")
-        
         if reading.risk_level == "CRITICAL":
-            logger.warning(f"🔴 CRITICAL ALERT: {reading.sensor_id}")
+            reading_log.anomaly("🔴 CRITICAL ALERT: %s = %s%s", reading.sensor_id, reading.value, reading.unit)
+        else:
+            reading_log.reading("📥 Processed: %s [%s] = %s%s",
+                                reading.risk_emoji, reading.sensor_id, reading.value, reading.unit)
         
         return ProcessResponse(
             success=True,
             reading_id=reading.id,
             risk_level=reading.risk_level,
             notification_sent=notification_sent,
-            timestamp=datetime.now().isoformat()
+            timestamp=format_iso(now_ns())
         )
         
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
-        logger.error(f"Error processing data: {e}")
+        logger.error("Error processing data: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -275,7 +323,7 @@ async def process_batch(data_list: List[EnrichedDataInput]):
                 "data_original": data.data_original,
                 "risk_level": data.risk_level,
                 "prediction_alert": data.prediction_alert,
-                "processed_at": data.processed_at or datetime.now().isoformat()
+                "processed_at": data.processed_at or format_iso(now_ns())
             }
             reading = observer.process(enriched_data)
             results.append({
@@ -299,18 +347,57 @@ async def process_batch(data_list: List[EnrichedDataInput]):
 # Endpoints - Server-Sent Events (SSE) para Real-time
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Intervalo de sondeo del ring compartido (FLOW_MONITOR_SHARED_STATE)
+SHARED_POLL_INTERVAL = 0.05
+HEARTBEAT_SECONDS = 30.0
+
+
+async def shared_event_generator():
+    """
+    Generador SSE en modo multi-worker: sigue el ring compartido.
+    
+    Cada cliente lleva su propio cursor, así ve las lecturas de todos los
+    workers; el JSON ya viene serializado desde quien escribió la lectura.
+    """
+    shared = observer.shared
+    cursor = shared.reading_seq
+    SSE_SUBSCRIBERS.inc()
+    
+    try:
+        yield f"event: connected\ndata: {json.dumps({'status': 'connected', 'timestamp': format_iso(now_ns())})}\n\n"
+        
+        idle = 0.0
+        while True:
+            cursor, events = shared.tail(cursor)
+            if events:
+                idle = 0.0
+                yield "".join(f"event: reading\ndata: {event}\n\n" for event in events)
+                continue
+            await asyncio.sleep(SHARED_POLL_INTERVAL)
+            idle += SHARED_POLL_INTERVAL
+            if idle >= HEARTBEAT_SECONDS:
+                idle = 0.0
+                yield f"event: heartbeat\ndata: {json.dumps({'timestamp': format_iso(now_ns())})}\n\n"
+                
+    except asyncio.CancelledError:
+        pass
+    finally:
+        SSE_SUBSCRIBERS.dec()
+
+
 async def event_generator():
     """Generador de eventos SSE."""
     queue = observer.create_event_queue()
+    SSE_SUBSCRIBERS.inc()
     
     try:
         # Enviar evento de conexión
-        yield f"event: connected\ndata: {json.dumps({'status': 'connected', 'timestamp': datetime.now().isoformat()})}\n\n"
+        yield f"event: connected\ndata: {json.dumps({'status': 'connected', 'timestamp': format_iso(now_ns())})}\n\n"
         
         while True:
             try:
                 # Esperar nuevo evento con timeout
-                reading = await asyncio.wait_for(queue.get(), timeout=30.0)
+                reading = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
                 
                 # Formatear como SSE
                 event_data = json.dumps(reading.to_dict())
@@ -318,10 +405,12 @@ async def event_generator():
                 
             except asyncio.TimeoutError:
                 # Enviar heartbeat cada 30 segundos
-                yield f"event: heartbeat\ndata: {json.dumps({'timestamp': datetime.now().isoformat()})}\n\n"
+                yield f"event: heartbeat\ndata: {json.dumps({'timestamp': format_iso(now_ns())})}\n\n"
                 
     except asyncio.CancelledError:
         pass
+    finally:
+        SSE_SUBSCRIBERS.dec()
 
 
 @app.get("/api/dashboard/stream", tags=["Real-time"])
@@ -346,7 +435,7 @@ async def stream_readings():
     ```
     """
     return StreamingResponse(
-        event_generator(),
+        shared_event_generator() if observer.shared is not None else event_generator(),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -13,10 +13,23 @@ from datetime import datetime
 from collections import deque
 import threading
 import asyncio
+import os
+from time import perf_counter
 
+from observability import metrics, spans
 
-from .models import DashboardReading, DashboardStats, AlertNotification
+from .models import DashboardReading, DashboardStats, AlertNotification, RISK_CODES
+from .history import ReadingHistory
 from .notification_dispatcher import NotificationDispatcher
+from .shared_state import SharedState, shared_state_from_env
+
+
+OBSERVED_READINGS = metrics.counter(
+    "flowmonitor_observer_readings", "Lecturas distribuidas por el DataObserver (Capa 3)"
+)
+LOCK_HOLD_SECONDS = metrics.histogram(
+    "flowmonitor_observer_lock_hold_seconds", "Tiempo con el lock del DataObserver tomado por lectura"
+)
 
 
 class DataObserver:
@@ -35,18 +48,29 @@ class DataObserver:
         
         # Cuando llega data de Capa 2:
         observer.process(enriched_data)
+    
+    Con ``shared`` (varios workers uvicorn) buffer, alertas y estadísticas
+    viven en un SharedState común; el historial largo sigue siendo por worker.
     """
     
     def __init__(
         self,
         max_buffer_size: int = 500,
-        notification_dispatcher: Optional[NotificationDispatcher] = None
+        notification_dispatcher: Optional[NotificationDispatcher] = None,
+        store: Optional[Any] = None,
+        history_size: int = 0,
+        shared: Optional[SharedState] = None
     ):
         self.max_buffer_size = max_buffer_size
         
         # Buffer circular de lecturas
         self._readings: deque = deque(maxlen=max_buffer_size)
         
+        # Historial largo columnar (opcional, ej: 1M lecturas)
+        self._history: Optional[ReadingHistory] = (
+            ReadingHistory(history_size) if history_size > 0 else None
+        )
+        
         # Alertas generadas
         self._alerts: List[AlertNotification] = []
         
@@ -66,6 +90,12 @@ class DataObserver:
         
         # Cola para streaming async
         self._event_queue: asyncio.Queue = None
+        
+        # Persistencia opcional (ej: storage.SQLiteStore)
+        self._store = store
+        
+        # Estado compartido entre workers (opcional)
+        self._shared = shared
     
     def process(self, enriched_data: Dict[str, Any]) -> DashboardReading:
         """
@@ -77,29 +107,79 @@ class DataObserver:
         Returns:
             DashboardReading formateado para el frontend
         """
+        # Transformar a formato Dashboard
+        reading = DashboardReading.from_enriched_data(enriched_data)
+        return self._handle(reading, enriched_data, self._dispatcher.dispatch)
+    
+    def process_enriched(self, enriched: Any, dispatch: bool = True) -> DashboardReading:
+        """
+        Procesa un EnrichedData de Capa 2 sin serializarlo a diccionario.
+        
+        Entrada tipada para pipelines en el mismo proceso (run_pipeline.py).
+        
+        Args:
+            enriched: EnrichedData de Capa 2
+            dispatch: Si es False, no se despachan notificaciones aquí; el
+                llamador las envía por su cuenta y las registra con record_alert()
+            
+        Returns:
+            DashboardReading formateado para el frontend
+        """
+        reading = DashboardReading.from_enriched(enriched)
+        return self._handle(
+            reading, enriched, self._dispatcher.dispatch_enriched if dispatch else None
+        )
+    
+    def record_alert(self, notification: AlertNotification) -> None:
+        """Registra una alerta despachada fuera del observer (ej: etapa notify async)."""
         with self._lock:
-            # Transformar a formato Dashboard
-            reading = DashboardReading.from_enriched_data(enriched_data)
+            self._record_alert_locked(notification)
+    
+    def _record_alert_locked(self, notification: AlertNotification) -> None:
+        if self._shared is not None:
+            self._shared.append_alert(notification)
+        else:
+            self._alerts.append(notification)
+            self._stats.update_alert(notification.channel.value)
+        if self._store is not None:
+            self._store.save_alert(notification)
+        
+        # Notificar suscriptores de alertas
+        for callback in self._alert_subscribers:
+            try:
+                callback(notification)
+            except Exception as e:
+                print(f"Error en alert callback: {e}")
+    
+    @spans.stage("observe")
+    def _handle(
+        self,
+        reading: DashboardReading,
+        enriched: Any,
+        dispatch: Optional[Callable[[Any], Optional[AlertNotification]]]
+    ) -> DashboardReading:
+        """Almacena, persiste, notifica y distribuye una lectura ya transformada."""
+        with self._lock:
+            held = perf_counter()
             
-            # Guardar en buffer
-            self._readings.append(reading)
+            # Guardar en buffer y actualizar estadísticas (locales o compartidos)
+            if self._shared is not None:
+                self._shared.append_reading(reading)
+            else:
+                self._readings.append(reading)
+                self._stats.update_reading(reading.risk_level)
+                self._stats.uptime_seconds = (datetime.now() - self._start_time).total_seconds()
+            if self._history is not None:
+                self._history.append(reading)
             
-            # Actualizar estadísticas
-            self._stats.update_reading(reading.risk_level)
-            self._stats.uptime_seconds = (datetime.now() - self._start_time).total_seconds()
+            # Persistir (solo encola, el escritor corre en su propio hilo)
+            if self._store is not None:
+                self._store.save_enriched(enriched)
             
             # Despachar notificación si es necesario
-            notification = self._dispatcher.dispatch(enriched_data)
+            notification = dispatch(enriched) if dispatch is not None else None
             if notification:
-                self._alerts.append(notification)
-                self._stats.update_alert(notification.channel.value)
-                
-                # Notificar suscriptores de alertas
-                for callback in self._alert_subscribers:
-                    try:
-                        callback(notification)
-                    except Exception as e:
-                        print(f"Error en alert callback: {e}")
+                self._record_alert_locked(notification)
             
             # Notificar suscriptores de datos
             for callback in self._subscribers:
@@ -108,15 +188,31 @@ class DataObserver:
                 except Exception as e:
                     print(f"Error en subscriber callback: {e}")
             
-            # Agregar a cola de eventos async si existe
-            if self._event_queue:
+            # Agregar a cola de eventos async si existe (compartido: SSE sigue el ring)
+            if self._event_queue and self._shared is None:
                 try:
                     self._event_queue.put_nowait(reading)
                 except asyncio.QueueFull:
                     pass  # Descartar si la cola está llena
             
+            LOCK_HOLD_SECONDS.observe(perf_counter() - held)
+            OBSERVED_READINGS.inc()
             return reading
     
+    @property
+    def shared(self) -> Optional[SharedState]:
+        """Estado compartido entre workers, o None en modo de un proceso."""
+        return self._shared
+    
+    @property
+    def dispatcher(self) -> NotificationDispatcher:
+        """Dispatcher de notificaciones usado por el observer."""
+        return self._dispatcher
+    
+    def attach_store(self, store: Any) -> None:
+        """Conecta un adaptador de persistencia (ej: SQLiteStore)."""
+        self._store = store
+    
     def add_subscriber(self, callback: Callable[[DashboardReading], None]) -> None:
         """Agrega un suscriptor para nuevas lecturas."""
         self._subscribers.append(callback)
@@ -142,6 +238,8 @@ class DataObserver:
         Returns:
             Lista de lecturas en formato diccionario
         """
+        if self._shared is not None:
+            return self._shared.readings(limit)
         with self._lock:
             readings_list = list(self._readings)
             return [r.to_dict() for r in readings_list[-limit:]]
@@ -157,17 +255,43 @@ class DataObserver:
         Returns:
             Lista de lecturas filtradas
         """
+        if self._shared is not None:
+            return self._shared.readings(limit, risk_level)
+        risk_code = RISK_CODES.get(risk_level, -1)
         with self._lock:
-            filtered = [r for r in self._readings if r.risk_level == risk_level]
+            filtered = [r for r in self._readings if r.risk_code == risk_code]
             return [r.to_dict() for r in filtered[-limit:]]
     
+    def get_history(
+        self,
+        limit: int = 100,
+        sensor_id: Optional[str] = None,
+        risk_level: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Obtiene lecturas del historial largo (si está habilitado).
+        
+        Args:
+            limit: Número máximo de lecturas
+            sensor_id: Filtrar por sensor
+            risk_level: Filtrar por nivel de riesgo
+        """
+        if self._history is None:
+            return []
+        with self._lock:
+            return self._history.get_latest(limit, sensor_id, risk_level)
+    
     def get_alerts(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Obtiene las últimas alertas generadas."""
+        if self._shared is not None:
+            return self._shared.alerts(limit)
         with self._lock:
             return [a.to_dict() for a in self._alerts[-limit:]]
     
     def get_stats(self) -> Dict[str, Any]:
         """Obtiene estadísticas actuales."""
+        if self._shared is not None:
+            return self._shared.stats()
         with self._lock:
             self._stats.uptime_seconds = (datetime.now() - self._start_time).total_seconds()
             return self._stats.to_dict()
@@ -185,6 +309,12 @@ class DataObserver:
             "stats": self.get_stats()
         }
     
+    @property
+    def event_queue_depth(self) -> int:
+        """Eventos pendientes en la cola de streaming (0 si no hay cola)."""
+        queue = self._event_queue
+        return queue.qsize() if queue is not None else 0
+    
     def create_event_queue(self) -> asyncio.Queue:
         """Crea una cola de eventos para streaming async (SSE)."""
         self._event_queue = asyncio.Queue(maxsize=100)
@@ -194,10 +324,14 @@ class DataObserver:
         """Limpia todos los datos."""
         with self._lock:
             self._readings.clear()
+            if self._history is not None:
+                self._history.clear()
             self._alerts.clear()
             self._stats = DashboardStats()
             self._start_time = datetime.now()
             self._dispatcher.clear_history()
+            if self._shared is not None:
+                self._shared.clear()
 
 
 # Instancia global singleton para compartir entre módulos
@@ -205,10 +339,18 @@ _global_observer: Optional[DataObserver] = None
 
 
 def get_observer() -> DataObserver:
-    """Obtiene la instancia global del DataObserver."""
+    """
+    Obtiene la instancia global del DataObserver.
+    
+    Con ``FLOW_MONITOR_SHARED_STATE`` (ej: /dev/shm/flow-monitor.state) todos
+    los workers del proceso uvicorn comparten buffer, alertas y estadísticas.
+    """
     global _global_observer
     if _global_observer is None:
-        _global_observer = DataObserver()
+        _global_observer = DataObserver(
+            history_size=int(os.getenv("FLOW_MONITOR_HISTORY_SIZE", "0")),
+            shared=shared_state_from_env()
+        )
     return _global_observer
 
 
@@ -0,0 +1,123 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                  🗃️ Reading History - Flow-Monitor                           ║
+║                Layer 3: Columnar Ring Buffer (NumPy-backed)                  ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Historial largo de lecturas (ej: 1M entradas) almacenado por columnas en
+arrays NumPy preasignados. Cada entrada ocupa ~25 bytes en lugar de un
+objeto Python por lectura.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from timebase import format_seconds
+
+from .models import DashboardReading, RISK_LEVELS, RISK_CODES
+
+
+class ReadingHistory:
+    """
+    🗃️ Ring buffer columnar de lecturas procesadas.
+
+    Columnas:
+        sensor (uint32, índice a una tabla de sensor_id), ts (float64 epoch),
+        value (float64), risk (int8), failure_probability (float32)
+
+    Ejemplo:
+        history = ReadingHistory(capacity=1_000_000)
+        history.append(dashboard_reading)
+        history.get_latest(limit=100, sensor_id="SENSOR_TEMP_01")
+    """
+
+    def __init__(self, capacity: int = 1_000_000):
+        self.capacity = capacity
+        self._sensor = np.zeros(capacity, dtype=np.uint32)
+        self._ts = np.zeros(capacity, dtype=np.float64)
+        self._value = np.zeros(capacity, dtype=np.float64)
+        self._risk = np.zeros(capacity, dtype=np.int8)
+        self._prob = np.zeros(capacity, dtype=np.float32)
+
+        # Tabla de sensores: índice <-> sensor_id
+        self._sensor_ids: List[str] = []
+        self._sensor_index: Dict[str, int] = {}
+
+        self._pos = 0
+        self._size = 0
+
+    def _sensor_code(self, sensor_id: str) -> int:
+        code = self._sensor_index.get(sensor_id)
+        if code is None:
+            code = len(self._sensor_ids)
+            self._sensor_ids.append(sensor_id)
+            self._sensor_index[sensor_id] = code
+        return code
+
+    def append(self, reading: DashboardReading) -> None:
+        """Agrega una lectura (sobrescribe la más antigua si está lleno)."""
+        i = self._pos
+        self._sensor[i] = self._sensor_code(reading.sensor_id)
+        self._ts[i] = reading.ts
+        self._value[i] = reading.value
+        self._risk[i] = reading.risk_code
+        self._prob[i] = reading.failure_probability
+        self._pos = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def _ordered_indices(self) -> np.ndarray:
+        """Índices físicos de la más antigua a la más reciente."""
+        if self._size < self.capacity:
+            return np.arange(self._size)
+        return (np.arange(self.capacity) + self._pos) % self.capacity
+
+    def get_latest(
+        self,
+        limit: int = 100,
+        sensor_id: Optional[str] = None,
+        risk_level: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Últimas lecturas del historial, opcionalmente filtradas.
+
+        Returns:
+            Lista de diccionarios (más antigua primero)
+        """
+        idx = self._ordered_indices()
+        if sensor_id is not None:
+            code = self._sensor_index.get(sensor_id)
+            if code is None:
+                return []
+            idx = idx[self._sensor[idx] == code]
+        if risk_level is not None:
+            idx = idx[self._risk[idx] == RISK_CODES.get(risk_level, -1)]
+        idx = idx[-limit:]
+
+        return [
+            {
+                "sensor_id": self._sensor_ids[self._sensor[i]],
+                "timestamp": format_seconds(self._ts[i]),
+                "value": float(self._value[i]),
+                "risk_level": RISK_LEVELS[self._risk[i]],
+                "failure_probability": round(float(self._prob[i]), 3),
+            }
+            for i in idx
+        ]
+
+    def clear(self) -> None:
+        """Vacía el historial (mantiene la memoria preasignada)."""
+        self._pos = 0
+        self._size = 0
+        self._sensor_ids.clear()
+        self._sensor_index.clear()
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes ocupados por las columnas."""
+        return (self._sensor.nbytes + self._ts.nbytes + self._value.nbytes
+                + self._risk.nbytes + self._prob.nbytes)
+
+    def __len__(self) -> int:
+        return self._size
@@ -4,11 +4,16 @@ Define estructuras para Dashboard, Notificaciones y Estadísticas.
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime
 from enum import Enum
 from typing import Optional, Dict, Any, List
+import itertools
+import sys
+import time
 import uuid
 
+from risk import RISK_CODES, RISK_LEVELS
+from timebase import NS_PER_SECOND, NS_PER_US, format_iso, now_ns, parse_timestamp
+
 
 class NotificationChannel(Enum):
     """Canales de notificación disponibles."""
@@ -26,56 +31,130 @@ class AlertStatus(Enum):
     FAILED = "failed"
 
 
-@dataclass
+# Emoji por código de riesgo (RISK_LEVELS/RISK_CODES vienen de risk)
+RISK_EMOJIS = ("🟢", "🟡", "🟠", "🔴")
+
+# Los ids de lectura son "<prefijo de proceso>-<secuencia>" en lugar de un uuid4 por lectura
+_READING_ID_PREFIX = uuid.uuid4().hex[:8]
+_reading_seq = itertools.count(1)
+
+
+def _parse_epoch(value: Any) -> float:
+    """
+    Convierte un timestamp ISO, epoch o epoch-ns a segundos; usa 'ahora' solo si falta.
+    
+    Raises:
+        ValueError: Si el timestamp no es parseable (un dato inválido no se
+            convierte en una lectura de 'ahora')
+    """
+    if value is None:
+        return time.time()
+    return parse_timestamp(value) / NS_PER_SECOND
+
+
+def _format_epoch(ts: float) -> str:
+    """Formatea epoch en ISO UTC con offset explícito (ver ``timebase.format_iso``)."""
+    return format_iso(round(ts * 1_000_000) * NS_PER_US)
+
+
+@dataclass(slots=True)
 class DashboardReading:
     """
     Lectura formateada para el Dashboard React.
-    Estructura JSON final que consume el frontend.
+    
+    Representación compacta para el buffer del DataObserver: strings
+    internados, nivel de riesgo como entero, timestamps como epoch float
+    y sin diccionarios anidados. La estructura JSON que consume el
+    frontend se construye solo en ``to_dict()``.
     """
-    id: str
+    seq: int
     sensor_id: str
-    timestamp: str
+    ts: float
     value: float
     unit: str
     location: str
-    risk_level: str
-    risk_emoji: str
-    prediction: Dict[str, Any]
-    processed_at: str
+    risk_code: int
+    failure_probability: float
+    alert_message: Optional[str]
+    recommended_action: Optional[str]
+    time_to_failure: Optional[str]
+    processed_ts: float
     
     @classmethod
     def from_enriched_data(cls, enriched_data: Dict[str, Any]) -> "DashboardReading":
         """Crea una lectura de Dashboard desde EnrichedData de Capa 2."""
         data_original = enriched_data.get("data_original", {})
         prediction_alert = enriched_data.get("prediction_alert", {})
-        risk_level = enriched_data.get("risk_level", "LOW")
         
-        # Mapeo de emojis por nivel de riesgo
-        emoji_map = {
-            "LOW": "🟢",
-            "MEDIUM": "🟡",
-            "HIGH": "🟠",
-            "CRITICAL": "🔴"
-        }
+        return cls(
+            seq=next(_reading_seq),
+            sensor_id=sys.intern(data_original.get("sensor_id", "UNKNOWN")),
+            ts=_parse_epoch(data_original.get("timestamp")),
+            value=float(data_original.get("value", 0.0)),
+            unit=sys.intern(data_original.get("unit", "")),
+            location=sys.intern(data_original.get("location", "") or ""),
+            risk_code=RISK_CODES.get(enriched_data.get("risk_level", "LOW"), 0),
+            failure_probability=prediction_alert.get("failure_probability", 0.0),
+            alert_message=prediction_alert.get("alert_message"),
+            recommended_action=prediction_alert.get("recommended_action"),
+            time_to_failure=prediction_alert.get("predicted_time_to_failure"),
+            processed_ts=_parse_epoch(enriched_data.get("processed_at"))
+        )
+    
+    @classmethod
+    def from_enriched(cls, enriched: Any) -> "DashboardReading":
+        """
+        Crea una lectura de Dashboard directamente desde un EnrichedData.
+        
+        Ruta tipada en el mismo proceso: no construye ni recorre diccionarios.
+        """
+        original = enriched.data_original
+        prediction = enriched.prediction_alert
         
         return cls(
-            id=str(uuid.uuid4()),
-            sensor_id=data_original.get("sensor_id", "UNKNOWN"),
-            timestamp=data_original.get("timestamp", datetime.now().isoformat()),
-            value=data_original.get("value", 0.0),
-            unit=data_original.get("unit", ""),
-            location=data_original.get("location", ""),
-            risk_level=risk_level,
-            risk_emoji=emoji_map.get(risk_level, "⚪"),
-            prediction={
-                "failure_probability": prediction_alert.get("failure_probability", 0.0),
-                "alert_message": prediction_alert.get("alert_message"),
-                "recommended_action": prediction_alert.get("recommended_action"),
-                "time_to_failure": prediction_alert.get("predicted_time_to_failure")
-            },
-            processed_at=enriched_data.get("processed_at", datetime.now().isoformat())
+            seq=next(_reading_seq),
+            sensor_id=original.sensor_id,
+            ts=original.timestamp / NS_PER_SECOND,
+            value=original.value,
+            unit=original.unit,
+            location=original.location,
+            risk_code=enriched.risk_level.code,
+            failure_probability=round(prediction.failure_probability, 3),
+            alert_message=prediction.alert_message,
+            recommended_action=prediction.recommended_action,
+            time_to_failure=prediction.predicted_time_to_failure,
+            processed_ts=enriched.processed_at / NS_PER_SECOND
         )
     
+    @property
+    def id(self) -> str:
+        return f"{_READING_ID_PREFIX}-{self.seq}"
+    
+    @property
+    def risk_level(self) -> str:
+        return RISK_LEVELS[self.risk_code]
+    
+    @property
+    def risk_emoji(self) -> str:
+        return RISK_EMOJIS[self.risk_code]
+    
+    @property
+    def timestamp(self) -> str:
+        return _format_epoch(self.ts)
+    
+    @property
+    def processed_at(self) -> str:
+        return _format_epoch(self.processed_ts)
+    
+    @property
+    def prediction(self) -> Dict[str, Any]:
+        return {
+            "failure_probability": self.failure_probability,
+            "alert_message": self.alert_message,
+            "recommended_action": self.recommended_action,
+            "time_to_failure": self.time_to_failure
+        }
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convierte a diccionario para serialización JSON."""
         return {
@@ -120,7 +199,7 @@ class AlertNotification:
         """Factory method para crear una nueva notificación."""
         return cls(
             id=str(uuid.uuid4()),
-            timestamp=datetime.now().isoformat(),
+            timestamp=format_iso(now_ns()),
             sensor_id=sensor_id,
             risk_level=risk_level,
             message=message,
@@ -158,6 +237,8 @@ class DashboardStats:
     """
     Estadísticas agregadas para el Dashboard.
     Proporciona KPIs y métricas en tiempo real.
+    
+    last_update es epoch en nanosegundos; se formatea solo en ``to_dict()``.
     """
     total_readings: int = 0
     readings_by_risk: Dict[str, int] = field(default_factory=lambda: {
@@ -167,7 +248,7 @@ class DashboardStats:
     alerts_by_channel: Dict[str, int] = field(default_factory=lambda: {
         "whatsapp": 0, "email": 0, "sms": 0
     })
-    last_update: str = field(default_factory=lambda: datetime.now().isoformat())
+    last_update: int = field(default_factory=time.time_ns)
     uptime_seconds: float = 0.0
     
     def update_reading(self, risk_level: str) -> None:
@@ -175,14 +256,14 @@ class DashboardStats:
         self.total_readings += 1
         if risk_level in self.readings_by_risk:
             self.readings_by_risk[risk_level] += 1
-        self.last_update = datetime.now().isoformat()
+        self.last_update = time.time_ns()
     
     def update_alert(self, channel: str) -> None:
         """Actualiza estadísticas con una nueva alerta enviada."""
         self.alerts_sent += 1
         if channel in self.alerts_by_channel:
             self.alerts_by_channel[channel] += 1
-        self.last_update = datetime.now().isoformat()
+        self.last_update = time.time_ns()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convierte a diccionario para serialización JSON."""
@@ -191,6 +272,6 @@ class DashboardStats:
             "readings_by_risk": self.readings_by_risk.copy(),
             "alerts_sent": self.alerts_sent,
             "alerts_by_channel": self.alerts_by_channel.copy(),
-            "last_update": self.last_update,
+            "last_update": format_iso(self.last_update),
             "uptime_seconds": self.uptime_seconds
         }
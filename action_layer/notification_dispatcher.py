@@ -7,16 +7,51 @@
 Despacha notificaciones según el nivel de riesgo detectado.
 Soporta múltiples canales: WhatsApp (Twilio), Email, SMS.
 
-Para el MVP, simula el envío con prints en consola.
+Para el MVP, simula el envío registrando banners en el logger
+``action_layer.notifications`` (formateo diferido, ver observability.logs).
 """
 
 from typing import Optional, Dict, Any, List, Callable
 from datetime import datetime
+from time import perf_counter
 import json
+import logging
+import threading
+
+from observability import metrics, spans
 
 from .models import AlertNotification, NotificationChannel, AlertStatus
 
 
+DISPATCH_SECONDS = metrics.histogram(
+    "flowmonitor_dispatch_seconds", "Latencia de envío de notificaciones por canal", ["channel"]
+)
+_DISPATCH_WHATSAPP = DISPATCH_SECONDS.labels(NotificationChannel.WHATSAPP.value)
+_DISPATCH_EMAIL = DISPATCH_SECONDS.labels(NotificationChannel.EMAIL.value)
+
+logger = logging.getLogger("action_layer.notifications")
+
+_WHATSAPP_BANNER = "\n".join([
+    "", "═" * 70,
+    "📱 [TWILIO MOCK] ENVIANDO WHATSAPP",
+    "═" * 70,
+    "   📞 Para: %s",
+    "   📝 Mensaje: %s",
+    "   ✅ Status: %s",
+    "   🆔 SID: %s",
+    "═" * 70,
+])
+
+_EMAIL_BANNER = "\n".join([
+    "", "─" * 70,
+    "📧 [EMAIL MOCK] ENVIANDO EMAIL",
+    "─" * 70,
+    "   📬 Para: %s",
+    "   📋 Asunto: %s",
+    "   📝 Cuerpo: %s...",
+    "─" * 70,
+])
+
 class TwilioMock:
     """
     Mock de la API de Twilio para WhatsApp.
@@ -53,14 +88,8 @@ class TwilioMock:
         # ╔═══════════════════════════════════════════════════════════════════╗
         # ║                    📱 TWILIO WHATSAPP MOCK                        ║
         # ╚═══════════════════════════════════════════════════════════════════╝
-        print("\n" + "═" * 70)
-        print("📱 [TWILIO MOCK] ENVIANDO WHATSAPP")
-        print("═" * 70)
-        print(f"   📞 Para: {to}")
-        print(f"   📝 Mensaje: {message}")
-        print(f"   ✅ Status: {result['status']}")
-        print(f"   🆔 SID: {result['sid']}")
-        print("═" * 70 + "\n")
+        # Formateo diferido: el banner se arma en el hilo del listener de logging
+        logger.info(_WHATSAPP_BANNER, to, message, result["status"], result["sid"])
         
         return result
 
@@ -80,13 +109,7 @@ class EmailMock:
             "timestamp": datetime.now().isoformat()
         }
         
-        print("\n" + "─" * 70)
-        print("📧 [EMAIL MOCK] ENVIANDO EMAIL")
-        print("─" * 70)
-        print(f"   📬 Para: {to}")
-        print(f"   📋 Asunto: {subject}")
-        print(f"   📝 Cuerpo: {body[:100]}...")
-        print("─" * 70 + "\n")
+        logger.info(_EMAIL_BANNER, to, subject, body[:100])
         
         return result
 
@@ -125,7 +148,9 @@ class NotificationDispatcher:
         self._notifications: List[AlertNotification] = []
         self._notification_callbacks: List[Callable[[AlertNotification], None]] = []
         
-        # Estadísticas
+        # Estadísticas (el pipeline despacha desde varios hilos: historial y
+        # contadores se actualizan bajo el lock, los envíos quedan fuera)
+        self._lock = threading.Lock()
         self._stats = {
             "whatsapp_sent": 0,
             "email_sent": 0,
@@ -152,14 +177,59 @@ class NotificationDispatcher:
             AlertNotification si se envió una alerta, None si no
         """
         risk_level = enriched_data.get("risk_level", "LOW")
+        if risk_level not in ("CRITICAL", "HIGH"):
+            return None
+        
         data_original = enriched_data.get("data_original", {})
-        prediction = enriched_data.get("prediction_alert", {})
         
-        sensor_id = data_original.get("sensor_id", "UNKNOWN")
-        value = data_original.get("value", 0)
-        unit = data_original.get("unit", "")
-        location = data_original.get("location", "")
+        return self._dispatch(
+            risk_level=risk_level,
+            sensor_id=data_original.get("sensor_id", "UNKNOWN"),
+            value=data_original.get("value", 0),
+            unit=data_original.get("unit", ""),
+            location=data_original.get("location", ""),
+            prediction=enriched_data.get("prediction_alert", {})
+        )
+    
+    def dispatch_enriched(self, enriched: Any) -> Optional[AlertNotification]:
+        """
+        Igual que dispatch() pero recibe un EnrichedData de Capa 2 sin serializar.
+        
+        Solo se construye el diccionario de predicción cuando realmente
+        hay que notificar (HIGH/CRITICAL).
+        
+        Args:
+            enriched: EnrichedData de Capa 2
+            
+        Returns:
+            AlertNotification si se envió una alerta, None si no
+        """
+        risk_level = enriched.risk_level.value
+        if risk_level not in ("CRITICAL", "HIGH"):
+            return None
+        
+        original = enriched.data_original
         
+        return self._dispatch(
+            risk_level=risk_level,
+            sensor_id=original.sensor_id,
+            value=original.value,
+            unit=original.unit,
+            location=original.location,
+            prediction=enriched.prediction_alert.to_dict()
+        )
+    
+    @spans.stage("dispatch")
+    def _dispatch(
+        self,
+        risk_level: str,
+        sensor_id: str,
+        value: float,
+        unit: str,
+        location: str,
+        prediction: Dict[str, Any]
+    ) -> Optional[AlertNotification]:
+        """Envía la alerta por el canal del nivel de riesgo y registra la notificación."""
         notification = None
         
         if risk_level == "CRITICAL":
@@ -180,8 +250,9 @@ class NotificationDispatcher:
             )
         
         if notification:
-            self._notifications.append(notification)
-            self._stats["total_dispatched"] += 1
+            with self._lock:
+                self._notifications.append(notification)
+                self._stats["total_dispatched"] += 1
             
             # Ejecutar callbacks
             for callback in self._notification_callbacks:
@@ -218,13 +289,17 @@ class NotificationDispatcher:
         )
         
         # Enviar WhatsApp
+        t0 = perf_counter()
         self._twilio.send_whatsapp(self.whatsapp_recipient, whatsapp_message)
-        self._stats["whatsapp_sent"] += 1
+        _DISPATCH_WHATSAPP.observe(perf_counter() - t0)
+        self._count("whatsapp_sent")
         
         # También enviar email
         email_subject = f"🔴 ALERTA CRÍTICA: {sensor_id} - {value}{unit}"
+        t0 = perf_counter()
         self._email.send_email(self.email_recipient, email_subject, whatsapp_message)
-        self._stats["email_sent"] += 1
+        _DISPATCH_EMAIL.observe(perf_counter() - t0)
+        self._count("email_sent")
         
         # Crear registro de notificación
         notification = AlertNotification.create(
@@ -263,8 +338,10 @@ class NotificationDispatcher:
         )
         
         email_subject = f"🟠 Alerta Alta: {sensor_id} - {value}{unit}"
+        t0 = perf_counter()
         self._email.send_email(self.email_recipient, email_subject, email_message)
-        self._stats["email_sent"] += 1
+        _DISPATCH_EMAIL.observe(perf_counter() - t0)
+        self._count("email_sent")
         
         notification = AlertNotification.create(
             sensor_id=sensor_id,
@@ -277,21 +354,29 @@ class NotificationDispatcher:
         
         return notification
     
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+    
     def get_notifications(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Retorna las últimas notificaciones enviadas."""
-        return [n.to_dict() for n in self._notifications[-limit:]]
+        with self._lock:
+            recent = self._notifications[-limit:]
+        return [n.to_dict() for n in recent]
     
     def get_stats(self) -> Dict[str, Any]:
         """Retorna estadísticas del dispatcher."""
-        return {
-            **self._stats,
-            "twilio_messages": len(self._twilio.messages_sent)
-        }
+        with self._lock:
+            return {
+                **self._stats,
+                "twilio_messages": len(self._twilio.messages_sent)
+            }
     
     def clear_history(self) -> None:
         """Limpia el historial de notificaciones."""
-        self._notifications.clear()
-        self._twilio.messages_sent.clear()
+        with self._lock:
+            self._notifications.clear()
+            self._twilio.messages_sent.clear()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -299,6 +384,9 @@ class NotificationDispatcher:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 if __name__ == "__main__":
+    from observability.logs import configure_logging
+    configure_logging(sample_every=1)
+    
     print("""
 ╔══════════════════════════════════════════════════════════════════════════════╗
 ║                 📢 Notification Dispatcher Demo                              ║
@@ -0,0 +1,279 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                  🔗 Shared State - Flow-Monitor                              ║
+║           Layer 3: Ring buffer y contadores entre workers (mmap)             ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Con ``uvicorn action_layer.api:app --workers N`` cada worker es un proceso con
+su propio DataObserver. ``SharedState`` mueve a un archivo mapeado en memoria
+(por defecto bajo /dev/shm, es decir, RAM) lo que el Dashboard debe ver igual
+desde cualquier worker:
+
+- Ring buffer de lecturas (JSON ya serializado, un slot fijo por lectura)
+- Ring buffer de alertas
+- Contadores de DashboardStats (lecturas por riesgo, alertas por canal)
+
+Las escrituras toman ``fcntl.flock`` exclusivo (~1 µs); las lecturas, uno
+compartido. Cada cliente SSE sigue el ring con ``tail()`` desde un cursor
+de secuencia, así ve las lecturas de todos los workers y el JSON se
+serializa una sola vez por lectura.
+
+El archivo sobrevive a reinicios de workers; borrarlo (o
+``DELETE /api/dashboard/clear``) reinicia el estado. Un archivo con otra
+geometría (``capacity``, ``slot_size``) no se redimensiona, porque otro
+worker podría tenerlo mapeado: ``SharedState`` se niega a abrirlo. Solo POSIX.
+
+Layout:
+    [header 256 B][lecturas: capacity × slot][alertas: alert_capacity × slot]
+    slot = uint32 largo + JSON utf-8
+"""
+
+import fcntl
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from timebase import format_seconds
+
+from .models import AlertNotification, DashboardReading, RISK_LEVELS
+
+
+MAGIC = b"FLOWSHM1"
+HEADER_SIZE = 256
+DEFAULT_SLOT_SIZE = 2048
+
+# Geometría: magic, slot_size, capacidad de lecturas, capacidad de alertas
+_GEOMETRY = struct.Struct("<8sIII")
+# Tiempos: inicio, última actualización (epoch)
+_TIMES = struct.Struct("<dd")
+_TIMES_AT = 24
+# Cursores: próxima secuencia y piso (tras clear) de lecturas y alertas
+_CURSORS = struct.Struct("<QQQQ")
+_CURSORS_AT = 40
+# Contadores de DashboardStats
+CHANNELS = ("whatsapp", "email", "sms")
+COUNTERS = ("total_readings",) + RISK_LEVELS + ("alerts_sent",) + CHANNELS
+_COUNTERS = struct.Struct(f"<{len(COUNTERS)}Q")
+_COUNTERS_AT = 72
+_SEQ = struct.Struct("<Q")
+_LEN = struct.Struct("<I")
+
+_READING_SEQ_AT = _CURSORS_AT
+_ALERT_SEQ_AT = _CURSORS_AT + 16
+
+
+class SharedState:
+    """
+    🔗 Estado del Dashboard compartido entre procesos vía mmap.
+
+    Ejemplo:
+        shared = SharedState("/dev/shm/flow-monitor.state", capacity=500)
+        shared.append_reading(reading)
+        shared.readings(limit=100)
+        cursor, events = shared.tail(cursor)   # JSON de lecturas nuevas
+    """
+
+    def __init__(
+        self,
+        path: str,
+        capacity: int = 500,
+        alert_capacity: int = 200,
+        slot_size: int = DEFAULT_SLOT_SIZE
+    ):
+        self.path = path
+        self.capacity = capacity
+        self.alert_capacity = alert_capacity
+        self.slot_size = slot_size
+        self.size = HEADER_SIZE + (capacity + alert_capacity) * slot_size
+        self._alerts_at = HEADER_SIZE + capacity * slot_size
+        self._thread_lock = threading.Lock()
+        self.oversize = 0
+        self._open()
+
+    # ───────────────────────────────────────────────────────────────────────
+    # Apertura y locking
+    # ───────────────────────────────────────────────────────────────────────
+
+    def _open(self) -> None:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            geometry = (MAGIC, self.slot_size, self.capacity, self.alert_capacity)
+            size = os.fstat(fd).st_size
+            header = os.pread(fd, _GEOMETRY.size, 0)
+            # Archivo nuevo o inicialización interrumpida: nadie llegó a mapearlo
+            fresh = header.strip(b"\0") == b""
+            if not fresh and (size != self.size or _GEOMETRY.unpack(header) != geometry):
+                # Otro worker puede tenerlo mapeado: truncarlo le daría SIGBUS
+                raise ValueError(
+                    f"Shared state {self.path} was created with another geometry "
+                    f"({size} bytes, expected {self.size}); stop every worker and "
+                    f"delete the file to reset it"
+                )
+            if fresh:
+                os.ftruncate(fd, self.size)
+            mm = mmap.mmap(fd, self.size)
+            if fresh:
+                _GEOMETRY.pack_into(mm, 0, *geometry)
+                now = time.time()
+                _TIMES.pack_into(mm, _TIMES_AT, now, now)
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._pid = os.getpid()
+        self._fd, self._mm = fd, mm
+
+    @contextmanager
+    def _locked(self, exclusive: bool = True) -> Iterator[None]:
+        if self._pid != os.getpid():
+            # Tras fork el flock heredado no excluye al padre: soltar la copia
+            # heredada (el padre conserva la suya) y reabrir
+            self.close()
+            self._open()
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """Libera el mapeo (el archivo queda para los demás workers)."""
+        self._mm.close()
+        os.close(self._fd)
+
+    # ───────────────────────────────────────────────────────────────────────
+    # Escritura
+    # ───────────────────────────────────────────────────────────────────────
+
+    def _encode(self, data: Dict[str, Any]) -> Optional[bytes]:
+        payload = json.dumps(data, ensure_ascii=False).encode()
+        if len(payload) > self.slot_size - _LEN.size:
+            self.oversize += 1
+            return None
+        return payload
+
+    def _write_slot(self, seq_at: int, base: int, capacity: int, payload: bytes) -> None:
+        (seq,) = _SEQ.unpack_from(self._mm, seq_at)
+        offset = base + (seq % capacity) * self.slot_size
+        _LEN.pack_into(self._mm, offset, len(payload))
+        self._mm[offset + _LEN.size:offset + _LEN.size + len(payload)] = payload
+        _SEQ.pack_into(self._mm, seq_at, seq + 1)
+
+    def _bump(self, *names: str) -> None:
+        counters = list(_COUNTERS.unpack_from(self._mm, _COUNTERS_AT))
+        for name in names:
+            counters[COUNTERS.index(name)] += 1
+        _COUNTERS.pack_into(self._mm, _COUNTERS_AT, *counters)
+        struct.pack_into("<d", self._mm, _TIMES_AT + 8, time.time())
+
+    def append_reading(self, reading: DashboardReading) -> None:
+        """Agrega una lectura al ring compartido y actualiza contadores."""
+        payload = self._encode(reading.to_dict())
+        with self._locked():
+            if payload is not None:
+                self._write_slot(_READING_SEQ_AT, HEADER_SIZE, self.capacity, payload)
+            self._bump("total_readings", reading.risk_level)
+
+    def append_alert(self, notification: AlertNotification) -> None:
+        """Agrega una alerta al ring compartido y actualiza contadores."""
+        payload = self._encode(notification.to_dict())
+        channel = notification.channel.value
+        with self._locked():
+            if payload is not None:
+                self._write_slot(_ALERT_SEQ_AT, self._alerts_at, self.alert_capacity, payload)
+            self._bump("alerts_sent", *((channel,) if channel in CHANNELS else ()))
+
+    def clear(self) -> None:
+        """Vacía rings y contadores para todos los workers."""
+        with self._locked():
+            reading_seq, _, alert_seq, _ = _CURSORS.unpack_from(self._mm, _CURSORS_AT)
+            _CURSORS.pack_into(self._mm, _CURSORS_AT, reading_seq, reading_seq, alert_seq, alert_seq)
+            _COUNTERS.pack_into(self._mm, _COUNTERS_AT, *([0] * len(COUNTERS)))
+            now = time.time()
+            _TIMES.pack_into(self._mm, _TIMES_AT, now, now)
+
+    # ───────────────────────────────────────────────────────────────────────
+    # Lectura
+    # ───────────────────────────────────────────────────────────────────────
+
+    def _read_slots(self, base: int, capacity: int, start: int, end: int) -> List[bytes]:
+        payloads = []
+        for seq in range(start, end):
+            offset = base + (seq % capacity) * self.slot_size
+            (length,) = _LEN.unpack_from(self._mm, offset)
+            payloads.append(self._mm[offset + _LEN.size:offset + _LEN.size + length])
+        return payloads
+
+    def _latest(self, seq_at: int, base: int, capacity: int, limit: int) -> List[bytes]:
+        seq, floor = struct.unpack_from("<QQ", self._mm, seq_at)
+        start = max(floor, seq - capacity, seq - limit)
+        return self._read_slots(base, capacity, start, seq)
+
+    def readings(self, limit: int = 100, risk_level: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Últimas lecturas de todos los workers (más antigua primero)."""
+        with self._locked(exclusive=False):
+            payloads = self._latest(
+                _READING_SEQ_AT, HEADER_SIZE, self.capacity,
+                self.capacity if risk_level else limit
+            )
+        readings = [json.loads(p) for p in payloads]
+        if risk_level:
+            readings = [r for r in readings if r["risk_level"] == risk_level][-limit:]
+        return readings
+
+    def alerts(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Últimas alertas de todos los workers."""
+        with self._locked(exclusive=False):
+            payloads = self._latest(_ALERT_SEQ_AT, self._alerts_at, self.alert_capacity, limit)
+        return [json.loads(p) for p in payloads]
+
+    def stats(self) -> Dict[str, Any]:
+        """Estadísticas agregadas con la misma forma que DashboardStats.to_dict()."""
+        with self._locked(exclusive=False):
+            counters = dict(zip(COUNTERS, _COUNTERS.unpack_from(self._mm, _COUNTERS_AT)))
+            start, last_update = _TIMES.unpack_from(self._mm, _TIMES_AT)
+        return {
+            "total_readings": counters["total_readings"],
+            "readings_by_risk": {level: counters[level] for level in RISK_LEVELS},
+            "alerts_sent": counters["alerts_sent"],
+            "alerts_by_channel": {channel: counters[channel] for channel in CHANNELS},
+            "last_update": format_seconds(last_update),
+            "uptime_seconds": time.time() - start,
+        }
+
+    @property
+    def reading_seq(self) -> int:
+        """Secuencia de la próxima lectura (cursor inicial para ``tail``)."""
+        with self._locked(exclusive=False):
+            return _SEQ.unpack_from(self._mm, _READING_SEQ_AT)[0]
+
+    def tail(self, cursor: int) -> Tuple[int, List[str]]:
+        """
+        Lecturas publicadas desde ``cursor`` por cualquier worker.
+
+        Si el lector quedó atrás más de ``capacity`` lecturas, salta a la
+        más antigua disponible.
+
+        Returns:
+            (nuevo cursor, lista de JSON de lecturas)
+        """
+        if _SEQ.unpack_from(self._mm, _READING_SEQ_AT)[0] == cursor:
+            return cursor, []   # Sin novedades: sin syscalls
+        with self._locked(exclusive=False):
+            seq, floor = struct.unpack_from("<QQ", self._mm, _READING_SEQ_AT)
+            start = max(cursor, floor, seq - self.capacity)
+            payloads = self._read_slots(HEADER_SIZE, self.capacity, start, seq)
+        return seq, [p.decode() for p in payloads]
+
+
+def shared_state_from_env(capacity: int = 500) -> Optional[SharedState]:
+    """SharedState en ``FLOW_MONITOR_SHARED_STATE`` (ej: /dev/shm/flow-monitor.state), o None."""
+    path = os.getenv("FLOW_MONITOR_SHARED_STATE")
+    return SharedState(path, capacity=capacity) if path else None
@@ -0,0 +1,5 @@
+"""Punto de entrada: python -m benchmarks run|compare (ver benchmarks.suite)."""
+
+from benchmarks.suite import main
+
+main()
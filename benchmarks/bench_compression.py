@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║              🗜️  Compression Benchmark - CPU por MB descomprimido            ║
+║          BodyDecoder + JsonStreamParser sobre lotes de la flota              ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Mide el costo de CPU (``time.process_time``) de recibir un upload masivo
+comprimido, por MB de cuerpo descomprimido, en trozos de 64 KiB como
+llegan del socket:
+
+    inflate_<enc>       Solo descomprimir
+    ndjson_identity     Parsear NDJSON sin comprimir
+    ndjson_<enc>        Descomprimir + parsear NDJSON
+    array_<enc>         Descomprimir + parsear un arreglo JSON
+
+``<enc>`` = gzip (nivel 6) y zstd si ``zstandard`` está instalado. También
+reporta la relación de compresión (lo que ahorra el gateway).
+
+Usage:
+    python -m benchmarks.bench_compression
+    python -m benchmarks.bench_compression --sensors 20000 --ticks 5
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingestion.bodies import BodyDecoder, JsonStreamParser, zstandard
+from sensors.fleet import FleetSimulator
+
+
+NETWORK_CHUNK = 64 * 1024
+
+
+def build_bodies(sensors: int, ticks: int) -> Dict[str, bytes]:
+    fleet = FleetSimulator(sensors=sensors, seed=7, anomaly_rate=0.001)
+    lines, payloads = [], []
+    for _ in range(ticks):
+        values, anomalies = fleet.tick()
+        lines.append(fleet.to_ndjson(values, anomalies))
+        payloads.extend(fleet.to_payloads(values, anomalies))
+    return {"ndjson": "".join(lines).encode(), "array": json.dumps(payloads).encode()}
+
+
+def compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    codecs = {"gzip": lambda data: gzip.compress(data, compresslevel=6)}
+    if zstandard is not None:
+        codecs["zstd"] = zstandard.ZstdCompressor(level=3).compress
+    return codecs
+
+
+def _chunks(data: bytes) -> List[bytes]:
+    return [data[i:i + NETWORK_CHUNK] for i in range(0, len(data), NETWORK_CHUNK)]
+
+
+def _receive(chunks: List[bytes], encoding: str, parse: bool) -> int:
+    """Recorre el cuerpo como lo hace el middleware + /api/ingest/stream; retorna payloads."""
+    decoder = BodyDecoder(encoding, max_bytes=1 << 40) if encoding != "identity" else None
+    parser = JsonStreamParser() if parse else None
+    items = 0
+    for chunk in chunks:
+        pieces = [chunk]
+        if decoder is not None:
+            pieces = [decoder.feed(chunk)]
+            while decoder.pending:
+                pieces.append(decoder.feed(b""))
+        if parser is not None:
+            for piece in pieces:
+                items += len(parser.feed(piece))
+    if decoder is not None:
+        tail = decoder.flush()
+        if parser is not None:
+            items += len(parser.feed(tail))
+    if parser is not None:
+        items += len(parser.close())
+    return items
+
+
+def cpu_per_mb(fn: Callable[[], int], decoded_bytes: int, repeat: int) -> float:
+    """Mejor CPU (ms) por MB descomprimido sobre ``repeat`` pasadas."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        best = min(best, time.process_time() - start)
+    return best * 1000 / (decoded_bytes / (1 << 20))
+
+
+def run(sensors: int = 10000, ticks: int = 3, repeat: int = 3) -> Dict[str, float]:
+    bodies = build_bodies(sensors, ticks)
+    results: Dict[str, float] = {
+        "ndjson_mb": len(bodies["ndjson"]) / (1 << 20),
+        "readings": sensors * ticks,
+    }
+    ndjson = bodies["ndjson"]
+    results["ndjson_identity_ms_per_mb"] = cpu_per_mb(
+        lambda: _receive(_chunks(ndjson), "identity", True), len(ndjson), repeat
+    )
+    for name, compress in compressors().items():
+        for kind, body in bodies.items():
+            compressed = _chunks(compress(body))
+            size = sum(len(c) for c in compressed)
+            results[f"{kind}_{name}_ratio"] = len(body) / size
+            results[f"{kind}_{name}_ms_per_mb"] = cpu_per_mb(
+                lambda: _receive(compressed, name, True), len(body), repeat
+            )
+            if kind == "ndjson":
+                results[f"inflate_{name}_ms_per_mb"] = cpu_per_mb(
+                    lambda: _receive(compressed, name, False), len(body), repeat
+                )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de cuerpos comprimidos")
+    parser.add_argument("--sensors", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    r = run(args.sensors, args.ticks, args.repeat)
+    print("═" * 70)
+    print(f"🗜️  Cuerpos comprimidos - {r['readings']:,} lecturas, "
+          f"{r['ndjson_mb']:.1f} MB NDJSON (CPU por MB descomprimido)")
+    print("═" * 70)
+    keys = [k for k in r if k.endswith("_ms_per_mb")]
+    for key in keys:
+        branch = "└─" if key == keys[-1] else "├─"
+        label = key[:-len("_ms_per_mb")]
+        ratio = r.get(f"{label}_ratio")
+        extra = f"  (relación {ratio:.1f}:1)" if ratio else ""
+        print(f"   {branch} {label:<18} {r[key]:8.2f} ms CPU/MB{extra}")
+    print("═" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                  🌐 HTTP Benchmark - APIs de Capa 1 y Capa 3                 ║
+║            Throughput y latencia con clientes keep-alive (closed loop)       ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Levanta cada API con uvicorn en un puerto libre (o usa una URL existente)
+y mide con N clientes concurrentes, cada uno con su requests.Session:
+
+    ingest             POST /api/ingest              (1 lectura por request)
+    ingest_fast        POST /api/ingest/fast         (cuerpo crudo, respuesta prearmada)
+    ingest_batch       POST /api/ingest/batch        (lotes de --batch lecturas)
+    dashboard_process  POST /api/dashboard/process   (payload enriquecido)
+
+Los cuerpos JSON se precalculan (simulador de flota con semilla fija o una
+captura .fmcap con --replay) para no medir al generador.
+
+Con ``--levels 1,100,1000`` compara /api/ingest contra /api/ingest/fast
+con esa cantidad de conexiones concurrentes; ahí los clientes son
+corrutinas asyncio sobre sockets keep-alive (1000 hilos con requests
+medirían al cliente, no al servidor).
+
+Usage:
+    python -m benchmarks.bench_http
+    python -m benchmarks.bench_http --clients 16 --requests 5000
+    python -m benchmarks.bench_http --levels 1,100,1000 --requests 20000
+    python -m benchmarks.bench_http --ingest-url http://localhost:8000 --dashboard-url http://localhost:8001
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sensors.fleet import FleetSimulator
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def serve(app: str, url: Optional[str] = None, workers: int = 1) -> Iterator[str]:
+    """URL base de la API: la existente o una instancia uvicorn temporal."""
+    if url:
+        yield url.rstrip("/")
+        return
+
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 20
+        while True:
+            try:
+                if requests.get(f"{base}/health", timeout=1).status_code == 200:
+                    break
+            except requests.exceptions.ConnectionError:
+                pass
+            if time.monotonic() > deadline or process.poll() is not None:
+                raise RuntimeError(f"No se pudo iniciar {app}")
+            time.sleep(0.2)
+        yield base
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def build_bodies(n: int, replay: Optional[str] = None) -> Dict[str, List[bytes]]:
+    """Cuerpos de ingest (DataPulse) y dashboard (enriquecidos) precalculados."""
+    if replay:
+        from sensors.capture import load_bodies
+        return {"ingest": load_bodies(replay, "ingest", n), "dashboard": load_bodies(replay, "dashboard", n)}
+
+    from intelligence_core import IntelligenceService
+
+    fleet = FleetSimulator(sensors=1000, seed=42, anomaly_rate=0.01)
+    ingest: List[bytes] = []
+    while len(ingest) < n:
+        values, anomalies = fleet.tick()
+        ingest.extend(line.encode() for line in fleet.to_ndjson(values, anomalies).splitlines())
+    ingest = ingest[:n]
+
+    service = IntelligenceService()
+    dashboard = [
+        json.dumps(service.process(json.loads(body)).to_dict()).encode()
+        for body in ingest
+    ]
+    return {"ingest": ingest, "dashboard": dashboard}
+
+
+def load(url: str, bodies: List[bytes], clients: int, total: int) -> Dict[str, float]:
+    """Closed loop: ``clients`` hilos envían ``total`` requests en conjunto."""
+    latencies: List[List[float]] = [[] for _ in range(clients)]
+    errors = [0] * clients
+    per_client = total // clients
+
+    def client(idx: int) -> None:
+        session = requests.Session()
+        lat = latencies[idx]
+        for i in range(per_client):
+            body = bodies[(idx * per_client + i) % len(bodies)]
+            t0 = time.perf_counter()
+            try:
+                ok = session.post(url, data=body, headers=JSON_HEADERS, timeout=10).ok
+            except requests.exceptions.RequestException:
+                ok = False
+            lat.append(time.perf_counter() - t0)
+            if not ok:
+                errors[idx] += 1
+        session.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    return _summary(latencies, errors, elapsed)
+
+
+def _summary(latencies: List[List[float]], errors: List[int], elapsed: float) -> Dict[str, float]:
+    merged = sorted(x for lat in latencies for x in lat)
+    done = len(merged)
+
+    def pct(q: float) -> float:
+        return merged[min(done - 1, int(q * done))] * 1000 if done else 0.0
+
+    return {
+        "requests": done,
+        "errors": sum(errors),
+        "rps": done / elapsed if elapsed else 0.0,
+        "p50_ms": pct(0.50),
+        "p99_ms": pct(0.99),
+        "max_ms": merged[-1] * 1000 if done else 0.0,
+    }
+
+
+async def _load_async(url: str, bodies: List[bytes], clients: int, total: int) -> Dict[str, float]:
+    parts = urlsplit(url)
+    head = (f"POST {parts.path} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: ").encode()
+    latencies: List[List[float]] = [[] for _ in range(clients)]
+    errors = [0] * clients
+    per_client = max(1, total // clients)
+    ready = asyncio.Event()
+    settled: List[int] = []  # Clientes conectados o con conexión fallida
+
+    async def client(idx: int) -> None:
+        lat = latencies[idx]
+        try:
+            reader, writer = await asyncio.open_connection(parts.hostname, parts.port)
+        except OSError:
+            # Sin conexión: todas sus requests cuentan como error
+            errors[idx] += per_client
+            return
+        finally:
+            settled.append(idx)
+        await ready.wait()
+        try:
+            for i in range(per_client):
+                body = bodies[(idx * per_client + i) % len(bodies)]
+                t0 = time.perf_counter()
+                writer.write(b"%s%d\r\n\r\n%s" % (head, len(body), body))
+                status_line = await reader.readline()
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    name, _, value = line.partition(b":")
+                    if name.lower() == b"content-length":
+                        length = int(value)
+                if length:
+                    await reader.readexactly(length)
+                lat.append(time.perf_counter() - t0)
+                if status_line[9:10] != b"2":
+                    errors[idx] += 1
+        except (OSError, asyncio.IncompleteReadError):
+            errors[idx] += per_client - len(lat)
+        finally:
+            writer.close()
+
+    tasks = [asyncio.create_task(client(i)) for i in range(clients)]
+    # Todas las conexiones abiertas antes de cronometrar
+    while len(settled) < clients:
+        await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    ready.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return _summary(latencies, errors, time.perf_counter() - start)
+
+
+def load_async(url: str, bodies: List[bytes], clients: int, total: int) -> Dict[str, float]:
+    """Closed loop con ``clients`` conexiones keep-alive concurrentes en un event loop."""
+    return asyncio.run(_load_async(url, bodies, clients, total))
+
+
+def compare_fast_path(levels: Sequence[int] = (1, 100, 1000), requests_total: int = 10000,
+                      ingest_url: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """/api/ingest vs /api/ingest/fast con cada nivel de concurrencia (claves ``<ruta>@<n>``)."""
+    bodies = build_bodies(min(requests_total, 20000))["ingest"]
+    results: Dict[str, Dict[str, float]] = {}
+    with serve("ingestion.api:app", ingest_url) as base:
+        load_async(f"{base}/api/ingest/fast", bodies, 10, 500)  # calentamiento
+        for clients in levels:
+            total = max(requests_total, clients * 5)
+            for name, path in (("ingest", "/api/ingest"), ("ingest_fast", "/api/ingest/fast")):
+                results[f"{name}@{clients}"] = load_async(f"{base}{path}", bodies, clients, total)
+    return results
+
+
+def run(clients: int = 8, requests_total: int = 2000, batch: int = 100,
+        ingest_url: Optional[str] = None, dashboard_url: Optional[str] = None,
+        replay: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    bodies = build_bodies(max(requests_total, batch * 50), replay)
+    batches = [
+        b"[" + b",".join(bodies["ingest"][i:i + batch]) + b"]"
+        for i in range(0, len(bodies["ingest"]), batch)
+    ]
+    results: Dict[str, Dict[str, float]] = {}
+
+    with serve("ingestion.api:app", ingest_url) as base:
+        results["ingest"] = load(f"{base}/api/ingest", bodies["ingest"], clients, requests_total)
+        results["ingest_fast"] = load(f"{base}/api/ingest/fast", bodies["ingest"], clients, requests_total)
+        r = load(f"{base}/api/ingest/batch", batches, clients, max(clients * 10, requests_total // 10))
+        r["readings_per_s"] = r["rps"] * batch
+        results["ingest_batch"] = r
+
+    with serve("action_layer.api:app", dashboard_url) as base:
+        results["dashboard_process"] = load(
+            f"{base}/api/dashboard/process", bodies["dashboard"], clients, requests_total
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTTP de las APIs")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=100, help="Lecturas por POST en /api/ingest/batch")
+    parser.add_argument("--ingest-url", default=None, help="API de Capa 1 existente (no levantar)")
+    parser.add_argument("--dashboard-url", default=None, help="API de Capa 3 existente (no levantar)")
+    parser.add_argument("--replay", default=None, help="Captura .fmcap para los cuerpos")
+    parser.add_argument("--levels", default=None,
+                        help="Concurrencias a comparar /api/ingest vs /api/ingest/fast (ej: 1,100,1000)")
+    args = parser.parse_args()
+
+    if args.levels:
+        levels = [int(x) for x in args.levels.split(",")]
+        results = compare_fast_path(levels, args.requests, args.ingest_url)
+        print("═" * 78)
+        print("⚡ /api/ingest vs /api/ingest/fast - clientes asyncio keep-alive")
+        print("═" * 78)
+        print(f"   {'clientes':>8} {'ruta':<12} {'req/s':>9} {'err':>5} {'p50 ms':>8} {'p99 ms':>8} {'speedup':>8}")
+        for clients in levels:
+            base_rps = results[f"ingest@{clients}"]["rps"]
+            for name in ("ingest", "ingest_fast"):
+                r = results[f"{name}@{clients}"]
+                speedup = r["rps"] / base_rps if base_rps else 0.0
+                print(f"   {clients:>8,} {name:<12} {r['rps']:>9,.0f} {r['errors']:>5,} "
+                      f"{r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {speedup:>7.2f}x")
+        print("═" * 78)
+        return
+
+    results = run(args.clients, args.requests, args.batch, args.ingest_url, args.dashboard_url, args.replay)
+
+    print("═" * 78)
+    print(f"🌐 HTTP - {args.clients} clientes keep-alive")
+    print("═" * 78)
+    print(f"   {'endpoint':<20} {'requests':>9} {'err':>5} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, r in results.items():
+        print(f"   {name:<20} {r['requests']:>9,} {r['errors']:>5,} {r['rps']:>9,.0f} "
+              f"{r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['max_ms']:>8.2f}")
+    print("═" * 78)
+    print(f"📦 Ingesta por lotes: {results['ingest_batch']['readings_per_s']:,.0f} lecturas/s")
+
+
+if __name__ == "__main__":
+    main()
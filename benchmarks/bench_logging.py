@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                 📝 Logging Benchmark - Ingesta con/sin logs                  ║
+║          Handler de /api/ingest en proceso bajo cada modo de logging         ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Invoca ``ingest_payload`` (el camino de /api/ingest, sin HTTP) para aislar
+el costo del logging por lectura. Salida a /dev/null, que favorece al modo
+síncrono: en un terminal o un pipe cada write() bloquea el event loop. Con una línea
+por lectura la cola no ayuda (el listener compite por el GIL); lo que
+recupera el throughput es el muestreo.
+
+    disabled        Nivel WARNING: sin logs por lectura
+    sync_every      StreamHandler síncrono, una línea por lectura (antes)
+    queue_every     QueueHandler + listener, una línea por lectura
+    queue_sampled   QueueHandler + listener, 1 de cada 100 (default)
+    json_sampled    Igual que queue_sampled con formato JSON
+
+Usage:
+    python -m benchmarks.bench_logging
+    python -m benchmarks.bench_logging --readings 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_stages import build_payloads
+from observability.logs import configure_logging, dropped_records
+
+
+MODES = {
+    "disabled": {"level": "WARNING"},
+    "sync_every": {"use_queue": False, "sample_every": 1},
+    "queue_every": {"sample_every": 1},
+    "queue_sampled": {"sample_every": 100},
+    "json_sampled": {"sample_every": 100, "fmt": "json"},
+}
+
+
+def _ingest_all(ingest, payloads: List[Dict[str, Any]]) -> None:
+    for payload in payloads:
+        ingest(payload)
+
+
+def run(readings: int = 20000, repeat: int = 3) -> Dict[str, Dict[str, float]]:
+    """Mejor de ``repeat`` corridas por modo (lecturas/s, µs/lectura, descartados)."""
+    from ingestion import api
+
+    payloads = build_payloads(readings, low_only=True)
+    results: Dict[str, Dict[str, float]] = {}
+    with open(os.devnull, "w") as devnull:
+        try:
+            configure_logging(stream=devnull, level="WARNING")
+            _ingest_all(api.ingest_payload, payloads[:1000])
+            for mode, options in MODES.items():
+                best = float("inf")
+                dropped = 0
+                for _ in range(repeat):
+                    configure_logging(stream=devnull, **{"level": "INFO", **options})
+                    start = time.perf_counter()
+                    _ingest_all(api.ingest_payload, payloads)
+                    best = min(best, time.perf_counter() - start)
+                    dropped = max(dropped, dropped_records())
+                    api.readings_buffer.clear()
+                results[mode] = {
+                    "readings_per_s": readings / best,
+                    "us_per_reading": best / readings * 1e6,
+                    "dropped": dropped,
+                }
+        finally:
+            configure_logging()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de logging en la ingesta")
+    parser.add_argument("--readings", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = run(args.readings, args.repeat)
+    base = results["disabled"]["readings_per_s"]
+    print("═" * 70)
+    print(f"📝 Ingesta en proceso - {args.readings:,} lecturas por modo")
+    print("═" * 70)
+    modes = list(results)
+    for mode in modes:
+        r = results[mode]
+        branch = "└─" if mode == modes[-1] else "├─"
+        print(f"   {branch} {mode:<14} {r['readings_per_s']:>10,.0f} lecturas/s "
+              f"{r['us_per_reading']:>7.1f} µs ({r['readings_per_s'] / base:>5.0%})"
+              f"{'  ⚠️ ' + format(int(r['dropped']), ',') + ' descartados' if r['dropped'] else ''}")
+    print("═" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                🧮 Memory Benchmark - Bytes por lectura                       ║
+║             Buffer del DataObserver (500) e historial de 1M                  ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Compara los bytes por lectura almacenada:
+
+    ANTES:   DashboardReading como dataclass con dict ``prediction`` anidado,
+             uuid4 por lectura y strings nuevos por cada JSON recibido
+    DESPUÉS: DashboardReading slotted (strings internados, riesgo int,
+             timestamps float) y ReadingHistory columnar para el historial
+
+Las lecturas se construyen desde JSON parseado (como llegan por la API),
+así cada string es un objeto nuevo salvo que se interne.
+
+Usage:
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_memory --history 1000000 --legacy-sample 100000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from action_layer.models import DashboardReading
+from action_layer.history import ReadingHistory
+
+
+@dataclass
+class LegacyDashboardReading:
+    """Réplica del DashboardReading original (referencia 'antes')."""
+    id: str
+    sensor_id: str
+    timestamp: str
+    value: float
+    unit: str
+    location: str
+    risk_level: str
+    risk_emoji: str
+    prediction: Dict[str, Any]
+    processed_at: str
+
+    @classmethod
+    def from_enriched_data(cls, enriched_data: Dict[str, Any]) -> "LegacyDashboardReading":
+        data_original = enriched_data.get("data_original", {})
+        prediction_alert = enriched_data.get("prediction_alert", {})
+        risk_level = enriched_data.get("risk_level", "LOW")
+        emoji_map = {"LOW": "🟢", "MEDIUM": "🟡", "HIGH": "🟠", "CRITICAL": "🔴"}
+        return cls(
+            id=str(uuid.uuid4()),
+            sensor_id=data_original.get("sensor_id", "UNKNOWN"),
+            timestamp=data_original.get("timestamp", datetime.now().isoformat()),
+            value=data_original.get("value", 0.0),
+            unit=data_original.get("unit", ""),
+            location=data_original.get("location", ""),
+            risk_level=risk_level,
+            risk_emoji=emoji_map.get(risk_level, "⚪"),
+            prediction={
+                "failure_probability": prediction_alert.get("failure_probability", 0.0),
+                "alert_message": prediction_alert.get("alert_message"),
+                "recommended_action": prediction_alert.get("recommended_action"),
+                "time_to_failure": prediction_alert.get("predicted_time_to_failure"),
+            },
+            processed_at=enriched_data.get("processed_at", datetime.now().isoformat()),
+        )
+
+
+def enriched_json(i: int) -> bytes:
+    """Payload JSON de Capa 2 como llega al endpoint /api/dashboard/process."""
+    return json.dumps({
+        "data_original": {
+            "sensor_id": f"SENSOR_{i % 200:03d}",
+            "timestamp": f"2025-12-18T01:{(i // 60) % 60:02d}:{i % 60:02d}.{i % 1000:03d}000",
+            "value": 20.0 + (i % 80) + 0.25,
+            "unit": "Celsius",
+            "location": f"Planta-{chr(65 + i % 4)}/Linea-{i % 10}",
+        },
+        "risk_level": ("LOW", "MEDIUM", "HIGH", "CRITICAL")[i % 4],
+        "prediction_alert": {
+            "failure_probability": (i % 100) / 100,
+            "alert_message": None,
+            "recommended_action": None,
+            "predicted_time_to_failure": None,
+            "confidence": 0.7,
+        },
+        "processed_at": "2025-12-18T01:00:00.500000",
+    }).encode()
+
+
+def measure(n: int, build: Callable[..., Any]) -> float:
+    """Bytes retenidos por entrada tras construir ``n`` entradas."""
+    payloads = [enriched_json(i) for i in range(min(n, 10_000))]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    container = build(n, payloads)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del container
+    return (after - before) / n
+
+
+def legacy_buffer(n, payloads):
+    buf = deque(maxlen=n)
+    for i in range(n):
+        buf.append(LegacyDashboardReading.from_enriched_data(json.loads(payloads[i % len(payloads)])))
+    return buf
+
+
+def compact_buffer(n, payloads):
+    buf = deque(maxlen=n)
+    for i in range(n):
+        buf.append(DashboardReading.from_enriched_data(json.loads(payloads[i % len(payloads)])))
+    return buf
+
+
+def columnar_history(n, payloads):
+    history = ReadingHistory(capacity=n)
+    for i in range(n):
+        history.append(DashboardReading.from_enriched_data(json.loads(payloads[i % len(payloads)])))
+    return history
+
+
+def run(buffer: int = 500, history: int = 1_000_000, legacy_sample: int = 100_000) -> Dict[str, float]:
+    return {
+        "buffer_before_bytes": measure(buffer, legacy_buffer),
+        "buffer_after_bytes": measure(buffer, compact_buffer),
+        "history_before_bytes": measure(legacy_sample, legacy_buffer),
+        "history_after_bytes": measure(history, columnar_history),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes por lectura almacenada")
+    parser.add_argument("--buffer", type=int, default=500, help="Tamaño del buffer del observer")
+    parser.add_argument("--history", type=int, default=1_000_000, help="Entradas del historial")
+    parser.add_argument("--legacy-sample", type=int, default=100_000,
+                        help="Muestra para extrapolar el historial 'antes'")
+    args = parser.parse_args()
+
+    r = run(args.buffer, args.history, args.legacy_sample)
+    buf_before, buf_after = r["buffer_before_bytes"], r["buffer_after_bytes"]
+    hist_before, hist_after = r["history_before_bytes"], r["history_after_bytes"]
+
+    mb = 1024 * 1024
+    print("═" * 70)
+    print("🧮 Bytes por lectura almacenada")
+    print("═" * 70)
+    print(f"   Buffer DataObserver ({args.buffer:,} lecturas)")
+    print(f"   ├─ Antes:   {buf_before:8.0f} B/lectura  ({buf_before * args.buffer / 1024:,.0f} KiB)")
+    print(f"   └─ Después: {buf_after:8.0f} B/lectura  ({buf_after * args.buffer / 1024:,.0f} KiB)")
+    print(f"\n   Historial ({args.history:,} lecturas)")
+    print(f"   ├─ Antes:   {hist_before:8.0f} B/lectura  (~{hist_before * args.history / mb:,.0f} MiB, "
+          f"extrapolado de {args.legacy_sample:,})")
+    print(f"   └─ Después: {hist_after:8.0f} B/lectura  ({hist_after * args.history / mb:,.0f} MiB)")
+    print("═" * 70)
+    print(f"📉 Reducción buffer: {buf_before / buf_after:.1f}x | historial: {hist_before / hist_after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
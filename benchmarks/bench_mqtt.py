@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                  📡 MQTT Benchmark - Mensajes/s por núcleo                   ║
+║           Suscriptor + MqttJsonPlugin.normalize_batch vs MiniBroker          ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+El broker y el publicador corren en un proceso hijo; este proceso solo
+suscribe, decodifica y normaliza. "Por núcleo" = mensajes / segundos de CPU
+de este proceso (``time.process_time``), que no depende de cuánto tarde
+el publicador.
+
+    subscribe_only   Solo recibir y parsear PUBLISH (sin normalizar)
+    normalize        Recibir + normalize_batch (lo que hace ingestion.api)
+
+Usage:
+    python -m benchmarks.bench_mqtt
+    python -m benchmarks.bench_mqtt --messages 500000 --sensors 5000 --batch-size 1000
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingestion.mqtt import MiniBroker, MqttClient, MqttSubscriber
+from ingestion.plugins.mqtt_plugin import MqttJsonPlugin
+
+
+def _publisher_process(ready, go, port_value, messages: int, sensors: int) -> None:
+    """Broker + publicador en el proceso hijo."""
+
+    async def main():
+        async with MiniBroker() as broker:
+            port_value.value = broker.port
+            ready.set()
+            await asyncio.get_running_loop().run_in_executor(None, go.wait)
+            publisher = MqttClient("127.0.0.1", broker.port)
+            await publisher.connect()
+            payloads = [
+                json.dumps({"timestamp": "2025-12-18T01:00:00", "value": 20.0 + i % 60,
+                            "unit": "Celsius", "_meta": {"step": i}}).encode()
+                for i in range(1000)
+            ]
+            for i in range(messages):
+                publisher.publish(f"flowmonitor/Planta-{i % 7}/SENSOR_{i % sensors:05d}",
+                                  payloads[i % 1000])
+                if i % 1000 == 999:
+                    await publisher.drain()
+            await publisher.drain()
+            # Dar tiempo a que el broker reenvíe antes de cerrar
+            while broker.delivered < messages:
+                await asyncio.sleep(0.01)
+            await publisher.close()
+
+    asyncio.run(main())
+
+
+def run_mode(messages: int, sensors: int, batch_size: int, normalize: bool) -> Dict[str, float]:
+    ctx = multiprocessing.get_context("spawn")
+    ready, go = ctx.Event(), ctx.Event()
+    port_value = ctx.Value("i", 0)
+    child = ctx.Process(target=_publisher_process, args=(ready, go, port_value, messages, sensors))
+    child.start()
+    ready.wait()
+
+    async def main():
+        plugin = MqttJsonPlugin()
+        subscriber = MqttSubscriber("127.0.0.1", port_value.value, [plugin.subscription],
+                                    batch_size=batch_size)
+        await subscriber.connect()
+        received = readings = 0
+        go.set()
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+        async for batch in subscriber.batches():
+            received += len(batch)
+            if normalize:
+                readings += len(plugin.normalize_batch(batch).readings)
+            if received >= messages:
+                break
+        cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+        await subscriber.close()
+        return received, readings, cpu, wall
+
+    received, readings, cpu, wall = asyncio.run(main())
+    child.join()
+    return {
+        "messages": received,
+        "readings": readings,
+        "msgs_per_cpu_s": received / cpu if cpu else 0.0,
+        "msgs_per_s": received / wall,
+        "cpu_s": cpu,
+        "wall_s": wall,
+    }
+
+
+def run(messages: int = 200_000, sensors: int = 2000, batch_size: int = 500) -> Dict[str, Dict[str, float]]:
+    return {
+        "subscribe_only": run_mode(messages, sensors, batch_size, normalize=False),
+        "normalize": run_mode(messages, sensors, batch_size, normalize=True),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del suscriptor MQTT")
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--sensors", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    results = run(args.messages, args.sensors, args.batch_size)
+    print("═" * 70)
+    print(f"📡 MQTT → normalize_batch - {args.messages:,} mensajes, {args.sensors:,} sensores "
+          f"(lotes de {args.batch_size})")
+    print("═" * 70)
+    modes = list(results)
+    for mode in modes:
+        r = results[mode]
+        branch = "└─" if mode == modes[-1] else "├─"
+        print(f"   {branch} {mode:<15} {r['msgs_per_cpu_s']:>10,.0f} msg/s por núcleo "
+              f"{r['msgs_per_s']:>10,.0f} msg/s reloj ({r['cpu_s']:.2f}s CPU)")
+    print("═" * 70)
+
+
+if __name__ == "__main__":
+    main()
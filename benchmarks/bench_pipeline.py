@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║               🔗 Pipeline Micro-Benchmark - Overhead por lectura             ║
+║                 Ruta con dicts vs ruta tipada (run_pipeline.py)              ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Mide el costo por lectura de FlowMonitorPipeline:
+
+    dict:   IntelligenceService.process(dict) → EnrichedData.to_dict()
+            → DataObserver.process(dict)   (ruta original)
+    tipada: IntelligenceService.process_reading(NormalizedReading)
+            → DataObserver.process_enriched(EnrichedData)
+
+Los valores se mantienen en rango LOW/MEDIUM para que el dispatcher no
+imprima alertas y la medición refleje solo el pipeline.
+
+Usage:
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --readings 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingestion.plugins.http_json_plugin import HttpJsonPlugin
+from run_pipeline import FlowMonitorPipeline
+
+
+def build_inputs(n: int):
+    """Genera payloads crudos y sus NormalizedReading equivalentes."""
+    plugin = HttpJsonPlugin()
+    base = datetime(2025, 12, 18, 1, 0, 0)
+    raw = [
+        {
+            "sensor_id": f"SENSOR_TEMP_{i % 50:02d}",
+            "timestamp": (base + timedelta(seconds=i)).isoformat(),
+            "value": 20.0 + (i % 45),
+            "unit": "Celsius",
+            "location": f"Planta-A/Horno-{i % 5}",
+        }
+        for i in range(n)
+    ]
+    normalized = [plugin.normalize_data(r) for r in raw]
+    return raw, normalized
+
+
+def bench_dict_path(pipeline: FlowMonitorPipeline, raw: list) -> float:
+    intelligence, observer = pipeline.intelligence, pipeline.observer
+    start = time.perf_counter()
+    for data in raw:
+        enriched_dict = intelligence.process(data).to_dict()
+        observer.process(enriched_dict)
+    return (time.perf_counter() - start) / len(raw)
+
+
+def bench_typed_path(pipeline: FlowMonitorPipeline, normalized: list) -> float:
+    process_reading = pipeline.process_reading
+    start = time.perf_counter()
+    for reading in normalized:
+        process_reading(reading)
+    return (time.perf_counter() - start) / len(normalized)
+
+
+def run(readings: int, rounds: int = 3) -> dict:
+    raw, normalized = build_inputs(readings)
+    pipeline = FlowMonitorPipeline()
+
+    # Calentamiento
+    bench_dict_path(pipeline, raw[:1000])
+    bench_typed_path(pipeline, normalized[:1000])
+
+    dict_us = min(bench_dict_path(pipeline, raw) for _ in range(rounds)) * 1e6
+    typed_us = min(bench_typed_path(pipeline, normalized) for _ in range(rounds)) * 1e6
+    return {
+        "readings": readings,
+        "dict_path_us": dict_us,
+        "typed_path_us": typed_us,
+        "speedup": dict_us / typed_us if typed_us else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Overhead por lectura del pipeline en proceso")
+    parser.add_argument("--readings", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    r = run(args.readings, args.rounds)
+    print("═" * 70)
+    print(f"🔗 Pipeline en proceso - {r['readings']:,} lecturas (mejor de {args.rounds})")
+    print("═" * 70)
+    print(f"   ├─ Ruta dict:    {r['dict_path_us']:7.2f} µs/lectura ({1e6 / r['dict_path_us']:,.0f} lecturas/s)")
+    print(f"   ├─ Ruta tipada:  {r['typed_path_us']:7.2f} µs/lectura ({1e6 / r['typed_path_us']:,.0f} lecturas/s)")
+    print(f"   └─ Mejora:       {r['speedup']:.2f}x")
+    print("═" * 70)
+
+
+if __name__ == "__main__":
+    main()
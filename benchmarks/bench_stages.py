@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║               🔬 Stage Micro-Benchmarks - Costo por etapa                    ║
+║          normalize → rules → predict → observe → dispatch (aislados)         ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Mide cada etapa del pipeline por separado, con entradas pre-construidas
+(deterministas) para que solo se cronometre la etapa:
+
+    normalize        HttpJsonPlugin.normalize_data(payload)
+    normalize_batch  HttpJsonPlugin.normalize_batch(lotes de 500), por lectura
+    mapping_batch    MappingPlugin con el formato DataPulse declarado (mismos lotes)
+    multichannel     normalize_batch de mensajes de 4 canales, por lectura expandida
+    json_body        json.loads(cuerpo) + normalize_batch, por lectura
+    binary_body      BinaryWirePlugin.normalize_batch(trama de 500), por lectura
+    ts_parse         timebase.parse_timestamp(ISO del DataPulse con µs) → ns
+    ts_format        timebase.format_iso(ns) → ISO (solo en los bordes)
+    rules            RulesEngine.evaluate(SensorData)
+    predict          PredictiveModel.predict(SensorData, RiskLevel)
+    core_columns     IntelligenceService.process_readings (lote de 500 en columnas:
+                     reglas + predicción), por lectura
+    observe_dict     DataObserver.process(dict)           (LOW/MEDIUM)
+    observe_typed    DataObserver.process_enriched(EnrichedData)
+    dispatch_skip    NotificationDispatcher.dispatch(dict) sin alerta
+    dispatch_alert   NotificationDispatcher.dispatch(dict) CRITICAL
+                     (salida de los mocks redirigida a /dev/null)
+    metrics_observe  Histogram.observe + 2 perf_counter (costo de instrumentar una etapa)
+
+Usage:
+    python -m benchmarks.bench_stages
+    python -m benchmarks.bench_stages --readings 50000 --rounds 5
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingestion.plugins.binary_plugin import BinaryWirePlugin
+from ingestion.plugins.http_json_plugin import HttpJsonPlugin
+from ingestion.plugins.mapping_plugin import DATAPULSE_MAPPING, MappingPlugin
+from intelligence_core import IntelligenceService
+from intelligence_core.models import SensorData
+from intelligence_core.predictive_model import PredictiveModel
+from intelligence_core.rules_engine import RulesEngine
+from action_layer.data_observer import DataObserver
+from action_layer.notification_dispatcher import NotificationDispatcher
+from observability import Registry
+from sensors.datapulse_sensor import encode_binary
+from timebase import format_iso, parse_timestamp
+
+
+BATCH_SIZE = 500
+
+
+def build_payloads(n: int, low_only: bool = False) -> List[Dict[str, Any]]:
+    """Payloads DataPulse deterministas (50 sensores, valores 20-94 °C)."""
+    base = datetime(2025, 12, 18, 1, 0, 0)
+    span = 45 if low_only else 75
+    return [
+        {
+            "sensor_id": f"SENSOR_TEMP_{i % 50:02d}",
+            "timestamp": (base + timedelta(seconds=i)).isoformat(),
+            "value": 20.0 + (i * 7 % span),
+            "unit": "Celsius",
+            "location": f"Planta-A/Horno-{i % 5}",
+        }
+        for i in range(n)
+    ]
+
+
+def build_multichannel(n: int) -> List[Dict[str, Any]]:
+    """Mensajes de gateway con 3 ejes de vibración + temperatura (``n`` lecturas)."""
+    base = datetime(2025, 12, 18, 1, 0, 0)
+    return [
+        {
+            "sensor_id": f"VIB_GW_{i % 50:02d}",
+            "timestamp": (base + timedelta(seconds=i)).isoformat(),
+            "unit": "mm/s",
+            "location": f"Planta-A/Bomba-{i % 5}",
+            "channels": {"x": 1.0 + i % 7, "y": 0.5 + i % 5, "z": 2.0 + i % 3,
+                         "temp": {"value": 20.0 + i % 60, "unit": "Celsius"}},
+        }
+        for i in range(n // 4)
+    ]
+
+
+def per_op_us(fn: Callable[[Any], Any], items: Sequence[Any], rounds: int) -> float:
+    """Mejor tiempo por operación (µs) sobre ``rounds`` pasadas."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, (time.perf_counter() - start) / len(items))
+    return best * 1e6
+
+
+def run(readings: int = 20000, rounds: int = 3) -> Dict[str, float]:
+    plugin = HttpJsonPlugin()
+    service = IntelligenceService()
+    rules = RulesEngine()
+    model = PredictiveModel()
+
+    payloads = build_payloads(readings)
+    batches = [payloads[i:i + BATCH_SIZE] for i in range(0, readings, BATCH_SIZE)]
+    json_bodies = [json.dumps(batch).encode() for batch in batches]
+    frames = [encode_binary(batch) for batch in batches]
+    binary_plugin = BinaryWirePlugin()
+    messages = build_multichannel(readings)
+    message_batches = [messages[i:i + BATCH_SIZE // 4] for i in range(0, len(messages), BATCH_SIZE // 4)]
+    reading_batches = [plugin.normalize_batch(batch).readings for batch in batches]
+    mapping_plugin = MappingPlugin(DATAPULSE_MAPPING)
+    # Timestamps con microsegundos, varios por segundo (como datetime.now() del DataPulse)
+    base = datetime(2025, 12, 18, 1, 0, 0)
+    iso_timestamps = [(base + timedelta(microseconds=i * 40_013)).isoformat() for i in range(readings)]
+    ns_timestamps = [parse_timestamp(t) for t in iso_timestamps]
+    low_payloads = build_payloads(readings, low_only=True)
+    sensor_data = [SensorData.from_dict(p) for p in payloads]
+    evaluated = [(sd,) + rules.evaluate_with_threshold(sd) for sd in sensor_data]
+    low_enriched = [service.process(p) for p in low_payloads]
+    low_dicts = [e.to_dict() for e in low_enriched]
+
+    critical_dict = service.process({**payloads[0], "value": 99.0}).to_dict()
+    alert_count = max(1, readings // 20)
+
+    def predict(item):
+        sd, risk, threshold = item
+        model.predict(sd, risk, threshold.critical, threshold.warning)
+
+    observer = DataObserver(max_buffer_size=500)
+    dispatcher = NotificationDispatcher()
+
+    results = {
+        "readings": readings,
+        "normalize_us": per_op_us(plugin.normalize_data, payloads, rounds),
+        "normalize_batch_us": per_op_us(plugin.normalize_batch, batches, rounds) / BATCH_SIZE,
+        "mapping_batch_us": per_op_us(mapping_plugin.normalize_batch, batches, rounds) / BATCH_SIZE,
+        "multichannel_us": per_op_us(plugin.normalize_batch, message_batches, rounds) / BATCH_SIZE,
+        "json_body_us": per_op_us(
+            lambda body: plugin.normalize_batch(json.loads(body)), json_bodies, rounds
+        ) / BATCH_SIZE,
+        "binary_body_us": per_op_us(
+            lambda frame: binary_plugin.normalize_batch([frame]), frames, rounds
+        ) / BATCH_SIZE,
+        "ts_parse_us": per_op_us(parse_timestamp, iso_timestamps, rounds),
+        "ts_format_us": per_op_us(format_iso, ns_timestamps, rounds),
+        "rules_us": per_op_us(rules.evaluate, sensor_data, rounds),
+        "predict_us": per_op_us(predict, evaluated, rounds),
+        "core_columns_us": per_op_us(service.process_readings, reading_batches, rounds) / BATCH_SIZE,
+        "observe_dict_us": per_op_us(observer.process, low_dicts, rounds),
+        "observe_typed_us": per_op_us(observer.process_enriched, low_enriched, rounds),
+        "dispatch_skip_us": per_op_us(dispatcher.dispatch, low_dicts, rounds),
+    }
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results["dispatch_alert_us"] = per_op_us(
+            dispatcher.dispatch, [critical_dict] * alert_count, rounds
+        )
+    
+    histogram = Registry().histogram("bench_stage_seconds", "bench")
+    clock = time.perf_counter
+    
+    def instrumented(_):
+        t0 = clock()
+        histogram.observe(clock() - t0)
+    
+    results["metrics_observe_us"] = per_op_us(instrumented, payloads, rounds)
+    return results
+
+
+STAGE_LABELS = {
+    "normalize_us": "normalize (Capa 1)",
+    "normalize_batch_us": "normalize_batch",
+    "mapping_batch_us": "mapeo declarativo",
+    "multichannel_us": "multicanal → lecturas",
+    "json_body_us": "cuerpo JSON → lote",
+    "binary_body_us": "trama binaria → lote",
+    "ts_parse_us": "timestamp ISO → ns",
+    "ts_format_us": "timestamp ns → ISO",
+    "rules_us": "rules evaluate",
+    "predict_us": "predict",
+    "core_columns_us": "reglas+predict (cols)",
+    "observe_dict_us": "observe (dict)",
+    "observe_typed_us": "observe (tipado)",
+    "dispatch_skip_us": "dispatch sin alerta",
+    "dispatch_alert_us": "dispatch CRITICAL",
+    "metrics_observe_us": "instrumentación",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks por etapa")
+    parser.add_argument("--readings", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    r = run(args.readings, args.rounds)
+    print("═" * 70)
+    print(f"🔬 Costo por etapa - {r['readings']:,} lecturas (mejor de {args.rounds})")
+    print("═" * 70)
+    keys = list(STAGE_LABELS)
+    for key in keys:
+        branch = "└─" if key == keys[-1] else "├─"
+        print(f"   {branch} {STAGE_LABELS[key]:<22} {r[key]:8.2f} µs/op ({1e6 / r[key]:>12,.0f} ops/s)")
+    print("═" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                 🗄️ Storage Benchmark - SQLiteStore                           ║
+║            ¿El escritor en segundo plano sostiene 20k lecturas/s?            ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Un productor encola NormalizedReading a ritmo fijo (por defecto 20.000/s)
+mientras el hilo escritor de SQLiteStore los persiste en lotes.
+
+Mide:
+    - Costo por ``save_reading`` en el productor (request path)
+    - Throughput real del escritor y profundidad de cola
+    - Retraso de vaciado al terminar (lag) y lecturas descartadas
+
+Usage:
+    python -m benchmarks.bench_storage
+    python -m benchmarks.bench_storage --rate 20000 --duration 10
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingestion.models import NormalizedReading, ReadingType
+from storage import SQLiteStore
+
+
+def build_readings(n_sensors: int = 1000) -> list:
+    """Pre-construye lecturas para que el productor no gaste CPU generando."""
+    now = datetime.now()
+    return [
+        NormalizedReading(
+            sensor_id=f"BENCH_{i:04d}",
+            timestamp=now,
+            value=20.0 + (i % 80),
+            unit="Celsius",
+            source="bench",
+            location=f"Zona-{i % 26}",
+            reading_type=ReadingType.TEMPERATURE,
+            metadata={"step": i},
+        )
+        for i in range(n_sensors)
+    ]
+
+
+def run(rate: int, duration: float, path: str, batch_size: int) -> dict:
+    store = SQLiteStore(path, batch_size=batch_size)
+    readings = build_readings()
+    n = len(readings)
+
+    tick = 0.01  # el productor encola en ráfagas de 10ms
+    per_tick = max(1, int(rate * tick))
+    put_ns_total = 0
+    put_ns_max = 0
+    sent = 0
+    max_depth = 0
+
+    start = time.perf_counter()
+    next_tick = start
+    end = start + duration
+    while time.perf_counter() < end:
+        for _ in range(per_tick):
+            t0 = time.perf_counter_ns()
+            store.save_reading(readings[sent % n])
+            dt = time.perf_counter_ns() - t0
+            put_ns_total += dt
+            if dt > put_ns_max:
+                put_ns_max = dt
+            sent += 1
+        max_depth = max(max_depth, store.get_stats()["queue_depth"])
+        next_tick += tick
+        sleep = next_tick - time.perf_counter()
+        if sleep > 0:
+            time.sleep(sleep)
+    produce_elapsed = time.perf_counter() - start
+
+    flush_start = time.perf_counter()
+    store.flush()
+    lag = time.perf_counter() - flush_start
+    total_elapsed = time.perf_counter() - start
+
+    stats = store.get_stats()
+    persisted = store.count("readings")
+    store.close()
+
+    return {
+        "target_rate": rate,
+        "sent": sent,
+        "produce_rate": sent / produce_elapsed,
+        "write_rate": stats["written"] / total_elapsed,
+        "persisted": persisted,
+        "dropped": stats["dropped"],
+        "batches": stats["batches"],
+        "max_queue_depth": max_depth,
+        "flush_lag_s": lag,
+        "put_avg_us": put_ns_total / sent / 1000 if sent else 0,
+        "put_max_us": put_ns_max / 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLiteStore writer benchmark")
+    parser.add_argument("--rate", type=int, default=20000, help="Lecturas/s objetivo")
+    parser.add_argument("--duration", type=float, default=5.0, help="Segundos de carga")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--db", default=None, help="Archivo SQLite (default: temporal)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db or os.path.join(tmp, "bench.db")
+        r = run(args.rate, args.duration, path, args.batch_size)
+
+    keeps_up = r["dropped"] == 0 and r["flush_lag_s"] < 1.0 and r["persisted"] == r["sent"]
+
+    print("═" * 70)
+    print("🗄️  SQLiteStore - Benchmark de escritura")
+    print("═" * 70)
+    print(f"   ├─ Objetivo:          {r['target_rate']:,} lecturas/s")
+    print(f"   ├─ Producido:         {r['produce_rate']:,.0f} lecturas/s ({r['sent']:,})")
+    print(f"   ├─ Escrito:           {r['write_rate']:,.0f} filas/s ({r['persisted']:,})")
+    print(f"   ├─ Lotes:             {r['batches']:,}")
+    print(f"   ├─ Cola máx.:         {r['max_queue_depth']:,}")
+    print(f"   ├─ Lag de vaciado:    {r['flush_lag_s'] * 1000:.1f} ms")
+    print(f"   ├─ Descartadas:       {r['dropped']:,}")
+    print(f"   ├─ save_reading avg:  {r['put_avg_us']:.2f} µs")
+    print(f"   └─ save_reading max:  {r['put_max_us']:.1f} µs")
+    print("═" * 70)
+    print("✅ El escritor sostiene la carga" if keeps_up else "🔴 El escritor NO sostiene la carga")
+
+
+if __name__ == "__main__":
+    main()
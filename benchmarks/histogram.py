@@ -0,0 +1,193 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                📏 Latency Histogram - Flow-Monitor Load Tools                ║
+║        Buckets logarítmicos (estilo HDR), memoria fija y combinables         ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Histograma de latencias compartido por load_hard_test, load_async_test y
+load_extreme_test:
+
+- Valores en microsegundos, 64 sub-buckets por potencia de 2: error
+  relativo < 1.6% en cualquier percentil, 2240 contadores int64 (17.5 KiB) sin
+  importar cuántas muestras se registren
+- ``merge()`` y ``to_bytes()/from_bytes()`` para combinar histogramas de
+  hilos y procesos al final de la prueba
+- ``OpenLoopSchedule``: tiempos de inicio planificados a tasa fija. La
+  latencia se mide desde el inicio *planificado*, así el retraso de cola
+  que un generador closed-loop oculta (omisión coordinada) queda incluido
+"""
+
+import time
+from array import array
+from typing import Dict, Optional
+
+
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS          # 128 valores exactos en [0, 128) µs
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1           # 64 sub-buckets por potencia de 2
+MAX_VALUE_BITS = 40                               # ~12 días en µs
+BUCKET_COUNT = (MAX_VALUE_BITS - SUB_BUCKET_BITS + 2) * SUB_BUCKET_HALF
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def _index(value: int) -> int:
+    if value < SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return (shift + 1) * SUB_BUCKET_HALF + (value >> shift) - SUB_BUCKET_HALF
+
+
+def _bucket_value(index: int) -> float:
+    """Punto medio del rango de valores del bucket."""
+    if index < SUB_BUCKET_COUNT:
+        return float(index)
+    shift = index // SUB_BUCKET_HALF - 1
+    low = (index % SUB_BUCKET_HALF + SUB_BUCKET_HALF) << shift
+    return low + ((1 << shift) - 1) / 2
+
+
+class LatencyHistogram:
+    """
+    📏 Histograma de latencias con buckets logarítmicos.
+
+    Ejemplo:
+        hist = LatencyHistogram()
+        hist.record(time.perf_counter() - intended_start)
+        hist.merge(other_thread_hist)
+        hist.percentile(99.9)  # ms
+    """
+
+    __slots__ = ("counts", "count", "total_us", "min_us", "max_us")
+
+    def __init__(self):
+        self.counts = array("q", bytes(8 * BUCKET_COUNT))
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def record_us(self, value: int) -> None:
+        """Registra una latencia en microsegundos."""
+        if value < 0:
+            value = 0
+        elif value.bit_length() > MAX_VALUE_BITS:
+            value = (1 << MAX_VALUE_BITS) - 1
+        self.counts[_index(value)] += 1
+        if not self.count or value < self.min_us:
+            self.min_us = value
+        if value > self.max_us:
+            self.max_us = value
+        self.count += 1
+        self.total_us += value
+
+    def record(self, seconds: float) -> None:
+        """Registra una latencia en segundos (ej: diferencia de perf_counter)."""
+        self.record_us(int(seconds * 1_000_000))
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Suma otro histograma a este (retorna self)."""
+        if not other.count:
+            return self
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.min_us = other.min_us if not self.count else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+        self.count += other.count
+        self.total_us += other.total_us
+        return self
+
+    def percentile(self, q: float) -> float:
+        """Latencia (ms) del percentil ``q`` (0-100)."""
+        if not self.count:
+            return 0.0
+        if q >= 100:
+            return self.max_us / 1000
+        target = max(1, int(self.count * q / 100 + 0.5))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c:
+                seen += c
+                if seen >= target:
+                    return min(_bucket_value(i), self.max_us) / 1000
+        return self.max_us / 1000
+
+    @property
+    def mean(self) -> float:
+        """Promedio en ms."""
+        return self.total_us / self.count / 1000 if self.count else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """count, min, mean, p50, p90, p99, p99.9 y max (ms)."""
+        result = {"count": self.count, "min": self.min_us / 1000, "mean": self.mean}
+        for q in PERCENTILES:
+            result[f"p{q:g}"] = self.percentile(q)
+        result["max"] = self.max_us / 1000
+        return result
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Serialización (para combinar entre procesos)
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def to_bytes(self) -> bytes:
+        header = array("q", [self.count, self.total_us, self.min_us, self.max_us])
+        return header.tobytes() + self.counts.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "LatencyHistogram":
+        hist = cls()
+        header = array("q")
+        header.frombytes(data[:32])
+        hist.count, hist.total_us, hist.min_us, hist.max_us = header
+        hist.counts = array("q")
+        hist.counts.frombytes(data[32:])
+        return hist
+
+
+class OpenLoopSchedule:
+    """
+    ⏰ Planificación open-loop: la request ``i`` debe iniciar en start + i/rate.
+
+    Los workers toman el siguiente slot, esperan hasta su inicio planificado
+    (si van adelantados) y miden la latencia desde ese instante. Si el
+    sistema se atrasa, los slots vencidos se envían de inmediato y su
+    espera cuenta como latencia.
+    """
+
+    def __init__(self, rate: float, start: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.interval = 1.0 / rate
+        self.start = time.perf_counter() if start is None else start
+
+    def intended(self, slot: int) -> float:
+        return self.start + slot * self.interval
+
+    def wait(self, slot: int) -> float:
+        """Duerme hasta el inicio planificado del slot y lo retorna."""
+        intended = self.start + slot * self.interval
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return intended
+
+
+def format_latency_report(hist: LatencyHistogram, open_loop: bool, indent: str = "   ") -> str:
+    """Bloque de reporte de latencias común a las tres herramientas de carga."""
+    s = hist.summary()
+    mode = ("open loop, desde el inicio planificado (incluye espera en cola)"
+            if open_loop else "closed loop, sin corrección de omisión coordinada")
+    lines = [
+        f"⏱️ LATENCIAS (ms) - {mode}",
+        f"{indent}├─ Muestras: {s['count']:,}",
+        f"{indent}├─ Mínima:   {s['min']:.2f}",
+        f"{indent}├─ Promedio: {s['mean']:.2f}",
+        f"{indent}├─ P50:      {s['p50']:.2f}",
+        f"{indent}├─ P90:      {s['p90']:.2f}",
+        f"{indent}├─ P99:      {s['p99']:.2f}",
+        f"{indent}├─ P99.9:    {s['p99.9']:.2f}",
+        f"{indent}└─ Máxima:   {s['max']:.2f}",
+    ]
+    return "\n".join(lines)
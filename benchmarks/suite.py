@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                   📊 Benchmark Suite - Flow-Monitor                          ║
+║            Resultados JSON y comparación contra un baseline                  ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Ejecuta los benchmarks del paquete y los reduce a métricas planas
+``<suite>.<métrica>`` con unidad y dirección (``lower``/``higher`` es mejor):
+
+    stages          Micro-benchmarks por etapa (bench_stages)
+    pipeline        Pipeline en proceso, ruta dict vs tipada (bench_pipeline)
+    async_pipeline  Runner asyncio de 5 etapas (pipeline.async_runner)
+    storage         Escritor SQLite en segundo plano (bench_storage)
+    memory          Bytes por lectura en buffer e historial (bench_memory)
+    compression     CPU por MB de cuerpos gzip/zstd + parser (bench_compression)
+    http            APIs vía uvicorn (bench_http) - no incluido por defecto
+    logging         Ingesta con/sin logs por lectura (bench_logging) - no incluido por defecto
+    mqtt            Suscriptor MQTT + normalize_batch (bench_mqtt) - no incluido por defecto
+
+Con ``--baseline`` (o el subcomando ``compare``) marca como regresión toda
+métrica que empeore más que ``--tolerance`` y termina con código 1.
+
+Usage:
+    python -m benchmarks run --out results.json
+    python -m benchmarks run stages pipeline --quick --baseline baseline.json
+    python -m benchmarks run all --out baseline.json
+    python -m benchmarks compare results.json baseline.json --tolerance 0.1
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+LOWER = "lower"
+HIGHER = "higher"
+
+# (valor, unidad, dirección)
+Metric = Tuple[float, str, str]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Suites
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _stages(quick: bool) -> Dict[str, Metric]:
+    from benchmarks import bench_stages
+
+    r = bench_stages.run(readings=5000 if quick else 20000, rounds=3)
+    return {key: (r[key], "µs", LOWER) for key in bench_stages.STAGE_LABELS}
+
+
+def _pipeline(quick: bool) -> Dict[str, Metric]:
+    from benchmarks import bench_pipeline
+
+    r = bench_pipeline.run(readings=5000 if quick else 20000, rounds=3)
+    return {
+        "dict_path_us": (r["dict_path_us"], "µs", LOWER),
+        "typed_path_us": (r["typed_path_us"], "µs", LOWER),
+    }
+
+
+def _async_pipeline(quick: bool) -> Dict[str, Metric]:
+    import asyncio
+    from pipeline.async_runner import AsyncPipelineRunner, synthetic_source
+
+    runner = AsyncPipelineRunner()
+    r = asyncio.run(runner.run(synthetic_source(20000 if quick else 100000)))
+    return {
+        "readings_per_s": (r["readings_per_second"], "lecturas/s", HIGHER),
+        "e2e_avg_ms": (r["e2e_avg_ms"], "ms", LOWER),
+    }
+
+
+def _storage(quick: bool) -> Dict[str, Metric]:
+    from benchmarks import bench_storage
+
+    with tempfile.TemporaryDirectory() as tmp:
+        r = bench_storage.run(rate=20000, duration=2.0 if quick else 5.0,
+                              path=os.path.join(tmp, "bench.db"), batch_size=2000)
+    return {
+        "put_avg_us": (r["put_avg_us"], "µs", LOWER),
+        "write_rate": (r["write_rate"], "filas/s", HIGHER),
+        "flush_lag_ms": (r["flush_lag_s"] * 1000, "ms", LOWER),
+        "dropped": (r["dropped"], "lecturas", LOWER),
+    }
+
+
+def _memory(quick: bool) -> Dict[str, Metric]:
+    from benchmarks import bench_memory
+
+    r = bench_memory.run(history=100_000 if quick else 1_000_000, legacy_sample=10_000)
+    return {
+        "buffer_bytes": (r["buffer_after_bytes"], "B/lectura", LOWER),
+        "history_bytes": (r["history_after_bytes"], "B/lectura", LOWER),
+    }
+
+
+def _http(quick: bool) -> Dict[str, Metric]:
+    from benchmarks import bench_http
+
+    results = bench_http.run(clients=8, requests_total=1000 if quick else 5000)
+    metrics: Dict[str, Metric] = {}
+    for endpoint, r in results.items():
+        metrics[f"{endpoint}_rps"] = (r["rps"], "req/s", HIGHER)
+        metrics[f"{endpoint}_p50_ms"] = (r["p50_ms"], "ms", LOWER)
+        metrics[f"{endpoint}_p99_ms"] = (r["p99_ms"], "ms", LOWER)
+        metrics[f"{endpoint}_errors"] = (r["errors"], "requests", LOWER)
+    return metrics
+
+
+def _logging(quick: bool) -> Dict[str, Metric]:
+    from benchmarks import bench_logging
+
+    results = bench_logging.run(readings=5000 if quick else 20000)
+    return {f"{mode}_rps": (r["readings_per_s"], "lecturas/s", HIGHER) for mode, r in results.items()}
+
+
+def _mqtt(quick: bool) -> Dict[str, Metric]:
+    from benchmarks import bench_mqtt
+
+    results = bench_mqtt.run(messages=50_000 if quick else 200_000)
+    return {f"{mode}_msgs_per_cpu_s": (r["msgs_per_cpu_s"], "msg/s", HIGHER) for mode, r in results.items()}
+
+
+def _compression(quick: bool) -> Dict[str, Metric]:
+    from benchmarks import bench_compression
+
+    r = bench_compression.run(sensors=3000 if quick else 10000)
+    metrics = {key: (value, "ms CPU/MB", LOWER) for key, value in r.items() if key.endswith("_ms_per_mb")}
+    metrics.update({key: (value, "x", HIGHER) for key, value in r.items() if key.endswith("_ratio")})
+    return metrics
+
+
+SUITES: Dict[str, Callable[[bool], Dict[str, Metric]]] = {
+    "stages": _stages,
+    "pipeline": _pipeline,
+    "async_pipeline": _async_pipeline,
+    "storage": _storage,
+    "memory": _memory,
+    "compression": _compression,
+    "http": _http,
+    "logging": _logging,
+    "mqtt": _mqtt,
+}
+
+DEFAULT_SUITES = ("stages", "pipeline", "async_pipeline", "storage", "memory", "compression")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Ejecución y comparación
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_suites(names: List[str], quick: bool = False) -> Dict[str, Any]:
+    """Ejecuta las suites indicadas y retorna el documento de resultados."""
+    metrics: Dict[str, Dict[str, Any]] = {}
+    for name in names:
+        print(f"⏱️  {name}...", file=sys.stderr, flush=True)
+        start = time.perf_counter()
+        for key, (value, unit, better) in SUITES[name](quick).items():
+            metrics[f"{name}.{key}"] = {"value": float(value), "unit": unit, "better": better}
+        print(f"   └─ {time.perf_counter() - start:.1f}s", file=sys.stderr, flush=True)
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+            "suites": names,
+        },
+        "metrics": metrics,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Compara métricas comunes contra el baseline.
+
+    Returns:
+        Filas con name, baseline, current, change (relativo) y status
+        ("ok", "improved" o "regression")
+    """
+    rows = []
+    for name, cur in current["metrics"].items():
+        base = baseline.get("metrics", {}).get(name)
+        if base is None:
+            continue
+        b, c = base["value"], cur["value"]
+        change = (c - b) / abs(b) if b else (0.0 if c == b else float("inf") * (1 if c > b else -1))
+        worse = change if cur["better"] == LOWER else -change
+        if worse > tolerance:
+            status = "regression"
+        elif worse < -tolerance:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": name, "baseline": b, "current": c, "unit": cur["unit"],
+                     "change": change, "status": status})
+    return rows
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    meta = results["meta"]
+    print("═" * 78)
+    print(f"📊 Benchmarks @ {meta['commit']} - Python {meta['python']}{' (quick)' if meta['quick'] else ''}")
+    print("═" * 78)
+    for name, m in results["metrics"].items():
+        arrow = "↓" if m["better"] == LOWER else "↑"
+        print(f"   {name:<42} {m['value']:>14,.2f} {m['unit']:<11} {arrow}")
+    print("═" * 78)
+
+
+def print_comparison(rows: List[Dict[str, Any]], tolerance: float) -> int:
+    """Imprime la comparación y retorna la cantidad de regresiones."""
+    icons = {"ok": "🟢", "improved": "🚀", "regression": "🔴"}
+    print(f"\n📐 Comparación contra baseline (tolerancia ±{tolerance:.0%})")
+    print("─" * 78)
+    for row in rows:
+        print(f"   {icons[row['status']]} {row['name']:<40} {row['baseline']:>12,.2f} → "
+              f"{row['current']:>12,.2f} ({row['change']:+.1%})")
+    print("─" * 78)
+    regressions = sum(1 for row in rows if row["status"] == "regression")
+    print("✅ Sin regresiones" if not regressions else f"🔴 {regressions} regresión(es)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="📊 Suite de benchmarks de Flow-Monitor")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Ejecuta suites y emite JSON")
+    run_p.add_argument("suites", nargs="*", default=list(DEFAULT_SUITES),
+                       help=f"Suites ({', '.join(SUITES)}) o 'all'")
+    run_p.add_argument("--quick", action="store_true", help="Tamaños reducidos (CI)")
+    run_p.add_argument("--out", default=None, help="Archivo JSON de resultados")
+    run_p.add_argument("--baseline", default=None, help="JSON de referencia para comparar")
+    run_p.add_argument("--tolerance", type=float, default=0.10)
+
+    cmp_p = sub.add_parser("compare", help="Compara dos archivos de resultados")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("--tolerance", type=float, default=0.10)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        names = list(SUITES) if args.suites == ["all"] else args.suites
+        unknown = [n for n in names if n not in SUITES]
+        if unknown:
+            parser.error(f"Suites desconocidas: {unknown}")
+        results = run_suites(names, args.quick)
+        print_results(results)
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"💾 Resultados en {args.out}")
+        if args.baseline:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+            if print_comparison(compare(results, baseline, args.tolerance), args.tolerance):
+                sys.exit(1)
+    else:
+        with open(args.current) as f:
+            current = json.load(f)
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if print_comparison(compare(current, baseline, args.tolerance), args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
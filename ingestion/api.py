@@ -14,29 +14,151 @@ Usage:
     
     o con uvicorn:
     uvicorn ingestion.api:app --reload --port 8000
+    
+    Ingesta MQTT además de HTTP (plantilla de tópico opcional):
+    export FLOW_MONITOR_MQTT=localhost:1883
+    export FLOW_MONITOR_MQTT_TOPIC="flowmonitor/{location}/{sensor_id}"
+    uvicorn ingestion.api:app --port 8000
+    
+    Cuerpos comprimidos (Content-Encoding gzip/deflate, zstd si está instalado):
+    gzip -c fleet.ndjson | curl --data-binary @- -H "Content-Encoding: gzip" \
+        -H "Content-Type: application/x-ndjson" localhost:8000/api/ingest/stream
+    
+    Ruta rápida para productores de alto volumen (202 sin cuerpo armado por request;
+    "Prefer: return=minimal" responde 204 vacío):
+    curl -d @reading.json -H "Content-Type: application/json" localhost:8000/api/ingest/fast
+    
+    Formatos JSON de proveedores declarados en configuración (ver ingestion.plugins.mapping_plugin):
+    export FLOW_MONITOR_MAPPINGS=config/vendor_mappings.json
+    uvicorn ingestion.api:app --port 8000
+    
+    Polling Modbus-TCP (perfiles y dispositivos en JSON, ver ingestion.modbus.mapping):
+    export FLOW_MONITOR_MODBUS=config/modbus_devices.json
+    uvicorn ingestion.api:app --port 8000
 
 Author: Flow-Monitor Team
 Project: Flow-Monitor (MVP Semilla Inicia)
 """
 
+import asyncio
+import atexit
+import json
 import logging
-from datetime import datetime
+import os
+from contextlib import asynccontextmanager
+from time import perf_counter
 from typing import Any, Dict, List, Optional
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
-from ingestion.models import NormalizedReading
-from ingestion.registry import get_default_registry, PluginNotFoundError
+from observability import metrics
+from observability.admin import router as admin_router
+from observability.logs import configure_logging, sampled_logger
+from ingestion.bodies import DecompressionMiddleware, JsonStreamParser
+from ingestion.models import NormalizedReading, RejectedPayload
+from ingestion.plugins.base import SensorPlugin
+from ingestion.registry import get_default_registry, PluginNotFoundError, ROUTE_HEADER
+from timebase import format_iso, now_ns
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson viene en requirements.txt; sin él, mismo resultado con json (más lento)
+    _loads = json.loads
 
-# Configuración de logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(message)s"
-)
+
+# Configuración de logging: cola + listener, 1 de cada N lecturas (ver observability.logs)
+configure_logging()
 logger = logging.getLogger("ingestion.api")
+reading_log = sampled_logger("ingestion.api")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Suscriptor MQTT opcional (FLOW_MONITOR_MQTT=host:1883)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def _mqtt_ingest_loop(address: str, topic_template: Optional[str]) -> None:
+    """Suscribe los tópicos de la plantilla y envía cada lote por la ruta de /api/ingest/batch."""
+    from ingestion.mqtt import MqttError, MqttSubscriber
+    from ingestion.plugins.mqtt_plugin import MqttJsonPlugin
+    
+    plugin = MqttJsonPlugin(topic_template or MqttJsonPlugin.DEFAULT_TOPIC_TEMPLATE)
+    if plugin.name not in registry:
+        registry.register(plugin)
+    plugin = registry.get(plugin.name)
+    host, _, port = address.rpartition(":") if ":" in address else (address, "", "1883")
+    
+    while True:
+        subscriber = MqttSubscriber(host, int(port), [plugin.subscription])
+        try:
+            await subscriber.connect()
+            logger.info("📡 MQTT subscribed to %s at %s", plugin.subscription, address)
+            async for batch in subscriber.batches():
+                _ingest_batch(plugin, batch)
+            logger.warning("📡 MQTT broker closed the connection, reconnecting")
+        except (OSError, MqttError) as e:
+            logger.warning("📡 MQTT connection error (%s), retrying in 5s", e)
+        except Exception:
+            # La tarea no se espera: sin esto un error de ingesta la termina sin dejar rastro
+            logger.exception("📡 MQTT ingest failed, reconnecting in 5s")
+        finally:
+            await subscriber.close()
+        await asyncio.sleep(5.0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Polling Modbus-TCP opcional (FLOW_MONITOR_MODBUS=devices.json)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def _modbus_poll_loop(config_path: str) -> None:
+    """Consulta los dispositivos del archivo y envía cada lote por la ruta de /api/ingest/batch."""
+    from ingestion.modbus import ModbusPoller, load_devices
+    from ingestion.plugins.modbus_plugin import ModbusTcpPlugin
+    
+    with open(config_path) as f:
+        devices = load_devices(json.load(f))
+    if "modbus-tcp-plugin" not in registry:
+        registry.register(ModbusTcpPlugin())
+    plugin = registry.get("modbus-tcp-plugin")
+    
+    poller = ModbusPoller(devices, sink=lambda reads: _ingest_batch(plugin, reads))
+    logger.info("🏭 Modbus polling %d devices from %s", len(devices), config_path)
+    await poller.run()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Mapeos JSON declarativos opcionales (FLOW_MONITOR_MAPPINGS=mappings.json)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _register_mappings(config_path: str) -> None:
+    """Compila los mapeos del archivo y los registra (se enrutan como cualquier plugin)."""
+    from ingestion.plugins.mapping_plugin import load_mapping_plugins
+    
+    with open(config_path) as f:
+        plugins = load_mapping_plugins(json.load(f))
+    for plugin in plugins:
+        if plugin.name in registry:
+            registry.unregister(plugin.name)
+        registry.register(plugin)
+    logger.info("🧩 %d JSON mappings loaded from %s", len(plugins), config_path)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if os.getenv("FLOW_MONITOR_MAPPINGS"):
+        _register_mappings(os.environ["FLOW_MONITOR_MAPPINGS"])
+    tasks = []
+    if os.getenv("FLOW_MONITOR_MQTT"):
+        tasks.append(asyncio.create_task(_mqtt_ingest_loop(
+            os.environ["FLOW_MONITOR_MQTT"], os.getenv("FLOW_MONITOR_MQTT_TOPIC")
+        )))
+    if os.getenv("FLOW_MONITOR_MODBUS"):
+        tasks.append(asyncio.create_task(_modbus_poll_loop(os.environ["FLOW_MONITOR_MODBUS"])))
+    yield
+    for task in tasks:
+        task.cancel()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -47,6 +169,7 @@ app = FastAPI(
     title="🔌 Flow-Monitor Ingestion API",
     description="Layer 1 - Universal Plugin Layer for sensor data ingestion",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS para desarrollo
@@ -58,6 +181,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Content-Encoding en las rutas de ingesta: descompresión en streaming y acotada
+app.add_middleware(DecompressionMiddleware, prefix="/api/ingest")
+
+# Perfilado en vivo y spans por etapa (/api/admin/profile, /api/admin/spans)
+app.include_router(admin_router)
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # Pydantic Models
@@ -71,6 +200,15 @@ class IngestResponse(BaseModel):
     timestamp: str
 
 
+class BatchIngestResponse(BaseModel):
+    """Respuesta de la API de ingesta por lotes."""
+    success: bool
+    accepted: int
+    rejected: int
+    errors: List[Dict[str, Any]] = []
+    timestamp: str
+
+
 class HealthResponse(BaseModel):
     """Respuesta del health check."""
     status: str
@@ -82,9 +220,49 @@ class HealthResponse(BaseModel):
 # Buffer para Capa 2 (MVP: lista en memoria)
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Registro de plugins (tabla de ruteo precalculada al registrar)
+registry = get_default_registry()
+
 # En producción esto sería una cola (RabbitMQ/Redis)
 readings_buffer: List[NormalizedReading] = []
 MAX_BUFFER_SIZE = 1000
+MAX_BATCH_ERRORS = 20  # Errores detallados por lote en la respuesta
+STREAM_BATCH_SIZE = 1000  # Payloads por normalize_batch en /api/ingest/stream
+
+# Respuestas prearmadas de /api/ingest/fast (sin modelo Pydantic ni serialización por request)
+_FAST_ACCEPTED = b'{"success":true,"accepted":1,"rejected":0}'
+_FAST_BATCH = b'{"success":%s,"accepted":%d,"rejected":%d}'
+_FAST_INVALID_JSON = b'{"detail":"Invalid JSON body"}'
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+# Captura opcional del tráfico real (FLOW_MONITOR_CAPTURE=/ruta/traffic.fmcap)
+# para reproducirlo luego con: python -m sensors.capture replay
+# Con --workers N cada proceso graba su propio archivo (traffic.<pid>.fmcap):
+# varios escritores sobre el mismo .fmcap lo corromperían
+capture = None
+if os.getenv("FLOW_MONITOR_CAPTURE"):
+    from sensors.capture import CaptureWriter
+    _capture_root, _capture_ext = os.path.splitext(os.environ["FLOW_MONITOR_CAPTURE"])
+    capture = CaptureWriter(
+        f"{_capture_root}.{os.getpid()}{_capture_ext or '.fmcap'}",
+        meta={"source": "ingestion-api", "pid": os.getpid()},
+    )
+    atexit.register(capture.close)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Métricas (GET /metrics)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+INGESTED = metrics.counter("flowmonitor_ingest_readings", "Lecturas aceptadas por la Capa 1", ["endpoint"])
+REJECTED = metrics.counter("flowmonitor_ingest_rejected", "Payloads rechazados por la Capa 1", ["endpoint"])
+NORMALIZE_SECONDS = metrics.histogram(
+    "flowmonitor_normalize_seconds", "Tiempo de normalización por lectura (lotes: promedio del lote)", ["plugin"]
+)
+metrics.gauge("flowmonitor_ingest_buffer_depth", "Lecturas en el buffer hacia Capa 2",
+              function=lambda: len(readings_buffer))
+_INGESTED_SINGLE, _INGESTED_BATCH = INGESTED.labels("single"), INGESTED.labels("batch")
+_REJECTED_SINGLE, _REJECTED_BATCH = REJECTED.labels("single"), REJECTED.labels("batch")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -105,22 +283,147 @@ async def root():
 @app.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_check():
     """Verifica el estado del servicio y plugins cargados."""
-    registry = get_default_registry()
     return HealthResponse(
         status="healthy",
-        timestamp=datetime.now().isoformat(),
+        timestamp=format_iso(now_ns()),
         plugins_loaded=registry.list_plugins(),
     )
 
 
+def _resolve_plugin(request: Request, payload: Any) -> SensorPlugin:
+    """Plugin por header X-Flow-Plugin, Content-Type, header de gateway o firma del payload."""
+    headers = request.headers
+    return registry.resolve(headers.get("content-type"), headers, payload)
+
+
+def _get_plugin(plugin_name: str) -> SensorPlugin:
+    try:
+        return registry.get(plugin_name)
+    except PluginNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+def _accept_one(normalized: NormalizedReading) -> None:
+    """Cuenta, deja en buffer (y captura) una lectura ya normalizada."""
+    _INGESTED_SINGLE.inc()
+    
+    # Guardar en buffer para Capa 2
+    readings_buffer.append(normalized)
+    if len(readings_buffer) > MAX_BUFFER_SIZE:
+        readings_buffer.pop(0)  # FIFO
+    
+    if capture is not None:
+        capture.record_reading(normalized)
+    
+    # Log muestreado (formateo diferido); las anomalías se registran siempre
+    if normalized.metadata.get("is_anomaly"):
+        reading_log.anomaly("🔥 ANOMALY DETECTED: %s = %s %s",
+                            normalized.sensor_id, normalized.value, normalized.unit)
+    else:
+        reading_log.reading("📥 Ingested: %s", normalized)
+
+
+def _normalize_one(plugin: SensorPlugin, payload: Any) -> NormalizedReading:
+    """
+    Valida y normaliza un payload (validación común de /api/ingest y /api/ingest/fast).
+    
+    Raises:
+        HTTPException: 400 si el plugin rechaza el payload (ValueError)
+    """
+    try:
+        if not plugin.validate(payload):
+            raise ValueError(f"Invalid payload for plugin {plugin.name}")
+        t0 = perf_counter()
+        normalized = plugin.normalize_data(payload)
+        NORMALIZE_SECONDS.labels(plugin.name).observe(perf_counter() - t0)
+    except ValueError as e:
+        _REJECTED_SINGLE.inc()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e) or f"Invalid payload for plugin {plugin.name}",
+        )
+    return normalized
+
+
+def _ingest_one(plugin: SensorPlugin, payload: Dict[str, Any]) -> IngestResponse:
+    """Valida, normaliza y deja en buffer un payload con el plugin ya resuelto."""
+    normalized = _normalize_one(plugin, payload)
+    _accept_one(normalized)
+    return IngestResponse(
+        success=True,
+        message="Data ingested and normalized successfully",
+        normalized_data=normalized.to_dict(),
+        timestamp=format_iso(now_ns()),
+    )
+
+
+def _ingest_batch(plugin: SensorPlugin, payloads: List[Dict[str, Any]]) -> BatchIngestResponse:
+    """Normaliza un lote con el plugin ya resuelto y lo deja en buffer."""
+    # Normalización del lote completo en una llamada (ver SensorPlugin.normalize_batch)
+    t0 = perf_counter()
+    batch = plugin.normalize_batch(payloads)
+    accepted: List[NormalizedReading] = batch.readings
+    if accepted:
+        NORMALIZE_SECONDS.labels(plugin.name).observe_many(
+            # Por lectura aceptada: un payload multicanal o Modbus aporta varias
+            (perf_counter() - t0) / len(accepted), len(accepted)
+        )
+    errors = [r.to_dict() for r in batch.rejected[:MAX_BATCH_ERRORS]]
+    anomalies = sum(1 for r in accepted if r.metadata.get("is_anomaly"))
+    
+    # Guardar en buffer para Capa 2
+    readings_buffer.extend(accepted)
+    if len(readings_buffer) > MAX_BUFFER_SIZE:
+        del readings_buffer[:-MAX_BUFFER_SIZE]  # FIFO
+    
+    if capture is not None:
+        for normalized in accepted:
+            capture.record_reading(normalized)
+    
+    # Un payload puede producir varias lecturas (bloques Modbus): contar rechazos, no restar
+    rejected = len(batch.rejected)
+    _INGESTED_BATCH.inc(len(accepted))
+    if rejected:
+        _REJECTED_BATCH.inc(rejected)
+    logger.info("📦 Batch ingested (%s): %d accepted, %d rejected", plugin.name, len(accepted), rejected)
+    if anomalies:
+        logger.warning("🔥 %d ANOMALIES in batch", anomalies)
+    
+    return BatchIngestResponse(
+        success=rejected == 0,
+        accepted=len(accepted),
+        rejected=rejected,
+        errors=errors,
+        timestamp=format_iso(now_ns()),
+    )
+
+
+def ingest_payload(payload: Dict[str, Any]) -> IngestResponse:
+    """
+    Ingesta en proceso, sin request HTTP (benchmarks, scripts): mismo
+    camino que /api/ingest, con el plugin resuelto solo por la firma del
+    payload (como un request sin headers de ruteo).
+    """
+    try:
+        plugin = registry.resolve(payload=payload)
+    except PluginNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return _ingest_one(plugin, payload)
+
+
 @app.post("/api/ingest", response_model=IngestResponse, tags=["Ingestion"])
-async def ingest_sensor_data(payload: Dict[str, Any]):
+async def ingest_sensor_data(payload: Dict[str, Any], request: Request):
     """
     🔌 Endpoint principal de ingesta de datos de sensores.
     
     Recibe datos en formato JSON del DataPulse Agent o cualquier fuente,
     los valida y normaliza usando el plugin apropiado.
     
+    El plugin se resuelve con la tabla de ruteo del registro: header
+    ``X-Flow-Plugin``, Content-Type, header de gateway o firma del payload;
+    si nada coincide, http-json-plugin. Para elegirlo explícitamente usar
+    ``/api/ingest/{plugin}``.
+    
     El dato normalizado queda disponible para que la Capa 2 lo consuma.
     
     Args:
@@ -130,51 +433,182 @@ async def ingest_sensor_data(payload: Dict[str, Any]):
         IngestResponse con el dato normalizado
     """
     try:
-        registry = get_default_registry()
-        
-        # Por ahora usamos el plugin por defecto (http-json-plugin)
-        # En el futuro se podría detectar el plugin basado en headers o payload
-        plugin = registry.get("http-json-plugin")
-        
-        # Validar payload
-        if not plugin.validate(payload):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid payload: missing required fields (sensor_id, timestamp, value, unit)"
-            )
-        
-        # Normalizar datos
-        normalized = plugin.normalize_data(payload)
-        
-        # Guardar en buffer para Capa 2
-        readings_buffer.append(normalized)
-        if len(readings_buffer) > MAX_BUFFER_SIZE:
-            readings_buffer.pop(0)  # FIFO
-        
-        # Log para debugging
-        logger.info(f"📥 Ingested: {normalized}")
-        
-        # Detectar anomalías para log especial
-        if normalized.metadata.get("is_anomaly"):
-            logger.warning(f"🔥 ANOMALY DETECTED: {normalized.sensor_id} = {normalized.value} {normalized.unit}")
-        
-        return IngestResponse(
-            success=True,
-            message="Data ingested and normalized successfully",
-            normalized_data=normalized.to_dict(),
-            timestamp=datetime.now().isoformat(),
-        )
+        plugin = _resolve_plugin(request, payload)
+    except PluginNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return _ingest_one(plugin, payload)
+
+
+@app.post("/api/ingest/batch", response_model=BatchIngestResponse, tags=["Ingestion"])
+async def ingest_sensor_batch(payloads: List[Dict[str, Any]], request: Request):
+    """
+    📦 Ingesta por lotes (flota DataPulse, reenvíos masivos).
+    
+    Normaliza el arreglo con ``normalize_batch`` del plugin: los inválidos
+    se rechazan sin afectar al resto del lote. El plugin se resuelve una
+    vez por lote (firma: primer payload).
+    
+    Args:
+        payloads: Lista de payloads JSON con el formato de /api/ingest
         
+    Returns:
+        BatchIngestResponse con conteos y los primeros errores
+    """
+    try:
+        plugin = _resolve_plugin(request, payloads[0] if payloads else None)
     except PluginNotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return _ingest_batch(plugin, payloads)
+
+
+@app.post("/api/ingest/stream", response_model=BatchIngestResponse, tags=["Ingestion"])
+async def ingest_stream(request: Request):
+    """
+    📜 Ingesta masiva en streaming: NDJSON o arreglo JSON, comprimido o no.
+    
+    El cuerpo se lee por trozos (ya descomprimidos por
+    DecompressionMiddleware) y se parsea incrementalmente; cada
+    ``STREAM_BATCH_SIZE`` payloads pasan por ``_ingest_batch``, así un
+    upload de cientos de MB nunca está entero en memoria. Los índices de
+    ``errors`` son posiciones en el stream.
+    
+    Un error de sintaxis en un arreglo (o un límite de descompresión)
+    corta el request; los lotes anteriores ya quedaron ingeridos y el
+    detalle del error lo indica.
+    """
+    content_type = (request.headers.get("content-type") or "").split(";", 1)[0].strip().lower()
+    parser = JsonStreamParser(ndjson=content_type in NDJSON_CONTENT_TYPES or None)
+    plugin: Optional[SensorPlugin] = None
+    pending: List[Any] = []
+    totals = {"offset": 0, "accepted": 0, "rejected": 0}
+    errors: List[Dict[str, Any]] = []
+    
+    def ingest_items(items: List[Any]) -> None:
+        nonlocal plugin
+        payloads, indices = [], []
+        for position, item in enumerate(items, totals["offset"]):
+            if isinstance(item, RejectedPayload):
+                totals["rejected"] += 1
+                if len(errors) < MAX_BATCH_ERRORS:
+                    errors.append(item.to_dict())
+            else:
+                payloads.append(item)
+                indices.append(position)
+        totals["offset"] += len(items)
+        if not payloads:
+            return
+        if plugin is None:
+            plugin = _resolve_plugin(request, payloads[0])
+        result = _ingest_batch(plugin, payloads)
+        totals["accepted"] += result.accepted
+        totals["rejected"] += result.rejected
+        for error in result.errors[:MAX_BATCH_ERRORS - len(errors)]:
+            errors.append({**error, "index": indices[error["index"]]})
+    
+    try:
+        async for chunk in request.stream():
+            pending.extend(parser.feed(chunk))
+            while len(pending) >= STREAM_BATCH_SIZE:
+                ingest_items(pending[:STREAM_BATCH_SIZE])
+                del pending[:STREAM_BATCH_SIZE]
+        pending.extend(parser.close())
+        ingest_items(pending)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
+            detail=f"{e} ({totals['accepted']} readings ingested before the error)",
+        )
+    except PluginNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    
+    return BatchIngestResponse(
+        success=totals["rejected"] == 0,
+        accepted=totals["accepted"],
+        rejected=totals["rejected"],
+        errors=errors,
+        timestamp=format_iso(now_ns()),
+    )
+
+
+@app.post("/api/ingest/binary", response_model=BatchIngestResponse, tags=["Ingestion"])
+async def ingest_binary_frame(request: Request):
+    """
+    🧱 Ingesta de una trama binaria DataPulse (``application/vnd.datapulse.binary``).
+    
+    El cuerpo es una trama completa (diccionario de sensores + registros
+    de ancho fijo, ver ``ingestion.plugins.binary_plugin``); se normaliza
+    como un lote de una trama. El plugin se resuelve por Content-Type o
+    ``X-Flow-Plugin``; sin coincidencia, binary-wire-plugin.
+    """
+    body = await request.body()
+    headers = request.headers
+    try:
+        plugin = registry.resolve(headers.get("content-type"), headers, None)
+    except PluginNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    if plugin is registry.routes.default and not headers.get(ROUTE_HEADER):
+        plugin = _get_plugin("binary-wire-plugin")
+    return _ingest_batch(plugin, [body])
+
+
+@app.post("/api/ingest/fast", status_code=status.HTTP_202_ACCEPTED, tags=["Ingestion"])
+async def ingest_fast(request: Request):
+    """
+    ⚡ Ruta rápida de ingesta: mismo resultado que /api/ingest (o /batch
+    si el cuerpo es un arreglo) sin el costo fijo por request.
+    
+    Lee el cuerpo crudo y lo decodifica con orjson (json si no está
+    instalado), en lugar de que FastAPI lo valide como ``Dict[str, Any]``;
+    el plugin valida una sola vez dentro de ``normalize_data``; la
+    respuesta es un cuerpo JSON prearmado con 202, o 204 sin cuerpo con
+    ``Prefer: return=minimal``. Los errores de validación responden 400
+    igual que /api/ingest.
+    """
+    body = await request.body()
+    try:
+        payload = _loads(body)
+    except ValueError:
+        return Response(_FAST_INVALID_JSON, status.HTTP_400_BAD_REQUEST, media_type="application/json")
+    
+    headers = request.headers
+    try:
+        plugin = registry.resolve(
+            headers.get("content-type"), headers, payload[0] if type(payload) is list and payload else payload
         )
+    except PluginNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    minimal = headers.get("prefer") == "return=minimal"
+    
+    if type(payload) is list:
+        result = _ingest_batch(plugin, payload)
+        if minimal:
+            return Response(status_code=status.HTTP_204_NO_CONTENT)
+        content = _FAST_BATCH % (b"true" if result.success else b"false", result.accepted, result.rejected)
+        return Response(content, status.HTTP_202_ACCEPTED, media_type="application/json")
+    
+    normalized = _normalize_one(plugin, payload)
+    _accept_one(normalized)
+    if minimal:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return Response(_FAST_ACCEPTED, status.HTTP_202_ACCEPTED, media_type="application/json")
+
+
+@app.post("/api/ingest/{plugin_name}", response_model=IngestResponse, tags=["Ingestion"])
+async def ingest_with_plugin(plugin_name: str, payload: Dict[str, Any]):
+    """🔌 Ingesta con un plugin explícito (ej: /api/ingest/http-json-plugin)."""
+    return _ingest_one(_get_plugin(plugin_name), payload)
+
+
+@app.post("/api/ingest/{plugin_name}/batch", response_model=BatchIngestResponse, tags=["Ingestion"])
+async def ingest_batch_with_plugin(plugin_name: str, payloads: List[Dict[str, Any]]):
+    """📦 Ingesta por lotes con un plugin explícito."""
+    return _ingest_batch(_get_plugin(plugin_name), payloads)
+
+
+@app.get("/metrics", tags=["Health"])
+async def prometheus_metrics():
+    """📈 Métricas del proceso en formato de exposición Prometheus."""
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
 
 
 @app.get("/api/buffer", tags=["Debug"])
@@ -203,9 +637,9 @@ async def clear_buffer():
 
 @app.get("/api/plugins", tags=["Plugins"])
 async def list_plugins():
-    """Lista todos los plugins registrados."""
-    registry = get_default_registry()
+    """Lista todos los plugins registrados y cómo se enrutan."""
     plugins = registry.get_all()
+    default = registry.routes.default
     
     return {
         "total": len(plugins),
@@ -214,6 +648,11 @@ async def list_plugins():
                 "name": p.name,
                 "version": p.version,
                 "description": p.description,
+                "route": f"/api/ingest/{p.name}",
+                "content_types": list(p.content_types),
+                "route_headers": [f"{name}: {value}" for name, value in p.route_headers],
+                "signature_keys": list(p.signature_keys),
+                "default": p is default,
             }
             for p in plugins.values()
         ],
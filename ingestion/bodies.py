@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                   🗜️  Request Bodies - Flow-Monitor                          ║
+║      Layer 1: Content-Encoding en streaming + parser NDJSON/arreglo          ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Los gateways por red celular pagan por megabyte: pueden enviar los lotes
+con ``Content-Encoding: gzip`` (o ``zstd`` si el paquete ``zstandard`` está
+instalado). Dos piezas:
+
+- ``DecompressionMiddleware``: middleware ASGI que descomprime el cuerpo
+  de las rutas de ingesta trozo a trozo a medida que llega, sin armar
+  el cuerpo comprimido ni el descomprimido completos. Cada mensaje
+  entregado a la app tiene como máximo ``CHUNK_BYTES`` descomprimidos.
+- ``JsonStreamParser``: parser incremental de NDJSON o de un arreglo JSON
+  que entrega los payloads completos de cada trozo (lo usa
+  ``/api/ingest/stream`` para normalizar por lotes mientras lee).
+
+Protección contra zip bombs: se corta con 413 si el total descomprimido
+supera ``max_bytes`` o si, pasado el primer MB, la relación
+descomprimido/comprimido supera ``max_ratio``. Con gzip la salida por
+paso está acotada (``max_length`` de zlib). zstandard no acepta un máximo
+de salida, pero un bloque zstd produce como mucho ``ZSTD_BLOCK_BYTES`` y
+ocupa al menos ``ZSTD_MIN_BLOCK_INPUT`` bytes: la entrada se entrega en
+porciones que, en el peor caso, no superan lo que aún permiten los límites.
+
+Variables de entorno:
+    FLOW_MONITOR_MAX_BODY_MB      Máximo descomprimido por request (default 256)
+    FLOW_MONITOR_MAX_BODY_RATIO   Relación máxima descomprimido/comprimido (default 200)
+
+Author: Flow-Monitor Team
+Project: Flow-Monitor (MVP Semilla Inicia)
+"""
+
+import codecs
+import json
+import os
+import re
+import zlib
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, status
+
+from ingestion.models import RejectedPayload
+
+try:
+    import zstandard
+except ImportError:  # zstd es opcional
+    zstandard = None
+
+
+# 413 Content Too Large (el nombre de la constante cambió entre versiones de Starlette)
+_TOO_LARGE = 413
+
+# Bytes descomprimidos por mensaje entregado a la app
+CHUNK_BYTES = 256 * 1024
+
+# Salida a partir de la cual se controla la relación de compresión
+RATIO_GRACE_BYTES = 1 << 20
+
+DEFAULT_MAX_BYTES = int(float(os.getenv("FLOW_MONITOR_MAX_BODY_MB", "256")) * (1 << 20))
+DEFAULT_MAX_RATIO = float(os.getenv("FLOW_MONITOR_MAX_BODY_RATIO", "200"))
+
+# Salida máxima de un bloque zstd y entrada mínima que lo codifica
+# (bloque RLE: cabecera de 3 bytes + 1 byte)
+ZSTD_BLOCK_BYTES = 128 * 1024
+ZSTD_MIN_BLOCK_INPUT = 4
+
+# Payload NDJSON o elemento de arreglo más largo aceptado
+MAX_ITEM_BYTES = 1 << 20
+
+
+def supported_encodings() -> List[str]:
+    encodings = ["gzip", "deflate"]
+    if zstandard is not None:
+        encodings.append("zstd")
+    return encodings
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Descompresión acotada
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class BodyDecoder:
+    """
+    🗜️ Descompresor incremental con límites de tamaño y relación.
+
+    ``feed()`` devuelve a lo sumo ``chunk_bytes`` por llamada; si queda
+    salida pendiente, ``pending`` es True y hay que volver a llamar con
+    ``b""`` antes de pasar más entrada.
+
+    Raises (en feed/flush):
+        HTTPException 413: Límite de tamaño o de relación superado
+        HTTPException 400: Datos comprimidos inválidos o truncados
+    """
+
+    def __init__(
+        self,
+        encoding: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_ratio: float = DEFAULT_MAX_RATIO,
+        chunk_bytes: int = CHUNK_BYTES,
+    ):
+        encoding = encoding.strip().lower()
+        if encoding in ("gzip", "x-gzip"):
+            self._zlib = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            self._zlib = zlib.decompressobj()
+        elif encoding == "zstd" and zstandard is not None:
+            self._zlib = None
+            self._zstd = zstandard.ZstdDecompressor().decompressobj()
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"Unsupported Content-Encoding '{encoding}' (supported: {', '.join(supported_encodings())})",
+            )
+        self.encoding = encoding
+        self.max_bytes = max_bytes
+        self.max_ratio = max_ratio
+        self.chunk_bytes = chunk_bytes
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._tail = b""
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._tail)
+
+    def _check(self, produced: int) -> None:
+        self.bytes_out += produced
+        if self.bytes_out > self.max_bytes:
+            raise HTTPException(
+                status_code=_TOO_LARGE,
+                detail=f"Decompressed body exceeds {self.max_bytes} bytes",
+            )
+        # Relación contra la entrada consumida (la cola sin procesar no cuenta)
+        consumed = self.bytes_in - len(self._tail)
+        if self.bytes_out > RATIO_GRACE_BYTES and self.bytes_out > consumed * self.max_ratio:
+            raise HTTPException(
+                status_code=_TOO_LARGE,
+                detail=f"Compression ratio exceeds {self.max_ratio:.0f}:1",
+            )
+
+    def _zstd_step(self) -> int:
+        """Entrada para el próximo paso zstd: su peor salida cabe en los límites."""
+        consumed = self.bytes_in - len(self._tail)
+        allowed = min(self.max_bytes, max(RATIO_GRACE_BYTES, consumed * self.max_ratio)) - self.bytes_out
+        return ZSTD_MIN_BLOCK_INPUT * max(1, int(allowed) // ZSTD_BLOCK_BYTES)
+
+    def _feed_zstd(self, data: bytes) -> bytes:
+        # Porciones acotadas hasta juntar chunk_bytes; el resto queda en _tail
+        view = memoryview(bytes(self._tail) + data if self._tail else data)
+        decompress = self._zstd.decompress
+        out, produced, pos = [], 0, 0
+        self._tail = view
+        while pos < len(view) and produced < self.chunk_bytes:
+            step = self._zstd_step()
+            piece = decompress(view[pos:pos + step])
+            pos += step
+            self._tail = view[pos:]
+            self._check(len(piece))
+            out.append(piece)
+            produced += len(piece)
+        if not self._tail:
+            self._tail = b""
+        return b"".join(out)
+
+    def feed(self, data: bytes) -> bytes:
+        self.bytes_in += len(data)
+        try:
+            if self._zlib is None:
+                return self._feed_zstd(data)
+            out = self._zlib.decompress(self._tail + data, self.chunk_bytes)
+            self._tail = self._zlib.unconsumed_tail
+        except (zlib.error, ValueError) as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"Invalid {self.encoding} body: {e}")
+        except Exception as e:
+            # zstandard.ZstdError no hereda de ValueError
+            if zstandard is not None and isinstance(e, zstandard.ZstdError):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                    detail=f"Invalid {self.encoding} body: {e}")
+            raise
+        self._check(len(out))
+        return out
+
+    def flush(self) -> bytes:
+        """Resto de la salida al terminar la entrada; 400 si el stream quedó truncado."""
+        if self._zlib is None:
+            return b""
+        out = self._zlib.flush()
+        self._check(len(out))
+        if not self._zlib.eof:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"Truncated {self.encoding} body")
+        return out
+
+
+class DecompressionMiddleware:
+    """
+    🗜️ Middleware ASGI: descomprime en streaming los cuerpos de las rutas de ingesta.
+
+    Quita ``Content-Encoding`` y ``Content-Length`` del scope, así las
+    rutas leen el cuerpo como si hubiera llegado sin comprimir.
+
+    Args:
+        app: Aplicación ASGI
+        prefix: Solo rutas que empiezan con este prefijo
+        max_bytes: Máximo descomprimido por request
+        max_ratio: Relación máxima descomprimido/comprimido
+    """
+
+    def __init__(self, app, prefix: str = "/api/ingest",
+                 max_bytes: int = DEFAULT_MAX_BYTES, max_ratio: float = DEFAULT_MAX_RATIO):
+        self.app = app
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_ratio = max_ratio
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            return await self.app(scope, receive, send)
+        encoding = None
+        headers = []
+        for name, value in scope["headers"]:
+            if name == b"content-encoding":
+                encoding = value.decode("latin-1")
+            elif name != b"content-length":
+                headers.append((name, value))
+        if encoding is None or encoding.strip().lower() == "identity":
+            return await self.app(scope, receive, send)
+
+        try:
+            decoder = BodyDecoder(encoding, self.max_bytes, self.max_ratio)
+        except HTTPException as e:
+            return await _send_error(send, e)
+
+        input_done = finished = False
+
+        async def decoded_receive():
+            nonlocal input_done, finished
+            if finished:
+                return await receive()
+            if decoder.pending:
+                body = decoder.feed(b"")
+            elif input_done:
+                body = b""
+            else:
+                message = await receive()
+                if message["type"] != "http.request":
+                    return message
+                body = decoder.feed(message.get("body", b""))
+                input_done = not message.get("more_body", False)
+            if input_done and not decoder.pending:
+                finished = True
+                return {"type": "http.request", "body": body + decoder.flush(), "more_body": False}
+            # Salida pendiente o más entrada: mensajes acotados a CHUNK_BYTES
+            return {"type": "http.request", "body": body, "more_body": True}
+
+        await self.app(dict(scope, headers=headers), decoded_receive, send)
+
+
+async def _send_error(send, error: HTTPException) -> None:
+    body = json.dumps({"detail": error.detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": error.status_code,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Parser incremental NDJSON / arreglo JSON
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9eE.+-]*")
+
+
+class JsonStreamParser:
+    """
+    📜 Payloads completos a partir de trozos de NDJSON o de un arreglo JSON.
+
+    El formato se detecta por el primer carácter (``[`` → arreglo) salvo
+    que se fije ``ndjson=True``. En NDJSON una línea inválida se devuelve
+    como ``RejectedPayload`` (con su índice en el stream) y el resto
+    sigue; en un arreglo un error de sintaxis no permite resincronizar y
+    levanta ValueError.
+
+    Example:
+        parser = JsonStreamParser()
+        async for chunk in request.stream():
+            items = parser.feed(chunk)
+        items = parser.close()
+    """
+
+    def __init__(self, ndjson: Optional[bool] = None, max_item_bytes: int = MAX_ITEM_BYTES):
+        self.mode = "ndjson" if ndjson else None
+        self.max_item_bytes = max_item_bytes
+        self.count = 0
+        self._bytes = b""
+        self._text = ""
+        self._pos = 0
+        self._state = "open"  # arreglo: open → first → item → sep → done
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        if self.mode is None:
+            head = (self._bytes + chunk).lstrip()
+            if not head:
+                self._bytes += chunk
+                return []
+            self.mode = "array" if head[:1] == b"[" else "ndjson"
+            chunk, self._bytes = self._bytes + chunk, b""
+        if self.mode == "ndjson":
+            return self._feed_lines(chunk, final=False)
+        return self._feed_array(chunk, final=False)
+
+    def close(self) -> List[Any]:
+        """Últimos payloads; ValueError si el arreglo quedó incompleto."""
+        if self.mode == "array":
+            items = self._feed_array(b"", final=True)
+            if self._state != "done":
+                raise ValueError("Invalid JSON array: unexpected end of body")
+            return items
+        if self.mode is None:
+            return []
+        return self._feed_lines(b"", final=True)
+
+    # NDJSON ────────────────────────────────────────────────────────────────────
+
+    def _feed_lines(self, chunk: bytes, final: bool) -> List[Any]:
+        data = self._bytes + chunk if self._bytes else chunk
+        if final:
+            complete, self._bytes = data, b""
+        else:
+            cut = data.rfind(b"\n")
+            if cut < 0:
+                if len(data) > self.max_item_bytes:
+                    raise ValueError(f"NDJSON line exceeds {self.max_item_bytes} bytes")
+                self._bytes = data
+                return []
+            complete, self._bytes = data[:cut], data[cut + 1:]
+            if len(self._bytes) > self.max_item_bytes:
+                raise ValueError(f"NDJSON line exceeds {self.max_item_bytes} bytes")
+        lines = [line for line in complete.split(b"\n") if line.strip()]
+        if not lines:
+            return []
+        # Línea por línea: unirlas en un arreglo dejaría que dos líneas
+        # inválidas (``[{..}`` + ``{..}]``) se completen entre sí
+        loads = json.loads
+        items = []
+        for offset, line in enumerate(lines):
+            try:
+                items.append(loads(line))
+            except ValueError as e:
+                items.append(RejectedPayload(self.count + offset, f"Invalid JSON line: {e}"))
+        self.count += len(items)
+        return items
+
+    # Arreglo ───────────────────────────────────────────────────────────────────
+
+    def _feed_array(self, chunk: bytes, final: bool) -> List[Any]:
+        text = self._text[self._pos:] + self._utf8.decode(chunk, final=final)
+        pos, end = 0, len(text)
+        items: List[Any] = []
+        state = self._state
+        raw_decode = self._decoder.raw_decode
+        whitespace = _WHITESPACE.match
+        while True:
+            pos = whitespace(text, pos).end()
+            if pos >= end:
+                break
+            char = text[pos]
+            if state == "open":
+                if char != "[":
+                    raise ValueError("Invalid JSON array: expected '['")
+                state, pos = "first", pos + 1
+            elif state in ("first", "item"):
+                if state == "first" and char == "]":
+                    state, pos = "done", pos + 1
+                    continue
+                try:
+                    item, item_end = raw_decode(text, pos)
+                except ValueError:
+                    if final:
+                        raise ValueError(f"Invalid JSON array element at item {self.count + len(items)}")
+                    if end - pos > self.max_item_bytes:
+                        raise ValueError(f"JSON array element exceeds {self.max_item_bytes} bytes")
+                    break  # Elemento incompleto: esperar más datos
+                if not final and (
+                    item_end == end
+                    or (isinstance(item, (int, float)) and _NUMBER_TAIL.match(text, item_end).end() == end)
+                ):
+                    break  # Un número al final del trozo (``-4.5`` de ``-4.5e3``) puede seguir
+                items.append(item)
+                state, pos = "sep", item_end
+            elif state == "sep":
+                if char == ",":
+                    state, pos = "item", pos + 1
+                elif char == "]":
+                    state, pos = "done", pos + 1
+                else:
+                    raise ValueError(f"Invalid JSON array: expected ',' or ']' after item {self.count + len(items)}")
+            else:
+                raise ValueError("Invalid JSON array: data after closing ']'")
+        self._text, self._pos, self._state = text, pos, state
+        self.count += len(items)
+        return items
@@ -0,0 +1,29 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                      🏭 Modbus-TCP - Flow-Monitor                            ║
+║        Cliente asyncio, mapa de registros, poller y simulador para pruebas   ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+El scheduler genérico vive en ``ingestion.polling``; la normalización de los
+bloques leídos en ``ingestion.plugins.modbus_plugin``.
+"""
+
+from .protocol import ModbusError
+from .client import ModbusTcpClient
+from .mapping import DeviceProfile, ModbusDevice, ReadBlock, RegisterPoint, load_devices, plan_reads
+from .poller import ModbusBlockRead, ModbusPoller
+from .simulator import ModbusSimulator
+
+__all__ = [
+    "ModbusError",
+    "ModbusTcpClient",
+    "DeviceProfile",
+    "ModbusDevice",
+    "ReadBlock",
+    "RegisterPoint",
+    "load_devices",
+    "plan_reads",
+    "ModbusBlockRead",
+    "ModbusPoller",
+    "ModbusSimulator",
+]
@@ -0,0 +1,122 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                   🏭 Modbus-TCP Client - Flow-Monitor                        ║
+║        Cliente asyncio con requests en paralelo sobre una conexión           ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Una conexión por gateway (host, puerto) sirve a todos sus unit ids: cada
+request lleva un transaction id y una tarea lectora resuelve el future
+correspondiente, así varios dispositivos detrás del mismo gateway se leen
+en paralelo sin abrir un socket por dispositivo.
+
+Example:
+    client = ModbusTcpClient("10.0.0.5", 502)
+    data = await client.read_registers(unit_id=7, table="holding", start=0, count=12)
+"""
+
+import asyncio
+import itertools
+from typing import Dict, Optional, Tuple
+
+from .protocol import FUNCTION_CODES, MAX_REGISTERS_PER_READ, ModbusError, parse_read_response, read_request, split_frames
+
+
+class ModbusTcpClient:
+    """
+    🏭 Conexión Modbus-TCP compartida (reconecta en el próximo request si se cae).
+
+    Args:
+        host: Gateway o dispositivo
+        port: Puerto Modbus-TCP (502)
+        timeout: Timeout de conexión (s); el de cada lectura lo pone el llamador
+    """
+
+    def __init__(self, host: str, port: int = 502, timeout: float = 3.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, Tuple[asyncio.Future, int]] = {}
+        self._ids = itertools.cycle(range(1, 65536))
+        self._connect_lock = asyncio.Lock()
+
+    async def _ensure_connected(self) -> asyncio.StreamWriter:
+        if self._writer is not None and not self._writer.is_closing():
+            return self._writer
+        async with self._connect_lock:
+            if self._writer is None or self._writer.is_closing():
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), self.timeout
+                )
+                self._writer = writer
+                self._reader_task = asyncio.create_task(self._read_loop(reader))
+        return self._writer
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        buffer = b""
+        error: Exception = ConnectionError(f"Modbus connection to {self.host}:{self.port} closed")
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                frames, buffer = split_frames(buffer + data if buffer else data)
+                for transaction_id, _, pdu in frames:
+                    entry = self._pending.pop(transaction_id, None)
+                    if entry is None:
+                        continue  # Respuesta tardía de un request que ya expiró
+                    future, count = entry
+                    if future.done():
+                        continue
+                    try:
+                        future.set_result(parse_read_response(pdu, count))
+                    except ModbusError as e:
+                        future.set_exception(e)
+        except (ConnectionError, OSError) as e:
+            error = e
+        finally:
+            # Fallar los requests en vuelo; el próximo request reconecta
+            pending, self._pending = self._pending, {}
+            for future, _ in pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    async def read_registers(self, unit_id: int, table: str, start: int, count: int) -> bytes:
+        """
+        Lee ``count`` registros desde ``start`` (FC 3 "holding" o FC 4 "input").
+
+        Returns:
+            Registros como bytes big-endian (2 × count)
+
+        Raises:
+            ModbusError: Excepción Modbus del dispositivo
+            ConnectionError: Conexión caída con el request en vuelo
+        """
+        if not 0 < count <= MAX_REGISTERS_PER_READ:
+            raise ValueError(f"count must be 1..{MAX_REGISTERS_PER_READ}")
+        writer = await self._ensure_connected()
+        transaction_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[transaction_id] = (future, count)
+        writer.write(read_request(transaction_id, unit_id, FUNCTION_CODES[table], start, count))
+        try:
+            return await future
+        finally:
+            # Si el llamador canceló (timeout), no dejar el future registrado
+            self._pending.pop(transaction_id, None)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
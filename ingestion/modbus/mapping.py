@@ -0,0 +1,252 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                   🗺️  Modbus Register Map - Flow-Monitor                     ║
+║       Puntos → bloques de lectura contiguos con decodificador precompilado   ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Un ``DeviceProfile`` describe el mapa de registros de un modelo de equipo
+(lo comparten todos los dispositivos de ese modelo). Al crearlo se
+planifican las lecturas una sola vez:
+
+- Los puntos de cada tabla se ordenan por dirección y se agrupan en
+  bloques contiguos; huecos de hasta ``max_gap`` registros se leen igual
+  (una lectura más larga cuesta menos que un round-trip extra)
+- Ningún bloque supera los 125 registros de FC 3/4
+- Cada bloque trae su ``struct.Struct`` (con bytes de relleno en los
+  huecos) y un dtype NumPy estructurado con los mismos offsets, para
+  decodificar un bloque o los bloques de N dispositivos de una vez
+
+Tipos: uint16, int16 (1 registro); uint32, int32, float32 (2); float64 (4),
+big-endian con la palabra alta primero (el orden más común en campo).
+"""
+
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .protocol import FUNCTION_CODES, MAX_REGISTERS_PER_READ
+
+
+# dtype → (código NumPy sin orden de bytes, registros, código struct)
+DTYPES: Dict[str, Tuple[str, int, str]] = {
+    "uint16": ("u2", 1, "H"),
+    "int16": ("i2", 1, "h"),
+    "uint32": ("u4", 2, "I"),
+    "int32": ("i4", 2, "i"),
+    "float32": ("f4", 2, "f"),
+    "float64": ("f8", 4, "d"),
+}
+
+# Registros de hueco que se leen de más antes de partir un bloque
+DEFAULT_MAX_GAP = 8
+
+
+@dataclass(frozen=True)
+class RegisterPoint:
+    """
+    📍 Un valor de sensor dentro del mapa de registros.
+
+    Attributes:
+        name: Sufijo del sensor_id (``{device_id}_{name}``)
+        address: Primer registro (base 0)
+        dtype: Ver ``DTYPES``
+        table: "holding" (FC 3) o "input" (FC 4)
+        unit: Unidad de la lectura ya escalada
+        scale: Factor aplicado al valor crudo
+        offset: Sumado tras escalar
+    """
+    name: str
+    address: int
+    dtype: str = "uint16"
+    table: str = "holding"
+    unit: str = ""
+    scale: float = 1.0
+    offset: float = 0.0
+
+    def __post_init__(self):
+        if self.dtype not in DTYPES:
+            raise ValueError(f"Unknown Modbus dtype '{self.dtype}'")
+        if self.table not in FUNCTION_CODES:
+            raise ValueError(f"Unknown Modbus table '{self.table}'")
+
+    @property
+    def registers(self) -> int:
+        return DTYPES[self.dtype][1]
+
+
+@dataclass(eq=False)
+class ReadBlock:
+    """
+    📦 Una lectura FC 3/4 que cubre uno o más puntos.
+
+    ``codec`` (struct) y ``dtype`` decodifican los ``count × 2`` bytes del bloque;
+    ``scales``/``offsets`` se aplican al vector de valores crudos.
+    """
+    table: str
+    start: int
+    count: int
+    points: Tuple[RegisterPoint, ...]
+    codec: struct.Struct = field(init=False, repr=False)
+    dtype: np.dtype = field(init=False, repr=False)
+    scales: np.ndarray = field(init=False, repr=False)
+    offsets: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        fmt, names, formats, byte_offsets = [">"], [], [], []
+        cursor = self.start
+        for i, point in enumerate(self.points):
+            code, registers, struct_code = DTYPES[point.dtype]
+            if point.address > cursor:
+                fmt.append(f"{(point.address - cursor) * 2}x")
+            fmt.append(struct_code)
+            names.append(f"p{i}")
+            formats.append(">" + code)
+            byte_offsets.append((point.address - self.start) * 2)
+            cursor = point.address + registers
+        if cursor < self.start + self.count:
+            fmt.append(f"{(self.start + self.count - cursor) * 2}x")
+        self.codec = struct.Struct("".join(fmt))
+        self.dtype = np.dtype({
+            "names": names, "formats": formats,
+            "offsets": byte_offsets, "itemsize": self.count * 2,
+        })
+        self.scales = np.array([p.scale for p in self.points], dtype=np.float64)
+        self.offsets = np.array([p.offset for p in self.points], dtype=np.float64)
+
+    def decode(self, data: bytes) -> List[float]:
+        """Valores escalados de un solo bloque (un ``unpack`` + escalado)."""
+        return [
+            raw * point.scale + point.offset
+            for raw, point in zip(self.codec.unpack(data), self.points)
+        ]
+
+    def decode_many(self, blocks: List[bytes]) -> np.ndarray:
+        """
+        Decodifica los bloques de N dispositivos con el mismo perfil.
+
+        Returns:
+            Matriz float64 (N, puntos) ya escalada
+        """
+        records = np.frombuffer(b"".join(blocks), dtype=self.dtype)
+        values = np.empty((len(blocks), len(self.points)), dtype=np.float64)
+        for i, name in enumerate(self.dtype.names):
+            values[:, i] = records[name]
+        values *= self.scales
+        values += self.offsets
+        return values
+
+
+def plan_reads(
+    points: List[RegisterPoint],
+    max_gap: int = DEFAULT_MAX_GAP,
+    max_count: int = MAX_REGISTERS_PER_READ,
+) -> List[ReadBlock]:
+    """
+    Agrupa puntos en bloques de lectura contiguos.
+
+    Args:
+        points: Puntos del perfil (cualquier orden, ambas tablas)
+        max_gap: Registros sin usar tolerados entre dos puntos del mismo bloque
+        max_count: Máximo de registros por lectura
+
+    Returns:
+        Bloques ordenados por tabla y dirección
+    """
+    blocks: List[ReadBlock] = []
+    for table in FUNCTION_CODES:
+        ordered = sorted((p for p in points if p.table == table), key=lambda p: p.address)
+        current: List[RegisterPoint] = []
+        start = end = 0
+        for point in ordered:
+            point_end = point.address + point.registers
+            if current and point.address < end:
+                raise ValueError(f"Overlapping Modbus points at {table} register {point.address}")
+            if current and (point.address - end > max_gap or point_end - start > max_count):
+                blocks.append(ReadBlock(table, start, end - start, tuple(current)))
+                current = []
+            if not current:
+                start = point.address
+            current.append(point)
+            end = point_end
+        if current:
+            blocks.append(ReadBlock(table, start, end - start, tuple(current)))
+    return blocks
+
+
+@dataclass(eq=False)
+class DeviceProfile:
+    """
+    🗺️ Mapa de registros de un modelo de equipo; las lecturas se planifican al crearlo.
+
+    Example:
+        >>> profile = DeviceProfile("pump-v2", [
+        ...     RegisterPoint("temp", 0, "float32", unit="Celsius"),
+        ...     RegisterPoint("pressure", 2, "uint16", unit="bar", scale=0.1),
+        ... ])
+        >>> len(profile.blocks)
+        1
+    """
+    name: str
+    points: List[RegisterPoint]
+    max_gap: int = DEFAULT_MAX_GAP
+    blocks: List[ReadBlock] = field(init=False)
+
+    def __post_init__(self):
+        self.blocks = plan_reads(self.points, self.max_gap)
+
+
+@dataclass(eq=False)
+class ModbusDevice:
+    """
+    🏭 Un dispositivo a consultar.
+
+    Attributes:
+        device_id: Prefijo de los sensor_id
+        host: Gateway o equipo Modbus-TCP
+        port: Puerto (502)
+        unit_id: Unit id detrás del gateway
+        profile: Mapa de registros
+        interval: Período de polling (s)
+        timeout: Tiempo máximo por ciclo de lectura (s)
+        location: Ubicación de las lecturas
+    """
+    device_id: str
+    host: str
+    profile: DeviceProfile
+    port: int = 502
+    unit_id: int = 1
+    interval: float = 5.0
+    timeout: float = 2.0
+    location: Optional[str] = None
+
+
+def load_devices(config: Dict) -> List[ModbusDevice]:
+    """
+    Dispositivos desde un dict de configuración (p. ej. un JSON en disco).
+
+    Formato:
+        {
+          "profiles": {"pump-v2": {"points": [{"name": "temp", "address": 0,
+                                               "dtype": "float32", "unit": "Celsius"}]}},
+          "devices": [{"device_id": "PUMP_001", "host": "10.0.0.5", "unit_id": 1,
+                       "profile": "pump-v2", "interval": 5}]
+        }
+    """
+    profiles = {
+        name: DeviceProfile(
+            name,
+            [RegisterPoint(**point) for point in spec["points"]],
+            spec.get("max_gap", DEFAULT_MAX_GAP),
+        )
+        for name, spec in config.get("profiles", {}).items()
+    }
+    devices = []
+    for spec in config.get("devices", []):
+        spec = dict(spec)
+        profile = spec.pop("profile")
+        if profile not in profiles:
+            raise ValueError(f"Device '{spec.get('device_id')}' uses unknown profile '{profile}'")
+        devices.append(ModbusDevice(profile=profiles[profile], **spec))
+    return devices
@@ -0,0 +1,99 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                   🏭 Modbus Poller - Flow-Monitor                            ║
+║           Dispositivos Modbus-TCP sobre el PollingScheduler                  ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Cada ciclo de un dispositivo lee los bloques planificados de su perfil (en
+paralelo sobre la conexión del gateway) y devuelve un ``ModbusBlockRead``
+por bloque con los bytes crudos; la decodificación queda para
+``ModbusTcpPlugin.normalize_batch``, que la hace por lotes.
+
+Example:
+    poller = ModbusPoller(devices, sink=lambda reads: plugin.normalize_batch(reads))
+    await poller.run()
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ingestion.polling import PollingScheduler, PollStats
+
+from .client import ModbusTcpClient
+from .mapping import ModbusDevice, ReadBlock
+
+
+@dataclass(slots=True)
+class ModbusBlockRead:
+    """Bytes crudos de un bloque leído de un dispositivo."""
+    device: ModbusDevice
+    block: ReadBlock
+    data: bytes
+    timestamp: int  # ns epoch
+
+
+class ModbusPoller:
+    """
+    🏭 Consulta dispositivos Modbus-TCP en sus intervalos.
+
+    Args:
+        devices: Dispositivos a consultar
+        sink: Recibe lotes de ``ModbusBlockRead``
+        concurrency: Dispositivos consultándose a la vez como máximo
+        **scheduler_options: Resto de opciones de ``PollingScheduler``
+    """
+
+    def __init__(
+        self,
+        devices: List[ModbusDevice],
+        sink: Callable[[List[ModbusBlockRead]], Any],
+        concurrency: int = 100,
+        **scheduler_options,
+    ):
+        self.scheduler = PollingScheduler(self.poll, sink, concurrency=concurrency, **scheduler_options)
+        self._clients: Dict[Tuple[str, int], ModbusTcpClient] = {}
+        for device in devices:
+            self.scheduler.add(device, device.interval, device.timeout)
+
+    @property
+    def stats(self) -> PollStats:
+        return self.scheduler.stats
+
+    def client(self, device: ModbusDevice) -> ModbusTcpClient:
+        """Conexión compartida del gateway del dispositivo."""
+        key = (device.host, device.port)
+        client = self._clients.get(key)
+        if client is None:
+            client = self._clients[key] = ModbusTcpClient(device.host, device.port)
+        return client
+
+    async def poll(self, device: ModbusDevice) -> List[ModbusBlockRead]:
+        """Un ciclo de lectura: todos los bloques del perfil en paralelo."""
+        client = self.client(device)
+        blocks = device.profile.blocks
+        if len(blocks) == 1:
+            block = blocks[0]
+            data = [await client.read_registers(device.unit_id, block.table, block.start, block.count)]
+        else:
+            data = await asyncio.gather(*(
+                client.read_registers(device.unit_id, block.table, block.start, block.count)
+                for block in blocks
+            ))
+        timestamp = time.time_ns()
+        return [ModbusBlockRead(device, block, chunk, timestamp) for block, chunk in zip(blocks, data)]
+
+    async def run(self, duration: Optional[float] = None) -> PollStats:
+        try:
+            return await self.scheduler.run(duration)
+        finally:
+            await self.close()
+
+    def stop(self) -> None:
+        self.scheduler.stop()
+
+    async def close(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.close()
@@ -0,0 +1,98 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                   🏭 Modbus-TCP Protocol - Flow-Monitor                      ║
+║              Codec MBAP + lectura de registros (FC 3 y FC 4)                 ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Trama Modbus-TCP:
+
+    MBAP (7 bytes): transaction_id u16, protocol_id u16 (=0), length u16, unit_id u8
+    PDU:            function u8 + datos
+
+Solo lectura de registros, que es lo que necesita el polling:
+
+    FC 3 Read Holding Registers   request: start u16, count u16 (≤ 125)
+    FC 4 Read Input Registers     response: byte_count u8 + count × u16 big-endian
+
+Una respuesta con ``function | 0x80`` es una excepción (código en el byte
+siguiente).
+"""
+
+import struct
+from typing import List, Optional, Tuple
+
+
+READ_HOLDING_REGISTERS = 3
+READ_INPUT_REGISTERS = 4
+FUNCTION_CODES = {"holding": READ_HOLDING_REGISTERS, "input": READ_INPUT_REGISTERS}
+
+MAX_REGISTERS_PER_READ = 125
+
+# Códigos de excepción Modbus
+ILLEGAL_FUNCTION = 1
+ILLEGAL_DATA_ADDRESS = 2
+SERVER_DEVICE_FAILURE = 4
+GATEWAY_TARGET_FAILED = 11
+
+MBAP = struct.Struct(">HHHB")
+_READ_REQUEST = struct.Struct(">HHHBBHH")
+
+
+class ModbusError(Exception):
+    """Respuesta de excepción Modbus o trama inválida."""
+
+    def __init__(self, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+
+
+def read_request(transaction_id: int, unit_id: int, function: int, start: int, count: int) -> bytes:
+    """Request FC 3/4 completo (MBAP + PDU)."""
+    return _READ_REQUEST.pack(transaction_id, 0, 6, unit_id, function, start, count)
+
+
+def parse_read_request(pdu: bytes) -> Tuple[int, int, int]:
+    """PDU de request FC 3/4 → (function, start, count)."""
+    function, start, count = struct.unpack_from(">BHH", pdu)
+    return function, start, count
+
+
+def read_response(transaction_id: int, unit_id: int, function: int, data: bytes) -> bytes:
+    """Response FC 3/4 con ``data`` = registros big-endian."""
+    pdu = bytes((function, len(data))) + data
+    return MBAP.pack(transaction_id, 0, len(pdu) + 1, unit_id) + pdu
+
+
+def exception_response(transaction_id: int, unit_id: int, function: int, code: int) -> bytes:
+    return MBAP.pack(transaction_id, 0, 3, unit_id) + bytes((function | 0x80, code))
+
+
+def parse_read_response(pdu: bytes, count: int) -> bytes:
+    """PDU de respuesta FC 3/4 → bytes de registros; ModbusError si es excepción."""
+    function = pdu[0]
+    if function & 0x80:
+        code = pdu[1] if len(pdu) > 1 else None
+        raise ModbusError(f"Modbus exception {code} for function {function & 0x7F}", code)
+    data = pdu[2:2 + pdu[1]]
+    if len(data) != count * 2:
+        raise ModbusError(f"Expected {count} registers, got {len(data) // 2}")
+    return data
+
+
+def split_frames(buffer: bytes) -> Tuple[List[Tuple[int, int, bytes]], bytes]:
+    """
+    Separa tramas completas de un buffer de stream.
+
+    Returns:
+        ([(transaction_id, unit_id, pdu), ...], resto incompleto)
+    """
+    frames = []
+    pos, end = 0, len(buffer)
+    while end - pos >= MBAP.size:
+        transaction_id, _, length, unit_id = MBAP.unpack_from(buffer, pos)
+        frame_end = pos + 6 + length
+        if frame_end > end:
+            break
+        frames.append((transaction_id, unit_id, buffer[pos + MBAP.size:frame_end]))
+        pos = frame_end
+    return frames, buffer[pos:]
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                   🧪 Modbus-TCP Simulator - Flow-Monitor                     ║
+║          Servidor Modbus-TCP en proceso para tests y desarrollo local        ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Un gateway simulado con muchos unit ids. Cada unidad tiene un banco de
+registros holding y otro input (``numpy.uint16``); los tests escriben
+valores con ``set_value`` y el scheduler los lee por FC 3/4.
+
+- Unit id sin banco → excepción 11 (gateway target failed)
+- Rango fuera del banco → excepción 2 (illegal data address)
+- ``delays[unit_id]`` simula un dispositivo lento (para timeouts)
+
+Usage:
+    python -m ingestion.modbus.simulator --port 5020 --units 100
+
+Example:
+    async with ModbusSimulator() as sim:
+        sim.add_unit(1)
+        sim.set_value(1, "holding", 0, 21.5, "float32")
+"""
+
+import argparse
+import asyncio
+import math
+import time
+from typing import Dict, Optional, Set
+
+import numpy as np
+
+from .mapping import DTYPES
+from .protocol import (
+    FUNCTION_CODES, GATEWAY_TARGET_FAILED, ILLEGAL_DATA_ADDRESS, ILLEGAL_FUNCTION,
+    exception_response, parse_read_request, read_response, split_frames,
+)
+
+_TABLES = {code: table for table, code in FUNCTION_CODES.items()}
+
+
+class ModbusSimulator:
+    """
+    🧪 Servidor Modbus-TCP en el event loop actual.
+
+    Args:
+        host: Interfaz de escucha
+        port: Puerto (0 = libre, ver ``sim.port`` tras ``start()``)
+        registers: Registros por tabla y unidad
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, registers: int = 256):
+        self.host = host
+        self.port = port
+        self.size = registers
+        self.banks: Dict[int, Dict[str, np.ndarray]] = {}
+        self.delays: Dict[int, float] = {}
+        self.requests = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+
+    def add_unit(self, unit_id: int) -> Dict[str, np.ndarray]:
+        bank = {table: np.zeros(self.size, dtype=np.uint16) for table in FUNCTION_CODES}
+        self.banks[unit_id] = bank
+        return bank
+
+    def set_value(self, unit_id: int, table: str, address: int, value: float, dtype: str = "uint16") -> None:
+        """Escribe ``value`` codificado como ``dtype`` (big-endian, palabra alta primero)."""
+        code = DTYPES[dtype][0]
+        words = np.frombuffer(np.array([value], dtype=">" + code).tobytes(), dtype=">u2")
+        self.banks[unit_id][table][address:address + len(words)] = words
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "ModbusSimulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def _respond(self, transaction_id: int, unit_id: int, pdu: bytes) -> bytes:
+        self.requests += 1
+        function = pdu[0]
+        table = _TABLES.get(function)
+        if table is None:
+            return exception_response(transaction_id, unit_id, function, ILLEGAL_FUNCTION)
+        bank = self.banks.get(unit_id)
+        if bank is None:
+            return exception_response(transaction_id, unit_id, function, GATEWAY_TARGET_FAILED)
+        _, start, count = parse_read_request(pdu)
+        if start + count > self.size:
+            return exception_response(transaction_id, unit_id, function, ILLEGAL_DATA_ADDRESS)
+        data = bank[table][start:start + count].astype(">u2").tobytes()
+        return read_response(transaction_id, unit_id, function, data)
+
+    async def _delayed(self, writer: asyncio.StreamWriter, delay: float, frame: bytes) -> None:
+        await asyncio.sleep(delay)
+        if not writer.is_closing():
+            writer.write(frame)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        buffer = b""
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                frames, buffer = split_frames(buffer + data)
+                for transaction_id, unit_id, pdu in frames:
+                    response = self._respond(transaction_id, unit_id, pdu)
+                    delay = self.delays.get(unit_id)
+                    if delay:
+                        asyncio.create_task(self._delayed(writer, delay, response))
+                    else:
+                        writer.write(response)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # Cliente desconectado o simulador cerrándose
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+async def _serve(host: str, port: int, units: int) -> None:
+    async with ModbusSimulator(host, port) as sim:
+        for unit_id in range(1, units + 1):
+            sim.add_unit(unit_id)
+        print(f"🧪 Modbus-TCP simulator en {host}:{sim.port} con {units} unidades (Ctrl+C para salir)")
+        # Registros 0-1 float32 (temperatura), 2 uint16 (presión × 10) variando en el tiempo
+        while True:
+            t = time.time()
+            for unit_id in sim.banks:
+                sim.set_value(unit_id, "holding", 0, 20.0 + 5.0 * math.sin(t / 60 + unit_id), "float32")
+                sim.set_value(unit_id, "holding", 2, 1013 + (unit_id % 10), "uint16")
+            await asyncio.sleep(1.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulador Modbus-TCP para desarrollo local")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--units", type=int, default=10)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args.host, args.port, args.units))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
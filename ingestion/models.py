@@ -13,9 +13,11 @@ Project: Flow-Monitor (MVP Semilla Inicia)
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Optional, Any
+from typing import Optional, Any, List
 from enum import Enum
+import sys
+
+from timebase import format_iso, parse_timestamp, to_datetime
 
 
 class ReadingType(Enum):
@@ -28,7 +30,7 @@ class ReadingType(Enum):
     GENERIC = "generic"
 
 
-@dataclass
+@dataclass(slots=True)
 class NormalizedReading:
     """
     📊 Modelo de datos normalizado para lecturas de sensores.
@@ -38,7 +40,8 @@ class NormalizedReading:
     
     Attributes:
         sensor_id: Identificador único del sensor
-        timestamp: Momento de la lectura (UTC)
+        timestamp: Momento de la lectura en nanosegundos epoch (se acepta
+            también ISO, epoch numérico o datetime y se convierte)
         value: Valor numérico de la lectura
         unit: Unidad de medida (ej: "Celsius", "Hz", "L/min")
         source: Nombre del plugin que generó el dato
@@ -49,14 +52,14 @@ class NormalizedReading:
     Example:
         >>> reading = NormalizedReading(
         ...     sensor_id="SENSOR_TEMP_01",
-        ...     timestamp=datetime.now(),
+        ...     timestamp=time.time_ns(),
         ...     value=35.5,
         ...     unit="Celsius",
         ...     source="http-json-plugin"
         ... )
     """
     sensor_id: str
-    timestamp: datetime
+    timestamp: int
     value: float
     unit: str
     source: str
@@ -68,10 +71,23 @@ class NormalizedReading:
         """Validación post-inicialización."""
         if not self.sensor_id:
             raise ValueError("sensor_id cannot be empty")
-        if not isinstance(self.timestamp, datetime):
-            raise ValueError("timestamp must be a datetime object")
+        if type(self.timestamp) is not int:
+            self.timestamp = parse_timestamp(self.timestamp)
         if not isinstance(self.value, (int, float)):
             raise ValueError("value must be numeric")
+        
+        if not isinstance(self.sensor_id, str):
+            raise ValueError("sensor_id must be a string")
+        if not isinstance(self.unit, str):
+            raise ValueError("unit must be a string")
+        if self.location is not None and not isinstance(self.location, str):
+            raise ValueError("location must be a string")
+        
+        # Internar strings repetidos: todas las lecturas de un sensor comparten copia
+        self.sensor_id = sys.intern(self.sensor_id)
+        self.unit = sys.intern(self.unit)
+        if self.location:
+            self.location = sys.intern(self.location)
     
     def to_dict(self) -> dict:
         """
@@ -82,7 +98,7 @@ class NormalizedReading:
         """
         return {
             "sensor_id": self.sensor_id,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": format_iso(self.timestamp),
             "value": self.value,
             "unit": self.unit,
             "source": self.source,
@@ -102,17 +118,13 @@ class NormalizedReading:
         Returns:
             Nueva instancia de NormalizedReading
         """
-        timestamp = data.get("timestamp")
-        if isinstance(timestamp, str):
-            timestamp = datetime.fromisoformat(timestamp)
-        
         reading_type = data.get("reading_type", "generic")
         if isinstance(reading_type, str):
             reading_type = ReadingType(reading_type)
         
         return cls(
             sensor_id=data["sensor_id"],
-            timestamp=timestamp,
+            timestamp=data.get("timestamp"),
             value=float(data["value"]),
             unit=data["unit"],
             source=data["source"],
@@ -127,6 +139,29 @@ class NormalizedReading:
     
     def __str__(self) -> str:
         return (
-            f"[{self.timestamp.strftime('%H:%M:%S')}] "
+            f"[{to_datetime(self.timestamp):%H:%M:%S}] "
             f"{self.sensor_id}: {self.value:.2f} {self.unit}"
         )
+
+
+@dataclass(slots=True)
+class RejectedPayload:
+    """Payload de un lote que no pudo normalizarse."""
+    index: int
+    error: str
+    
+    def to_dict(self) -> dict:
+        return {"index": self.index, "error": self.error}
+
+
+@dataclass
+class NormalizedBatch:
+    """
+    📦 Resultado de ``SensorPlugin.normalize_batch``.
+    
+    Attributes:
+        readings: Lecturas normalizadas, en el orden del lote
+        rejected: Payloads rechazados con su índice en el lote y el motivo
+    """
+    readings: List[NormalizedReading] = field(default_factory=list)
+    rejected: List[RejectedPayload] = field(default_factory=list)
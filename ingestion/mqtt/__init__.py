@@ -0,0 +1,21 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                      📡 MQTT - Flow-Monitor                                  ║
+║           Suscriptor asyncio, codec 3.1.1 y broker para pruebas              ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+La normalización de los mensajes vive en ``ingestion.plugins.mqtt_plugin``.
+"""
+
+from .protocol import MqttError, MqttMessage, topic_matches
+from .client import MqttClient, MqttSubscriber
+from .broker import MiniBroker
+
+__all__ = [
+    "MqttError",
+    "MqttMessage",
+    "topic_matches",
+    "MqttClient",
+    "MqttSubscriber",
+    "MiniBroker",
+]
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                   🧪 Mini MQTT Broker - Flow-Monitor                         ║
+║           Broker MQTT 3.1.1 en proceso para tests y benchmarks               ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Sustituto mínimo de Mosquitto para desarrollo local, tests y el benchmark
+del suscriptor. No es un broker de producción:
+
+- Sin sesiones persistentes, retained ni will; sin autenticación
+- Entrega siempre en QoS 0 (un PUBLISH QoS 1 recibe PUBACK del broker)
+- Filtros con ``+`` y ``#``; tópico → suscriptores se cachea hasta el
+  próximo SUBSCRIBE o desconexión
+- Contrapresión: tras cada bloque leído de un publicador espera el
+  ``drain()`` de los suscriptores a los que escribió
+
+Usage:
+    python -m ingestion.mqtt.broker --port 1883
+
+Example:
+    async with MiniBroker() as broker:
+        subscriber = MqttSubscriber("127.0.0.1", broker.port, ["flowmonitor/#"])
+"""
+
+import argparse
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+
+from .protocol import (
+    CONNECT, DISCONNECT, PINGREQ, PINGRESP_PACKET, PUBLISH, SUBSCRIBE,
+    DEFAULT_MAX_PACKET_SIZE, MqttError, PacketParser,
+    connack_packet, encode_length, parse_connect, parse_subscribe, puback_packet,
+    suback_packet, topic_matches,
+)
+from .client import READ_SIZE
+
+
+class _Session:
+    __slots__ = ("client_id", "writer", "filters")
+
+    def __init__(self, client_id: str, writer: asyncio.StreamWriter):
+        self.client_id = client_id
+        self.writer = writer
+        self.filters: List[str] = []
+
+
+class MiniBroker:
+    """
+    🧪 Broker MQTT en el event loop actual.
+
+    Args:
+        host: Interfaz de escucha
+        port: Puerto (0 = libre, ver ``broker.port`` tras ``start()``)
+        max_packet_size: Paquete más grande aceptado de un cliente (bytes)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 max_packet_size: int = DEFAULT_MAX_PACKET_SIZE):
+        self.host = host
+        self.port = port
+        self.max_packet_size = max_packet_size
+        self.published = 0
+        self.delivered = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._sessions: Set[_Session] = set()
+        self._routes: Dict[str, Tuple[_Session, ...]] = {}
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for session in list(self._sessions):
+                session.writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MiniBroker":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def _subscribers(self, topic: str) -> Tuple[_Session, ...]:
+        targets = self._routes.get(topic)
+        if targets is None:
+            targets = tuple(
+                s for s in self._sessions if any(topic_matches(f, topic) for f in s.filters)
+            )
+            self._routes[topic] = targets
+        return targets
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        parser = PacketParser(self.max_packet_size)
+        session: Optional[_Session] = None
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    break
+                touched: Set[_Session] = set()
+                for ptype, flags, body in parser.feed(data):
+                    if ptype == PUBLISH:
+                        self._route_publish(flags, body, writer, touched)
+                    elif ptype == CONNECT:
+                        client_id, _ = parse_connect(body)
+                        session = _Session(client_id, writer)
+                        self._sessions.add(session)
+                        writer.write(connack_packet(0))
+                    elif ptype == SUBSCRIBE and session is not None:
+                        packet_id, filters = parse_subscribe(body)
+                        session.filters.extend(f for f, _ in filters)
+                        self._routes.clear()
+                        writer.write(suback_packet(packet_id, [0] * len(filters)))
+                    elif ptype == PINGREQ:
+                        writer.write(PINGRESP_PACKET)
+                    elif ptype == DISCONNECT:
+                        return
+                for target in touched:
+                    await target.writer.drain()
+        except (ConnectionError, MqttError, asyncio.CancelledError):
+            # Cliente desconectado o broker cerrándose: terminar la sesión sin ruido
+            pass
+        finally:
+            if session is not None:
+                self._sessions.discard(session)
+                self._routes.clear()
+            writer.close()
+
+    def _route_publish(self, flags: int, body: bytes, writer: asyncio.StreamWriter,
+                       touched: Set[_Session]) -> None:
+        self.published += 1
+        topic_len = int.from_bytes(body[:2], "big")
+        topic = body[2:2 + topic_len].decode()
+        qos = (flags >> 1) & 0x03
+        if qos:
+            # Confirmar al publicador y reenviar como QoS 0 (sin packet id)
+            packet_id = int.from_bytes(body[2 + topic_len:4 + topic_len], "big")
+            writer.write(puback_packet(packet_id))
+            body = body[:2 + topic_len] + body[4 + topic_len:]
+        targets = self._subscribers(topic)
+        if not targets:
+            return
+        packet = bytes((PUBLISH << 4,)) + encode_length(len(body)) + body
+        for target in targets:
+            target.writer.write(packet)
+            touched.add(target)
+        self.delivered += len(targets)
+
+
+async def _serve(host: str, port: int) -> None:
+    async with MiniBroker(host, port) as broker:
+        print(f"🧪 Mini MQTT broker en {host}:{broker.port} (Ctrl+C para salir)")
+        await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Broker MQTT mínimo para desarrollo local")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1883)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                   📡 MQTT Subscriber - Flow-Monitor                          ║
+║         Cliente asyncio: tópicos con comodines y entrega por lotes           ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Un suscriptor por proceso atiende miles de sensores con un par de filtros
+con comodines (``flowmonitor/+/+``, ``plant/#``): el broker hace el fan-in y
+el cliente solo parsea bloques de bytes.
+
+Entrega por lotes: cada ``read()`` del socket se parsea completo y los
+PUBLISH se acumulan hasta ``batch_size`` o hasta ``max_delay`` segundos
+desde el primer mensaje pendiente. QoS 1 se confirma (PUBACK) al
+recibir, antes de normalizar.
+
+Example:
+    subscriber = MqttSubscriber("localhost", 1883, ["flowmonitor/#"])
+    await subscriber.connect()
+    async for batch in subscriber.batches():
+        plugin.normalize_batch(batch)
+"""
+
+import asyncio
+import itertools
+import os
+from typing import AsyncIterator, List, Optional, Sequence
+
+from .protocol import (
+    CONNACK, DISCONNECT_PACKET, PINGREQ_PACKET, PUBLISH, SUBACK,
+    DEFAULT_MAX_PACKET_SIZE, MqttError, MqttMessage, PacketParser,
+    connect_packet, parse_publish, puback_packet, publish_packet, subscribe_packet,
+)
+
+
+READ_SIZE = 1 << 16
+
+
+class MqttClient:
+    """
+    📡 Conexión MQTT 3.1.1 mínima (publicar y suscribir).
+
+    Example:
+        client = MqttClient("localhost", 1883)
+        await client.connect()
+        client.publish("flowmonitor/planta-a/S01", b'{"value": 1}')
+        await client.drain()
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 1883,
+        client_id: Optional[str] = None,
+        keepalive: int = 60,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        max_packet_size: int = DEFAULT_MAX_PACKET_SIZE
+    ):
+        self.host = host
+        self.port = port
+        self.client_id = client_id or f"flowmonitor-{os.getpid()}-{id(self) & 0xFFFF:04x}"
+        self.keepalive = keepalive
+        self.username = username
+        self.password = password
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._parser = PacketParser(max_packet_size)
+        self._packet_ids = itertools.cycle(range(1, 65536))
+        # PUBLISH recibidos mientras se esperaba otro paquete (ej: SUBACK)
+        self._backlog: List[MqttMessage] = []
+        self._ping_task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        """Abre la conexión y espera CONNACK."""
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._writer.write(connect_packet(
+            self.client_id, self.keepalive, username=self.username, password=self.password
+        ))
+        body = await self._wait_for(CONNACK)
+        if body[1] != 0:
+            raise MqttError(f"Connection refused by broker (code {body[1]})")
+        if self.keepalive:
+            self._ping_task = asyncio.create_task(self._ping_loop())
+
+    async def _wait_for(self, packet_type: int) -> bytes:
+        """Lee hasta recibir ``packet_type``; los PUBLISH intermedios quedan en backlog."""
+        while True:
+            data = await self._reader.read(READ_SIZE)
+            if not data:
+                raise MqttError("Connection closed by broker")
+            found = None
+            for ptype, flags, body in self._parser.feed(data):
+                if ptype == PUBLISH:
+                    self._on_publish(flags, body, self._backlog)
+                elif ptype == packet_type and found is None:
+                    found = body
+            if found is not None:
+                return found
+
+    def _on_publish(self, flags: int, body: bytes, out: List[MqttMessage]) -> None:
+        message, packet_id = parse_publish(flags, body)
+        if packet_id:
+            self._writer.write(puback_packet(packet_id))
+        out.append(message)
+
+    async def _ping_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.keepalive / 2)
+            self._writer.write(PINGREQ_PACKET)
+
+    async def subscribe(self, topics: Sequence[str], qos: int = 0) -> List[int]:
+        """Suscribe filtros (con ``+``/``#``) y retorna los QoS otorgados."""
+        self._writer.write(subscribe_packet(next(self._packet_ids), [(t, qos) for t in topics]))
+        granted = list((await self._wait_for(SUBACK))[2:])
+        if 0x80 in granted:
+            raise MqttError(f"Subscription rejected by broker: {list(topics)}")
+        return granted
+
+    def publish(self, topic: str, payload: bytes, qos: int = 0, retain: bool = False) -> None:
+        """Encola un PUBLISH en el buffer de escritura (``drain()`` para esperar)."""
+        packet_id = next(self._packet_ids) if qos else 0
+        self._writer.write(publish_packet(topic, payload, qos, packet_id, retain))
+
+    async def drain(self) -> None:
+        await self._writer.drain()
+
+    async def close(self) -> None:
+        """Envía DISCONNECT y cierra el socket."""
+        if self._ping_task is not None:
+            self._ping_task.cancel()
+            self._ping_task = None
+        if self._writer is not None:
+            try:
+                self._writer.write(DISCONNECT_PACKET)
+                self._writer.close()
+                await self._writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+            self._writer = None
+
+
+class MqttSubscriber(MqttClient):
+    """
+    📥 Suscriptor de ingesta: entrega los mensajes en lotes.
+
+    Args:
+        topics: Filtros de tópico (ej: ``["flowmonitor/+/+"]``)
+        qos: QoS pedido para todas las suscripciones (0 o 1)
+        batch_size: Máximo de mensajes por lote
+        max_delay: Espera máxima (s) para completar un lote parcial
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 1883,
+        topics: Sequence[str] = ("flowmonitor/#",),
+        qos: int = 0,
+        batch_size: int = 500,
+        max_delay: float = 0.05,
+        **kwargs
+    ):
+        super().__init__(host, port, **kwargs)
+        self.topics = list(topics)
+        self.qos = qos
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.received = 0
+
+    async def connect(self) -> None:
+        """Conecta y suscribe ``topics``."""
+        await super().connect()
+        await self.subscribe(self.topics, self.qos)
+
+    async def batches(self) -> AsyncIterator[List[MqttMessage]]:
+        """Lotes de mensajes hasta que el broker cierre la conexión."""
+        loop = asyncio.get_running_loop()
+        reader, parser = self._reader, self._parser
+        pending, self._backlog = self._backlog, []
+        deadline = loop.time() + self.max_delay if pending else None
+        batch_size = self.batch_size
+
+        while True:
+            if len(pending) >= batch_size or (pending and loop.time() >= deadline):
+                for start in range(0, len(pending), batch_size):
+                    batch = pending[start:start + batch_size]
+                    self.received += len(batch)
+                    yield batch
+                pending, deadline = [], None
+                continue
+
+            try:
+                if deadline is None:
+                    data = await reader.read(READ_SIZE)
+                else:
+                    data = await asyncio.wait_for(reader.read(READ_SIZE), deadline - loop.time())
+            except asyncio.TimeoutError:
+                continue
+            if not data:
+                if pending:
+                    self.received += len(pending)
+                    yield pending
+                return
+
+            for ptype, flags, body in parser.feed(data):
+                if ptype == PUBLISH:
+                    self._on_publish(flags, body, pending)
+            if pending and deadline is None:
+                deadline = loop.time() + self.max_delay
+
+    async def messages(self) -> AsyncIterator[MqttMessage]:
+        """Mensajes uno a uno (fuente para ``AsyncPipelineRunner``)."""
+        async for batch in self.batches():
+            for message in batch:
+                yield message
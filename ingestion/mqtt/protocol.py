@@ -0,0 +1,242 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                    📡 MQTT Protocol - Flow-Monitor                           ║
+║            Codec MQTT 3.1.1 mínimo (sin dependencias externas)               ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Solo los paquetes que usan el suscriptor de ingesta y el broker de pruebas:
+CONNECT/CONNACK, PUBLISH/PUBACK (QoS 0 y 1), SUBSCRIBE/SUBACK,
+PINGREQ/PINGRESP y DISCONNECT.
+
+``PacketParser`` trabaja sobre bloques: cada ``feed(data)`` retorna todos
+los paquetes completos del bloque, de modo que un ``read(64 KiB)`` produce
+un lote de PUBLISH sin un ``await`` por byte o por paquete. Un paquete
+que declara más de ``max_packet_size`` bytes se rechaza al leer su
+encabezado, antes de acumular el cuerpo.
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+
+CONNECT = 1
+CONNACK = 2
+PUBLISH = 3
+PUBACK = 4
+SUBSCRIBE = 8
+SUBACK = 9
+PINGREQ = 12
+PINGRESP = 13
+DISCONNECT = 14
+
+PROTOCOL_LEVEL = 4  # MQTT 3.1.1
+MAX_PACKET_SIZE = 268_435_455
+# Límite por defecto de PacketParser: lecturas de sensores, no archivos
+DEFAULT_MAX_PACKET_SIZE = 1 << 20
+
+PINGREQ_PACKET = b"\xc0\x00"
+PINGRESP_PACKET = b"\xd0\x00"
+DISCONNECT_PACKET = b"\xe0\x00"
+
+_U16 = struct.Struct("!H")
+
+
+class MqttError(Exception):
+    """Error de protocolo MQTT o conexión rechazada por el broker."""
+    pass
+
+
+@dataclass(slots=True)
+class MqttMessage:
+    """Mensaje PUBLISH recibido."""
+    topic: str
+    payload: bytes
+    qos: int = 0
+    retain: bool = False
+
+
+def encode_length(n: int) -> bytes:
+    """Remaining Length en formato varint de MQTT (1 a 4 bytes)."""
+    if n < 128:
+        return bytes((n,))
+    out = bytearray()
+    while True:
+        byte, n = n % 128, n // 128
+        out.append(byte | 0x80 if n else byte)
+        if not n:
+            return bytes(out)
+
+
+def encode_string(value: str) -> bytes:
+    data = value.encode()
+    return _U16.pack(len(data)) + data
+
+
+def _packet(first_byte: int, body: bytes) -> bytes:
+    return bytes((first_byte,)) + encode_length(len(body)) + body
+
+
+def connect_packet(
+    client_id: str,
+    keepalive: int = 60,
+    clean_session: bool = True,
+    username: Optional[str] = None,
+    password: Optional[str] = None
+) -> bytes:
+    flags = 0x02 if clean_session else 0
+    payload = encode_string(client_id)
+    if username is not None:
+        flags |= 0x80
+        payload += encode_string(username)
+    if password is not None:
+        flags |= 0x40
+        payload += encode_string(password)
+    body = encode_string("MQTT") + bytes((PROTOCOL_LEVEL, flags)) + _U16.pack(keepalive) + payload
+    return _packet(CONNECT << 4, body)
+
+
+def connack_packet(return_code: int = 0, session_present: bool = False) -> bytes:
+    return bytes((CONNACK << 4, 2, int(session_present), return_code))
+
+
+def publish_packet(topic: str, payload: bytes, qos: int = 0, packet_id: int = 0,
+                   retain: bool = False) -> bytes:
+    header = (PUBLISH << 4) | (qos << 1) | int(retain)
+    body = encode_string(topic) + (_U16.pack(packet_id) if qos else b"") + payload
+    return _packet(header, body)
+
+
+def puback_packet(packet_id: int) -> bytes:
+    return bytes((PUBACK << 4, 2)) + _U16.pack(packet_id)
+
+
+def subscribe_packet(packet_id: int, filters: Sequence[Tuple[str, int]]) -> bytes:
+    body = _U16.pack(packet_id) + b"".join(encode_string(f) + bytes((qos,)) for f, qos in filters)
+    return _packet((SUBSCRIBE << 4) | 0x02, body)
+
+
+def suback_packet(packet_id: int, granted: Sequence[int]) -> bytes:
+    return _packet(SUBACK << 4, _U16.pack(packet_id) + bytes(granted))
+
+
+def parse_publish(flags: int, body: bytes) -> Tuple[MqttMessage, int]:
+    """PUBLISH → (mensaje, packet_id; 0 si QoS 0)."""
+    (topic_len,) = _U16.unpack_from(body, 0)
+    pos = 2 + topic_len
+    topic = body[2:pos].decode()
+    qos = (flags >> 1) & 0x03
+    packet_id = 0
+    if qos:
+        (packet_id,) = _U16.unpack_from(body, pos)
+        pos += 2
+    return MqttMessage(topic, body[pos:], qos, bool(flags & 0x01)), packet_id
+
+
+def parse_connect(body: bytes) -> Tuple[str, int]:
+    """CONNECT → (client_id, keepalive). Ignora usuario/clave."""
+    (name_len,) = _U16.unpack_from(body, 0)
+    pos = 2 + name_len
+    if body[2:pos] != b"MQTT" or body[pos] != PROTOCOL_LEVEL:
+        raise MqttError("Unsupported MQTT protocol (expected 3.1.1)")
+    (keepalive,) = _U16.unpack_from(body, pos + 2)
+    pos += 4
+    (id_len,) = _U16.unpack_from(body, pos)
+    return body[pos + 2:pos + 2 + id_len].decode(), keepalive
+
+
+def parse_subscribe(body: bytes) -> Tuple[int, List[Tuple[str, int]]]:
+    """SUBSCRIBE → (packet_id, [(filtro, qos), ...])."""
+    (packet_id,) = _U16.unpack_from(body, 0)
+    pos, filters = 2, []
+    while pos < len(body):
+        (length,) = _U16.unpack_from(body, pos)
+        topic_filter = body[pos + 2:pos + 2 + length].decode()
+        pos += 2 + length
+        filters.append((topic_filter, body[pos] & 0x03))
+        pos += 1
+    return packet_id, filters
+
+
+class PacketParser:
+    """
+    Parser incremental de paquetes MQTT sobre un stream de bytes.
+
+    Los bytes de un paquete incompleto quedan en un ``bytearray`` que
+    crece en su lugar: un paquete grande que llega en muchos bloques no
+    se recopia entero en cada ``feed``.
+
+    Args:
+        max_packet_size: Remaining Length máximo aceptado (bytes)
+
+    Ejemplo:
+        parser = PacketParser()
+        for packet_type, flags, body in parser.feed(await reader.read(65536)):
+            ...
+    """
+
+    def __init__(self, max_packet_size: int = DEFAULT_MAX_PACKET_SIZE):
+        self.max_packet_size = min(max_packet_size, MAX_PACKET_SIZE)
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[Tuple[int, int, bytes]]:
+        """
+        Agrega ``data`` y retorna los paquetes completos (tipo, flags, cuerpo).
+
+        Raises:
+            MqttError: Remaining Length malformado o mayor que ``max_packet_size``
+        """
+        if self._buffer:
+            self._buffer += data
+            buffer = self._buffer
+        else:
+            buffer = data
+        packets = []
+        pos, end = 0, len(buffer)
+        while end - pos >= 2:
+            first = buffer[pos]
+            # Remaining Length (varint); el caso común es 1 byte
+            length = buffer[pos + 1]
+            header = 2
+            if length & 0x80:
+                length &= 0x7F
+                shift = 7
+                while True:
+                    if pos + header >= end:
+                        length = -1
+                        break
+                    byte = buffer[pos + header]
+                    header += 1
+                    length |= (byte & 0x7F) << shift
+                    if not byte & 0x80:
+                        break
+                    shift += 7
+                    if shift > 21:
+                        raise MqttError("Malformed remaining length")
+                if length < 0:
+                    break
+            if length > self.max_packet_size:
+                raise MqttError(f"Packet of {length} bytes exceeds the {self.max_packet_size} byte limit")
+            if end - pos < header + length:
+                break
+            packets.append((first >> 4, first & 0x0F, bytes(buffer[pos + header:pos + header + length])))
+            pos += header + length
+        if buffer is self._buffer:
+            del buffer[:pos]
+        elif pos < end:
+            self._buffer = bytearray(buffer[pos:])
+        return packets
+
+
+def topic_matches(topic_filter: str, topic: str) -> bool:
+    """Coincidencia de un tópico con un filtro con comodines ``+`` y ``#``."""
+    if topic_filter == topic or topic_filter == "#":
+        return True
+    filter_levels = topic_filter.split("/")
+    topic_levels = topic.split("/")
+    for i, level in enumerate(filter_levels):
+        if level == "#":
+            return True
+        if i >= len(topic_levels) or (level != "+" and level != topic_levels[i]):
+            return False
+    return len(filter_levels) == len(topic_levels)
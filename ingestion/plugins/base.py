@@ -13,9 +13,9 @@ Project: Flow-Monitor (MVP Semilla Inicia)
 """
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Iterable, Tuple
 
-from ingestion.models import NormalizedReading
+from ingestion.models import NormalizedBatch, NormalizedReading, RejectedPayload
 
 
 class SensorPlugin(ABC):
@@ -29,6 +29,15 @@ class SensorPlugin(ABC):
     1. Validar que el payload recibido sea procesable
     2. Normalizar los datos crudos al formato estándar NormalizedReading
     
+    Para lotes, ``normalize_batch`` recorre los métodos por registro; los
+    plugins de alto volumen pueden sobrescribirlo con una versión que
+    valide y normalice en un solo recorrido.
+    
+    Enrutamiento (ver ``PluginRegistry.resolve``): además de la ruta
+    ``/api/ingest/{name}``, un plugin puede declarar los Content-Type que
+    atiende, headers de gateway (nombre, valor) y claves de payload que lo
+    identifican. El registro las indexa al registrar el plugin.
+    
     Example:
         >>> class MyCustomPlugin(SensorPlugin):
         ...     @property
@@ -42,6 +51,15 @@ class SensorPlugin(ABC):
         ...         return NormalizedReading(...)
     """
     
+    # Content-Type propios (sin parámetros, en minúsculas)
+    content_types: Tuple[str, ...] = ()
+    
+    # Headers de gateway que identifican al emisor: ((nombre, valor), ...)
+    route_headers: Tuple[Tuple[str, str], ...] = ()
+    
+    # Claves de primer nivel cuya presencia identifica el payload
+    signature_keys: Tuple[str, ...] = ()
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -97,5 +115,29 @@ class SensorPlugin(ABC):
         """
         pass
     
+    def normalize_batch(self, raw_batch: Iterable[Any]) -> NormalizedBatch:
+        """
+        Normaliza un lote de payloads; los inválidos no afectan al resto.
+        
+        Implementación por defecto: ``validate`` + ``normalize_data`` por
+        registro.
+        
+        Args:
+            raw_batch: Payloads crudos de la fuente
+            
+        Returns:
+            NormalizedBatch con las lecturas aceptadas y los rechazos
+            (índice en el lote y motivo)
+        """
+        batch = NormalizedBatch()
+        for index, raw_data in enumerate(raw_batch):
+            try:
+                if not self.validate(raw_data):
+                    raise ValueError(f"Invalid payload for plugin {self.name}")
+                batch.readings.append(self.normalize_data(raw_data))
+            except (ValueError, TypeError) as e:
+                batch.rejected.append(RejectedPayload(index, str(e)))
+        return batch
+    
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}(name='{self.name}', version='{self.version}')>"
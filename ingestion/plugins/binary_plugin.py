@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                   🧱 Binary Wire Plugin - Flow-Monitor                       ║
+║          Layer 1: Tramas DataPulse binarias → NormalizedReading por lotes    ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Formato compacto para el DataPulse (Content-Type
+``application/vnd.datapulse.binary``). En JSON cada lectura repite sus
+claves, sensor, unidad y ubicación (~250 bytes por un valor de 8); en una
+trama binaria esos textos van una vez en un diccionario y cada lectura es
+un registro de ancho fijo de 21 bytes. Todo little-endian:
+
+    Cabecera (16 bytes)
+        magic       4s   b"DPB1"
+        version     u16  1
+        record_size u16  21
+        sensors     u32  entradas del diccionario
+        records     u32  registros
+
+    Diccionario: por sensor, tres textos UTF-8 con largo u16 delante
+        sensor_id, unit, location (largo 0 = sin ubicación)
+
+    Registros (empaquetados, sin alineación)
+        sensor       u32  índice en el diccionario
+        timestamp_ms i64  epoch en milisegundos
+        value        f64
+        flags        u8   bit 0 = anomalía, bits 1-2 = estado DataPulse
+
+Los registros se decodifican sin copiar: ``numpy.frombuffer`` sobre la
+trama con un dtype estructurado, y luego se pasan a listas por columna.
+El encoder vive en ``sensors.datapulse_sensor`` (``encode_binary``).
+
+Author: Flow-Monitor Team
+Project: Flow-Monitor (MVP Semilla Inicia)
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ingestion.models import NormalizedBatch, NormalizedReading, ReadingType, RejectedPayload
+from ingestion.plugins.base import SensorPlugin
+from ingestion.plugins.http_json_plugin import UNIT_READING_TYPES
+from observability import spans
+from timebase import NS_PER_MS
+
+
+BINARY_CONTENT_TYPE = "application/vnd.datapulse.binary"
+
+MAGIC = b"DPB1"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+RECORD_DTYPE = np.dtype([
+    ("sensor", "<u4"),
+    ("timestamp_ms", "<i8"),
+    ("value", "<f8"),
+    ("flags", "u1"),
+])
+
+# |timestamp_ms| máximo cuyo paso a ns cabe en int64 (año 2262)
+MAX_TIMESTAMP_MS = np.iinfo(np.int64).max // NS_PER_MS
+
+FLAG_ANOMALY = 0x01
+STATUS_SHIFT = 1
+STATUSES = ("NORMAL", "WARNING", "CRITICAL", "ANOMALY_INJECTED")
+
+_LENGTH = struct.Struct("<H")
+
+# Metadata por valor del byte de flags (se copia en cada lectura)
+_METADATA = [
+    {"raw_status": STATUSES[flags >> STATUS_SHIFT & 0x03], "is_anomaly": bool(flags & FLAG_ANOMALY)}
+    for flags in range(256)
+]
+
+
+@dataclass
+class BinaryFrame:
+    """
+    🧱 Trama decodificada.
+
+    Attributes:
+        sensors: (sensor_id, unit, location) por índice del diccionario
+        records: Vista estructurada (RECORD_DTYPE) sobre los bytes de la trama
+    """
+    sensors: List[Tuple[str, str, Optional[str]]]
+    records: np.ndarray
+
+
+def decode_frame(data: Any) -> BinaryFrame:
+    """
+    Decodifica una trama (bytes, bytearray o memoryview) sin copiar los registros.
+
+    Raises:
+        ValueError: Trama truncada, versión desconocida, índice de sensor
+            inválido o timestamp fuera de rango
+    """
+    view = memoryview(data)
+    if len(view) < HEADER.size:
+        raise ValueError("Invalid binary frame: truncated header")
+    magic, version, record_size, sensor_count, record_count = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("Invalid binary frame: bad magic")
+    if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"Unsupported binary frame version {version} (record size {record_size})")
+
+    sensors = []
+    pos = HEADER.size
+    try:
+        for _ in range(sensor_count):
+            fields = []
+            for _ in range(3):
+                (length,) = _LENGTH.unpack_from(view, pos)
+                pos += 2
+                if pos + length > len(view):
+                    raise ValueError("Invalid binary frame: truncated sensor dictionary")
+                fields.append(str(view[pos:pos + length], "utf-8"))
+                pos += length
+            sensor_id, unit, location = fields
+            sensors.append((sensor_id, unit, location or None))
+    except struct.error:
+        raise ValueError("Invalid binary frame: truncated sensor dictionary")
+
+    if len(view) - pos != record_count * RECORD_DTYPE.itemsize:
+        raise ValueError(
+            f"Invalid binary frame: expected {record_count} records of {RECORD_DTYPE.itemsize} bytes"
+        )
+    records = np.frombuffer(view, dtype=RECORD_DTYPE, count=record_count, offset=pos)
+    if record_count:
+        if int(records["sensor"].max()) >= sensor_count:
+            raise ValueError("Invalid binary frame: sensor index out of range")
+        # ms * NS_PER_MS desbordaría int64 en silencio en _readings
+        timestamps = records["timestamp_ms"]
+        if int(timestamps.max()) > MAX_TIMESTAMP_MS or int(timestamps.min()) < -MAX_TIMESTAMP_MS:
+            raise ValueError("Invalid binary frame: timestamp out of range")
+    return BinaryFrame(sensors, records)
+
+
+class BinaryWirePlugin(SensorPlugin):
+    """
+    🧱 Plugin para tramas binarias del DataPulse (un payload = una trama = N lecturas).
+
+    Example:
+        >>> plugin = BinaryWirePlugin()
+        >>> batch = plugin.normalize_batch([frame_bytes])
+    """
+
+    content_types = (BINARY_CONTENT_TYPE,)
+
+    @property
+    def name(self) -> str:
+        return "binary-wire-plugin"
+
+    @property
+    def description(self) -> str:
+        return "DataPulse binary frames (sensor dictionary + fixed-width records)"
+
+    def validate(self, raw_data: Any) -> bool:
+        return isinstance(raw_data, (bytes, bytearray, memoryview)) and bytes(raw_data[:4]) == MAGIC
+
+    def normalize_data(self, raw_data: Any) -> NormalizedReading:
+        """
+        Normaliza una trama de un solo registro.
+
+        Raises:
+            ValueError: Trama inválida o con varios registros (usar ``normalize_batch``)
+        """
+        frame = decode_frame(raw_data)
+        if len(frame.records) != 1:
+            raise ValueError(f"Frame with {len(frame.records)} records: use normalize_batch")
+        return self._readings(frame)[0]
+
+    def _readings(self, frame: BinaryFrame) -> List[NormalizedReading]:
+        records = frame.records
+        source = self.name
+        sensors = [
+            (sensor_id, unit, location, UNIT_READING_TYPES.get(unit.lower(), ReadingType.GENERIC))
+            for sensor_id, unit, location in frame.sensors
+        ]
+        # ms → ns epoch en un solo paso vectorizado
+        timestamps = (records["timestamp_ms"] * NS_PER_MS).tolist()
+        metadata = _METADATA
+        readings = []
+        append = readings.append
+        for index, timestamp, value, flags in zip(
+            records["sensor"].tolist(), timestamps,
+            records["value"].tolist(), records["flags"].tolist(),
+        ):
+            sensor_id, unit, location, reading_type = sensors[index]
+            # Posicional: mismo orden de campos que NormalizedReading
+            append(NormalizedReading(
+                sensor_id, timestamp, value, unit, source, location, reading_type,
+                metadata[flags].copy(),
+            ))
+        return readings
+
+    @spans.stage("normalize_batch")
+    def normalize_batch(self, raw_batch: Iterable[Any]) -> NormalizedBatch:
+        """
+        Normaliza tramas completas; una trama inválida se rechaza entera
+        (índice = posición de la trama en el lote).
+        """
+        batch = NormalizedBatch()
+        for index, raw_data in enumerate(raw_batch):
+            try:
+                if not self.validate(raw_data):
+                    raise ValueError("Invalid binary frame: bad magic")
+                batch.readings.extend(self._readings(decode_frame(raw_data)))
+            except ValueError as e:
+                batch.rejected.append(RejectedPayload(index, str(e)))
+        return batch
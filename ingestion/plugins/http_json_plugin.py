@@ -12,11 +12,34 @@ Author: Flow-Monitor Team
 Project: Flow-Monitor (MVP Semilla Inicia)
 """
 
-from datetime import datetime
-from typing import Any
+from typing import Any, Dict, Iterable, List, Optional
 
 from ingestion.plugins.base import SensorPlugin
-from ingestion.models import NormalizedReading, ReadingType
+from observability import spans
+from ingestion.models import NormalizedBatch, NormalizedReading, ReadingType, RejectedPayload
+from timebase import parse_timestamp
+
+
+# Dispositivos multicanal con sus sensor_id por canal ({sensor_id}_{canal})
+# recordados antes de vaciar la caché
+MAX_CACHED_DEVICES = 10_000
+_CHANNEL_IDS: Dict[Any, Dict[Any, str]] = {}
+
+# Unidad (en minúsculas) → tipo de lectura
+UNIT_READING_TYPES: Dict[str, ReadingType] = {
+    **dict.fromkeys(("celsius", "fahrenheit", "kelvin", "°c", "°f"), ReadingType.TEMPERATURE),
+    **dict.fromkeys(("hz", "g", "mm/s"), ReadingType.VIBRATION),
+    **dict.fromkeys(("l/min", "gpm", "m³/h"), ReadingType.FLOW),
+    **dict.fromkeys(("bar", "psi", "kpa", "pa"), ReadingType.PRESSURE),
+    **dict.fromkeys(("%rh", "%", "humidity"), ReadingType.HUMIDITY),
+}
+
+VALUE_AND_CHANNELS_ERROR = "Invalid payload: use either value or channels, not both"
+
+
+def is_number(value: Any) -> bool:
+    """Valor numérico de una lectura: int o float, nunca bool (``True`` no es una medición)."""
+    return value.__class__ is float or (value.__class__ is not bool and isinstance(value, (int, float)))
 
 
 class HttpJsonPlugin(SensorPlugin):
@@ -41,6 +64,22 @@ class HttpJsonPlugin(SensorPlugin):
             }
         }
     
+    Mensajes multicanal (un gateway que reporta varias magnitudes a la vez):
+    ``channels`` reemplaza a ``value``. Se aceptan como mapa (un número usa
+    ``unit`` del mensaje; un objeto trae su ``value``/``unit``) o como lista
+    de objetos con ``name``:
+        {
+            "sensor_id": "VIB_GW_07",
+            "timestamp": "2025-12-18T00:53:11",
+            "unit": "mm/s",
+            "location": "Planta-A/Bomba-3",
+            "channels": {"x": 1.2, "y": 0.8, "z": 2.1,
+                         "temp": {"value": 45.2, "unit": "Celsius"}}
+        }
+    ``normalize_batch`` lo expande en una lectura por canal
+    (``sensor_id = VIB_GW_07_x``, ``metadata.channel = "x"``); timestamp,
+    location y metadata del encabezado se procesan una vez por mensaje.
+    
     Example:
         >>> plugin = HttpJsonPlugin()
         >>> raw_data = {"sensor_id": "S01", "timestamp": "...", "value": 25.0, "unit": "C"}
@@ -51,6 +90,17 @@ class HttpJsonPlugin(SensorPlugin):
     # Campos requeridos en el payload
     REQUIRED_FIELDS = {"sensor_id", "timestamp", "value", "unit"}
     
+    # Campos que no se copian a metadata
+    RESERVED_FIELDS = frozenset(REQUIRED_FIELDS | {"location", "_meta"})
+    
+    # Mensajes multicanal: canales en lugar de value
+    CHANNELS_FIELD = "channels"
+    CHANNEL_RESERVED_FIELDS = frozenset(RESERVED_FIELDS | {CHANNELS_FIELD})
+    
+    # Enrutamiento: también es el plugin por defecto del registro
+    content_types = ("application/vnd.datapulse+json",)
+    signature_keys = ("_meta",)
+    
     @property
     def name(self) -> str:
         return "http-json-plugin"
@@ -71,22 +121,29 @@ class HttpJsonPlugin(SensorPlugin):
             raw_data: Diccionario JSON del payload
             
         Returns:
-            True si contiene sensor_id, timestamp, value y unit
+            True si contiene sensor_id, timestamp, value y unit (o
+            sensor_id, timestamp y channels en un mensaje multicanal)
         """
         if not isinstance(raw_data, dict):
             return False
         
+        channels = raw_data.get(self.CHANNELS_FIELD)
+        if channels is not None:
+            return (isinstance(channels, (dict, list)) and bool(channels) and "value" not in raw_data
+                    and "sensor_id" in raw_data and "timestamp" in raw_data)
+        
         # Verificar campos requeridos
         for field in self.REQUIRED_FIELDS:
             if field not in raw_data:
                 return False
         
         # Verificar que value sea numérico
-        if not isinstance(raw_data.get("value"), (int, float)):
+        if not is_number(raw_data.get("value")):
             return False
         
         return True
     
+    @spans.stage("normalize")
     def normalize_data(self, raw_data: dict) -> NormalizedReading:
         """
         Transforma el payload JSON del DataPulse al formato normalizado.
@@ -98,21 +155,30 @@ class HttpJsonPlugin(SensorPlugin):
             NormalizedReading con los datos estandarizados
             
         Raises:
-            ValueError: Si los datos no pueden ser normalizados
+            ValueError: Si los datos no pueden ser normalizados, o es un
+                mensaje multicanal (usar ``normalize_batch``)
         """
+        if isinstance(raw_data, dict) and self.CHANNELS_FIELD in raw_data:
+            if "value" in raw_data:
+                raise ValueError(VALUE_AND_CHANNELS_ERROR)
+            raise ValueError("Multi-channel payload: use normalize_batch (/api/ingest/batch)")
         if not self.validate(raw_data):
             raise ValueError(
                 f"Invalid payload: missing required fields {self.REQUIRED_FIELDS}"
             )
-        
-        # Parse timestamp
-        timestamp = raw_data["timestamp"]
-        if isinstance(timestamp, str):
-            # Soportar formato ISO con o sin microsegundos
-            timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        try:
+            return self._normalize_one(raw_data)
+        except (TypeError, AttributeError) as e:
+            # Campos con otro tipo (ej: "_meta": "x"): error de validación, no del servidor
+            raise ValueError(f"Invalid payload for plugin {self.name}: {e}") from None
+    
+    def _normalize_one(self, raw_data: dict) -> NormalizedReading:
+        """Cuerpo de ``normalize_data`` para un payload ya validado."""
+        # ISO (con o sin microsegundos / zona) o epoch numérico → ns
+        timestamp = parse_timestamp(raw_data["timestamp"])
         
         # Extraer metadata del campo _meta si existe
-        meta = raw_data.get("_meta", {})
+        meta = raw_data.get("_meta") or {}
         
         # Determinar el tipo de lectura basado en la unidad
         reading_type = self._infer_reading_type(raw_data.get("unit", ""))
@@ -125,7 +191,7 @@ class HttpJsonPlugin(SensorPlugin):
             "agent": meta.get("agent"),
             # Preservar cualquier campo adicional del payload original
             **{k: v for k, v in raw_data.items() 
-               if k not in self.REQUIRED_FIELDS | {"location", "_meta"}}
+               if k not in self.RESERVED_FIELDS}
         }
         
         # Limpiar None values
@@ -142,6 +208,206 @@ class HttpJsonPlugin(SensorPlugin):
             metadata=metadata,
         )
     
+    @spans.stage("normalize_batch")
+    def normalize_batch(self, raw_batch: Iterable[Any]) -> NormalizedBatch:
+        """
+        Normaliza un lote de payloads DataPulse en un solo recorrido.
+        
+        Mismo resultado que ``normalize_data`` por registro, sin la cadena
+        validate → normalize_data → _infer_reading_type por lectura: los
+        campos requeridos se validan al leerlos (un KeyError rechaza el
+        payload), el tipo de lectura se resuelve una vez por unidad
+        distinta del lote y los payloads sin campos extra (contando
+        claves) no recorren sus items.
+        
+        Los mensajes multicanal (sin ``value``) se detectan al fallar esa
+        clave, sin costo para los payloads de un solo valor, y se expanden
+        con ``expand_channels``.
+        
+        Args:
+            raw_batch: Payloads JSON del DataPulse
+            
+        Returns:
+            NormalizedBatch con lecturas aceptadas y rechazos por índice
+        """
+        batch = NormalizedBatch()
+        readings, rejected = batch.readings, batch.rejected
+        reserved = self.RESERVED_FIELDS
+        required_count = len(self.REQUIRED_FIELDS)
+        missing_error = f"Invalid payload: missing required fields {self.REQUIRED_FIELDS}"
+        source = self.name
+        parse = parse_timestamp
+        channels_field = self.CHANNELS_FIELD
+        # Una flota envía el mismo timestamp en todo un tick: reusar el último parseado
+        last_text, last_ns = object(), 0
+        reading_types: Dict[str, ReadingType] = {}
+        
+        for index, raw_data in enumerate(raw_batch):
+            try:
+                if not isinstance(raw_data, dict):
+                    raise ValueError(missing_error)
+                # Indexar los campos requeridos ya los valida (KeyError → rechazo)
+                sensor_id = raw_data["sensor_id"]
+                timestamp = raw_data["timestamp"]
+                value = raw_data["value"]
+                unit = raw_data["unit"]
+                if not is_number(value):
+                    raise ValueError(missing_error)
+                
+                if timestamp != last_text:
+                    last_text, last_ns = timestamp, parse(timestamp)
+                timestamp = last_ns
+                
+                reading_type = reading_types.get(unit)
+                if reading_type is None:
+                    reading_type = reading_types[unit] = self._infer_reading_type(unit)
+                
+                location = raw_data.get("location")
+                meta = raw_data.get("_meta")
+                if meta:
+                    metadata = {
+                        k: v for k, v in (
+                            ("raw_status", meta.get("status")),
+                            ("is_anomaly", meta.get("is_anomaly", False)),
+                            ("step", meta.get("step")),
+                            ("agent", meta.get("agent")),
+                        ) if v is not None
+                    }
+                else:
+                    metadata = {"is_anomaly": False}
+                # Campos extra solo si hay más claves que las reservadas presentes
+                # (channels es una de ellas: con value, se rechaza como en normalize_data)
+                if len(raw_data) > required_count + ("location" in raw_data) + ("_meta" in raw_data):
+                    for k, v in raw_data.items():
+                        if k not in reserved:
+                            if k == channels_field:
+                                raise ValueError(VALUE_AND_CHANNELS_ERROR)
+                            if v is None:
+                                metadata.pop(k, None)
+                            else:
+                                metadata[k] = v
+                
+                readings.append(NormalizedReading(
+                    sensor_id=sensor_id,
+                    timestamp=timestamp,
+                    value=float(value),
+                    unit=unit,
+                    source=source,
+                    location=location,
+                    reading_type=reading_type,
+                    metadata=metadata,
+                ))
+            except KeyError:
+                if isinstance(raw_data, dict) and channels_field in raw_data:
+                    try:
+                        readings.extend(self.expand_channels(raw_data, reading_types))
+                    except KeyError:
+                        rejected.append(RejectedPayload(index, missing_error))
+                    except (ValueError, TypeError, AttributeError) as e:
+                        rejected.append(RejectedPayload(index, str(e)))
+                else:
+                    rejected.append(RejectedPayload(index, missing_error))
+            except (ValueError, TypeError, AttributeError) as e:
+                rejected.append(RejectedPayload(index, str(e)))
+        
+        return batch
+    
+    def expand_channels(
+        self, raw_data: Dict[str, Any], reading_types: Optional[Dict[str, ReadingType]] = None
+    ) -> List[NormalizedReading]:
+        """
+        Expande un mensaje multicanal en una lectura por canal.
+        
+        El encabezado (timestamp, location, _meta y campos extra) se
+        procesa una sola vez y lo comparten todas las lecturas; cada canal
+        solo aporta valor, unidad y su ``sensor_id`` (recordado entre
+        mensajes).
+        
+        Args:
+            raw_data: Mensaje con ``channels`` (mapa o lista, ver la clase)
+            reading_types: Caché unidad → tipo de lectura del lote
+            
+        Returns:
+            Lecturas en el orden de los canales
+            
+        Raises:
+            KeyError: Falta sensor_id o timestamp
+            ValueError: Canal sin valor numérico o sin unidad, o sin canales
+        """
+        device = raw_data["sensor_id"]
+        timestamp = parse_timestamp(raw_data["timestamp"])
+        channels = raw_data[self.CHANNELS_FIELD]
+        default_unit = raw_data.get("unit")
+        location = raw_data.get("location")
+        if reading_types is None:
+            reading_types = {}
+        
+        meta = raw_data.get("_meta")
+        if meta:
+            header = {
+                k: v for k, v in (
+                    ("raw_status", meta.get("status")),
+                    ("is_anomaly", meta.get("is_anomaly", False)),
+                    ("step", meta.get("step")),
+                    ("agent", meta.get("agent")),
+                ) if v is not None
+            }
+        else:
+            header = {"is_anomaly": False}
+        # Campos extra solo si hay más claves que las conocidas presentes
+        known = 3 + ("unit" in raw_data) + ("location" in raw_data) + ("_meta" in raw_data)
+        if len(raw_data) > known:
+            reserved = self.CHANNEL_RESERVED_FIELDS
+            for k, v in raw_data.items():
+                if k not in reserved and v is not None:
+                    header[k] = v
+        header["device_id"] = device
+        
+        if channels.__class__ is dict:
+            items = channels.items()
+        elif channels.__class__ is list:
+            items = [(spec.get("name"), spec) for spec in channels]
+        else:
+            raise ValueError("channels must be an object or a list")
+        if not items:
+            raise ValueError("Multi-channel payload without channels")
+        
+        channel_ids = _CHANNEL_IDS.get(device)
+        if channel_ids is None:
+            if len(_CHANNEL_IDS) >= MAX_CACHED_DEVICES:
+                _CHANNEL_IDS.clear()
+            channel_ids = _CHANNEL_IDS[device] = {}
+        source = self.name
+        readings = []
+        for name, spec in items:
+            if spec.__class__ is dict:
+                value, unit = spec.get("value"), spec.get("unit", default_unit)
+            else:
+                value, unit = spec, default_unit
+            if not is_number(value):
+                raise ValueError(f"Channel {name!r} needs a numeric value")
+            if unit is None or name is None:
+                raise ValueError(f"Channel {name!r} needs a name and a unit")
+            
+            sensor_id = channel_ids.get(name)
+            if sensor_id is None:
+                sensor_id = channel_ids[name] = f"{device}_{name}"
+            reading_type = reading_types.get(unit)
+            if reading_type is None:
+                reading_type = reading_types[unit] = self._infer_reading_type(unit)
+            
+            readings.append(NormalizedReading(
+                sensor_id=sensor_id,
+                timestamp=timestamp,
+                value=float(value),
+                unit=unit,
+                source=source,
+                location=location,
+                reading_type=reading_type,
+                metadata={**header, "channel": name},
+            ))
+        return readings
+    
     def _infer_reading_type(self, unit: str) -> ReadingType:
         """
         Infiere el tipo de lectura basado en la unidad de medida.
@@ -152,17 +418,4 @@ class HttpJsonPlugin(SensorPlugin):
         Returns:
             ReadingType correspondiente
         """
-        unit_lower = unit.lower()
-        
-        if unit_lower in ("celsius", "fahrenheit", "kelvin", "°c", "°f"):
-            return ReadingType.TEMPERATURE
-        elif unit_lower in ("hz", "g", "mm/s"):
-            return ReadingType.VIBRATION
-        elif unit_lower in ("l/min", "gpm", "m³/h"):
-            return ReadingType.FLOW
-        elif unit_lower in ("bar", "psi", "kpa", "pa"):
-            return ReadingType.PRESSURE
-        elif unit_lower in ("%rh", "%", "humidity"):
-            return ReadingType.HUMIDITY
-        
-        return ReadingType.GENERIC
+        return UNIT_READING_TYPES.get(unit.lower(), ReadingType.GENERIC)
@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                  🧩 JSON Mapping Plugin - Flow-Monitor                       ║
+║          Layer 1: Formatos de proveedor declarados, compilados al cargar     ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Un proveedor nuevo es una entrada de configuración, no una subclase de
+``SensorPlugin``. La configuración dice dónde está cada campo de
+``NormalizedReading`` en el JSON del proveedor:
+
+    {
+      "name": "acme-json",
+      "content_types": ["application/vnd.acme+json"],
+      "each": "readings",
+      "sensor_id": {"template": "{device.serial}_{@.channel}"},
+      "timestamp": {"path": "ts", "epoch": "ms"},
+      "value": {"path": "@.v", "scale": 0.1, "from_unit": "fahrenheit"},
+      "unit": {"const": "Celsius"},
+      "location": {"path": "site", "default": null},
+      "metadata": {"battery": "device.battery", "vendor": {"const": "acme"}}
+    }
+
+Campos (un string es atajo de ``{"path": ...}``):
+
+- ``path``: claves separadas por punto; un segmento numérico indexa una
+  lista (``values.0``). ``@`` es el elemento actual del ``each``.
+- ``const``: valor fijo. ``template``: texto con ``{ruta}`` intercaladas
+  (sin conversiones ni formato: ``{ruta!r}`` o ``{ruta:>10}`` se rechazan).
+- ``default``: valor si la ruta no existe o es ``null`` (sin él, el
+  payload se rechaza); en ``timestamp`` se acepta ``"now"``.
+- ``value``: número (o texto numérico; un booleano se rechaza).
+  ``scale``/``offset`` (finitos) y ``from_unit`` (convierte a la ``unit``
+  constante del mapeo, ver ``UNIT_CONVERSIONS``) se pliegan en una sola
+  multiplicación y suma al compilar.
+- ``timestamp``: ``epoch`` (s, ms, us, ns) fija la unidad; sin él se usa
+  ``parse_timestamp`` (ISO o epoch por magnitud).
+- ``metadata``: nombre → campo; las rutas ausentes o ``null`` se omiten.
+- ``each``: ruta a una lista; cada elemento es una lectura. Los campos del
+  sobre (rutas sin ``@``) se leen una vez por payload, no por elemento.
+- ``reading_type``: fijo; si falta se infiere de la unidad.
+- ``location`` y las entradas de ``metadata`` son opcionales; ``sensor_id``
+  y ``unit`` deben ser texto (un id numérico se convierte con ``template``).
+
+Al cargar, la configuración se traduce a código Python (accesos por
+subíndice literales, constantes ya resueltas) y se compila una vez: por
+lectura cuesta lo mismo que un plugin escrito a mano. El código generado
+queda en ``MappingPlugin.source``. Las rutas y constantes se emiten con
+``repr``: la configuración no puede inyectar código.
+
+Author: Flow-Monitor Team
+Project: Flow-Monitor (MVP Semilla Inicia)
+"""
+
+import math
+import string
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from ingestion.models import NormalizedBatch, NormalizedReading, ReadingType, RejectedPayload
+from ingestion.plugins.base import SensorPlugin
+from ingestion.plugins.http_json_plugin import UNIT_READING_TYPES
+from observability import spans
+from timebase import NS_PER_MS, NS_PER_SECOND, NS_PER_US, parse_timestamp
+
+
+# (desde, hacia) en minúsculas → (factor, suma): convertido = crudo * factor + suma
+UNIT_CONVERSIONS: Dict[Tuple[str, str], Tuple[float, float]] = {
+    ("fahrenheit", "celsius"): (5 / 9, -160 / 9),
+    ("celsius", "fahrenheit"): (1.8, 32.0),
+    ("kelvin", "celsius"): (1.0, -273.15),
+    ("celsius", "kelvin"): (1.0, 273.15),
+    ("psi", "bar"): (0.0689475729, 0.0),
+    ("bar", "psi"): (14.5037738, 0.0),
+    ("kpa", "bar"): (0.01, 0.0),
+    ("pa", "bar"): (1e-5, 0.0),
+    ("gpm", "l/min"): (3.78541178, 0.0),
+    ("m³/h", "l/min"): (1000 / 60, 0.0),
+    ("l/min", "m³/h"): (0.06, 0.0),
+}
+
+EPOCH_UNITS = {"s": NS_PER_SECOND, "ms": NS_PER_MS, "us": NS_PER_US, "ns": 1}
+
+# Claves de primer nivel aceptadas en la configuración de un mapeo
+SPEC_KEYS = frozenset({
+    "name", "description", "version", "content_types", "route_headers", "signature_keys",
+    "each", "sensor_id", "timestamp", "value", "unit", "location", "reading_type", "metadata",
+})
+FIELD_KEYS = frozenset({"path", "const", "template", "default", "scale", "offset", "from_unit", "epoch"})
+
+# Formato DataPulse (el de HttpJsonPlugin) como mapeo: referencia para
+# escribir mapeos nuevos y para comparar contra el plugin escrito a mano
+DATAPULSE_MAPPING: Dict[str, Any] = {
+    "name": "datapulse-mapping",
+    "sensor_id": "sensor_id",
+    "timestamp": "timestamp",
+    "value": "value",
+    "unit": "unit",
+    "location": "location",
+    "metadata": {
+        "raw_status": "_meta.status",
+        "is_anomaly": {"path": "_meta.is_anomaly", "default": False},
+        "step": "_meta.step",
+        "agent": "_meta.agent",
+    },
+}
+
+# Errores de una ruta que no existe en el payload
+LOOKUP_ERRORS = (KeyError, IndexError, TypeError)
+
+_MISSING = object()
+
+
+Normalizer = Callable[[Any, Callable[[NormalizedReading], None]], None]
+
+
+@dataclass(frozen=True)
+class CompiledMapping:
+    """
+    ⚙️ Resultado de ``compile_mapping``.
+
+    Attributes:
+        normalize: ``normalize(payload, out)``; llama a ``out`` con cada lectura
+        source: Código Python generado (para depurar un mapeo)
+        required_keys: Claves de primer nivel sin las que el payload no se normaliza
+    """
+    normalize: Normalizer
+    source: str
+    required_keys: Tuple[str, ...]
+
+
+def _parse_memo(memo: List[Tuple[Any, int]], raw: Any) -> int:
+    last = memo[0]
+    if raw == last[0]:
+        return last[1]
+    ns = parse_timestamp(raw)
+    memo[0] = (raw, ns)
+    return ns
+
+
+def _reading_type_of(cache: Dict[str, ReadingType], unit: str) -> ReadingType:
+    reading_type = cache.get(unit)
+    if reading_type is None:
+        if len(cache) >= 1024:
+            cache.clear()
+        reading_type = cache[unit] = UNIT_READING_TYPES.get(unit.lower(), ReadingType.GENERIC)
+    return reading_type
+
+
+def _as_float(raw: Any) -> float:
+    """Valor de la lectura; un booleano (``true`` → 1.0) no es una medición."""
+    if raw.__class__ is bool:
+        raise ValueError("value must be numeric, not a boolean")
+    return float(raw)
+
+
+def _scaled_epoch(raw: Any, scale: int) -> int:
+    """Epoch en unidad conocida → ns (enteros sin pasar por float)."""
+    if raw.__class__ is int:
+        return raw * scale
+    return round(float(raw) * scale)
+
+
+class _Compiler:
+    """Traduce una configuración de mapeo a la fuente de ``normalize(p, out)``."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self.env: Dict[str, Any] = {
+            "NormalizedReading": NormalizedReading,
+            "LOOKUP_ERRORS": LOOKUP_ERRORS,
+            "as_float": _as_float,
+            "parse_memo": _parse_memo,
+            "scaled_epoch": _scaled_epoch,
+            "reading_type_of": _reading_type_of,
+            "time_ns": time.time_ns,
+        }
+        self.header: List[str] = []   # Sobre: una vez por payload
+        self.body: List[str] = []     # Por elemento del each (sangría relativa al for)
+        self.required_keys: List[str] = []
+        self.fan_out = spec.get("each") is not None
+        self._names = 0
+        self._parents: Dict[Tuple[bool, Tuple[str, ...]], str] = {}
+
+    def _const(self, value: Any) -> str:
+        """Nombre global para una constante (evita literales mutables compartidos)."""
+        name = f"C{len(self.env)}"
+        self.env[name] = value
+        return name
+
+    def _local(self) -> str:
+        self._names += 1
+        return f"v{self._names}"
+
+    def _path(self, path: str) -> Tuple[str, bool]:
+        """Ruta → (expresión de subíndices, es relativa al elemento)."""
+        if not isinstance(path, str) or not path:
+            raise ValueError(f"Invalid mapping path {path!r}")
+        segments = path.split(".")
+        item = segments[0] == "@"
+        if item:
+            if not self.fan_out:
+                raise ValueError(f"Path '{path}' uses '@' but the mapping has no 'each'")
+            segments = segments[1:]
+        expr = "it" if item else "p"
+        for segment in segments:
+            if not segment:
+                raise ValueError(f"Invalid mapping path {path!r}")
+            expr += f"[{int(segment)}]" if segment.isdigit() else f"[{segment!r}]"
+        return expr, item
+
+    def field(self, key: str, spec: Any, convert: Callable[[str], str] = str,
+              optional: bool = False) -> Tuple[str, bool]:
+        """
+        Emite la lectura de un campo y devuelve (expresión, depende del elemento).
+
+        ``convert`` envuelve la expresión cruda (float, str, parseo...). Los
+        valores del sobre se guardan en un local antes del bucle.
+        """
+        if isinstance(spec, str):
+            spec = {"path": spec}
+        if not isinstance(spec, dict):
+            raise ValueError(f"Field '{key}' must be a path string or an object")
+        unknown = set(spec) - FIELD_KEYS
+        if unknown:
+            raise ValueError(f"Field '{key}' has unknown options {sorted(unknown)}")
+        sources = [s for s in ("path", "const", "template") if s in spec]
+        if len(sources) != 1:
+            raise ValueError(f"Field '{key}' needs exactly one of path, const or template")
+
+        if "const" in spec:
+            return self._const(spec["const"]), False
+
+        if "template" in spec:
+            parts, item = [], False
+            for literal, name, format_spec, conversion in string.Formatter().parse(spec["template"]):
+                if format_spec or conversion:
+                    raise ValueError(
+                        f"Field '{key}': template '{{{name}}}' cannot use a conversion or format spec"
+                    )
+                if literal:
+                    parts.append(repr(literal))
+                if name is not None:
+                    expr, in_item = self._path(name)
+                    if in_item:
+                        item = True
+                    else:
+                        # Parte del sobre: convertida una vez, fuera del bucle
+                        self._require(name)
+                        local = self._local()
+                        self.header.append(f"{local} = str({expr})")
+                        expr = local
+                    parts.append(f"str({expr})" if in_item else expr)
+            return " + ".join(parts) or "''", item
+
+        expr, item = self._path(spec["path"])
+        default = spec.get("default", _MISSING)
+        if default is _MISSING and not optional:
+            if not item:
+                self._require(spec["path"])
+            value = convert(expr)
+            if item:
+                return value, True
+            local = self._local()
+            self.header.append(f"{local} = {value}")
+            return local, False
+
+        local = self._local()
+        fallback = "None" if default is _MISSING else self._default(key, default)
+        lines = self.body if item else self.header
+        segments = spec["path"].split(".")[1 if item else 0:]
+        if any(segment.isdigit() for segment in segments):
+            # Índices de lista: sin .get, la ausencia se detecta por excepción
+            lines.extend([
+                "try:",
+                f"    {local} = {convert(expr)}",
+                "except LOOKUP_ERRORS:",
+                f"    {local} = {fallback}",
+            ])
+            return local, item
+        # Cadena de .get: una clave ausente no lanza excepciones, y los
+        # contenedores intermedios (p. ej. "_meta") se leen una sola vez
+        lines.append(f"{local} = {self._get(item, segments)}")
+        if convert is not str:
+            lines.append(f"{local} = {fallback} if {local} is None else {convert(local)}")
+        elif fallback != "None":
+            lines.append(f"if {local} is None: {local} = {fallback}")
+        return local, item
+
+    def _get(self, item: bool, segments: List[str]) -> str:
+        """Expresión ``.get`` de una ruta opcional; los prefijos se guardan en locales."""
+        parent = "it" if item else "p"
+        for depth in range(1, len(segments)):
+            key = (item, tuple(segments[:depth]))
+            local = self._parents.get(key)
+            if local is None:
+                local = self._parents[key] = self._local()
+                (self.body if item else self.header).append(
+                    f"{local} = {self._get_step(parent, segments[depth - 1], depth == 1)}"
+                )
+            parent = local
+        return self._get_step(parent, segments[-1], len(segments) == 1)
+
+    @staticmethod
+    def _get_step(parent: str, segment: str, root: bool) -> str:
+        if root:
+            return f"{parent}.get({segment!r})"
+        return f"({parent}.get({segment!r}) if {parent} is not None else None)"
+
+    def _parse_memo(self, expr: str) -> str:
+        """
+        ``parse_timestamp`` con el último texto recordado: una flota envía el
+        mismo timestamp en todo un tick. El par (texto, ns) se reemplaza
+        como una tupla, así que es seguro entre hilos.
+        """
+        memo = self._const([(object(), 0)])
+        return f"parse_memo({memo}, {expr})"
+
+    def _default(self, key: str, default: Any) -> str:
+        if key == "timestamp" and default == "now":
+            return "time_ns()"
+        return self._const(default)
+
+    def _number(self, option: str, raw: Any) -> float:
+        """``scale``/``offset`` finitos: se emiten como literales en el código generado."""
+        try:
+            number = float(raw)
+        except (TypeError, ValueError):
+            number = math.nan
+        if isinstance(raw, bool) or not math.isfinite(number):
+            raise ValueError(f"Mapping '{self.spec['name']}': {option} must be a finite number, got {raw!r}")
+        return number
+
+    def _require(self, path: str) -> None:
+        top = path.split(".", 1)[0]
+        if top not in self.required_keys:
+            self.required_keys.append(top)
+
+    def compile(self) -> CompiledMapping:
+        spec = self.spec
+        unknown = set(spec) - SPEC_KEYS
+        if unknown:
+            raise ValueError(f"Mapping '{spec.get('name')}' has unknown keys {sorted(unknown)}")
+        for key in ("name", "sensor_id", "value", "unit"):
+            if key not in spec:
+                raise ValueError(f"Mapping '{spec.get('name')}' is missing '{key}'")
+
+        each = None
+        if self.fan_out:
+            each, _ = self._path(spec["each"])
+            self._require(spec["each"])
+
+        # Unidad constante: tipo de lectura y conversión se resuelven aquí
+        unit_spec = spec["unit"]
+        const_unit = unit_spec.get("const") if isinstance(unit_spec, dict) else None
+        if const_unit is not None:
+            unit, _ = self.field("unit", {"const": str(const_unit)})
+        else:
+            unit, _ = self.field("unit", unit_spec)
+
+        reading_type: str
+        if "reading_type" in spec:
+            reading_type = self._const(ReadingType(spec["reading_type"]))
+        elif const_unit is not None:
+            reading_type = self._const(UNIT_READING_TYPES.get(str(const_unit).lower(), ReadingType.GENERIC))
+        else:
+            # Tipo por unidad distinta, recordado entre payloads
+            reading_type = f"reading_type_of({self._const({})}, {unit})"
+
+        value_spec = spec["value"]
+        if isinstance(value_spec, str):
+            value_spec = {"path": value_spec}
+        factor = self._number("scale", value_spec.get("scale", 1.0)) if isinstance(value_spec, dict) else 1.0
+        addend = self._number("offset", value_spec.get("offset", 0.0)) if isinstance(value_spec, dict) else 0.0
+        from_unit = value_spec.get("from_unit") if isinstance(value_spec, dict) else None
+        if from_unit is not None:
+            if const_unit is None:
+                raise ValueError(f"Mapping '{spec['name']}': from_unit needs a constant unit")
+            pair = (str(from_unit).lower(), str(const_unit).lower())
+            if pair[0] != pair[1]:
+                if pair not in UNIT_CONVERSIONS:
+                    raise ValueError(f"Mapping '{spec['name']}': no conversion {pair[0]} → {pair[1]}")
+                a, b = UNIT_CONVERSIONS[pair]
+                factor, addend = factor * a, addend * a + b
+        if factor == 1.0 and addend == 0.0:
+            to_value = lambda e: f"as_float({e})"
+        elif addend == 0.0:
+            to_value = lambda e: f"as_float({e}) * {factor!r}"
+        else:
+            sign = "-" if addend < 0 else "+"
+            to_value = lambda e: f"as_float({e}) * {factor!r} {sign} {abs(addend)!r}"
+        value, _ = self.field("value", value_spec, to_value)
+
+        sensor_id, _ = self.field("sensor_id", spec["sensor_id"])
+
+        # Sin timestamp en el formato: momento de la ingesta
+        ts_spec = spec.get("timestamp")
+        if ts_spec is None:
+            timestamp = "time_ns()"
+        else:
+            epoch = ts_spec.get("epoch") if isinstance(ts_spec, dict) else None
+            if epoch is None:
+                to_ns = self._parse_memo
+            elif epoch in EPOCH_UNITS:
+                to_ns = lambda e: f"scaled_epoch({e}, {EPOCH_UNITS[epoch]})"
+            else:
+                raise ValueError(f"Mapping '{spec['name']}': epoch must be one of {sorted(EPOCH_UNITS)}")
+            timestamp, _ = self.field("timestamp", ts_spec, to_ns)
+
+        location = "None"
+        if spec.get("location") is not None:
+            location, _ = self.field("location", spec["location"], optional=True)
+
+        metadata = self._metadata(spec.get("metadata") or {})
+
+        lines = ["def normalize(p, out):"]
+        lines += [f"    {line}" for line in self.header]
+        indent = "    "
+        if each is not None:
+            lines.append(f"    for it in {each}:")
+            indent = "        "
+        lines += [f"{indent}{line}" for line in self.body]
+        lines += [
+            f"{indent}out(NormalizedReading(",
+            f"{indent}    sensor_id={sensor_id},",
+            f"{indent}    timestamp={timestamp},",
+            f"{indent}    value={value},",
+            f"{indent}    unit={unit},",
+            f"{indent}    source={self._const(spec['name'])},",
+            f"{indent}    location={location},",
+            f"{indent}    reading_type={reading_type},",
+            f"{indent}    metadata={metadata},",
+            f"{indent}))",
+        ]
+        source = "\n".join(lines) + "\n"
+        namespace = dict(self.env)
+        exec(compile(source, f"<mapping {spec['name']}>", "exec"), namespace)
+        return CompiledMapping(namespace["normalize"], source, tuple(self.required_keys))
+
+    def _metadata(self, spec: Dict[str, Any]) -> str:
+        """Metadata del sobre armada una vez; las del elemento se agregan por lectura."""
+        if not isinstance(spec, dict):
+            raise ValueError(f"Mapping '{self.spec['name']}': metadata must be an object")
+        envelope = self._local()
+        self.header.append(f"{envelope} = {{}}")
+        item_fields = []
+        for name, field_spec in spec.items():
+            expr, item = self.field(f"metadata.{name}", field_spec, optional=True)
+            if isinstance(field_spec, dict) and "const" in field_spec:
+                self.header.append(f"{envelope}[{name!r}] = {expr}")
+                continue
+            if item:
+                item_fields.append((name, expr))
+            else:
+                self.header.append(f"if {expr} is not None: {envelope}[{name!r}] = {expr}")
+        if not item_fields:
+            # Sin each hay una sola lectura: el dict del sobre se usa directo
+            return f"{envelope}.copy()" if self.fan_out else envelope
+        local = self._local()
+        self.body.append(f"{local} = {envelope}.copy()")
+        for name, expr in item_fields:
+            self.body.append(f"if {expr} is not None: {local}[{name!r}] = {expr}")
+        return local
+
+
+def compile_mapping(spec: Dict[str, Any]) -> CompiledMapping:
+    """
+    Compila una configuración de mapeo.
+
+    Returns:
+        CompiledMapping con ``normalize(payload, out)``, que llama a ``out``
+        con cada ``NormalizedReading`` del payload
+
+    Raises:
+        ValueError: Configuración inválida (clave desconocida, ruta mal
+            formada, conversión de unidades inexistente...)
+    """
+    return _Compiler(spec).compile()
+
+
+class MappingPlugin(SensorPlugin):
+    """
+    🧩 Plugin definido por configuración (ver el formato en el módulo).
+
+    Example:
+        >>> plugin = MappingPlugin({"name": "acme-json", "sensor_id": "id",
+        ...                         "timestamp": "ts", "value": "v", "unit": "unit"})
+        >>> plugin.normalize_data({"id": "S1", "ts": 1766019600, "v": 3, "unit": "bar"}).value
+        3.0
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        compiled = compile_mapping(spec)
+        self._normalize = compiled.normalize
+        self._required = compiled.required_keys
+        self.source = compiled.source
+        self.content_types = tuple(spec.get("content_types", ()))
+        self.route_headers = tuple(tuple(pair) for pair in spec.get("route_headers", ()))
+        self.signature_keys = tuple(spec.get("signature_keys", ()))
+
+    @property
+    def name(self) -> str:
+        return self.spec["name"]
+
+    @property
+    def version(self) -> str:
+        return self.spec.get("version", "1.0.0")
+
+    @property
+    def description(self) -> str:
+        return self.spec.get("description", "Config-driven JSON mapping")
+
+    def validate(self, raw_data: Any) -> bool:
+        """Objeto JSON con las claves de primer nivel que el mapeo exige."""
+        return isinstance(raw_data, dict) and all(key in raw_data for key in self._required)
+
+    @spans.stage("normalize")
+    def normalize_data(self, raw_data: Any) -> NormalizedReading:
+        """
+        Normaliza un payload que produce una sola lectura.
+
+        Raises:
+            ValueError: Payload inválido, o un ``each`` con cero o varias
+                lecturas (usar ``normalize_batch``)
+        """
+        readings: List[NormalizedReading] = []
+        try:
+            self._normalize(raw_data, readings.append)
+        except KeyError as e:
+            raise ValueError(f"Invalid payload: missing field {e}") from None
+        except (IndexError, TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid payload for plugin {self.name}: {e}") from None
+        if len(readings) != 1:
+            raise ValueError(f"Payload with {len(readings)} readings: use normalize_batch")
+        return readings[0]
+
+    @spans.stage("normalize_batch")
+    def normalize_batch(self, raw_batch: Iterable[Any]) -> NormalizedBatch:
+        """
+        Normaliza un lote; un payload con ``each`` aporta una lectura por elemento.
+
+        Un payload con un elemento inválido se rechaza entero (sus lecturas
+        ya generadas se descartan).
+        """
+        batch = NormalizedBatch()
+        readings, rejected = batch.readings, batch.rejected
+        normalize, out = self._normalize, readings.append
+        for index, raw_data in enumerate(raw_batch):
+            start = len(readings)
+            try:
+                normalize(raw_data, out)
+            except KeyError as e:
+                del readings[start:]
+                rejected.append(RejectedPayload(index, f"Invalid payload: missing field {e}"))
+            except (ValueError, TypeError, IndexError, AttributeError) as e:
+                del readings[start:]
+                rejected.append(RejectedPayload(index, str(e)))
+        return batch
+
+
+def load_mapping_plugins(config: Any) -> List[MappingPlugin]:
+    """
+    Plugins desde un dict de configuración (p. ej. un JSON en disco).
+
+    Formato: ``{"mappings": [spec, ...]}`` o directamente la lista de specs.
+
+    Raises:
+        ValueError: Alguna configuración inválida o nombres repetidos
+    """
+    specs = config.get("mappings", []) if isinstance(config, dict) else config
+    plugins = [MappingPlugin(spec) for spec in specs]
+    names = [plugin.name for plugin in plugins]
+    duplicated = {name for name in names if names.count(name) > 1}
+    if duplicated:
+        raise ValueError(f"Duplicated mapping names: {sorted(duplicated)}")
+    return plugins
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                   📡 MQTT-JSON Plugin - Flow-Monitor                         ║
+║              Layer 1: Mensajes MQTT → NormalizedReading por lotes            ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Plugin para payloads JSON publicados por MQTT (un mensaje por lectura, con
+el formato DataPulse de HttpJsonPlugin). El tópico aporta los campos que
+el payload omite según una plantilla:
+
+    flowmonitor/{location}/{sensor_id}   →   flowmonitor/Planta-A/SENSOR_TEMP_01
+
+Los lotes del suscriptor se decodifican mensaje a mensaje (un payload
+inválido solo rechaza su propio índice) y luego pasan por el mismo
+``HttpJsonPlugin.normalize_batch`` que la ingesta HTTP.
+
+Author: Flow-Monitor Team
+Project: Flow-Monitor (MVP Semilla Inicia)
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Tuple
+
+from ingestion.models import NormalizedBatch, NormalizedReading, RejectedPayload
+from ingestion.mqtt.protocol import MqttMessage
+from ingestion.plugins.http_json_plugin import HttpJsonPlugin
+
+
+# Tópicos distintos recordados (campos ya extraídos) antes de vaciar la caché
+MAX_CACHED_TOPICS = 100_000
+
+
+class MqttJsonPlugin(HttpJsonPlugin):
+    """
+    📡 Plugin para mensajes MQTT con payload JSON.
+
+    Example:
+        >>> plugin = MqttJsonPlugin("flowmonitor/{location}/{sensor_id}")
+        >>> plugin.subscription
+        'flowmonitor/+/+'
+        >>> batch = plugin.normalize_batch(messages)   # List[MqttMessage]
+    """
+
+    DEFAULT_TOPIC_TEMPLATE = "flowmonitor/{location}/{sensor_id}"
+
+    # Se elige por ruta (/api/ingest/mqtt-json-plugin) o desde el suscriptor
+    content_types = ()
+    signature_keys = ()
+
+    def __init__(self, topic_template: str = DEFAULT_TOPIC_TEMPLATE):
+        self.topic_template = topic_template
+        levels = topic_template.split("/")
+        self._topic_levels = len(levels)
+        self._topic_fields: Tuple[Tuple[int, str], ...] = tuple(
+            (i, level[1:-1]) for i, level in enumerate(levels)
+            if level.startswith("{") and level.endswith("}")
+        )
+        self._topic_cache: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+
+    @property
+    def name(self) -> str:
+        return "mqtt-json-plugin"
+
+    @property
+    def description(self) -> str:
+        return "MQTT/JSON adapter (DataPulse payloads, fields from topic)"
+
+    @property
+    def subscription(self) -> str:
+        """Filtro con comodines que cubre la plantilla (``{campo}`` → ``+``)."""
+        fields = {i for i, _ in self._topic_fields}
+        return "/".join(
+            "+" if i in fields else level
+            for i, level in enumerate(self.topic_template.split("/"))
+        )
+
+    def topic_fields(self, topic: str) -> Tuple[Tuple[str, str], ...]:
+        """Pares (campo, valor) que la plantilla extrae del tópico."""
+        fields = self._topic_cache.get(topic)
+        if fields is None:
+            levels = topic.split("/")
+            if len(levels) != self._topic_levels:
+                fields = ()
+            else:
+                fields = tuple((name, levels[i]) for i, name in self._topic_fields)
+            if len(self._topic_cache) >= MAX_CACHED_TOPICS:
+                self._topic_cache.clear()
+            self._topic_cache[topic] = fields
+        return fields
+
+    def _with_topic(self, message: MqttMessage, payload: Any) -> Dict[str, Any]:
+        if not isinstance(payload, dict):
+            raise ValueError("Invalid payload: MQTT message must be a JSON object")
+        for field, value in self.topic_fields(message.topic):
+            if field not in payload:
+                payload[field] = value
+        return payload
+
+    def decode(self, message: MqttMessage) -> Dict[str, Any]:
+        """Payload JSON de un mensaje, completado con los campos del tópico."""
+        return self._with_topic(message, json.loads(message.payload))
+
+    def validate(self, raw_data: Any) -> bool:
+        if isinstance(raw_data, MqttMessage):
+            try:
+                raw_data = self.decode(raw_data)
+            except ValueError:
+                return False
+        return super().validate(raw_data)
+
+    def normalize_data(self, raw_data: Any) -> NormalizedReading:
+        """Normaliza un MqttMessage (o un dict ya decodificado)."""
+        if isinstance(raw_data, MqttMessage):
+            raw_data = self.decode(raw_data)
+        return super().normalize_data(raw_data)
+
+    def _decode_batch(
+        self, messages: List[MqttMessage]
+    ) -> Tuple[List[Dict[str, Any]], List[int], List[RejectedPayload]]:
+        """
+        Payloads decodificados, su índice en el lote y los rechazos de decodificación.
+        
+        Cada payload se decodifica por separado: unir los payloads en un solo
+        arreglo JSON permitiría que dos mensajes inválidos se complementen
+        (``{..},{..}`` + ``[1`` + ``2]``) y desplazaran lecturas a otro tópico.
+        
+        Un dict se toma como payload ya decodificado (sin tópico); cualquier
+        otro elemento se rechaza en su índice.
+        """
+        loads = json.loads
+        payloads, indices, rejected = [], [], []
+        for index, message in enumerate(messages):
+            if not isinstance(message, MqttMessage):
+                if isinstance(message, dict):
+                    payloads.append(message)
+                    indices.append(index)
+                else:
+                    rejected.append(RejectedPayload(index, "Expected an MqttMessage or a JSON object"))
+                continue
+            try:
+                payload = loads(message.payload)
+            except ValueError as e:
+                rejected.append(RejectedPayload(index, f"Invalid JSON payload: {e}"))
+                continue
+            try:
+                payloads.append(self._with_topic(message, payload))
+                indices.append(index)
+            except ValueError as e:
+                rejected.append(RejectedPayload(index, str(e)))
+        return payloads, indices, rejected
+
+    def normalize_batch(self, raw_batch: Iterable[Any]) -> NormalizedBatch:
+        """
+        Normaliza un lote de MqttMessage (o payloads ya decodificados): un
+        ``json.loads`` por mensaje y luego ``HttpJsonPlugin.normalize_batch``
+        para todo el lote. Los rechazos conservan el índice en ``raw_batch``.
+        """
+        payloads, indices, rejected = self._decode_batch(list(raw_batch))
+        batch = super().normalize_batch(payloads)
+        if batch.rejected:
+            rejected.extend(RejectedPayload(indices[r.index], r.error) for r in batch.rejected)
+            rejected.sort(key=lambda r: r.index)
+        batch.rejected = rejected
+        return batch
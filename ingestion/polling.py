@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                   ⏱️  Polling Scheduler - Flow-Monitor                        ║
+║            Layer 1: Lectura periódica de dispositivos pull-based             ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Scheduler asyncio para miles de dispositivos que hay que consultar (Modbus,
+APIs REST de equipos) en lugar de esperar a que publiquen:
+
+- Un heap de vencimientos: un solo bucle despierta en el próximo
+  vencimiento, sin una tarea dormida por dispositivo
+- Intervalo propio por dispositivo; el primer vencimiento se reparte al
+  azar dentro del intervalo (jitter) para no disparar todo a la vez
+- Concurrencia acotada con un semáforo; timeout por consulta
+- Nunca dos consultas en vuelo al mismo dispositivo: si la anterior no
+  terminó, el ciclo se salta y se cuenta en ``stats.skipped``
+- Ciclos perdidos por atraso no se recuperan en ráfaga: el próximo
+  vencimiento se alinea a la grilla del dispositivo
+- Los resultados se entregan al ``sink`` en lotes (por tamaño o cada
+  ``flush_interval``) para que lleguen a ``normalize_batch`` agrupados
+
+Example:
+    scheduler = PollingScheduler(poller.poll, sink=lambda batch: ..., concurrency=200)
+    for device in devices:
+        scheduler.add(device, device.interval, device.timeout)
+    await scheduler.run()
+
+Author: Flow-Monitor Team
+Project: Flow-Monitor (MVP Semilla Inicia)
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PollStats:
+    """Contadores del scheduler."""
+    polls: int = 0
+    results: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    skipped: int = 0
+    batches: int = 0
+    max_in_flight: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+class _Entry:
+    __slots__ = ("target", "interval", "timeout", "active", "busy")
+
+    def __init__(self, target: Any, interval: float, timeout: float):
+        self.target = target
+        self.interval = interval
+        self.timeout = timeout
+        self.active = True
+        self.busy = False
+
+
+class PollingScheduler:
+    """
+    ⏱️ Consulta objetivos en intervalos propios con concurrencia acotada.
+
+    Args:
+        poll: ``async poll(target) -> List[resultados]``
+        sink: Recibe cada lote de resultados (síncrono)
+        concurrency: Consultas en vuelo como máximo
+        batch_size: Resultados acumulados que fuerzan una entrega
+        flush_interval: Entrega lo acumulado al menos cada tantos segundos
+        jitter: Fracción del intervalo sobre la que se reparte el primer vencimiento
+        seed: Semilla del jitter (tests reproducibles)
+    """
+
+    def __init__(
+        self,
+        poll: Callable[[Any], Awaitable[List[Any]]],
+        sink: Callable[[List[Any]], Any],
+        concurrency: int = 100,
+        batch_size: int = 1000,
+        flush_interval: float = 0.5,
+        jitter: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        self.poll = poll
+        self.sink = sink
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.jitter = jitter
+        self.stats = PollStats()
+        self._random = random.Random(seed)
+        self._heap: List[list] = []
+        self._entries: Dict[int, _Entry] = {}
+        self._seq = itertools.count()
+        self._pending: List[Any] = []
+        self._tasks: set = set()
+        self._active = 0
+        self._wake: Optional[asyncio.Event] = None
+        self._running = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def in_flight(self) -> int:
+        return self._active
+
+    def add(self, target: Any, interval: float, timeout: Optional[float] = None) -> None:
+        """Agrega un objetivo; su primer vencimiento cae al azar dentro de ``interval × jitter``."""
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.remove(target)
+        entry = _Entry(target, interval, timeout if timeout is not None else interval)
+        self._entries[id(target)] = entry
+        now = asyncio.get_running_loop().time() if self._running else 0.0
+        due = now + self._random.uniform(0.0, interval * self.jitter)
+        heapq.heappush(self._heap, [due, next(self._seq), entry])
+        if self._wake is not None:
+            self._wake.set()
+
+    def remove(self, target: Any) -> None:
+        """Quita un objetivo (su entrada en el heap se descarta al vencer)."""
+        entry = self._entries.pop(id(target), None)
+        if entry is not None:
+            entry.active = False
+
+    def stop(self) -> None:
+        self._running = False
+        if self._wake is not None:
+            self._wake.set()
+
+    def flush(self) -> None:
+        """Entrega al sink los resultados acumulados."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        self.stats.batches += 1
+        try:
+            self.sink(batch)
+        except Exception:
+            logger.exception("⏱️ Polling sink failed for a batch of %d results", len(batch))
+
+    async def run(self, duration: Optional[float] = None) -> PollStats:
+        """
+        Ejecuta el scheduler hasta ``stop()`` o durante ``duration`` segundos.
+
+        Al terminar espera las consultas en vuelo y entrega lo pendiente.
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + duration if duration is not None else None
+        semaphore = asyncio.Semaphore(self.concurrency)
+        self._wake = asyncio.Event()
+        self._running = True
+        # Los objetivos agregados antes de run() tienen vencimientos relativos a 0
+        for item in self._heap:
+            item[0] += start
+        heapq.heapify(self._heap)
+        next_flush = start + self.flush_interval
+
+        try:
+            while self._running:
+                now = loop.time()
+                if deadline is not None and now >= deadline:
+                    break
+                if now >= next_flush:
+                    self.flush()
+                    next_flush = now + self.flush_interval
+
+                wake_at = next_flush
+                if deadline is not None:
+                    wake_at = min(wake_at, deadline)
+                if self._heap and self._heap[0][0] > now:
+                    wake_at = min(wake_at, self._heap[0][0])
+                if not self._heap or self._heap[0][0] > now:
+                    self._wake.clear()
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), max(wake_at - now, 0.0))
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                item = heapq.heappop(self._heap)
+                due, _, entry = item
+                if not entry.active:
+                    continue
+                # Próximo vencimiento en la grilla del objetivo, sin ráfagas por atraso
+                missed = int((now - due) // entry.interval)
+                self.stats.skipped += missed
+                item[0] = due + (missed + 1) * entry.interval
+                item[1] = next(self._seq)
+                heapq.heappush(self._heap, item)
+
+                if entry.busy:
+                    self.stats.skipped += 1
+                    continue
+                # El semáforo se toma dentro de la tarea: con todos los cupos
+                # ocupados el bucle sigue atendiendo vencimientos y flushes
+                entry.busy = True
+                task = asyncio.create_task(self._poll_one(entry, semaphore))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        finally:
+            self._running = False
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            self.flush()
+            # Vencimientos de vuelta a relativos por si se vuelve a ejecutar
+            end = loop.time()
+            for item in self._heap:
+                item[0] = max(item[0] - end, 0.0)
+            self._wake = None
+        return self.stats
+
+    async def _poll_one(self, entry: _Entry, semaphore: asyncio.Semaphore) -> None:
+        try:
+            await semaphore.acquire()
+        except asyncio.CancelledError:
+            entry.busy = False
+            raise
+        # Contador propio: la tarea sigue en _tasks hasta su done callback,
+        # después de liberar el semáforo
+        self._active += 1
+        if self._active > self.stats.max_in_flight:
+            self.stats.max_in_flight = self._active
+        self.stats.polls += 1
+        try:
+            results = await asyncio.wait_for(self.poll(entry.target), entry.timeout)
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+            return
+        except Exception as e:
+            self.stats.errors += 1
+            logger.debug("⏱️ Poll failed for %r: %s", entry.target, e)
+            return
+        finally:
+            entry.busy = False
+            self._active -= 1
+            semaphore.release()
+        if results:
+            self.stats.results += len(results)
+            self._pending.extend(results)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
@@ -6,22 +6,68 @@
 ╚══════════════════════════════════════════════════════════════════════════════╝
 
 Sistema de registro de plugins para descubrimiento dinámico.
-Permite registrar, listar y obtener plugins por nombre.
+Permite registrar, listar y obtener plugins por nombre, y resolver qué
+plugin atiende un request (header, Content-Type o firma del payload) con
+una tabla de ruteo que se reconstruye al registrar, no en cada request.
 
 Author: Flow-Monitor Team
 Project: Flow-Monitor (MVP Semilla Inicia)
 """
 
-from typing import Dict, List, Optional, Type
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional
 
 from ingestion.plugins.base import SensorPlugin
 
+logger = logging.getLogger(__name__)
 
 class PluginNotFoundError(Exception):
     """Excepción cuando no se encuentra un plugin."""
     pass
 
 
+# Header explícito: nombre del plugin que debe procesar el request
+ROUTE_HEADER = "x-flow-plugin"
+
+
+@dataclass
+class RoutingTable:
+    """
+    🧭 Índices de ruteo precalculados a partir de los plugins registrados.
+    
+    Attributes:
+        content_types: Content-Type (minúsculas, sin parámetros) → plugin
+        headers: header (minúsculas) → valor (minúsculas) → plugin
+        signatures: clave de primer nivel del payload → plugin, en orden
+            de registro (es el orden en que se prueban)
+        default: Plugin cuando nada coincide
+    """
+    content_types: Dict[str, SensorPlugin] = field(default_factory=dict)
+    headers: Dict[str, Dict[str, SensorPlugin]] = field(default_factory=dict)
+    signatures: Dict[str, SensorPlugin] = field(default_factory=dict)
+    default: Optional[SensorPlugin] = None
+    
+    def add(self, plugin: SensorPlugin) -> None:
+        """Indexa las declaraciones del plugin; ValueError si chocan con otro."""
+        entries = [
+            (self.content_types, content_type.lower(), "Content-Type")
+            for content_type in plugin.content_types
+        ] + [
+            (self.headers.setdefault(header.lower(), {}), value.lower(), f"header {header}")
+            for header, value in plugin.route_headers
+        ] + [
+            (self.signatures, key, "signature key")
+            for key in plugin.signature_keys
+        ]
+        for index, key, kind in entries:
+            owner = index.get(key)
+            if owner is not None and owner is not plugin:
+                raise ValueError(f"{kind} '{key}' already routed to plugin '{owner.name}'")
+        for index, key, _ in entries:
+            index[key] = plugin
+
+
 class PluginRegistry:
     """
     📦 Registro central de plugins de sensores.
@@ -34,17 +80,28 @@ class PluginRegistry:
         >>> registry.register(HttpJsonPlugin())
         >>> plugin = registry.get("http-json-plugin")
         >>> reading = plugin.normalize_data(raw_data)
+        >>> plugin = registry.resolve(content_type, request.headers, payload)
     """
     
     _instance: Optional["PluginRegistry"] = None
     _plugins: Dict[str, SensorPlugin]
+    _routes: RoutingTable
+    _default: Optional[str]
     
     def __new__(cls) -> "PluginRegistry":
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._plugins = {}
+            cls._instance._routes = RoutingTable()
+            cls._instance._default = None
         return cls._instance
     
+    def _rebuild_routes(self, plugins: Dict[str, SensorPlugin]) -> RoutingTable:
+        routes = RoutingTable(default=plugins.get(self._default) if self._default else None)
+        for plugin in plugins.values():
+            routes.add(plugin)
+        return routes
+    
     def register(self, plugin: SensorPlugin) -> None:
         """
         Registra un plugin en el registro.
@@ -59,18 +116,24 @@ class PluginRegistry:
         if name in self._plugins:
             raise ValueError(f"Plugin '{name}' is already registered")
         
-        self._plugins[name] = plugin
-        print(f"📦 Plugin registrado: {plugin}")
+        # Valida las rutas declaradas antes de aceptar el plugin
+        plugins = {**self._plugins, name: plugin}
+        self._routes = self._rebuild_routes(plugins)
+        self._plugins = plugins
+        logger.info("📦 Plugin registrado: %s", plugin)
     
     def unregister(self, name: str) -> None:
         """
-        Elimina un plugin del registro.
+        Elimina un plugin del registro (y el default, si era ese).
         
         Args:
             name: Nombre del plugin a eliminar
         """
         if name in self._plugins:
             del self._plugins[name]
+            if self._default == name:
+                self._default = None
+            self._routes = self._rebuild_routes(self._plugins)
     
     def get(self, name: str) -> SensorPlugin:
         """
@@ -110,6 +173,70 @@ class PluginRegistry:
                 return self.get(default)
             return None
     
+    def set_default(self, name: Optional[str]) -> None:
+        """Define el plugin que atiende los requests sin ruta que coincida."""
+        if name is not None:
+            self.get(name)
+        self._default = name
+        self._routes = self._rebuild_routes(self._plugins)
+    
+    def resolve(
+        self,
+        content_type: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        payload: Any = None
+    ) -> SensorPlugin:
+        """
+        Resuelve el plugin de un request con la tabla de ruteo.
+        
+        Orden: header ``X-Flow-Plugin`` → Content-Type → headers de
+        gateway → claves del payload → plugin por defecto. Las primeras son
+        búsquedas en diccionarios; la firma prueba las claves registradas en
+        orden de registro, así el plugin elegido no depende del orden de las
+        claves que mande el sensor.
+        
+        Args:
+            content_type: Header Content-Type (se ignoran los parámetros)
+            headers: Headers del request con nombres en minúsculas (o
+                ``request.headers`` de Starlette, que no distingue mayúsculas)
+            payload: Payload ya parseado (JSON) para la prueba de firma
+            
+        Returns:
+            Plugin que debe normalizar el payload
+            
+        Raises:
+            PluginNotFoundError: Plugin pedido por header inexistente, o
+                ninguna ruta coincide y no hay plugin por defecto
+        """
+        routes = self._routes
+        if headers is not None:
+            name = headers.get(ROUTE_HEADER)
+            if name:
+                return self.get(name)
+        if content_type and routes.content_types:
+            plugin = routes.content_types.get(content_type.split(";", 1)[0].strip().lower())
+            if plugin is not None:
+                return plugin
+        if headers is not None:
+            for header, values in routes.headers.items():
+                value = headers.get(header)
+                if value is not None:
+                    plugin = values.get(value.lower())
+                    if plugin is not None:
+                        return plugin
+        if routes.signatures and isinstance(payload, dict):
+            for key, plugin in routes.signatures.items():
+                if key in payload:
+                    return plugin
+        if routes.default is None:
+            raise PluginNotFoundError("No plugin route matches the request and no default plugin is set")
+        return routes.default
+    
+    @property
+    def routes(self) -> RoutingTable:
+        """Tabla de ruteo vigente (solo lectura)."""
+        return self._routes
+    
     def list_plugins(self) -> List[str]:
         """
         Lista todos los plugins registrados.
@@ -130,7 +257,9 @@ class PluginRegistry:
     
     def clear(self) -> None:
         """Elimina todos los plugins del registro (útil para tests)."""
-        self._plugins.clear()
+        self._plugins = {}
+        self._default = None
+        self._routes = RoutingTable()
     
     def __len__(self) -> int:
         return len(self._plugins)
@@ -144,8 +273,9 @@ def get_default_registry() -> PluginRegistry:
     Obtiene el registro de plugins con los plugins por defecto cargados.
     
     Returns:
-        PluginRegistry con HttpJsonPlugin preregistrado
+        PluginRegistry con HttpJsonPlugin (por defecto) y BinaryWirePlugin
     """
+    from ingestion.plugins.binary_plugin import BinaryWirePlugin
     from ingestion.plugins.http_json_plugin import HttpJsonPlugin
     
     registry = PluginRegistry()
@@ -153,5 +283,9 @@ def get_default_registry() -> PluginRegistry:
     # Registrar plugins por defecto
     if "http-json-plugin" not in registry:
         registry.register(HttpJsonPlugin())
+    if "binary-wire-plugin" not in registry:
+        registry.register(BinaryWirePlugin())
+    if registry.routes.default is None:
+        registry.set_default("http-json-plugin")
     
     return registry
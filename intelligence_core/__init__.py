@@ -15,7 +15,15 @@ Módulos:
 - intelligence_service: Servicio orquestador principal
 """
 
-from .models import SensorData, RiskLevel, PredictionAlert, EnrichedData
+from .models import (
+    SensorData,
+    RiskLevel,
+    PredictionAlert,
+    EnrichedData,
+    SensorColumns,
+    PredictionColumns,
+    EnrichedColumns,
+)
 from .rules_engine import RulesEngine
 from .predictive_model import PredictiveModel
 from .intelligence_service import IntelligenceService
@@ -25,6 +33,9 @@ __all__ = [
     "RiskLevel", 
     "PredictionAlert",
     "EnrichedData",
+    "SensorColumns",
+    "PredictionColumns",
+    "EnrichedColumns",
     "RulesEngine",
     "PredictiveModel",
     "IntelligenceService",
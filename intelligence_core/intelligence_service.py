@@ -3,15 +3,28 @@ Servicio principal de Intelligence Core.
 Orquesta el procesamiento de datos de sensores.
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterable, List
 from datetime import datetime
+from time import perf_counter
 
-from .models import SensorData, RiskLevel, PredictionAlert, EnrichedData
+import numpy as np
+
+from observability import metrics
+
+from .models import SensorData, SensorColumns, RiskLevel, PredictionAlert, EnrichedData, EnrichedColumns
 from .rules_engine import RulesEngine
 from .predictive_model import PredictiveModel
 from .config import IntelligenceConfig, config as default_config
 
 
+RULES_EVAL_SECONDS = metrics.histogram(
+    "flowmonitor_rules_eval_seconds", "Tiempo de evaluación de reglas por lectura (Capa 2)"
+)
+PREDICTION_SECONDS = metrics.histogram(
+    "flowmonitor_prediction_seconds", "Tiempo de predicción por lectura (Capa 2)"
+)
+
+
 class IntelligenceService:
     """
     🧠 Intelligence Service - Orquestador principal de Capa 2.
@@ -28,6 +41,9 @@ class IntelligenceService:
         
         enriched = service.process(sensor_data_dict)
         print(enriched.to_dict())
+        
+        # Lotes (p. ej. un mensaje multicanal expandido): en columnas
+        columns = service.process_readings(normalized_batch.readings)
     """
     
     def __init__(self, config: Optional[IntelligenceConfig] = None):
@@ -76,24 +92,47 @@ class IntelligenceService:
         Returns:
             EnrichedData con análisis de riesgo y predicciones
         """
-        # Convertir a modelo tipado
-        sensor_data = SensorData.from_dict(data)
+        return self.process_sensor_data(SensorData.from_dict(data))
+    
+    def process_reading(self, reading: Any) -> EnrichedData:
+        """
+        Procesa un NormalizedReading de Capa 1 sin pasar por diccionario.
         
-        # Evaluar reglas
-        risk_level = self.rules_engine.evaluate(sensor_data)
+        Es la entrada tipada para pipelines en el mismo proceso; la
+        serialización solo ocurre en los límites de proceso (HTTP, colas).
         
-        # Obtener umbrales para el modelo predictivo
-        threshold_info = self.rules_engine.get_threshold_status(sensor_data)
-        threshold_critical = threshold_info["thresholds"]["critical"]
-        threshold_warning = threshold_info["thresholds"]["warning"]
+        Args:
+            reading: NormalizedReading producido por un plugin de ingesta
+            
+        Returns:
+            EnrichedData con análisis de riesgo y predicciones
+        """
+        return self.process_sensor_data(SensorData.from_normalized(reading))
+    
+    def process_sensor_data(self, sensor_data: SensorData) -> EnrichedData:
+        """
+        Evalúa reglas y predicción sobre un SensorData ya construido.
+        
+        Args:
+            sensor_data: Datos tipados del sensor
+            
+        Returns:
+            EnrichedData con análisis de riesgo y predicciones
+        """
+        # Evaluar reglas (y obtener los umbrales aplicados en una sola pasada)
+        t0 = perf_counter()
+        risk_level, threshold = self.rules_engine.evaluate_with_threshold(sensor_data)
+        t1 = perf_counter()
         
         # Generar predicción
         prediction = self.predictive_model.predict(
             sensor_data,
             risk_level,
-            threshold_critical=threshold_critical,
-            threshold_warning=threshold_warning
+            threshold_critical=threshold.critical,
+            threshold_warning=threshold.warning
         )
+        RULES_EVAL_SECONDS.observe(t1 - t0)
+        PREDICTION_SECONDS.observe(perf_counter() - t1)
         
         # Actualizar estadísticas
         self._processed_count += 1
@@ -120,6 +159,49 @@ class IntelligenceService:
         """
         return [self.process(data) for data in data_list]
     
+    def process_columns(self, columns: SensorColumns) -> EnrichedColumns:
+        """
+        Evalúa reglas y predicción sobre un lote columnar.
+        
+        Mismo resultado (y mismas estadísticas) que ``process_sensor_data``
+        lectura por lectura, en el orden del lote, pero con una pasada
+        NumPy por etapa en lugar de una llamada por lectura.
+        
+        Args:
+            columns: Lote de lecturas en columnas
+            
+        Returns:
+            EnrichedColumns (``to_enriched()`` da las filas como EnrichedData)
+        """
+        count = len(columns)
+        t0 = perf_counter()
+        risk_codes, critical, warning = self.rules_engine.evaluate_columns(columns)
+        t1 = perf_counter()
+        predictions = self.predictive_model.predict_columns(columns.values, risk_codes, critical, warning)
+        if count:
+            RULES_EVAL_SECONDS.observe_many((t1 - t0) / count, count)
+            PREDICTION_SECONDS.observe_many((perf_counter() - t1) / count, count)
+        
+        # Actualizar estadísticas
+        self._processed_count += count
+        for level, level_count in zip(RiskLevel, np.bincount(risk_codes, minlength=len(RiskLevel)).tolist()):
+            self._risk_counts[level.value] += level_count
+        self._alerts_generated += predictions.alert_count
+        
+        return EnrichedColumns(data=columns, risk_codes=risk_codes, predictions=predictions)
+    
+    def process_readings(self, readings: Iterable[Any]) -> EnrichedColumns:
+        """
+        Procesa un lote de NormalizedReading de Capa 1 en columnas.
+        
+        Args:
+            readings: Lecturas normalizadas (p. ej. ``NormalizedBatch.readings``)
+            
+        Returns:
+            EnrichedColumns con análisis de riesgo y predicciones
+        """
+        return self.process_columns(SensorColumns.from_readings(readings))
+    
     def get_stats(self) -> Dict[str, Any]:
         """Retorna estadísticas del servicio."""
         runtime = datetime.now() - self._start_time
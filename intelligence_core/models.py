@@ -4,9 +4,14 @@ Define las estructuras de entrada, salida y estados intermedios.
 """
 
 from dataclasses import dataclass, field, asdict
-from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+import sys
+import time
+
+import numpy as np
+
+from timebase import format_iso, parse_timestamp
 
 
 class RiskLevel(Enum):
@@ -32,38 +37,85 @@ class RiskLevel(Enum):
         """Retorna prioridad numérica (mayor = más urgente)."""
         priorities = {"LOW": 1, "MEDIUM": 2, "HIGH": 3, "CRITICAL": 4}
         return priorities.get(self.value, 0)
+    
+    @property
+    def code(self) -> int:
+        """Código entero compacto (0=LOW ... 3=CRITICAL) para almacenamiento."""
+        return self.priority - 1
+    
+    @classmethod
+    def from_code(cls, code: int) -> "RiskLevel":
+        """Obtiene el nivel desde su código entero."""
+        return _RISK_BY_CODE[code]
+
 
+_RISK_BY_CODE = (RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL)
 
-@dataclass
+
+@dataclass(slots=True)
 class SensorData:
     """
     Datos normalizados de un sensor (entrada desde Capa 1).
     Compatible con el formato generado por DataPulse Agent.
+    
+    sensor_id, unit y location se internan: miles de lecturas del mismo
+    sensor comparten una única copia de cada string. El timestamp es
+    epoch en nanosegundos y se formatea en ISO solo al serializar.
     """
     sensor_id: str
-    timestamp: str
+    timestamp: int
     value: float
     unit: str
     location: str
     meta: Optional[Dict[str, Any]] = None
-    
+
+    def __post_init__(self):
+        # Se acepta ISO, epoch o datetime; se guarda siempre como ns
+        if type(self.timestamp) is not int:
+            self.timestamp = parse_timestamp(self.timestamp)
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "SensorData":
-        """Crea una instancia desde un diccionario (payload de Capa 1)."""
+        """
+        Crea una instancia desde un diccionario (payload de Capa 1).
+        
+        Un timestamp ausente o no reconocible se reemplaza por 'ahora'.
+        """
+        try:
+            timestamp = parse_timestamp(data.get("timestamp"))
+        except ValueError:
+            timestamp = time.time_ns()
         return cls(
-            sensor_id=data.get("sensor_id", "UNKNOWN"),
-            timestamp=data.get("timestamp", datetime.now().isoformat()),
+            sensor_id=sys.intern(data.get("sensor_id", "UNKNOWN")),
+            timestamp=timestamp,
             value=float(data.get("value", 0.0)),
-            unit=data.get("unit", ""),
-            location=data.get("location", ""),
+            unit=sys.intern(data.get("unit", "")),
+            location=sys.intern(data.get("location") or ""),
             meta=data.get("_meta")
         )
     
+    @classmethod
+    def from_normalized(cls, reading: Any) -> "SensorData":
+        """
+        Crea una instancia directamente desde un NormalizedReading de Capa 1.
+        
+        Evita el paso por diccionario: el timestamp (ns) se copia tal cual
+        y solo se formatea si se serializa.
+        """
+        return cls(
+            sensor_id=reading.sensor_id,
+            timestamp=reading.timestamp,
+            value=reading.value,
+            unit=reading.unit,
+            location=reading.location or "",
+            meta=reading.metadata or None
+        )
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convierte a diccionario para serialización."""
         result = {
             "sensor_id": self.sensor_id,
-            "timestamp": self.timestamp,
+            "timestamp": format_iso(self.timestamp),
             "value": self.value,
             "unit": self.unit,
             "location": self.location
@@ -73,7 +125,7 @@ class SensorData:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class PredictionAlert:
     """
     Resultado del modelo predictivo.
@@ -101,16 +153,19 @@ class PredictionAlert:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class EnrichedData:
     """
     Datos enriquecidos de salida de Intelligence Core.
     Combina datos originales con análisis de riesgo y predicciones.
+    
+    processed_at se guarda como epoch en nanosegundos y se formatea en
+    ISO solo al serializar.
     """
     data_original: SensorData
     risk_level: RiskLevel
     prediction_alert: PredictionAlert
-    processed_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    processed_at: int = field(default_factory=time.time_ns)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convierte a diccionario para serialización JSON."""
@@ -118,7 +173,7 @@ class EnrichedData:
             "data_original": self.data_original.to_dict(),
             "risk_level": self.risk_level.value,
             "prediction_alert": self.prediction_alert.to_dict(),
-            "processed_at": self.processed_at
+            "processed_at": format_iso(self.processed_at)
         }
     
     def __str__(self) -> str:
@@ -130,3 +185,142 @@ class EnrichedData:
             f"Riesgo: {self.risk_level.value} | "
             f"Prob. Fallo: {prob:.1%}"
         )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Lotes columnares (IntelligenceService.process_columns)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass(eq=False)
+class SensorColumns:
+    """
+    Lote de lecturas en columnas: una lista o array por campo de SensorData.
+    
+    Reglas y predicción operan sobre ``values`` con NumPy (una pasada por
+    lote, no por lectura); las filas se materializan como SensorData solo
+    si se piden (``row``).
+    """
+    sensor_ids: List[str]
+    timestamps: np.ndarray   # int64, ns epoch
+    values: np.ndarray       # float64
+    units: List[str]
+    locations: List[str]
+    metas: List[Optional[Dict[str, Any]]]
+    
+    def __len__(self) -> int:
+        return len(self.sensor_ids)
+    
+    @classmethod
+    def from_readings(cls, readings: Iterable[Any]) -> "SensorColumns":
+        """Desde NormalizedReading de Capa 1 (p. ej. ``NormalizedBatch.readings``)."""
+        readings = list(readings)
+        return cls(
+            sensor_ids=[r.sensor_id for r in readings],
+            timestamps=np.fromiter((r.timestamp for r in readings), dtype=np.int64, count=len(readings)),
+            values=np.fromiter((r.value for r in readings), dtype=np.float64, count=len(readings)),
+            units=[r.unit for r in readings],
+            locations=[r.location or "" for r in readings],
+            metas=[r.metadata or None for r in readings],
+        )
+    
+    @classmethod
+    def from_sensor_data(cls, items: Iterable[SensorData]) -> "SensorColumns":
+        """Desde SensorData ya construidos."""
+        items = list(items)
+        return cls(
+            sensor_ids=[d.sensor_id for d in items],
+            timestamps=np.fromiter((d.timestamp for d in items), dtype=np.int64, count=len(items)),
+            values=np.fromiter((d.value for d in items), dtype=np.float64, count=len(items)),
+            units=[d.unit for d in items],
+            locations=[d.location for d in items],
+            metas=[d.meta for d in items],
+        )
+    
+    def row(self, index: int) -> SensorData:
+        """Lectura ``index`` como SensorData."""
+        return SensorData(
+            self.sensor_ids[index], int(self.timestamps[index]), float(self.values[index]),
+            self.units[index], self.locations[index], self.metas[index],
+        )
+    
+    def rows(self) -> List[SensorData]:
+        """Todas las lecturas como SensorData (arrays convertidos una vez con ``tolist``)."""
+        return list(map(
+            SensorData, self.sensor_ids, self.timestamps.tolist(), self.values.tolist(),
+            self.units, self.locations, self.metas,
+        ))
+
+
+@dataclass(eq=False)
+class PredictionColumns:
+    """
+    Predicciones de un lote en columnas (una fila por lectura).
+    
+    ``alert_codes`` indexa ``alert_messages``/``recommended_actions``
+    (-1 = sin alerta); el modelo predictivo aporta esas tablas.
+    """
+    failure_probability: np.ndarray   # float64
+    confidence: np.ndarray            # float64
+    alert_codes: np.ndarray           # int8
+    alert_messages: Tuple[str, ...]
+    recommended_actions: Tuple[str, ...]
+    
+    @property
+    def alert_count(self) -> int:
+        return int(np.count_nonzero(self.alert_codes >= 0))
+    
+    def alert(self, index: int) -> PredictionAlert:
+        """Fila ``index`` como PredictionAlert (mismos campos que ``PredictiveModel.predict``)."""
+        return self._alert(
+            float(self.failure_probability[index]), float(self.confidence[index]), int(self.alert_codes[index])
+        )
+    
+    def alerts(self) -> List[PredictionAlert]:
+        """Todas las filas como PredictionAlert."""
+        return list(map(
+            self._alert, self.failure_probability.tolist(), self.confidence.tolist(), self.alert_codes.tolist()
+        ))
+    
+    def _alert(self, probability: float, confidence: float, code: int) -> PredictionAlert:
+        alert = PredictionAlert(failure_probability=probability, confidence=confidence)
+        if code >= 0:
+            alert.alert_message = self.alert_messages[code]
+            alert.recommended_action = self.recommended_actions[code]
+            if probability >= 0.8:
+                alert.predicted_time_to_failure = "< 5 minutos"
+            elif probability >= 0.6:
+                alert.predicted_time_to_failure = "5-15 minutos"
+            elif probability >= 0.4:
+                alert.predicted_time_to_failure = "15-30 minutos"
+        return alert
+
+
+@dataclass(eq=False)
+class EnrichedColumns:
+    """
+    Salida columnar de Intelligence Core: el lote de entrada, los códigos
+    de riesgo (``RiskLevel.code``) y las predicciones.
+    
+    Capa 3 puede consumir las columnas directamente o pedir las filas
+    como EnrichedData (``to_enriched``).
+    """
+    data: SensorColumns
+    risk_codes: np.ndarray   # int8
+    predictions: PredictionColumns
+    processed_at: int = field(default_factory=time.time_ns)
+    
+    def __len__(self) -> int:
+        return len(self.data)
+    
+    def risk_counts(self) -> Dict[str, int]:
+        """Lecturas por nivel de riesgo."""
+        counts = np.bincount(self.risk_codes, minlength=len(_RISK_BY_CODE))
+        return {level.value: int(count) for level, count in zip(_RISK_BY_CODE, counts)}
+    
+    def to_enriched(self) -> List[EnrichedData]:
+        """Filas como EnrichedData (mismo resultado que el procesamiento por lectura)."""
+        processed_at = self.processed_at
+        return [
+            EnrichedData(row, _RISK_BY_CODE[code], alert, processed_at)
+            for row, code, alert in zip(self.data.rows(), self.risk_codes.tolist(), self.predictions.alerts())
+        ]
@@ -9,7 +9,12 @@ from typing import Optional, List
 from collections import deque
 from datetime import datetime
 
-from .models import SensorData, PredictionAlert, RiskLevel
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from observability import spans
+
+from .models import SensorData, PredictionAlert, PredictionColumns, RiskLevel
 from .config import IntelligenceConfig, config as default_config
 
 
@@ -26,6 +31,9 @@ class PredictiveModel:
         model = PredictiveModel()
         alert = model.predict(sensor_data, risk_level)
         print(f"Probabilidad de fallo: {alert.failure_probability:.1%}")
+        
+        # Lote columnar: mismo resultado que predict() lectura por lectura
+        predictions = model.predict_columns(values, risk_codes, critical, warning)
     """
     
     # Mensajes de alerta por tipo de escenario
@@ -45,6 +53,15 @@ class PredictiveModel:
         "anomaly": "Investigar causa raíz de la anomalía"
     }
     
+    # Orden de prioridad de _determine_alert_type; el índice es el código en PredictionColumns
+    ALERT_TYPES = ("critical_imminent", "overheat", "trend_warning", "unstable", "anomaly")
+    
+    # Bonus de probabilidad por RiskLevel.code
+    RISK_BONUS = (0.0, 0.1, 0.2, 0.3)
+    
+    # Lecturas de historial que usa _calculate_trend_factor
+    TREND_WINDOW = 10
+    
     def __init__(self, config: Optional[IntelligenceConfig] = None):
         self.config = config or default_config
         self._history: deque = deque(maxlen=50)  # Últimas 50 lecturas
@@ -139,6 +156,7 @@ class PredictiveModel:
         
         return None
     
+    @spans.stage("predict")
     def predict(
         self, 
         sensor_data: SensorData, 
@@ -216,6 +234,108 @@ class PredictiveModel:
         
         return alert
     
+    @spans.stage("predict_columns")
+    def predict_columns(
+        self,
+        values: np.ndarray,
+        risk_codes: np.ndarray,
+        threshold_critical: np.ndarray,
+        threshold_warning: np.ndarray
+    ) -> PredictionColumns:
+        """
+        Predicción de un lote columnar, equivalente a ``predict`` en orden.
+        
+        El historial avanza igual que lectura por lectura: la tendencia de
+        cada fila usa las ventanas de ``TREND_WINDOW`` valores que terminan
+        en ella (``sliding_window_view`` sobre historial + lote). El ruido
+        y la confianza se sortean con ``random`` en el mismo orden que
+        ``predict``, así que con la misma semilla el resultado es idéntico.
+        
+        Args:
+            values: Valores del lote (float64)
+            risk_codes: ``RiskLevel.code`` por fila (de ``RulesEngine.evaluate_columns``)
+            threshold_critical: Umbral crítico por fila
+            threshold_warning: Umbral de advertencia por fila
+            
+        Returns:
+            PredictionColumns con probabilidad, confianza y código de alerta
+        """
+        n = len(values)
+        previous = len(self._history)
+        self._prediction_count += n
+        
+        # Proximidad a los umbrales (mismas ramas que _calculate_proximity_factor)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            between = 0.5 + ((values - threshold_warning) / (threshold_critical - threshold_warning)) * 0.5
+            below = np.where(
+                threshold_warning > 0,
+                np.maximum(0, np.minimum(0.5, (values / threshold_warning) * 0.5)),
+                0.1,
+            )
+        proximity = np.where(
+            values >= threshold_critical, 1.0, np.where(values >= threshold_warning, between, below)
+        )
+        
+        trend = self._trend_columns(values)
+        self._history.extend(values.tolist())
+        
+        pred_config = self.config.prediction
+        probability = (
+            proximity * pred_config.proximity_weight +
+            np.maximum(0, trend) * pred_config.trend_weight
+        )
+        probability = probability + np.array(self.RISK_BONUS)[risk_codes]
+        
+        # Sorteos intercalados como en predict: gauss (ruido) y uniform (confianza)
+        gauss, uniform = random.gauss, random.uniform
+        draws = np.array([(gauss(0, 0.05), uniform(-0.1, 0.15)) for _ in range(n)]).reshape(n, 2)
+        probability = np.clip(probability + draws[:, 0], 0.0, 1.0)
+        confidence = np.clip(0.7 + draws[:, 1], 0.5, 0.95)
+        
+        critical = risk_codes == RiskLevel.CRITICAL.code
+        high = risk_codes == RiskLevel.HIGH.code
+        alert_codes = np.select(
+            [probability >= 0.9, (probability >= 0.7) & critical, (probability >= 0.6) & (trend > 0.1),
+             high & (probability >= 0.5), probability >= 0.5],
+            [0, 1, 2, 3, 4],
+            -1,
+        ).astype(np.int8)
+        alert_codes[probability < pred_config.alert_threshold] = -1
+        
+        return PredictionColumns(
+            failure_probability=probability,
+            confidence=confidence,
+            alert_codes=alert_codes,
+            alert_messages=tuple(self.ALERT_MESSAGES[t] for t in self.ALERT_TYPES),
+            recommended_actions=tuple(self.RECOMMENDED_ACTIONS[t] for t in self.ALERT_TYPES),
+        )
+    
+    def _trend_columns(self, values: np.ndarray) -> np.ndarray:
+        """Factor de tendencia por fila, con el historial como queda tras agregarla."""
+        window = self.TREND_WINDOW
+        half = window // 2
+        tail = list(self._history)[-window:]
+        series = np.concatenate([np.array(tail, dtype=np.float64), values])
+        # Largo de la serie (= historial reciente) tras agregar cada fila
+        ends = len(tail) + np.arange(1, len(values) + 1)
+        
+        trend = np.full(len(values), np.nan)   # NaN = historial corto → factor 0
+        full = np.flatnonzero(ends >= window)
+        if len(full):
+            windows = sliding_window_view(series, window)[ends[full] - window]
+            trend[full] = windows[:, half:].sum(axis=1) / (window - half) - windows[:, :half].sum(axis=1) / half
+        # Primeras lecturas de un modelo nuevo: ventana parcial, como _calculate_trend_factor
+        for i in np.flatnonzero((ends < window) & (ends >= 3)).tolist():
+            recent = series[:ends[i]].tolist()
+            mid = len(recent) // 2
+            trend[i] = sum(recent[mid:]) / (len(recent) - mid) - sum(recent[:mid]) / mid
+        
+        return np.select(
+            [trend > 5, trend > 2, trend > 0, trend < -5, trend < 0],
+            [0.3, 0.15, 0.05, -0.2, -0.1],
+            0.0,
+        )
+    
     def reset_history(self) -> None:
         """Limpia el historial de lecturas."""
         self._history.clear()
@@ -3,8 +3,13 @@ Motor de Reglas para Intelligence Core.
 Evalúa datos de sensores contra umbrales configurables.
 """
 
-from typing import Optional
-from .models import SensorData, RiskLevel
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from observability import spans
+
+from .models import SensorColumns, SensorData, RiskLevel
 from .config import IntelligenceConfig, ThresholdConfig, config as default_config
 
 
@@ -19,11 +24,16 @@ class RulesEngine:
         engine = RulesEngine()
         engine.set_threshold("temperature", max_temp=80, warning_temp=60)
         risk = engine.evaluate(sensor_data)
+        codes, critical, warning = engine.evaluate_columns(columns)
     """
     
+    # (sensor_id, unidad) recordados con su tipo inferido antes de vaciar la caché
+    MAX_CACHED_SENSORS = 100_000
+    
     def __init__(self, config: Optional[IntelligenceConfig] = None):
         self.config = config or default_config
         self._custom_thresholds: dict = {}
+        self._sensor_types: Dict[Tuple[str, str], str] = {}
     
     def set_threshold(
         self,
@@ -67,8 +77,12 @@ class RulesEngine:
     
     def _infer_sensor_type(self, sensor_data: SensorData) -> str:
         """Infiere el tipo de sensor basado en ID, unidad o ubicación."""
-        sensor_id_lower = sensor_data.sensor_id.lower()
-        unit_lower = sensor_data.unit.lower()
+        return self._sensor_type(sensor_data.sensor_id, sensor_data.unit)
+    
+    @staticmethod
+    def _sensor_type(sensor_id: str, unit: str) -> str:
+        sensor_id_lower = sensor_id.lower()
+        unit_lower = unit.lower()
         
         # Mapeo de identificadores comunes
         type_hints = {
@@ -96,10 +110,26 @@ class RulesEngine:
         Returns:
             RiskLevel indicando el nivel de riesgo actual
         """
+        return self.evaluate_with_threshold(sensor_data)[0]
+    
+    @spans.stage("rules")
+    def evaluate_with_threshold(self, sensor_data: SensorData) -> Tuple[RiskLevel, ThresholdConfig]:
+        """
+        Evalúa el nivel de riesgo y retorna también los umbrales aplicados.
+        
+        Evita que el llamador tenga que volver a inferir el tipo de sensor
+        (o construir get_threshold_status) para obtener los umbrales.
+        
+        Returns:
+            Tupla (RiskLevel, ThresholdConfig)
+        """
         sensor_type = self._infer_sensor_type(sensor_data)
         threshold = self.get_threshold(sensor_type)
-        value = sensor_data.value
-        
+        return self._classify(sensor_data.value, threshold), threshold
+    
+    @staticmethod
+    def _classify(value: float, threshold: ThresholdConfig) -> RiskLevel:
+        """Clasifica un valor contra un conjunto de umbrales."""
         # Evaluar contra umbrales (orden de prioridad: crítico > warning > normal)
         if value >= threshold.critical:
             return RiskLevel.CRITICAL
@@ -113,6 +143,48 @@ class RulesEngine:
         else:
             return RiskLevel.LOW
     
+    @spans.stage("rules_columns")
+    def evaluate_columns(self, columns: SensorColumns) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evalúa un lote columnar: mismo resultado que ``evaluate_with_threshold`` por lectura.
+        
+        El tipo de sensor se infiere una vez por (sensor_id, unidad) y se
+        recuerda entre lotes; la clasificación es una sola pasada NumPy
+        sobre los umbrales de cada fila.
+        
+        Returns:
+            Tupla (códigos de riesgo int8 = ``RiskLevel.code``, umbral
+            crítico y umbral de advertencia por fila)
+        """
+        sensor_types = self._sensor_types
+        if len(sensor_types) >= self.MAX_CACHED_SENSORS:
+            sensor_types.clear()
+        # Tipos distintos del lote → fila de la tabla de umbrales
+        slots: Dict[str, int] = {}
+        thresholds: List[ThresholdConfig] = []
+        rows = []
+        for key in zip(columns.sensor_ids, columns.units):
+            sensor_type = sensor_types.get(key)
+            if sensor_type is None:
+                sensor_type = sensor_types[key] = self._sensor_type(*key)
+            slot = slots.get(sensor_type)
+            if slot is None:
+                slot = slots[sensor_type] = len(thresholds)
+                thresholds.append(self.get_threshold(sensor_type))
+            rows.append(slot)
+        
+        limits = np.array(
+            [(t.critical, t.warning, t.normal_max, t.normal_min) for t in thresholds], dtype=np.float64
+        ).reshape(-1, 4)[rows]
+        critical, warning, normal_max, normal_min = limits.T
+        values = columns.values
+        codes = np.select(
+            [values >= critical, values >= warning, values >= normal_max, values < normal_min],
+            [RiskLevel.CRITICAL.code, RiskLevel.HIGH.code, RiskLevel.MEDIUM.code, RiskLevel.MEDIUM.code],
+            RiskLevel.LOW.code,
+        ).astype(np.int8)
+        return codes, critical, warning
+    
     def get_threshold_status(self, sensor_data: SensorData) -> dict:
         """
         Retorna información detallada sobre el estado respecto a umbrales.
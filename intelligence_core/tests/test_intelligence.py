@@ -2,10 +2,12 @@
 Tests unitarios para Intelligence Core.
 """
 
+import random
+
 import pytest
 from datetime import datetime
 
-from intelligence_core.models import SensorData, RiskLevel, PredictionAlert, EnrichedData
+from intelligence_core.models import SensorData, SensorColumns, RiskLevel, PredictionAlert, EnrichedData
 from intelligence_core.rules_engine import RulesEngine
 from intelligence_core.predictive_model import PredictiveModel
 from intelligence_core.intelligence_service import IntelligenceService
@@ -289,5 +291,44 @@ class TestIntelligenceService:
         assert stats["processed_count"] == 2
 
 
+class TestColumns:
+    """Tests del procesamiento en columnas (lotes vectorizados)."""
+    
+    @pytest.fixture
+    def data(self):
+        """Lecturas de varios sensores con valores bajos, altos y negativos."""
+        return [
+            SensorData(f"TEMP_{i % 3}", f"2025-12-18T00:00:{i % 60:02d}", value, "C", "A")
+            for i, value in enumerate([30.0, 95.0, -5.0, 62.0, 85.0, 91.0, 40.0] * 6)
+        ]
+    
+    @pytest.mark.parametrize("split", [1, 5, 42])
+    def test_process_columns_matches_per_reading(self, data, split):
+        """Mismas salidas y estadísticas que process_sensor_data con la misma semilla."""
+        sequential, columnar = IntelligenceService(), IntelligenceService()
+        random.seed(7)
+        expected = [sequential.process_sensor_data(d).to_dict() for d in data]
+        random.seed(7)
+        result = []
+        for i in range(0, len(data), split):
+            batch = columnar.process_columns(SensorColumns.from_sensor_data(data[i:i + split]))
+            result += [e.to_dict() for e in batch.to_enriched()]
+        
+        def strip(output):
+            return {**output, "processed_at": None}
+        
+        assert [strip(o) for o in result] == [strip(o) for o in expected]
+        got, want = columnar.get_stats(), sequential.get_stats()
+        for key in ("processed_count", "risk_distribution", "alerts_generated", "model_stats"):
+            assert got[key] == want[key]
+    
+    def test_columns_round_trip(self, data):
+        """SensorColumns conserva las lecturas originales."""
+        columns = SensorColumns.from_sensor_data(data)
+        
+        assert len(columns) == len(data)
+        assert [d.to_dict() for d in columns.rows()] == [d.to_dict() for d in data]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
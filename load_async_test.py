@@ -8,8 +8,15 @@
 Este script utiliza AIOHTTP y UVLOOP para generar carga masiva asíncrona.
 Es capaz de generar miles de peticiones por segundo (RPS) desde un solo nodo.
 
+Sin ``--rate`` cada worker envía la siguiente request al recibir la
+respuesta (closed loop). Con ``--rate`` las requests se lanzan a tasa fija
+(open loop) y la latencia se mide desde su inicio planificado, incluyendo
+la espera por una conexión libre.
+
 Uso:
     python load_async_test.py --total 2000000 --concurrency 500
+    python load_async_test.py --total 200000 --rate 5000            # Open loop a 5k req/s
+    python load_async_test.py --total 500000 --replay fleet.fmcap   # Tráfico grabado
 """
 
 import asyncio
@@ -19,19 +26,36 @@ import time
 import random
 import argparse
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from benchmarks.histogram import LatencyHistogram, format_latency_report
 
 # Instalar uvloop como la política por defecto
 asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 @dataclass
 class Stats:
+    """Contadores de un worker (o del despachador open loop); se combinan al reportar."""
     sent: int = 0
     success: int = 0
     failed: int = 0
     errors: int = 0
     start_time: float = 0
     end_time: float = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def merge(self, other: "Stats") -> "Stats":
+        self.sent += other.sent
+        self.success += other.success
+        self.failed += other.failed
+        self.errors += other.errors
+        self.latency.merge(other.latency)
+        return self
+
+# Cuerpos JSON precalculados de una captura (--replay): el generador no compite por CPU
+REPLAY_BODIES: Optional[List[bytes]] = None
+JSON_HEADERS = {"Content-Type": "application/json"}
 
 def generate_payload(req_id):
     """Payload ligero pre-calculado para velocidad."""
@@ -54,44 +78,88 @@ def generate_payload(req_id):
         "processed_at": datetime.now().isoformat()
     }
 
-async def worker(session, url, stats, total_target, progress_bar=True):
-    """Worker asíncrono que bombardea la API."""
-    while stats.sent < total_target:
-        # Incremento optimista anticipado para velocidad
-        current_id = stats.sent
+async def send_one(session, url, stats, req_id, intended):
+    """Envía una request y registra su latencia desde ``intended`` (perf_counter)."""
+    try:
+        if REPLAY_BODIES:
+            request = session.post(url, data=REPLAY_BODIES[req_id % len(REPLAY_BODIES)],
+                                   headers=JSON_HEADERS)
+        else:
+            request = session.post(url, json=generate_payload(req_id))
+        async with request as response:
+            if response.status == 200:
+                stats.success += 1
+            else:
+                stats.failed += 1
+                # Leer cuerpo de error solo si es necesario para debug (lento)
+                # await response.text() 
+    except Exception:
+        stats.errors += 1
+    stats.latency.record(time.perf_counter() - intended)
+
+async def worker(session, url, stats, request_ids):
+    """
+    Worker asíncrono que bombardea la API (closed loop).
+
+    Recibe su propia porción de ids (``range(i, total, concurrency)``) y
+    cuenta solo en su ``Stats``: ningún contador compartido entre workers.
+    """
+    for current_id in request_ids:
         stats.sent += 1
-        
-        if current_id >= total_target:
-            break
-            
+        await send_one(session, url, stats, current_id, time.perf_counter())
+
+async def open_loop(session, url, stats, total_target, rate, max_inflight):
+    """
+    Lanza ``total_target`` requests a ``rate`` req/s sin esperar respuestas.
+
+    ``max_inflight`` acota la memoria si el backend se atrasa; el tiempo
+    esperando un cupo cuenta como latencia porque se mide desde el inicio
+    planificado.
+    """
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    slots = asyncio.Semaphore(max_inflight)
+    tasks = set()
+
+    async def run(req_id, intended):
         try:
-            payload = generate_payload(current_id)
-            async with session.post(url, json=payload) as response:
-                if response.status == 200:
-                    stats.success += 1
-                else:
-                    stats.failed += 1
-                    # Leer cuerpo de error solo si es necesario para debug (lento)
-                    # await response.text() 
-        except Exception:
-            stats.errors += 1
-
-async def monitor(stats, total_target):
-    """Monitor de progreso en tiempo real."""
+            await send_one(session, url, stats, req_id, intended)
+        finally:
+            slots.release()
+
+    for req_id in range(total_target):
+        intended = start + req_id * interval
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await slots.acquire()
+        stats.sent += 1
+        task = asyncio.create_task(run(req_id, intended))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+
+async def monitor(parts, total_target, start_time):
+    """Monitor de progreso en tiempo real (suma los Stats de cada worker)."""
     print("⏳ Iniciando calentamiento de motores...")
     await asyncio.sleep(1)
     
-    while stats.sent < total_target:
-        elapsed = time.time() - stats.start_time
+    sent = 0
+    while sent < total_target:
+        sent = sum(p.sent for p in parts)
+        errors = sum(p.failed + p.errors for p in parts)
+        elapsed = time.time() - start_time
         if elapsed == 0: elapsed = 0.001
         
-        rps = stats.sent / elapsed
-        percent = (stats.sent / total_target) * 100
+        rps = sent / elapsed
+        percent = (sent / total_target) * 100
         
         # Barra de progreso
         bar = '█' * int(percent / 4) + '░' * (25 - int(percent / 4))
         
-        print(f"\r🚀 [{bar}] {percent:5.1f}% | Req: {stats.sent:,} | RPS: {rps:,.0f} | Err: {stats.failed + stats.errors}", end="", flush=True)
+        print(f"\r🚀 [{bar}] {percent:5.1f}% | Req: {sent:,} | RPS: {rps:,.0f} | Err: {errors}", end="", flush=True)
         await asyncio.sleep(0.5)
         
         # Si llevamos mucho tiempo (safety break)
@@ -102,8 +170,19 @@ async def main():
     parser.add_argument("--total", type=int, default=2000000, help="Total requests")
     parser.add_argument("--concurrency", type=int, default=200, help="Conexiones concurrentes")
     parser.add_argument("--url", default="http://localhost:8001/api/dashboard/process")
+    parser.add_argument("--replay", help="Captura .fmcap a reproducir (sensors.capture)")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Open loop: requests por segundo planificadas (omitir = closed loop)")
+    parser.add_argument("--max-inflight", type=int, default=None,
+                        help="Open loop: máximo de requests en vuelo (default 10x concurrencia)")
     args = parser.parse_args()
 
+    if args.replay:
+        global REPLAY_BODIES
+        from sensors.capture import load_bodies
+        REPLAY_BODIES = load_bodies(args.replay, "dashboard", limit=args.total)
+        print(f"🎞️  Replay: {len(REPLAY_BODIES):,} payloads precalculados de {args.replay}")
+
     print(f"""
 ╔══════════════════════════════════════════════════════════════════════════════╗
 ║             🚀  PRUEBA DE ESTRÉS ASÍNCRONA (AIOHTTP) 🚀                      ║
@@ -116,6 +195,8 @@ async def main():
 
     stats = Stats()
     stats.start_time = time.time()
+    # Un Stats por worker: en open loop un único despachador, en closed loop uno por conexión
+    parts = [Stats() for _ in range(1 if args.rate else args.concurrency)]
     
     # Configuración de rendimiento de TCP
     conn = aiohttp.TCPConnector(limit=args.concurrency, ttl_dns_cache=300)
@@ -124,11 +205,16 @@ async def main():
     
     async with aiohttp.ClientSession(connector=conn, timeout=timeout) as session:
         # Lanzar monitor
-        monitor_task = asyncio.create_task(monitor(stats, args.total))
+        monitor_task = asyncio.create_task(monitor(parts, args.total, stats.start_time))
         
         # Lanzar workers
-        workers = [asyncio.create_task(worker(session, args.url, stats, args.total)) 
-                   for _ in range(args.concurrency)]
+        if args.rate:
+            workers = [asyncio.create_task(open_loop(
+                session, args.url, parts[0], args.total, args.rate,
+                args.max_inflight or args.concurrency * 10))]
+        else:
+            workers = [asyncio.create_task(worker(session, args.url, part, range(i, args.total, args.concurrency)))
+                       for i, part in enumerate(parts)]
         
         # Esperar a que terminen
         await asyncio.gather(*workers)
@@ -137,6 +223,8 @@ async def main():
         await monitor_task
 
     stats.end_time = time.time()
+    for part in parts:
+        stats.merge(part)
     duration = stats.end_time - stats.start_time
     total_reqs = stats.success + stats.failed + stats.errors
     rps = total_reqs / duration if duration > 0 else 0
@@ -149,6 +237,8 @@ async def main():
     print(f"✅ Exitosas:          {stats.success:,}")
     print(f"❌ Fallidas/Err:      {stats.failed + stats.errors:,}")
     print(f"⚡ Throughput (RPS):  {rps:,.0f} req/s")
+    print("─" * 70)
+    print(format_latency_report(stats.latency, open_loop=bool(args.rate)))
     print("═" * 70)
     
     # Análisis de Infraestructura IA
@@ -13,8 +13,18 @@ ADVERTENCIA:
     - Puede causar denegación de servicio (DoS) local.
     - Diseñado para evaluar infraestructura crítica.
 
+Cada hilo lleva sus propios contadores e histograma de latencias; cada
+proceso publica sus totales en un ``multiprocessing.Array`` sin lock (una
+celda por proceso) y al final envía su histograma al proceso principal,
+que reporta
+p50/p90/p99/p99.9/max globales. Con ``--rate`` las requests siguen una
+planificación open loop (tasa repartida entre procesos) y la latencia se
+mide desde el inicio planificado.
+
 Uso:
     python load_extreme_test.py --total 2000000 --processes 8 --threads 50
+    python load_extreme_test.py --total 300000 --rate 10000           # Open loop a 10k req/s
+    python load_extreme_test.py --total 500000 --replay fleet.fmcap   # Tráfico grabado
 """
 
 import sys
@@ -27,9 +37,11 @@ import random
 from datetime import datetime
 from queue import Empty
 import argparse
+import itertools
 
 # Agregar path para imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchmarks.histogram import LatencyHistogram, OpenLoopSchedule, format_latency_report
 # Importamos clases base pero las re-implementaremos ligeras para velocidad máxima
 # from intelligence_core import IntelligenceService 
 # NOTA: Para velocidad extrema, generaremos payloads "pre-calculados" o ligeros
@@ -62,12 +74,33 @@ def generate_fast_payload(sensor_id):
         "processed_at": datetime.now().isoformat()
     }
 
-def worker_process(proc_id, target_url, limit_requests, num_threads, shared_counter, error_counter, start_event):
+PUBLISH_INTERVAL = 0.25  # segundos entre publicaciones de contadores por proceso
+
+
+def worker_process(proc_id, target_url, quota, num_threads, counters, start_event,
+                   replay_path=None, num_processes=1, hist_queue=None, rate=None):
     """
     Función que ejecuta un PROCESO completo.
     Lanza múltiples hilos para realizar peticiones HTTP.
+
+    Envía exactamente ``quota`` peticiones. Cada hilo cuenta en variables
+    propias; un hilo publicador suma esos contadores y los escribe en las
+    celdas ``counters[2*proc_id]`` (exitosas) y ``counters[2*proc_id + 1]``
+    (errores), de las que este proceso es el único escritor: el camino
+    caliente no toma ningún lock entre procesos.
+
+    Al terminar publica en ``hist_queue`` el histograma de latencias del
+    proceso serializado (``LatencyHistogram.to_bytes``).
     """
     
+    # Replay: cada proceso precalcula su porción de la captura antes del inicio
+    replay = None
+    if replay_path:
+        from sensors.capture import load_bodies
+        bodies = load_bodies(replay_path, "dashboard")[proc_id::num_processes]
+        replay = itertools.cycle(bodies) if bodies else None
+    json_headers = {"Content-Type": "application/json"}
+    
     # Esperar señal de inicio para coordinar ataque simultáneo
     start_event.wait()
     
@@ -76,37 +109,46 @@ def worker_process(proc_id, target_url, limit_requests, num_threads, shared_coun
     adapter = requests.adapters.HTTPAdapter(pool_connections=num_threads, pool_maxsize=num_threads)
     session.mount('http://', adapter)
     
-    local_count = 0
-    local_errors = 0
+    # [exitosas, errores] por hilo: un solo escritor por lista
+    thread_counts = []
+    histograms = []
+    
+    # Open loop: cada proceso cubre rate/num_processes; next() sobre count es atómico bajo el GIL
+    schedule = OpenLoopSchedule(rate / num_processes) if rate else None
+    slots = itertools.count()
     
     def thread_task():
-        nonlocal local_count, local_errors
+        local = [0, 0]
+        thread_counts.append(local)
+        hist = LatencyHistogram()
+        histograms.append(hist)
         while True:
-            # Verificación "suelta" para rendimiento (no lockear en cada iteración)
-            if shared_counter.value >= limit_requests:
+            slot = next(slots)
+            if slot >= quota:
                 break
                 
+            intended = schedule.wait(slot) if schedule else time.perf_counter()
             try:
-                # Generar payload rápido
-                payload = generate_fast_payload(f"PROC_{proc_id}_THREAD_{threading.get_ident()}")
-                
-                resp = session.post(target_url, json=payload, timeout=5)
+                if replay is not None:
+                    resp = session.post(target_url, data=next(replay), headers=json_headers, timeout=5)
+                else:
+                    # Generar payload rápido
+                    payload = generate_fast_payload(f"PROC_{proc_id}_THREAD_{threading.get_ident()}")
+                    resp = session.post(target_url, json=payload, timeout=5)
                 
                 if resp.status_code == 200:
-                    local_count += 1
-                    # Actualizar contador compartido en lotes para evitar contención de lock
-                    if local_count % 100 == 0:
-                        with shared_counter.get_lock():
-                            shared_counter.value += 100
+                    local[0] += 1
                 else:
-                    local_errors += 1
-                    with error_counter.get_lock():
-                        error_counter.value += 1
+                    local[1] += 1
                         
             except Exception:
-                local_errors += 1
-                with error_counter.get_lock():
-                    error_counter.value += 1
+                local[1] += 1
+            hist.record(time.perf_counter() - intended)
+    
+    def publish():
+        counts = list(thread_counts)
+        counters[2 * proc_id] = sum(c[0] for c in counts)
+        counters[2 * proc_id + 1] = sum(c[1] for c in counts)
     
     threads = []
     for _ in range(num_threads):
@@ -114,24 +156,35 @@ def worker_process(proc_id, target_url, limit_requests, num_threads, shared_coun
         t.daemon = True
         t.start()
         threads.append(t)
+    
+    while any(t.is_alive() for t in threads):
+        publish()
+        time.sleep(PUBLISH_INTERVAL)
         
     for t in threads:
         t.join()
+    publish()
 
-    # Actualizar remanente
-    rem = local_count % 100
-    if rem > 0:
-        with shared_counter.get_lock():
-            shared_counter.value += rem
+    if hist_queue is not None:
+        merged = LatencyHistogram()
+        for hist in histograms:
+            merged.merge(hist)
+        hist_queue.put(merged.to_bytes())
 
 
-def monitor(shared_counter, error_counter, total_target, start_time):
+def totals(counters):
+    """(exitosas, errores) sumando las celdas de todos los procesos."""
+    snapshot = counters[:]
+    return sum(snapshot[0::2]), sum(snapshot[1::2])
+
+
+def monitor(counters, total_target, start_time, processes):
     """Hilo de monitoreo en el proceso principal."""
     try:
         while True:
             time.sleep(1)
-            current = shared_counter.value
-            errors = error_counter.value
+            success, errors = totals(counters)
+            current = success + errors
             elapsed = time.time() - start_time
             
             if elapsed == 0: continue
@@ -149,7 +202,7 @@ def monitor(shared_counter, error_counter, total_target, start_time):
                   f"Errors: {errors:,} | "
                   f"RPS: {rps:,.0f}", end="", flush=True)
             
-            if current >= total_target:
+            if current >= total_target or not any(p.is_alive() for p in processes):
                 break
     except KeyboardInterrupt:
         pass
@@ -160,6 +213,9 @@ def main():
     parser.add_argument("--processes", type=int, default=multiprocessing.cpu_count(), help="Número de procesos CPU")
     parser.add_argument("--threads", type=int, default=50, help="Hilos por proceso")
     parser.add_argument("--url", default="http://localhost:8001/api/dashboard/process", help="Endpoint destino")
+    parser.add_argument("--replay", help="Captura .fmcap a reproducir (sensors.capture)")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="Open loop: requests por segundo planificadas en total (omitir = closed loop)")
     
     args = parser.parse_args()
     
@@ -173,25 +229,26 @@ def main():
 ╚══════════════════════════════════════════════════════════════════════════════╝
     """)
     
-    # Objetos compartidos
-    manager = multiprocessing.Manager()
-    shared_counter = multiprocessing.Value('i', 0)
-    error_counter = multiprocessing.Value('i', 0)
+    # Objetos compartidos: una celda [exitosas, errores] por proceso, sin lock
+    # (cada proceso es el único escritor de sus celdas)
+    counters = multiprocessing.Array('q', 2 * args.processes, lock=False)
     start_event = multiprocessing.Event()
+    hist_queue = multiprocessing.Queue()
     
     # Crear procesos
     processes = []
     
-    # Dividimos el objetivo "virtualmente", pero todos suman al shared_counter
-    # Pasamos limit_requests muy alto al worker para que paren por el contador global logic (o aproximado)
-    # Mejor: que cada worker pare cuando vea el shared_counter lleno.
+    # Cuota exacta por proceso: la suma es --total sin coordinación en caliente
+    quotas = [args.total // args.processes + (1 if i < args.total % args.processes else 0)
+              for i in range(args.processes)]
     
     print("🔥 Preparando ojivas (creando procesos)...")
     
     for i in range(args.processes):
         p = multiprocessing.Process(
             target=worker_process,
-            args=(i, args.url, args.total, args.threads, shared_counter, error_counter, start_event)
+            args=(i, args.url, quotas[i], args.threads, counters, start_event,
+                  args.replay, args.processes, hist_queue, args.rate)
         )
         processes.append(p)
         p.start()
@@ -201,7 +258,12 @@ def main():
     start_event.set() # Iniciar todos a la vez
     
     # Monitoreo
-    monitor(shared_counter, error_counter, args.total, start_time)
+    monitor(counters, args.total, start_time, processes)
+    
+    # Combinar histogramas (antes del join: la cola debe vaciarse para que terminen)
+    latency = LatencyHistogram()
+    for _ in processes:
+        latency.merge(LatencyHistogram.from_bytes(hist_queue.get()))
     
     # Esperar terminación
     for p in processes:
@@ -209,7 +271,8 @@ def main():
         
     end_time = time.time()
     duration = end_time - start_time
-    total_reqs = shared_counter.value
+    success, errors = totals(counters)
+    total_reqs = success + errors
     actual_rps = total_reqs / duration if duration > 0 else 0
     
     print("\n\n" + "═" * 70)
@@ -217,8 +280,11 @@ def main():
     print("═" * 70)
     print(f"⏱️  Duración Total:      {duration:.2f} segundos")
     print(f"📨 Peticiones Totales:  {total_reqs:,}")
-    print(f"❌ Errores:             {error_counter.value:,} ({(error_counter.value/total_reqs*100):.2f}%)")
+    print(f"✅ Exitosas:            {success:,}")
+    print(f"❌ Errores:             {errors:,} ({(errors / total_reqs * 100 if total_reqs else 0):.2f}%)")
     print(f"⚡ Throughput (RPS):    {actual_rps:,.2f} req/s")
+    print("─" * 70)
+    print(format_latency_report(latency, open_loop=bool(args.rate)))
     print("═" * 70)
     
     # Evaluación para Kubernetes
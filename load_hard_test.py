@@ -13,6 +13,7 @@ Usage:
     python load_hard_test.py --rps 500                # 500 requests por segundo
     python load_hard_test.py --rps 1000 --duration 30 # 1000 req/s por 30 segundos
     python load_hard_test.py --chaos                  # Modo caos: bursts aleatorios
+    python load_hard_test.py --replay fleet.fmcap     # Tráfico grabado (reproducible)
 """
 
 import sys
@@ -20,8 +21,8 @@ import os
 import time
 import threading
 import argparse
+import itertools
 import random
-import statistics
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
@@ -33,6 +34,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from intelligence_core import IntelligenceService
 from sensors.datapulse_sensor import DataPulseAgent, SensorConfig
+from benchmarks.histogram import LatencyHistogram, OpenLoopSchedule, format_latency_report
 
 
 @dataclass
@@ -43,15 +45,23 @@ class RequestMetrics:
     success: bool
     status_code: int
     error: str = ""
+    service_ms: float = 0.0
 
 
 @dataclass
 class LoadTestResults:
-    """Resultados agregados del test de carga."""
+    """
+    Resultados agregados del test de carga.
+
+    ``latency`` mide desde el inicio planificado de cada request (incluye
+    la espera en cola cuando los workers no dan abasto); ``service`` solo
+    desde el envío real.
+    """
     total_requests: int = 0
     successful: int = 0
     failed: int = 0
-    latencies: List[float] = field(default_factory=list)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    service: LatencyHistogram = field(default_factory=LatencyHistogram)
     errors: Dict[str, int] = field(default_factory=dict)
     start_time: float = 0
     end_time: float = 0
@@ -62,35 +72,46 @@ class LoadTestResults:
     
     @property
     def avg_latency(self) -> float:
-        return statistics.mean(self.latencies) if self.latencies else 0
+        return self.latency.mean
     
     @property
     def p50_latency(self) -> float:
-        return statistics.median(self.latencies) if self.latencies else 0
+        return self.latency.percentile(50)
+    
+    @property
+    def p90_latency(self) -> float:
+        return self.latency.percentile(90)
     
     @property
     def p95_latency(self) -> float:
-        if not self.latencies:
-            return 0
-        sorted_lat = sorted(self.latencies)
-        idx = int(len(sorted_lat) * 0.95)
-        return sorted_lat[idx]
+        return self.latency.percentile(95)
     
     @property
     def p99_latency(self) -> float:
-        if not self.latencies:
-            return 0
-        sorted_lat = sorted(self.latencies)
-        idx = int(len(sorted_lat) * 0.99)
-        return sorted_lat[min(idx, len(sorted_lat) - 1)]
+        return self.latency.percentile(99)
+    
+    @property
+    def p999_latency(self) -> float:
+        return self.latency.percentile(99.9)
     
     @property
     def max_latency(self) -> float:
-        return max(self.latencies) if self.latencies else 0
+        return self.latency.max_us / 1000
     
     @property
     def min_latency(self) -> float:
-        return min(self.latencies) if self.latencies else 0
+        return self.latency.min_us / 1000
+    
+    def merge(self, other: "LoadTestResults") -> "LoadTestResults":
+        """Suma los resultados de otro worker a este (retorna self)."""
+        self.total_requests += other.total_requests
+        self.successful += other.successful
+        self.failed += other.failed
+        self.latency.merge(other.latency)
+        self.service.merge(other.service)
+        for error, count in other.errors.items():
+            self.errors[error] = self.errors.get(error, 0) + count
+        return self
     
     @property
     def duration(self) -> float:
@@ -111,7 +132,8 @@ class HardLoadTester:
     def __init__(self, base_url: str = "http://localhost:8001",
                  target_rps: int = 100, 
                  num_workers: int = 50,
-                 chaos_mode: bool = False):
+                 chaos_mode: bool = False,
+                 replay: Optional[str] = None):
         self.base_url = base_url
         self.target_rps = target_rps
         self.num_workers = min(num_workers, target_rps)
@@ -121,11 +143,19 @@ class HardLoadTester:
         self.intelligence = IntelligenceService()
         self.intelligence.configure_threshold("temperature", max_temp=60, warning_temp=80, critical_temp=90)
         
-        # Resultados
+        # Resultados: cada worker escribe solo en los suyos (sin lock en el camino
+        # caliente); se combinan en `results` al terminar
         self.results = LoadTestResults()
-        self._lock = threading.Lock()
+        self._worker_results: List[LoadTestResults] = []
         self.running = False
         
+        # Replay de una captura: payloads precalculados, el generador no compite por CPU
+        self.replay_path = replay
+        self._replay = None
+        if replay:
+            from sensors.capture import load_bodies
+            self._replay = itertools.cycle(load_bodies(replay, "dashboard"))
+        
         # Configuraciones de sensores variados
         self.sensor_configs = [
             {"id": f"STRESS_{i:03d}", "location": f"Zona-{chr(65 + i % 26)}/Equipo-{i}", 
@@ -157,71 +187,90 @@ class HardLoadTester:
             "processed_at": datetime.now().isoformat()
         }
     
-    def _send_request(self) -> RequestMetrics:
-        """Envía una request y mide el tiempo."""
+    def _send_request(self, intended: float) -> RequestMetrics:
+        """
+        Envía una request y mide el tiempo.
+
+        Args:
+            intended: Inicio planificado (perf_counter) asignado por el generador
+        """
         start = time.perf_counter()
         try:
-            payload = self._generate_payload()
-            response = requests.post(
-                f"{self.base_url}/api/dashboard/process",
-                json=payload,
-                timeout=10
-            )
-            latency = (time.perf_counter() - start) * 1000
+            if self._replay is not None:
+                response = requests.post(
+                    f"{self.base_url}/api/dashboard/process",
+                    data=next(self._replay),
+                    headers={"Content-Type": "application/json"},
+                    timeout=10
+                )
+            else:
+                payload = self._generate_payload()
+                response = requests.post(
+                    f"{self.base_url}/api/dashboard/process",
+                    json=payload,
+                    timeout=10
+                )
+            end = time.perf_counter()
             
             return RequestMetrics(
                 timestamp=time.time(),
-                latency_ms=latency,
+                latency_ms=(end - intended) * 1000,
                 success=response.status_code == 200,
-                status_code=response.status_code
+                status_code=response.status_code,
+                service_ms=(end - start) * 1000
             )
         except requests.Timeout:
             return RequestMetrics(
                 timestamp=time.time(),
-                latency_ms=(time.perf_counter() - start) * 1000,
+                latency_ms=(time.perf_counter() - intended) * 1000,
                 success=False,
                 status_code=0,
-                error="TIMEOUT"
+                error="TIMEOUT",
+                service_ms=(time.perf_counter() - start) * 1000
             )
         except requests.ConnectionError as e:
             return RequestMetrics(
                 timestamp=time.time(),
-                latency_ms=(time.perf_counter() - start) * 1000,
+                latency_ms=(time.perf_counter() - intended) * 1000,
                 success=False,
                 status_code=0,
-                error=f"CONNECTION_ERROR: {str(e)[:50]}"
+                error=f"CONNECTION_ERROR: {str(e)[:50]}",
+                service_ms=(time.perf_counter() - start) * 1000
             )
         except Exception as e:
             return RequestMetrics(
                 timestamp=time.time(),
-                latency_ms=(time.perf_counter() - start) * 1000,
+                latency_ms=(time.perf_counter() - intended) * 1000,
                 success=False,
                 status_code=0,
-                error=str(e)[:50]
+                error=str(e)[:50],
+                service_ms=(time.perf_counter() - start) * 1000
             )
     
     def _worker(self, request_queue: Queue):
         """Worker que procesa requests de la cola."""
+        local = LoadTestResults()
+        self._worker_results.append(local)
         while self.running:
             try:
                 # Obtener trabajo de la cola (con timeout para poder verificar running)
                 try:
-                    _ = request_queue.get(timeout=0.1)
+                    intended = request_queue.get(timeout=0.1)
                 except:
                     continue
                 
-                metrics = self._send_request()
+                metrics = self._send_request(intended)
                 
-                with self._lock:
-                    self.results.total_requests += 1
-                    self.results.latencies.append(metrics.latency_ms)
-                    
-                    if metrics.success:
-                        self.results.successful += 1
-                    else:
-                        self.results.failed += 1
-                        error_key = metrics.error or f"HTTP_{metrics.status_code}"
-                        self.results.errors[error_key] = self.results.errors.get(error_key, 0) + 1
+                local.total_requests += 1
+                local.latency.record_us(int(metrics.latency_ms * 1000))
+                local.service.record_us(int(metrics.service_ms * 1000))
+                
+                if metrics.success:
+                    local.successful += 1
+                else:
+                    local.failed += 1
+                    error_key = metrics.error or f"HTTP_{metrics.status_code}"
+                    local.errors[error_key] = local.errors.get(error_key, 0) + 1
                 
                 request_queue.task_done()
             except Exception:
@@ -232,22 +281,29 @@ class HardLoadTester:
         while self.running:
             # Burst aleatorio de 50-200 requests
             burst_size = random.randint(50, 200)
+            burst_start = time.perf_counter()
             for _ in range(burst_size):
                 if not self.running:
                     break
-                request_queue.put(1)
+                request_queue.put(burst_start)
             
             # Pausa aleatoria
             pause = random.uniform(0.1, 0.5)
             time.sleep(pause)
     
     def _rate_limiter(self, request_queue: Queue):
-        """Mantiene el rate de requests constante."""
-        interval = 1.0 / self.target_rps
+        """
+        Open loop: encola el inicio planificado de cada request a tasa fija.
+
+        Los slots se calculan desde el inicio (no se acumula deriva del
+        sleep) y no esperan a que terminen las requests anteriores.
+        """
+        schedule = OpenLoopSchedule(self.target_rps)
         
-        while self.running:
-            request_queue.put(1)
-            time.sleep(interval)
+        for slot in itertools.count():
+            if not self.running:
+                break
+            request_queue.put(schedule.wait(slot))
     
     def _print_live_stats(self):
         """Imprime estadísticas en tiempo real."""
@@ -257,12 +313,16 @@ class HardLoadTester:
             if not self.running:
                 break
             
-            with self._lock:
-                current = self.results.total_requests
-                rps = current - last_count
-                success_rate = self.results.success_rate
-                avg_lat = self.results.avg_latency
-                failed = self.results.failed
+            # Lectura sin lock de los contadores de cada worker (puede ir una
+            # request atrasada, suficiente para el indicador en vivo)
+            parts = list(self._worker_results)
+            current = sum(p.total_requests for p in parts)
+            rps = current - last_count
+            successful = sum(p.successful for p in parts)
+            success_rate = successful / current * 100 if current else 0
+            samples = sum(p.latency.count for p in parts)
+            avg_lat = sum(p.latency.total_us for p in parts) / samples / 1000 if samples else 0
+            failed = sum(p.failed for p in parts)
             
             last_count = current
             
@@ -292,6 +352,8 @@ class HardLoadTester:
         print(f"👷 Workers: {self.num_workers}")
         print(f"⏳ Duración: {duration}s")
         print(f"🌀 Modo Caos: {'Activado' if self.chaos_mode else 'Desactivado'}")
+        if self.replay_path:
+            print(f"🎞️ Replay: {self.replay_path}")
         print("─" * 70)
         
         # Verificar conexión
@@ -339,8 +401,11 @@ class HardLoadTester:
         self.running = False
         self.results.end_time = time.time()
         
-        # Esperar a que terminen las requests pendientes
-        time.sleep(1)
+        # Esperar a que terminen las requests en vuelo (timeout de request: 10s)
+        for t in workers:
+            t.join(timeout=11)
+        for part in self._worker_results:
+            self.results.merge(part)
         
         print("\n\n")
         self._print_report()
@@ -386,13 +451,12 @@ class HardLoadTester:
    ├─ Duración: {r.duration:.1f}s
    └─ RPS Real: {r.actual_rps:.1f} req/s
 
-⏱️ LATENCIAS (ms)
-   ├─ Mínima: {r.min_latency:.1f}ms
-   ├─ Promedio: {r.avg_latency:.1f}ms
-   ├─ P50 (mediana): {r.p50_latency:.1f}ms
-   ├─ P95: {r.p95_latency:.1f}ms
-   ├─ P99: {r.p99_latency:.1f}ms
-   └─ Máxima: {r.max_latency:.1f}ms
+{format_latency_report(r.latency, open_loop=True)}
+
+🛰️ TIEMPO DE SERVICIO (ms, desde el envío real)
+   ├─ P50: {r.service.percentile(50):.2f}
+   ├─ P99: {r.service.percentile(99):.2f}
+   └─ Espera en cola P99: {max(0.0, r.p99_latency - r.service.percentile(99)):.2f}
 """)
         
         if r.errors:
@@ -445,6 +509,8 @@ Ejemplos:
                         help="Modo caos: bursts aleatorios en lugar de rate constante")
     parser.add_argument("--url", "-u", default="http://localhost:8001",
                         help="URL base del backend")
+    parser.add_argument("--replay", default=None,
+                        help="Captura .fmcap a reproducir en lugar de payloads aleatorios")
     
     args = parser.parse_args()
     
@@ -452,7 +518,8 @@ Ejemplos:
         base_url=args.url,
         target_rps=args.rps,
         num_workers=args.workers,
-        chaos_mode=args.chaos
+        chaos_mode=args.chaos,
+        replay=args.replay
     )
     
     tester.run(duration=args.duration)
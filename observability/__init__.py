@@ -0,0 +1,26 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                    🔭 Observability - Flow-Monitor                           ║
+║                  Métricas del proceso para /metrics                          ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+from .metrics import (
+    CONTENT_TYPE,
+    LATENCY_BUCKETS,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+)
+
+__all__ = [
+    "CONTENT_TYPE",
+    "LATENCY_BUCKETS",
+    "REGISTRY",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+]
@@ -0,0 +1,64 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                    🛠️ Admin Router - Flow-Monitor Observability               ║
+║              Perfilado en vivo y resumen de spans para ambas APIs            ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Endpoints montados en Capa 1 y Capa 3 con ``app.include_router(router)``:
+
+    GET /api/admin/profile?seconds=10&interval_ms=5   → texto collapsed (flamegraph)
+    GET /api/admin/spans                              → tiempos por etapa
+
+Ambos exigen el header ``X-Admin-Token`` con el valor de
+``FLOW_MONITOR_ADMIN_TOKEN``; sin esa variable quedan deshabilitados (403).
+"""
+
+import asyncio
+import hmac
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from . import profiler, spans
+
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"])
+
+
+def _check_token(token: Optional[str]) -> None:
+    expected = os.getenv("FLOW_MONITOR_ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                            detail="Admin endpoints disabled: set FLOW_MONITOR_ADMIN_TOKEN")
+    if token is None or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def sampling_profile(
+    seconds: float = Query(10.0, gt=0, le=profiler.MAX_SECONDS, description="Duración del muestreo"),
+    interval_ms: float = Query(5.0, ge=1.0, le=1000.0, description="Intervalo entre muestras"),
+    include_idle: bool = Query(False, description="Incluir hilos bloqueados esperando trabajo"),
+    x_admin_token: Optional[str] = Header(None),
+):
+    """
+    🔥 Perfila el proceso en vivo durante ``seconds`` y retorna stacks collapsed.
+
+    El muestreo corre en un hilo aparte: el event loop sigue atendiendo
+    requests (y aparece en el perfil). Guardar la salida y abrirla con
+    speedscope o ``flamegraph.pl``.
+    """
+    _check_token(x_admin_token)
+    folded = await asyncio.to_thread(profiler.profile, seconds, interval_ms / 1000, include_idle)
+    if folded is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Profile already running")
+    return PlainTextResponse(folded)
+
+
+@router.get("/spans")
+async def stage_spans(x_admin_token: Optional[str] = Header(None)):
+    """⏱️ Conteo y tiempo promedio por etapa (requiere FLOW_MONITOR_SPANS=1)."""
+    _check_token(x_admin_token)
+    return spans.summary()
@@ -0,0 +1,196 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                  📝 Logging - Flow-Monitor Observability                     ║
+║        Cola + listener en segundo plano, muestreo por lectura y JSON         ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+El camino caliente nunca escribe a stdout:
+
+- ``configure_logging()`` instala un ``QueueHandler`` en el logger raíz; un
+  ``QueueListener`` (hilo propio) formatea y escribe. Si la cola se llena
+  el registro se descarta y se cuenta (``dropped``), nunca se bloquea.
+- El mensaje se formatea en el listener: usar ``logger.info("%s", obj)`` y
+  no f-strings, así ``obj.__str__`` solo corre si el registro se emite.
+- ``SampledLogger``: logs por lectura 1 de cada N (``FLOW_MONITOR_LOG_SAMPLE``,
+  0 = ninguno); las anomalías se registran siempre.
+- ``FLOW_MONITOR_LOG_FORMAT=json`` emite una línea JSON por registro.
+
+Variables de entorno:
+    FLOW_MONITOR_LOG_LEVEL    INFO (default), WARNING, ...
+    FLOW_MONITOR_LOG_FORMAT   text (default) | json
+    FLOW_MONITOR_LOG_SAMPLE   100 (default): 1 de cada N lecturas
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import IO, Any, Dict, List, Optional
+
+from timebase import format_seconds
+
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(message)s"
+DEFAULT_SAMPLE_EVERY = 100
+QUEUE_SIZE = 10_000
+
+# Atributos estándar de LogRecord: el resto (extra=...) va como campos JSON
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro, con los campos de ``extra`` incluidos."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": format_seconds(record.created),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que encola el LogRecord sin formatear y nunca bloquea.
+
+    ``QueueHandler.prepare`` de la stdlib formatea en el hilo que loguea;
+    aquí se deja para el listener.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class SampledLogger:
+    """
+    📉 Logger por lectura con muestreo.
+
+    Ejemplo:
+        reading_log = sampled_logger("ingestion.api")
+        reading_log.reading("📥 Ingested: %s", normalized)        # 1 de cada N
+        reading_log.anomaly("🔥 ANOMALY: %s = %s", sensor, value)  # siempre
+    """
+
+    def __init__(self, logger: logging.Logger, every: int = DEFAULT_SAMPLE_EVERY):
+        self.logger = logger
+        self.every = every
+        self._count = 0
+
+    def reading(self, msg: str, *args: Any) -> None:
+        """INFO para 1 de cada ``every`` llamadas (0 = nunca)."""
+        if not self.every:
+            return
+        self._count += 1
+        if self._count >= self.every:
+            self._count = 0
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(msg, *args)
+
+    def anomaly(self, msg: str, *args: Any) -> None:
+        """WARNING sin muestreo."""
+        self.logger.warning(msg, *args)
+
+
+_sampled: List[SampledLogger] = []
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[_LazyQueueHandler] = None
+_installed: List[logging.Handler] = []
+
+
+def _sample_every_from_env() -> int:
+    try:
+        return max(0, int(os.getenv("FLOW_MONITOR_LOG_SAMPLE", str(DEFAULT_SAMPLE_EVERY))))
+    except ValueError:
+        return DEFAULT_SAMPLE_EVERY
+
+
+def sampled_logger(name: str) -> SampledLogger:
+    """SampledLogger para ``name``; ``configure_logging(sample_every=...)`` lo ajusta."""
+    sampled = SampledLogger(logging.getLogger(name), _sample_every_from_env())
+    _sampled.append(sampled)
+    return sampled
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    fmt: Optional[str] = None,
+    sample_every: Optional[int] = None,
+    stream: Optional[IO[str]] = None,
+    use_queue: bool = True,
+) -> None:
+    """
+    Configura el logging del proceso (reemplaza la configuración previa).
+
+    Args:
+        level: Nivel del logger raíz (default FLOW_MONITOR_LOG_LEVEL o INFO)
+        fmt: "text" o "json" (default FLOW_MONITOR_LOG_FORMAT o text)
+        sample_every: 1 de cada N logs por lectura (default FLOW_MONITOR_LOG_SAMPLE)
+        stream: Destino (default stderr)
+        use_queue: False escribe en el hilo que loguea (solo para comparar)
+    """
+    shutdown_logging()
+
+    level = (level or os.getenv("FLOW_MONITOR_LOG_LEVEL", "INFO")).upper()
+    fmt = (fmt or os.getenv("FLOW_MONITOR_LOG_FORMAT", "text")).lower()
+    every = _sample_every_from_env() if sample_every is None else max(0, sample_every)
+    for sampled in _sampled:
+        sampled.every = every
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+
+    global _listener, _handler
+    if use_queue:
+        _handler = _LazyQueueHandler(queue.Queue(maxsize=QUEUE_SIZE))
+        _listener = logging.handlers.QueueListener(_handler.queue, output, respect_handler_level=True)
+        _listener.start()
+        installed = _handler
+    else:
+        installed = output
+    root.addHandler(installed)
+    _installed.append(installed)
+
+
+def shutdown_logging() -> None:
+    """Vacía la cola, detiene el listener y quita los handlers instalados aquí."""
+    global _listener, _handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    root = logging.getLogger()
+    while _installed:
+        handler = _installed.pop()
+        root.removeHandler(handler)
+        handler.flush()
+    _handler = None
+
+
+def dropped_records() -> int:
+    """Registros descartados por cola llena desde el último configure_logging()."""
+    return _handler.dropped if _handler is not None else 0
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,159 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                🔥 Sampling Profiler - Flow-Monitor Observability             ║
+║          Muestreo estadístico de stacks en vivo → formato collapsed          ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Un hilo toma ``sys._current_frames()`` cada ``interval`` segundos durante N
+segundos y cuenta stacks idénticos. No instrumenta código ni activa
+``sys.setprofile``: el proceso perfilado solo paga el muestreo (~decenas
+de µs cada 5 ms).
+
+La salida es el formato "collapsed" de Brendan Gregg (una línea por stack,
+frames separados por ``;`` y el conteo al final), entrada directa de
+flamegraph.pl, speedscope o inferno:
+
+    MainThread;uvicorn/server.py:serve;...;ingestion/api.py:ingest_sensor_data 42
+
+Usage:
+    python -m observability.profiler --seconds 5 --url http://localhost:8000 > ingest.folded
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+
+MAX_SECONDS = 60.0
+MIN_INTERVAL = 0.001
+
+# Frames hoja de hilos bloqueados esperando trabajo (no consumen CPU)
+IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("socket.py", "accept"),
+    ("thread.py", "_worker"),
+}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    path = code.co_filename
+    parent = os.path.basename(os.path.dirname(path))
+    return f"{parent}/{os.path.basename(path)}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """
+    🔥 Profiler por muestreo de todos los hilos del proceso.
+
+    Ejemplo:
+        profiler = SamplingProfiler(interval=0.005)
+        stacks = profiler.run(seconds=10)
+        print(profiler.collapsed(stacks))
+    """
+
+    def __init__(self, interval: float = 0.005, include_idle: bool = False, max_depth: int = 128):
+        self.interval = max(MIN_INTERVAL, interval)
+        self.include_idle = include_idle
+        self.max_depth = max_depth
+        self.samples = 0
+
+    def _is_idle(self, frame) -> bool:
+        code = frame.f_code
+        return (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES
+
+    def _stack(self, frame, thread_name: str) -> Tuple[str, ...]:
+        labels = []
+        while frame is not None and len(labels) < self.max_depth:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        labels.append(thread_name)
+        labels.reverse()
+        return tuple(labels)
+
+    def _sample(self, stacks: Counter) -> None:
+        own = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own or (not self.include_idle and self._is_idle(frame)):
+                continue
+            stacks[self._stack(frame, names.get(ident, f"thread-{ident}"))] += 1
+        self.samples += 1
+
+    def run(self, seconds: float) -> Dict[Tuple[str, ...], int]:
+        """Muestrea durante ``seconds`` (bloquea al llamador) y retorna stack → conteo."""
+        seconds = min(max(seconds, self.interval), MAX_SECONDS)
+        stacks: Counter = Counter()
+        deadline = time.perf_counter() + seconds
+        next_tick = time.perf_counter()
+        while True:
+            self._sample(stacks)
+            next_tick += self.interval
+            delay = next_tick - time.perf_counter()
+            if next_tick >= deadline:
+                break
+            if delay > 0:
+                time.sleep(delay)
+        return dict(stacks)
+
+    @staticmethod
+    def collapsed(stacks: Dict[Tuple[str, ...], int]) -> str:
+        """Texto collapsed (frames con ``;``), ordenado por conteo descendente."""
+        lines = [
+            f"{';'.join(stack)} {count}"
+            for stack, count in sorted(stacks.items(), key=lambda item: -item[1])
+        ]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+
+# Un solo perfilado a la vez por proceso
+_profile_lock = threading.Lock()
+
+
+def profile(seconds: float, interval: float = 0.005, include_idle: bool = False) -> Optional[str]:
+    """
+    Perfila el proceso actual y retorna el texto collapsed.
+
+    Returns:
+        None si ya hay un perfilado en curso
+    """
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    try:
+        profiler = SamplingProfiler(interval, include_idle)
+        return profiler.collapsed(profiler.run(seconds))
+    finally:
+        _profile_lock.release()
+
+
+def main():
+    import requests
+
+    parser = argparse.ArgumentParser(description="Descarga un perfil collapsed de una API en vivo")
+    parser.add_argument("--url", default="http://localhost:8000", help="API base (Capa 1 o Capa 3)")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--interval-ms", type=float, default=5.0)
+    parser.add_argument("--include-idle", action="store_true")
+    parser.add_argument("--token", default=os.getenv("FLOW_MONITOR_ADMIN_TOKEN"))
+    args = parser.parse_args()
+
+    response = requests.get(
+        f"{args.url.rstrip('/')}/api/admin/profile",
+        params={"seconds": args.seconds, "interval_ms": args.interval_ms,
+                "include_idle": args.include_idle},
+        headers={"X-Admin-Token": args.token} if args.token else {},
+        timeout=args.seconds + 30,
+    )
+    response.raise_for_status()
+    sys.stdout.write(response.text)
+
+
+if __name__ == "__main__":
+    main()
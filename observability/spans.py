@@ -0,0 +1,77 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                  ⏱️ Stage Spans - Flow-Monitor Observability                 ║
+║         Tiempo por etapa opcional, costo cero cuando está desactivado        ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+``@stage("rules")`` envuelve una función con un span que mide su duración y
+la registra en ``flowmonitor_span_seconds{stage=...}`` (ver /metrics).
+
+Se activa con ``FLOW_MONITOR_SPANS=1`` y la decisión se toma al importar:
+desactivado, el decorador retorna la función original, así que el camino
+caliente no paga ni un ``if``. Etapas instrumentadas:
+
+    normalize         HttpJsonPlugin.normalize_data
+    normalize_batch   HttpJsonPlugin.normalize_batch (un span por lote)
+    rules             RulesEngine.evaluate_with_threshold
+    predict           PredictiveModel.predict
+    observe           DataObserver (buffer, persistencia, dispatch y suscriptores)
+    dispatch          NotificationDispatcher (canal por nivel de riesgo)
+"""
+
+import functools
+import os
+from time import perf_counter
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from . import metrics
+
+
+ENABLED = os.getenv("FLOW_MONITOR_SPANS", "0").lower() in ("1", "true", "yes", "on")
+
+SPAN_SECONDS = metrics.histogram(
+    "flowmonitor_span_seconds", "Duración por etapa (FLOW_MONITOR_SPANS=1)", ["stage"]
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def stage(name: str, enabled: Optional[bool] = None) -> Callable[[F], F]:
+    """
+    Decorador de span para una etapa del pipeline.
+
+    Args:
+        name: Etiqueta ``stage`` del span
+        enabled: Forzar activación (por defecto ``FLOW_MONITOR_SPANS``)
+    """
+    if not (ENABLED if enabled is None else enabled):
+        return lambda fn: fn
+
+    histogram = SPAN_SECONDS.labels(name)
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.observe(perf_counter() - t0)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def summary() -> Dict[str, Any]:
+    """Conteo, tiempo total y promedio (µs) por etapa registrada."""
+    stages = {}
+    for (name,), child in sorted(SPAN_SECONDS._children.items()):
+        count = child.count
+        total = child.sum
+        stages[name] = {
+            "count": count,
+            "total_s": total,
+            "avg_us": total / count * 1e6 if count else 0.0,
+        }
+    return {"enabled": ENABLED, "stages": stages}
@@ -0,0 +1,17 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                    ⚡ Pipeline Runners - Flow-Monitor                        ║
+║                  Ejecución en proceso de las 3 capas                         ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Runners que encadenan Capa 1 → Capa 2 → Capa 3 en un solo proceso.
+"""
+
+from .async_runner import AsyncPipelineRunner, StageConfig, StageStats, STAGES
+
+__all__ = [
+    "AsyncPipelineRunner",
+    "StageConfig",
+    "StageStats",
+    "STAGES",
+]
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║               ⚡ Async Pipeline Runner - Flow-Monitor                        ║
+║        ingest → normalize → evaluate → observe → notify (asyncio)            ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Runner asyncio del pipeline completo en un solo proceso.
+
+- Colas acotadas entre etapas: si una etapa se atrasa, la anterior se
+  bloquea en ``put`` y la presión se propaga hasta la fuente (un async
+  generator deja de ser consumido)
+- Concurrencia configurable por etapa (workers por etapa) y ``offload`` a
+  un thread pool para etapas de I/O (notify)
+- Lotes: la fuente se agrupa en lotes de ``batch_size`` y cada etapa
+  combina lotes pendientes hasta su propio ``batch_size``
+- Estadísticas por etapa: profundidad de cola, espera en cola, tiempo de
+  servicio y latencia extremo a extremo
+
+Usage:
+    python -m pipeline.async_runner --readings 200000
+    python -m pipeline.async_runner --readings 100000 --batch-size 500 --rate 50000
+
+Example:
+    runner = AsyncPipelineRunner()
+    stats = asyncio.run(runner.run(source))
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Union
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingestion.plugins.base import SensorPlugin
+from intelligence_core import IntelligenceService
+from intelligence_core.models import RiskLevel
+from action_layer.data_observer import DataObserver
+from action_layer.notification_dispatcher import NotificationDispatcher
+
+
+STAGES = ("ingest", "normalize", "evaluate", "observe", "notify")
+
+_ALERT_LEVELS = (RiskLevel.HIGH, RiskLevel.CRITICAL)
+
+
+@dataclass
+class StageConfig:
+    """
+    Configuración de una etapa.
+
+    Attributes:
+        concurrency: Workers de la etapa
+        batch_size: Máximo de lecturas procesadas por llamada
+        queue_size: Capacidad (en lotes) de la cola de entrada de la etapa
+        offload: Ejecutar el lote en el thread pool (etapas de I/O)
+    """
+    concurrency: int = 1
+    batch_size: int = 256
+    queue_size: int = 64
+    offload: bool = False
+
+
+@dataclass
+class StageStats:
+    """Estadísticas acumuladas de una etapa."""
+    processed: int = 0
+    errors: int = 0
+    batches: int = 0
+    wait_total: float = 0.0
+    service_total: float = 0.0
+    service_max: float = 0.0
+    max_depth: int = 0
+
+    def to_dict(self, queue_depth: int = 0) -> Dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "errors": self.errors,
+            "batches": self.batches,
+            "queue_depth": queue_depth,
+            "max_queue_depth": self.max_depth,
+            "avg_wait_ms": self.wait_total / self.batches * 1000 if self.batches else 0.0,
+            "avg_service_us": self.service_total / self.processed * 1e6 if self.processed else 0.0,
+            "max_batch_ms": self.service_max * 1000,
+        }
+
+
+@dataclass
+class _Batch:
+    """Lote en tránsito entre etapas."""
+    items: List[Any]
+    origin: float
+    enqueued: float = field(default_factory=time.perf_counter)
+
+
+async def _aiter(source: Union[Iterable[Any], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+    """Itera indistintamente fuentes síncronas y asíncronas."""
+    if hasattr(source, "__aiter__"):
+        async for item in source:
+            yield item
+    else:
+        for item in source:
+            yield item
+
+
+class AsyncPipelineRunner:
+    """
+    ⚡ Runner asyncio con colas acotadas entre etapas.
+
+    Ejemplo:
+        runner = AsyncPipelineRunner(stages={
+            "ingest": StageConfig(batch_size=500),
+            "notify": StageConfig(concurrency=4, offload=True),
+        })
+        stats = await runner.run(payloads)
+    """
+
+    def __init__(
+        self,
+        plugin: Optional[SensorPlugin] = None,
+        intelligence: Optional[IntelligenceService] = None,
+        observer: Optional[DataObserver] = None,
+        dispatcher: Optional[NotificationDispatcher] = None,
+        stages: Optional[Dict[str, StageConfig]] = None,
+    ):
+        if plugin is None:
+            from ingestion.plugins.http_json_plugin import HttpJsonPlugin
+            plugin = HttpJsonPlugin()
+        self.plugin = plugin
+        self.intelligence = intelligence or IntelligenceService()
+        self.observer = observer or DataObserver()
+        self.dispatcher = dispatcher or self.observer.dispatcher
+
+        self.stages: Dict[str, StageConfig] = {name: StageConfig() for name in STAGES}
+        self.stages["notify"].offload = True
+        for name, cfg in (stages or {}).items():
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'. Must be one of {STAGES}")
+            self.stages[name] = cfg
+
+        self.stats: Dict[str, StageStats] = {name: StageStats() for name in STAGES}
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._e2e_total = 0.0
+        self._e2e_max = 0.0
+        self._e2e_batches = 0
+        self._start = 0.0
+        self._end = 0.0
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Funciones por lote (síncronas, se ejecutan inline o en thread pool)
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def _normalize(self, batch: List[Any]) -> List[Any]:
+        normalized = self.plugin.normalize_batch(batch)
+        self.stats["normalize"].errors += len(normalized.rejected)
+        return normalized.readings
+
+    def _evaluate(self, batch: List[Any]) -> List[Any]:
+        # Lote columnar (reglas y predicción en una pasada); observe recibe EnrichedData
+        return self.intelligence.process_readings(batch).to_enriched()
+
+    def _observe(self, batch: List[Any]) -> List[Any]:
+        """Registra en el observer; solo HIGH/CRITICAL siguen hacia notify."""
+        process_enriched = self.observer.process_enriched
+        alerts = []
+        for enriched in batch:
+            process_enriched(enriched, dispatch=False)
+            if enriched.risk_level in _ALERT_LEVELS:
+                alerts.append(enriched)
+        return alerts
+
+    def _notify(self, batch: List[Any]) -> List[Any]:
+        for enriched in batch:
+            notification = self.dispatcher.dispatch_enriched(enriched)
+            if notification:
+                self.observer.record_alert(notification)
+        return []
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Orquestación
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    async def run(self, source: Union[Iterable[Any], AsyncIterator[Any]]) -> Dict[str, Any]:
+        """
+        Ejecuta el pipeline hasta agotar la fuente.
+
+        Args:
+            source: Iterable o async iterable de payloads crudos (dict)
+
+        Returns:
+            Estadísticas finales (ver get_stats)
+        """
+        for name in STAGES[1:]:
+            self._queues[name] = asyncio.Queue(maxsize=self.stages[name].queue_size)
+
+        handlers: Dict[str, Callable[[List[Any]], List[Any]]] = {
+            "normalize": self._normalize,
+            "evaluate": self._evaluate,
+            "observe": self._observe,
+            "notify": self._notify,
+        }
+
+        self._start = time.perf_counter()
+        tasks = [asyncio.create_task(self._ingest(source))]
+        for i, name in enumerate(STAGES[1:], start=1):
+            next_name = STAGES[i + 1] if i + 1 < len(STAGES) else None
+            tasks.append(asyncio.create_task(self._stage(name, handlers[name], next_name)))
+
+        await asyncio.gather(*tasks)
+        self._end = time.perf_counter()
+        return self.get_stats()
+
+    async def _ingest(self, source: Union[Iterable[Any], AsyncIterator[Any]]) -> None:
+        cfg = self.stages["ingest"]
+        stats = self.stats["ingest"]
+        out_q = self._queues["normalize"]
+        batch: List[Any] = []
+        batch_start = time.perf_counter()
+
+        async def emit(items: List[Any], started: float) -> None:
+            now = time.perf_counter()
+            stats.processed += len(items)
+            stats.batches += 1
+            stats.service_total += now - started
+            # Backpressure: si normalize está saturado, la fuente deja de leerse aquí
+            await out_q.put(_Batch(items, origin=started))
+            stats.max_depth = max(stats.max_depth, out_q.qsize())
+            await asyncio.sleep(0)
+
+        async for raw in _aiter(source):
+            if not batch:
+                batch_start = time.perf_counter()
+            batch.append(raw)
+            if len(batch) >= cfg.batch_size:
+                await emit(batch, batch_start)
+                batch = []
+        if batch:
+            await emit(batch, batch_start)
+
+        for _ in range(self.stages["normalize"].concurrency):
+            await out_q.put(None)
+
+    async def _stage(self, name: str, handler: Callable[[List[Any]], List[Any]],
+                     next_name: Optional[str]) -> None:
+        cfg = self.stages[name]
+        workers = [
+            asyncio.create_task(self._worker(name, handler, next_name))
+            for _ in range(cfg.concurrency)
+        ]
+        await asyncio.gather(*workers)
+        if next_name is not None:
+            for _ in range(self.stages[next_name].concurrency):
+                await self._queues[next_name].put(None)
+
+    async def _worker(self, name: str, handler: Callable[[List[Any]], List[Any]],
+                      next_name: Optional[str]) -> None:
+        cfg = self.stages[name]
+        stats = self.stats[name]
+        in_q = self._queues[name]
+        out_q = self._queues[next_name] if next_name else None
+        loop = asyncio.get_running_loop()
+
+        while True:
+            first = await in_q.get()
+            if first is None:
+                return
+
+            started = time.perf_counter()
+            stats.wait_total += started - first.enqueued
+            items, origin = first.items, first.origin
+
+            # Combinar lotes ya encolados hasta batch_size
+            stop = False
+            while len(items) < cfg.batch_size and not in_q.empty():
+                nxt = in_q.get_nowait()
+                if nxt is None:
+                    stop = True
+                    break
+                items = items + nxt.items
+                origin = min(origin, nxt.origin)
+
+            try:
+                if cfg.offload:
+                    out = await loop.run_in_executor(None, handler, items)
+                else:
+                    out = handler(items)
+            except Exception as e:
+                stats.errors += len(items)
+                print(f"⚠️  Etapa '{name}' falló procesando lote: {e}")
+                out = []
+
+            elapsed = time.perf_counter() - started
+            stats.processed += len(items)
+            stats.batches += 1
+            stats.service_total += elapsed
+            stats.service_max = max(stats.service_max, elapsed)
+
+            if name == "observe":
+                e2e = time.perf_counter() - origin
+                self._e2e_total += e2e
+                self._e2e_max = max(self._e2e_max, e2e)
+                self._e2e_batches += 1
+
+            if out and out_q is not None:
+                await out_q.put(_Batch(out, origin=origin))
+                self.stats[next_name].max_depth = max(
+                    self.stats[next_name].max_depth, out_q.qsize()
+                )
+
+            if stop:
+                return
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Reporte
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estadísticas por etapa y globales (se puede llamar durante la ejecución)."""
+        end = self._end or time.perf_counter()
+        elapsed = end - self._start if self._start else 0.0
+        observed = self.stats["observe"].processed
+        return {
+            "elapsed_seconds": elapsed,
+            "readings_per_second": observed / elapsed if elapsed else 0.0,
+            "e2e_avg_ms": self._e2e_total / self._e2e_batches * 1000 if self._e2e_batches else 0.0,
+            "e2e_max_ms": self._e2e_max * 1000,
+            "stages": {
+                name: self.stats[name].to_dict(
+                    self._queues[name].qsize() if name in self._queues else 0
+                )
+                for name in STAGES
+            },
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def synthetic_source(total: int, sensors: int = 100, rate: float = 0.0) -> AsyncIterator[dict]:
+    """Fuente sintética estilo DataPulse (opcionalmente limitada a ``rate`` lecturas/s)."""
+    from datetime import datetime
+
+    timestamp = datetime.now().isoformat()
+    templates = [
+        {
+            "sensor_id": f"SENSOR_TEMP_{i:03d}",
+            "unit": "Celsius",
+            "location": f"Planta-A/Linea-{i % 10}",
+        }
+        for i in range(sensors)
+    ]
+    start = time.perf_counter()
+    for i in range(total):
+        payload = dict(templates[i % sensors])
+        payload["timestamp"] = timestamp
+        payload["value"] = 20.0 + (i * 7919 % 60)
+        yield payload
+        if rate and i % 100 == 0:
+            ahead = start + i / rate - time.perf_counter()
+            if ahead > 0:
+                await asyncio.sleep(ahead)
+
+
+async def _report_loop(runner: AsyncPipelineRunner, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        stats = runner.get_stats()
+        depths = " ".join(
+            f"{name}={s['queue_depth']}" for name, s in stats["stages"].items() if name != "ingest"
+        )
+        print(f"\r⚡ {stats['stages']['observe']['processed']:,} lecturas | "
+              f"{stats['readings_per_second']:,.0f}/s | colas: {depths}   ", end="", flush=True)
+
+
+async def _main(args: argparse.Namespace) -> Dict[str, Any]:
+    runner = AsyncPipelineRunner(stages={
+        "ingest": StageConfig(batch_size=args.batch_size),
+        "normalize": StageConfig(batch_size=args.batch_size, queue_size=args.queue_size),
+        "evaluate": StageConfig(batch_size=args.batch_size, queue_size=args.queue_size),
+        "observe": StageConfig(batch_size=args.batch_size, queue_size=args.queue_size),
+        "notify": StageConfig(concurrency=args.notify_concurrency, queue_size=args.queue_size,
+                              offload=True),
+    })
+    reporter = asyncio.create_task(_report_loop(runner, 1.0))
+    try:
+        return await runner.run(synthetic_source(args.readings, args.sensors, args.rate))
+    finally:
+        reporter.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="⚡ Pipeline asyncio de extremo a extremo")
+    parser.add_argument("--readings", type=int, default=100000)
+    parser.add_argument("--sensors", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--queue-size", type=int, default=64, help="Capacidad de cola (lotes)")
+    parser.add_argument("--notify-concurrency", type=int, default=2)
+    parser.add_argument("--rate", type=float, default=0.0, help="Lecturas/s de la fuente (0 = máximo)")
+    args = parser.parse_args()
+
+    stats = asyncio.run(_main(args))
+
+    print("\n\n" + "═" * 78)
+    print(f"⚡ {stats['stages']['observe']['processed']:,} lecturas en {stats['elapsed_seconds']:.2f}s "
+          f"→ {stats['readings_per_second']:,.0f} lecturas/s")
+    print(f"   Latencia extremo a extremo: avg {stats['e2e_avg_ms']:.1f} ms | max {stats['e2e_max_ms']:.1f} ms")
+    print("═" * 78)
+    print(f"   {'etapa':<10} {'procesadas':>11} {'errores':>8} {'cola máx':>9} "
+          f"{'espera ms':>10} {'µs/lectura':>11}")
+    for name, s in stats["stages"].items():
+        print(f"   {name:<10} {s['processed']:>11,} {s['errors']:>8,} {s['max_queue_depth']:>9,} "
+              f"{s['avg_wait_ms']:>10.2f} {s['avg_service_us']:>11.2f}")
+    print("═" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                          🚦 Risk - Flow-Monitor                              ║
+║             Tabla nivel de riesgo ↔ código entero compartida                 ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+from .levels import RISK_CODES, RISK_LEVELS
+
+__all__ = [
+    "RISK_CODES",
+    "RISK_LEVELS",
+]
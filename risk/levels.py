@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                       🚦 Risk Levels - Flow-Monitor                          ║
+║           Códigos enteros de riesgo compartidos por todas las capas          ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Los niveles de riesgo se guardan como enteros (int8) en el Dashboard, el
+historial columnar, las capturas .fmcap y los exports .npz/Parquet. La
+tabla vive aquí para que sensores, storage y la Capa 3 usen el mismo
+orden sin importarse entre sí.
+
+Author: Flow-Monitor Team
+Project: Flow-Monitor (MVP Semilla Inicia)
+"""
+
+from typing import Dict, Tuple
+
+
+# Índice = código, mismo orden que RiskLevel.priority - 1 (intelligence_core)
+RISK_LEVELS: Tuple[str, ...] = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+RISK_CODES: Dict[str, int] = {name: code for code, name in enumerate(RISK_LEVELS)}
@@ -22,9 +22,12 @@ from datetime import datetime
 # Agregar el directorio raíz al path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from ingestion.models import NormalizedReading
 from intelligence_core import IntelligenceService
 from action_layer.data_observer import get_observer
+from action_layer.models import DashboardReading
 from action_layer.notification_dispatcher import NotificationDispatcher
+from observability.logs import configure_logging
 
 
 class FlowMonitorPipeline:
@@ -71,22 +74,40 @@ class FlowMonitorPipeline:
         
         # Paso 2: Intelligence Core (Capa 2)
         enriched = self.intelligence.process(raw_data)
-        enriched_dict = enriched.to_dict()
         
-        # Paso 3: Action Layer (Capa 3) - Observer procesa y notifica
-        reading = self.observer.process(enriched_dict)
+        # Paso 3: Action Layer (Capa 3) - Observer procesa y notifica (sin dict intermedio)
+        reading = self.observer.process_enriched(enriched)
         
         self._processed += 1
         
+        # Serializar solo en el borde (salida para el llamador)
         return {
             "reading": reading.to_dict(),
-            "enriched_data": enriched_dict,
+            "enriched_data": enriched.to_dict(),
             "pipeline_stats": {
                 "total_processed": self._processed,
                 "uptime": (datetime.now() - self._start_time).total_seconds()
             }
         }
     
+    def process_reading(self, reading: NormalizedReading) -> DashboardReading:
+        """
+        Ruta tipada en proceso: NormalizedReading → EnrichedData → DashboardReading.
+        
+        No construye diccionarios intermedios; serializar (to_dict) queda
+        a cargo del llamador cuando cruza un límite de proceso.
+        
+        Args:
+            reading: Lectura normalizada por un plugin de Capa 1
+            
+        Returns:
+            DashboardReading almacenado en el observer
+        """
+        enriched = self.intelligence.process_reading(reading)
+        dashboard_reading = self.observer.process_enriched(enriched)
+        self._processed += 1
+        return dashboard_reading
+    
     def get_dashboard_data(self) -> dict:
         """Obtiene datos para el Dashboard."""
         return self.observer.get_dashboard_data()
@@ -105,6 +126,9 @@ class FlowMonitorPipeline:
 
 def demo_pipeline():
     """Ejecuta una demostración del pipeline completo."""
+    # Banners de los mocks en línea con la salida de la demo (sin cola)
+    configure_logging(stream=sys.stdout, use_queue=False)
+    
     print("""
 ╔══════════════════════════════════════════════════════════════════════════════╗
 ║                🔗 Flow-Monitor Full Pipeline Demo                            ║
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                   🎞️ Traffic Capture & Replay - Flow-Monitor                 ║
+║           Grabación binaria de tráfico y replay desde archivo mmap           ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Formato de captura (.fmcap) para benchmarks reproducibles:
+
+    [header 64 B][registros de ancho fijo (34 B)][tabla de sensores JSON]
+
+    header:   magic "FMCAP01\\n", versión, cantidad de registros, offset de
+              la tabla de sensores y epoch del primer registro
+    registro: t_ns (offset de llegada), ts (epoch de la lectura), value,
+              sensor (índice a la tabla), failure_probability, risk
+              (-1 = sin evaluar) y flags (bit 0 = anomalía)
+
+El replayer abre los registros con np.memmap y arma los cuerpos JSON con
+plantillas por sensor, a velocidad original, escalada o máxima. Con
+``materialize()`` los cuerpos se precalculan antes de la prueba y el
+generador queda fuera de la medición.
+
+Fuentes de grabación:
+    - Tráfico real: FLOW_MONITOR_CAPTURE=archivo.fmcap en la Ingestion API
+      (un archivo por worker: archivo.<pid>.fmcap)
+    - NDJSON capturado (ej: sensors.fleet --out)
+    - Simulador de flota (determinista con --seed)
+
+Usage:
+    python -m sensors.capture record --fleet 1000 --ticks 100 --seed 42 --out fleet.fmcap
+    python -m sensors.capture record --from-ndjson fleet.ndjson --out fleet.fmcap
+    python -m sensors.capture info fleet.fmcap
+    python -m sensors.capture replay fleet.fmcap --speed 2 --target http
+    python -m sensors.capture replay fleet.fmcap --speed 0 --target null
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from risk import RISK_CODES, RISK_LEVELS
+from timebase import NS_PER_SECOND, format_seconds, from_epoch, parse_timestamp
+
+
+MAGIC = b"FMCAP01\n"
+VERSION = 1
+HEADER_FORMAT = "<8sHHIQQd"  # magic, version, flags, reserved, count, table_offset, t0
+HEADER_SIZE = 64
+
+RECORD_DTYPE = np.dtype([
+    ("t_ns", "<i8"),
+    ("ts", "<f8"),
+    ("value", "<f8"),
+    ("sensor", "<u4"),
+    ("prob", "<f4"),
+    ("risk", "i1"),
+    ("flags", "u1"),
+])
+
+FLAG_ANOMALY = 1
+
+FORMATS = ("ingest", "dashboard")
+
+
+def _to_epoch(value: Any) -> float:
+    """
+    Convierte un timestamp ISO, datetime, epoch o epoch-ns a segundos.
+
+    Raises:
+        ValueError: Si no es un timestamp reconocible (reemplazarlo por
+            "ahora" desordenaría la línea de tiempo del replay)
+    """
+    return parse_timestamp(value) / NS_PER_SECOND
+
+
+class CaptureWriter:
+    """
+    🎞️ Grabador de tráfico en formato .fmcap.
+
+    Ejemplo:
+        with CaptureWriter("traffic.fmcap") as capture:
+            capture.record(payload)
+    """
+
+    def __init__(self, path: str, meta: Optional[Dict[str, Any]] = None, chunk_size: int = 65536):
+        self.path = path
+        self.meta = dict(meta or {})
+        self._file = open(path, "wb")
+        self._file.write(b"\0" * HEADER_SIZE)
+        self._buffer = np.zeros(chunk_size, dtype=RECORD_DTYPE)
+        self._pending = 0
+        self.count = 0
+        self.skipped = 0  # Registros omitidos al grabar (timestamp inválido)
+
+        self._sensors: List[Tuple[str, str, str]] = []
+        self._sensor_index: Dict[Tuple[str, str, str], int] = {}
+        self._t0_perf: Optional[float] = None
+        self._t0_wall = 0.0
+
+    def sensor_code(self, sensor_id: str, unit: str = "", location: str = "") -> int:
+        """Índice del sensor en la tabla (lo registra si es nuevo)."""
+        key = (sensor_id, unit or "", location or "")
+        code = self._sensor_index.get(key)
+        if code is None:
+            code = len(self._sensors)
+            self._sensors.append(key)
+            self._sensor_index[key] = code
+        return code
+
+    def _arrival_ns(self, at: Optional[float]) -> int:
+        """Offset de llegada en ns (``at`` = segundos desde el inicio, o reloj real)."""
+        if self._t0_perf is None:
+            self._t0_perf = time.perf_counter()
+            self._t0_wall = time.time()
+        if at is None:
+            at = time.perf_counter() - self._t0_perf
+        return int(at * 1e9)
+
+    def _append(self, t_ns: int, ts: float, value: float, sensor: int,
+                prob: float, risk: int, flags: int) -> None:
+        self._buffer[self._pending] = (t_ns, ts, value, sensor, prob, risk, flags)
+        self._pending += 1
+        if self._pending == len(self._buffer):
+            self._flush_buffer()
+
+    def record(self, payload: Dict[str, Any], at: Optional[float] = None,
+               risk_level: Optional[str] = None, failure_probability: float = 0.0) -> None:
+        """Graba un payload con formato DataPulse (o data_original de Capa 2)."""
+        data = payload.get("data_original", payload)
+        risk_level = risk_level or payload.get("risk_level")
+        if "prediction_alert" in payload:
+            failure_probability = payload["prediction_alert"].get("failure_probability", failure_probability)
+        meta = data.get("_meta") or {}
+        self._append(
+            self._arrival_ns(at),
+            _to_epoch(data.get("timestamp")),
+            float(data["value"]),
+            self.sensor_code(data["sensor_id"], data.get("unit", ""), data.get("location", "")),
+            failure_probability,
+            RISK_CODES.get(risk_level, -1),
+            FLAG_ANOMALY if meta.get("is_anomaly") else 0,
+        )
+
+    def record_reading(self, reading, at: Optional[float] = None) -> None:
+        """Graba un NormalizedReading (Capa 1)."""
+        self._append(
+            self._arrival_ns(at),
+            _to_epoch(reading.timestamp),
+            reading.value,
+            self.sensor_code(reading.sensor_id, reading.unit, reading.location or ""),
+            0.0,
+            -1,
+            FLAG_ANOMALY if reading.metadata.get("is_anomaly") else 0,
+        )
+
+    def record_enriched(self, enriched, at: Optional[float] = None) -> None:
+        """Graba un EnrichedData (Capa 2) con su nivel de riesgo."""
+        sensor = enriched.data_original
+        self._append(
+            self._arrival_ns(at),
+            _to_epoch(sensor.timestamp),
+            sensor.value,
+            self.sensor_code(sensor.sensor_id, sensor.unit, sensor.location or ""),
+            enriched.prediction_alert.failure_probability,
+            enriched.risk_level.code,
+            0,
+        )
+
+    def record_block(self, sensors: np.ndarray, ts: float, values: np.ndarray,
+                     at: Optional[float] = None, flags: Optional[np.ndarray] = None,
+                     risk: Optional[np.ndarray] = None, prob: Optional[np.ndarray] = None) -> None:
+        """Graba un bloque vectorizado (ej: un tick de la flota) con la misma llegada."""
+        self._flush_buffer()
+        block = np.zeros(len(values), dtype=RECORD_DTYPE)
+        block["t_ns"] = self._arrival_ns(at)
+        block["ts"] = ts
+        block["value"] = values
+        block["sensor"] = sensors
+        block["risk"] = -1 if risk is None else risk
+        if prob is not None:
+            block["prob"] = prob
+        if flags is not None:
+            block["flags"] = flags.astype(np.uint8) * FLAG_ANOMALY
+        block.tofile(self._file)
+        self.count += len(block)
+
+    def _flush_buffer(self) -> None:
+        if self._pending:
+            self._buffer[:self._pending].tofile(self._file)
+            self.count += self._pending
+            self._pending = 0
+
+    def close(self) -> None:
+        """Escribe la tabla de sensores y completa el header."""
+        if self._file.closed:
+            return
+        self._flush_buffer()
+        table_offset = self._file.tell()
+        self._file.write(json.dumps({"sensors": self._sensors, "meta": self.meta}).encode())
+        self._file.seek(0)
+        self._file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, 0, 0,
+                                     self.count, table_offset, self._t0_wall))
+        self._file.close()
+
+    def __enter__(self) -> "CaptureWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class CaptureReader:
+    """
+    ▶️ Replayer de capturas .fmcap (registros vía np.memmap).
+
+    Ejemplo:
+        capture = CaptureReader("traffic.fmcap")
+        for body in capture.iter_json("ingest", speed=1.0):
+            session.post(url, data=body)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(struct.calcsize(HEADER_FORMAT))
+            magic, version, _, _, count, table_offset, t0 = struct.unpack(HEADER_FORMAT, header)
+            if magic != MAGIC:
+                raise ValueError(f"Not a Flow-Monitor capture: {path}")
+            if version != VERSION:
+                raise ValueError(f"Unsupported capture version {version} (expected {VERSION})")
+            f.seek(table_offset)
+            table = json.loads(f.read())
+
+        self.count = count
+        self.t0 = t0
+        self.meta: Dict[str, Any] = table.get("meta", {})
+        self.sensors: List[Tuple[str, str, str]] = [tuple(s) for s in table["sensors"]]
+        self.records = (
+            np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+            if count else np.zeros(0, dtype=RECORD_DTYPE)
+        )
+        self._heads: Dict[str, List[bytes]] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def duration(self) -> float:
+        """Duración original de la captura en segundos."""
+        return float(self.records["t_ns"][-1]) / 1e9 if self.count else 0.0
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Serialización
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def _sensor_heads(self, fmt: str) -> List[bytes]:
+        """Prefijo JSON precomputado por sensor para cada formato."""
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}'. Must be one of {FORMATS}")
+        heads = self._heads.get(fmt)
+        if heads is None:
+            template = ('{"sensor_id":%s,"unit":%s,"location":%s,'
+                        if fmt == "ingest" else
+                        '{"data_original":{"sensor_id":%s,"unit":%s,"location":%s,')
+            heads = [
+                (template % (json.dumps(s), json.dumps(u), json.dumps(loc))).encode()
+                for s, u, loc in self.sensors
+            ]
+            self._heads[fmt] = heads
+        return heads
+
+    def _encode_chunk(self, chunk: np.ndarray, fmt: str, iso_cache: Dict[float, bytes]) -> List[bytes]:
+        heads = self._sensor_heads(fmt)
+        bodies = []
+        for ts, value, sensor, prob, risk, flags in zip(
+            chunk["ts"].tolist(), chunk["value"].tolist(), chunk["sensor"].tolist(),
+            chunk["prob"].tolist(), chunk["risk"].tolist(), chunk["flags"].tolist(),
+        ):
+            iso = iso_cache.get(ts)
+            if iso is None:
+                if len(iso_cache) > 100_000:
+                    iso_cache.clear()
+                iso = iso_cache[ts] = format_seconds(ts).encode()
+            anomaly = b"true" if flags & FLAG_ANOMALY else b"false"
+            if fmt == "ingest":
+                bodies.append(b"%s\"timestamp\":\"%s\",\"value\":%r,\"_meta\":{\"is_anomaly\":%s,"
+                              b"\"agent\":\"Replay\"}}" % (heads[sensor], iso, value, anomaly))
+            else:
+                level = RISK_LEVELS[risk] if risk >= 0 else "LOW"
+                bodies.append(b"%s\"timestamp\":\"%s\",\"value\":%r,\"_meta\":{\"is_anomaly\":%s}},"
+                              b"\"risk_level\":\"%s\",\"prediction_alert\":{\"failure_probability\":%.4f},"
+                              b"\"processed_at\":\"%s\"}"
+                              % (heads[sensor], iso, value, anomaly, level.encode(), prob, iso))
+        return bodies
+
+    def iter_json(self, fmt: str = "ingest", speed: float = 0.0, loop: bool = False,
+                  chunk_size: int = 4096) -> Iterator[bytes]:
+        """
+        Genera los cuerpos JSON de la captura.
+
+        Args:
+            fmt: "ingest" (payload DataPulse para Capa 1) o "dashboard"
+                 (payload enriquecido para /api/dashboard/process)
+            speed: 1.0 = tiempos originales, 2.0 = el doble de rápido,
+                   0 = velocidad máxima
+            loop: Repetir la captura indefinidamente
+            chunk_size: Registros leídos del mmap por bloque
+        """
+        iso_cache: Dict[float, bytes] = {}
+        while True:
+            start = time.perf_counter()
+            for offset in range(0, self.count, chunk_size):
+                chunk = self.records[offset:offset + chunk_size]
+                bodies = self._encode_chunk(chunk, fmt, iso_cache)
+                if speed <= 0:
+                    yield from bodies
+                    continue
+                targets = (start + chunk["t_ns"] / (1e9 * speed)).tolist()
+                for target, body in zip(targets, bodies):
+                    ahead = target - time.perf_counter()
+                    if ahead > 0.0005:
+                        time.sleep(ahead)
+                    yield body
+            if not loop or not self.count:
+                return
+
+    def iter_payloads(self, fmt: str = "ingest", speed: float = 0.0, loop: bool = False) -> Iterator[dict]:
+        """Igual que iter_json pero como diccionarios."""
+        for body in self.iter_json(fmt, speed, loop):
+            yield json.loads(body)
+
+    def materialize(self, fmt: str = "ingest", limit: Optional[int] = None) -> List[bytes]:
+        """Precalcula todos los cuerpos JSON (para sacar el generador de la medición)."""
+        records = self.records[:limit] if limit else self.records
+        return self._encode_chunk(records, fmt, {})
+
+
+def load_bodies(path: str, fmt: str, limit: Optional[int] = None) -> List[bytes]:
+    """Atajo para los scripts de carga: cuerpos JSON precalculados de una captura."""
+    return CaptureReader(path).materialize(fmt, limit)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _record_fleet(args: argparse.Namespace) -> CaptureWriter:
+    from sensors.fleet import FleetSimulator
+
+    fleet = FleetSimulator(sensors=args.fleet, seed=args.seed, anomaly_rate=args.anomaly_rate)
+    writer = CaptureWriter(args.out, meta={"source": "fleet", "sensors": args.fleet,
+                                           "seed": args.seed, "interval": args.interval})
+    codes = np.array([writer.sensor_code(s, u, loc) for s, u, loc in
+                      zip(fleet.sensor_ids, fleet.units, fleet.locations)], dtype=np.uint32)
+    service = _intelligence() if args.enrich else None
+    t0 = time.time()
+    for tick in range(args.ticks):
+        values, anomalies = fleet.tick()
+        values = np.round(values, 2)
+        ts = t0 + tick * args.interval
+        risk = prob = None
+        if service is not None:
+            risk, prob = _enrich_block(service, fleet, values, ts)
+        writer.record_block(codes, ts, values, at=tick * args.interval,
+                            flags=anomalies, risk=risk, prob=prob)
+    return writer
+
+
+def _record_ndjson(args: argparse.Namespace) -> CaptureWriter:
+    """Graba un NDJSON; la llegada se deriva de los timestamps de las lecturas."""
+    writer = CaptureWriter(args.out, meta={"source": os.path.basename(args.from_ndjson)})
+    service = _intelligence() if args.enrich else None
+    first_ts: Optional[float] = None
+    with open(args.from_ndjson, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            payload = json.loads(line)
+            try:
+                ts = _to_epoch(payload.get("data_original", payload).get("timestamp"))
+            except ValueError:
+                writer.skipped += 1
+                continue
+            if first_ts is None:
+                first_ts = ts
+            at = max(0.0, ts - first_ts)
+            if service is not None and "risk_level" not in payload:
+                enriched = service.process(payload)
+                writer.record(payload, at=at, risk_level=enriched.risk_level.value,
+                              failure_probability=enriched.prediction_alert.failure_probability)
+            else:
+                writer.record(payload, at=at)
+    return writer
+
+
+def _intelligence():
+    from intelligence_core import IntelligenceService
+    return IntelligenceService()
+
+
+def _enrich_block(service, fleet, values: np.ndarray, ts: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Evalúa un tick con el Intelligence Core (una vez, al grabar)."""
+    from intelligence_core.models import SensorData
+
+    risk = np.empty(len(values), dtype=np.int8)
+    prob = np.empty(len(values), dtype=np.float32)
+    timestamp = from_epoch(ts)
+    for i, (sensor_id, unit, location, value) in enumerate(
+        zip(fleet.sensor_ids, fleet.units, fleet.locations, values.tolist())
+    ):
+        enriched = service.process_sensor_data(SensorData(sensor_id, timestamp, value, unit, location))
+        risk[i] = enriched.risk_level.code
+        prob[i] = enriched.prediction_alert.failure_probability
+    return risk, prob
+
+
+def _replay(args: argparse.Namespace) -> None:
+    capture = CaptureReader(args.file)
+    fmt = "dashboard" if args.target == "dashboard" else "ingest"
+    bodies = capture.iter_json(fmt, speed=args.speed, loop=args.loop)
+    start = time.perf_counter()
+    sent = 0
+
+    if args.target == "null":
+        for _ in bodies:
+            sent += 1
+    elif args.target == "stdout":
+        out = sys.stdout.buffer
+        for body in bodies:
+            out.write(body + b"\n")
+            sent += 1
+    elif args.target == "http":
+        from sensors.sender import BatchSender, SenderConfig
+        with BatchSender(SenderConfig(endpoint=args.endpoint, batch_size=args.batch_size)) as sender:
+            for body in bodies:
+                sender.send(body, block=True)
+                sent += 1
+    else:
+        import requests
+        session = requests.Session()
+        headers = {"Content-Type": "application/json"}
+        for body in bodies:
+            session.post(args.endpoint, data=body, headers=headers, timeout=10)
+            sent += 1
+
+    elapsed = time.perf_counter() - start
+    print(f"▶️  {sent:,} lecturas en {elapsed:.2f}s ({sent / elapsed:,.0f}/s)", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🎞️ Grabación y replay de tráfico de sensores")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="Graba una captura .fmcap")
+    source = rec.add_mutually_exclusive_group(required=True)
+    source.add_argument("--fleet", type=int, help="Sensores del simulador de flota")
+    source.add_argument("--from-ndjson", help="Archivo NDJSON con payloads DataPulse")
+    rec.add_argument("--out", required=True)
+    rec.add_argument("--ticks", type=int, default=100)
+    rec.add_argument("--interval", type=float, default=1.0, help="Segundos entre ticks (--fleet)")
+    rec.add_argument("--seed", type=int, default=42)
+    rec.add_argument("--anomaly-rate", type=float, default=0.01)
+    rec.add_argument("--no-enrich", dest="enrich", action="store_false",
+                     help="No precalcular risk_level con el Intelligence Core")
+
+    info = sub.add_parser("info", help="Muestra el contenido de una captura")
+    info.add_argument("file")
+
+    rep = sub.add_parser("replay", help="Reproduce una captura")
+    rep.add_argument("file")
+    rep.add_argument("--speed", type=float, default=1.0, help="1 = original, 0 = máxima")
+    rep.add_argument("--loop", action="store_true")
+    rep.add_argument("--target", choices=("null", "stdout", "http", "dashboard"), default="null",
+                     help="http = lotes a /api/ingest/batch, dashboard = POST por lectura a Capa 3")
+    rep.add_argument("--endpoint", default="http://localhost:8000/api/ingest/batch")
+    rep.add_argument("--batch-size", type=int, default=500)
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        start = time.perf_counter()
+        writer = _record_fleet(args) if args.fleet else _record_ndjson(args)
+        writer.close()
+        size = os.path.getsize(args.out)
+        print(f"🎞️  {writer.count:,} lecturas → {args.out} ({size / 1024 / 1024:.1f} MiB, "
+              f"{time.perf_counter() - start:.1f}s)")
+        if writer.skipped:
+            print(f"⚠️  {writer.skipped:,} registros omitidos por timestamp inválido", file=sys.stderr)
+    elif args.command == "info":
+        capture = CaptureReader(args.file)
+        risks = np.bincount(capture.records["risk"].astype(np.int16) + 1, minlength=5)
+        print("═" * 70)
+        print(f"🎞️  {args.file}")
+        print("═" * 70)
+        print(f"   ├─ Lecturas:  {capture.count:,}")
+        print(f"   ├─ Sensores:  {len(capture.sensors):,}")
+        print(f"   ├─ Duración:  {capture.duration:.1f}s")
+        print(f"   ├─ Riesgo:    " + " | ".join(
+            f"{name} {risks[i + 1]:,}" for i, name in enumerate(RISK_LEVELS)) + f" | sin evaluar {risks[0]:,}")
+        print(f"   └─ Meta:      {capture.meta}")
+    else:
+        _replay(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,13 +17,21 @@ import requests
 import time
 import random
 import math
+import struct
 import threading
 import argparse
 from datetime import datetime
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+
+try:
+    from sensors.sender import BatchSender, SenderConfig
+except ImportError:  # Ejecutado como script desde sensors/
+    from sender import BatchSender, SenderConfig
+
 
 class SensorStatus(Enum):
     """Estados posibles del sensor."""
@@ -33,6 +41,98 @@ class SensorStatus(Enum):
     ANOMALY_INJECTED = "ANOMALY_INJECTED"
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# Formato binario (ver ingestion.plugins.binary_plugin para la especificación)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+BINARY_CONTENT_TYPE = "application/vnd.datapulse.binary"
+
+_BINARY_HEADER = struct.Struct("<4sHHII")
+_BINARY_RECORD = np.dtype([
+    ("sensor", "<u4"),
+    ("timestamp_ms", "<i8"),
+    ("value", "<f8"),
+    ("flags", "u1"),
+])
+_STATUS_CODES = {status.value: code for code, status in enumerate(SensorStatus)}
+
+
+def status_flags(status: str, is_anomaly: bool) -> int:
+    """Byte de flags: bit 0 = anomalía, bits 1-2 = estado."""
+    return (_STATUS_CODES.get(status, 0) << 1) | bool(is_anomaly)
+
+
+def encode_sensor_dictionary(sensors: Sequence[Tuple[str, str, Optional[str]]]) -> bytes:
+    """Diccionario (sensor_id, unit, location) de la trama; reutilizable entre tramas."""
+    parts = []
+    for fields in sensors:
+        for text in fields:
+            data = (text or "").encode()
+            parts.append(len(data).to_bytes(2, "little"))
+            parts.append(data)
+    return b"".join(parts)
+
+
+def encode_binary_frame(
+    dictionary: bytes,
+    sensor_count: int,
+    sensor_index: Sequence[int],
+    timestamp_ms: Sequence[int],
+    values: Sequence[float],
+    flags: Sequence[int],
+) -> bytes:
+    """
+    Trama binaria a partir de columnas (listas o arreglos NumPy).
+
+    Args:
+        dictionary: Salida de ``encode_sensor_dictionary``
+        sensor_count: Entradas del diccionario
+        sensor_index: Índice de sensor por registro
+        timestamp_ms: Epoch en milisegundos por registro (o un escalar para todos)
+        values: Valor por registro
+        flags: Ver ``status_flags``
+    """
+    records = np.empty(len(values), dtype=_BINARY_RECORD)
+    records["sensor"] = sensor_index
+    records["timestamp_ms"] = timestamp_ms
+    records["value"] = values
+    records["flags"] = flags
+    header = _BINARY_HEADER.pack(b"DPB1", 1, _BINARY_RECORD.itemsize, sensor_count, len(records))
+    return b"".join((header, dictionary, records.tobytes()))
+
+
+def encode_binary(payloads: List[dict]) -> bytes:
+    """
+    Codifica payloads JSON del DataPulse como una trama binaria.
+
+    Cada (sensor_id, unit, location) distinto entra una vez en el
+    diccionario; ``_meta.step`` y ``_meta.agent`` no viajan.
+    """
+    # Import diferido: el agente en modo JSON corre también como script desde sensors/
+    from timebase import NS_PER_MS, parse_timestamp
+
+    index: Dict[Tuple[str, str, Optional[str]], int] = {}
+    sensor_index, timestamps, values, flags = [], [], [], []
+    parsed: Dict[str, int] = {}
+    for payload in payloads:
+        key = (payload["sensor_id"], payload["unit"], payload.get("location"))
+        position = index.get(key)
+        if position is None:
+            position = index[key] = len(index)
+        sensor_index.append(position)
+        timestamp = payload["timestamp"]
+        ms = parsed.get(timestamp)
+        if ms is None:
+            # ISO (con o sin zona) o epoch numérico, igual que la API
+            ms = parsed[timestamp] = parse_timestamp(timestamp) // NS_PER_MS
+        timestamps.append(ms)
+        values.append(payload["value"])
+        meta = payload.get("_meta") or {}
+        flags.append(status_flags(meta.get("status", "NORMAL"), meta.get("is_anomaly", False)))
+    return encode_binary_frame(encode_sensor_dictionary(list(index)), len(index),
+                               sensor_index, timestamps, values, flags)
+
+
 @dataclass
 class SensorConfig:
     """Configuración del sensor virtual."""
@@ -59,6 +159,12 @@ class SensorConfig:
     api_endpoint: str = "http://localhost:8000/api/ingest"
     interval_seconds: float = 2.0
     send_to_api: bool = False  # Solo simulación por defecto
+    
+    # Envío por lotes (BatchSender): keep-alive, reintentos y spill a disco
+    batch_mode: bool = False
+    batch_endpoint: str = "http://localhost:8000/api/ingest/batch"
+    batch_size: int = 100
+    flush_interval: float = 5.0
 
 
 class DataPulseAgent:
@@ -79,6 +185,10 @@ class DataPulseAgent:
         self._thread: Optional[threading.Thread] = None
         self._callbacks: list[Callable] = []
         
+        # Conexión persistente (keep-alive) para el envío por lectura
+        self._session: Optional[requests.Session] = None
+        self._sender: Optional[BatchSender] = None
+        
         # Estadísticas
         self.total_readings = 0
         self.total_anomalies = 0
@@ -191,13 +301,24 @@ class DataPulseAgent:
         
         return payload
 
+    def generate_binary(self, count: int = 1) -> bytes:
+        """Genera ``count`` lecturas consecutivas como una trama binaria."""
+        return encode_binary([self.generate_reading() for _ in range(count)])
+
     def _send_to_api(self, payload: dict) -> Optional[int]:
         """Envía los datos al endpoint configurado."""
         if not self.config.send_to_api:
             return None
         
+        if self.config.batch_mode:
+            self._get_sender().send(payload)
+            return None
+        
+        if self._session is None:
+            self._session = requests.Session()
+        
         try:
-            response = requests.post(
+            response = self._session.post(
                 self.config.api_endpoint,
                 json=payload,
                 timeout=5
@@ -207,6 +328,16 @@ class DataPulseAgent:
             print(f"⚠️  Error enviando datos: {e}")
             return None
 
+    def _get_sender(self) -> BatchSender:
+        """Crea e inicia el BatchSender en el primer envío."""
+        if self._sender is None:
+            self._sender = BatchSender(SenderConfig(
+                endpoint=self.config.batch_endpoint,
+                batch_size=self.config.batch_size,
+                flush_interval=self.config.flush_interval,
+            )).start()
+        return self._sender
+
     def _format_output(self, payload: dict) -> str:
         """Formatea la salida para la consola."""
         status = payload["_meta"]["status"]
@@ -278,6 +409,12 @@ class DataPulseAgent:
     def stop(self):
         """Detiene el sensor."""
         self.running = False
+        if self._sender is not None:
+            self._sender.close()
+            self._sender = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
         print("\n" + "─" * 70)
         print(self._get_stats())
         print("─" * 70)
@@ -339,6 +476,7 @@ Ejemplos de uso:
   python datapulse_sensor.py --send-api         # Enviar datos al API
   python datapulse_sensor.py --interval 1       # Lecturas cada segundo
   python datapulse_sensor.py --anomaly-rate 0.1 # 10% de anomalías automáticas
+  python datapulse_sensor.py --send-api --batch # Envío por lotes con spill a disco
         """
     )
     
@@ -368,6 +506,11 @@ Ejemplos de uso:
         action="store_true",
         help="Activar envío real al API (por defecto solo simulación)"
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Enviar por lotes a /api/ingest/batch (keep-alive, reintentos, spill a disco)"
+    )
     parser.add_argument(
         "--anomaly-rate",
         type=float,
@@ -396,6 +539,8 @@ Ejemplos de uso:
         api_endpoint=args.endpoint,
         interval_seconds=args.interval,
         send_to_api=args.send_api,
+        batch_mode=args.batch,
+        batch_endpoint=args.endpoint.rstrip("/") + "/batch",
         auto_anomaly_probability=args.anomaly_rate,
         base_temp=args.base_temp,
         amplitude=args.amplitude
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                      🏭 DataPulse Fleet Simulator 🏭                         ║
+║              Miles de sensores virtuales por proceso (NumPy)                 ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Modo flota del DataPulse: N sensores de tipos mixtos (temperatura,
+vibración, caudal, presión) generados como vectores NumPy por tick.
+
+- Onda senoidal por sensor con fase y período propios
+- Deriva lenta por sensor (calibración que se degrada)
+- Anomalías automáticas (probabilidad por lectura) y escenarios
+  programados: spike, ramp y stuck sobre un subconjunto de la flota
+- Salida: NDJSON a archivo, lotes HTTP a /api/ingest/batch o el
+  pipeline asyncio en proceso; ``to_binary`` arma la trama binaria
+  compacta (ver ingestion.plugins.binary_plugin)
+
+Usage:
+    python -m sensors.fleet --sensors 10000 --ticks 100 --out fleet.ndjson
+    python -m sensors.fleet --sensors 5000 --rate 100000 --target http
+    python -m sensors.fleet --sensors 2000 --ticks 50 --target pipeline \\
+        --scenario ramp:10:30:temperature:0.05
+
+Author: DataPulse Agent
+Project: Flow-Monitor (MVP Semilla Inicia)
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SensorProfile:
+    """Parámetros de generación para un tipo de sensor."""
+    prefix: str
+    unit: str
+    base: float
+    amplitude: float
+    noise: float
+    anomaly_min: float
+    anomaly_max: float
+    warning_threshold: float
+    critical_threshold: float
+
+
+# Rangos alineados con DEFAULT_THRESHOLDS del Intelligence Core
+PROFILES: Dict[str, SensorProfile] = {
+    "temperature": SensorProfile("TEMP", "Celsius", 30.0, 10.0, 1.0, 85.0, 110.0, 60.0, 80.0),
+    "vibration": SensorProfile("VIB", "mm/s", 2.5, 1.5, 0.3, 11.0, 20.0, 5.0, 10.0),
+    "flow": SensorProfile("FLOW", "L/min", 180.0, 60.0, 6.0, 420.0, 600.0, 300.0, 400.0),
+    "pressure": SensorProfile("PRESS", "PSI", 60.0, 20.0, 2.0, 125.0, 170.0, 100.0, 120.0),
+}
+
+SENSOR_TYPES: Tuple[str, ...] = tuple(PROFILES)
+
+DEFAULT_MIX: Dict[str, float] = {
+    "temperature": 0.4,
+    "vibration": 0.3,
+    "flow": 0.15,
+    "pressure": 0.15,
+}
+
+SCENARIO_KINDS = ("spike", "ramp", "stuck")
+
+# Mismos valores que SensorStatus del DataPulse Agent
+STATUS_NAMES = ("NORMAL", "WARNING", "CRITICAL", "ANOMALY_INJECTED")
+
+
+@dataclass
+class AnomalyScenario:
+    """
+    Anomalía programada sobre un subconjunto de la flota.
+
+    Attributes:
+        kind: "spike" (valores en rango de anomalía), "ramp" (sube linealmente
+              hasta el rango de anomalía) o "stuck" (sensor congelado)
+        start_tick: Tick en que comienza
+        duration: Número de ticks
+        sensor_type: Limitar a un tipo de sensor (None = todos)
+        fraction: Fracción de sensores afectados
+    """
+    kind: str
+    start_tick: int
+    duration: int
+    sensor_type: Optional[str] = None
+    fraction: float = 0.01
+
+    def __post_init__(self):
+        if self.kind not in SCENARIO_KINDS:
+            raise ValueError(f"Unknown scenario '{self.kind}'. Must be one of {SCENARIO_KINDS}")
+
+    @classmethod
+    def parse(cls, spec: str) -> "AnomalyScenario":
+        """Parsea ``kind:start:duration[:sensor_type[:fraction]]``."""
+        parts = spec.split(":")
+        if len(parts) < 3:
+            raise ValueError(f"Invalid scenario '{spec}': expected kind:start:duration[:type[:fraction]]")
+        return cls(
+            kind=parts[0],
+            start_tick=int(parts[1]),
+            duration=int(parts[2]),
+            sensor_type=parts[3] or None if len(parts) > 3 else None,
+            fraction=float(parts[4]) if len(parts) > 4 else 0.01,
+        )
+
+
+class FleetSimulator:
+    """
+    🏭 Flota de sensores virtuales generada en bloque.
+
+    Cada llamada a ``tick()`` produce un vector con una lectura por sensor.
+
+    Ejemplo:
+        fleet = FleetSimulator(sensors=10_000, seed=42)
+        values, anomalies = fleet.tick()
+        payloads = fleet.to_payloads(values, anomalies)
+    """
+
+    def __init__(
+        self,
+        sensors: int = 1000,
+        mix: Optional[Dict[str, float]] = None,
+        seed: Optional[int] = None,
+        anomaly_rate: float = 0.0,
+        drift_per_tick: float = 0.002,
+        scenarios: Optional[List[AnomalyScenario]] = None,
+        locations: int = 20,
+    ):
+        self.size = sensors
+        self.anomaly_rate = anomaly_rate
+        self.rng = np.random.default_rng(seed)
+        self.step = 0
+
+        # Tipo de cada sensor según la mezcla
+        mix = mix or DEFAULT_MIX
+        weights = np.array([mix.get(t, 0.0) for t in SENSOR_TYPES], dtype=np.float64)
+        counts = np.floor(weights / weights.sum() * sensors).astype(np.int64)
+        counts[0] += sensors - counts.sum()
+        self.type_codes = np.repeat(np.arange(len(SENSOR_TYPES), dtype=np.int8), counts)
+
+        profiles = [PROFILES[t] for t in SENSOR_TYPES]
+
+        def column(attr: str) -> np.ndarray:
+            return np.array([getattr(p, attr) for p in profiles], dtype=np.float64)[self.type_codes]
+
+        self.base = column("base")
+        self.amplitude = column("amplitude") * self.rng.uniform(0.7, 1.3, sensors)
+        self.noise = column("noise")
+        self.anomaly_min = column("anomaly_min")
+        self.anomaly_max = column("anomaly_max")
+        self.warning = column("warning_threshold")
+        self.critical = column("critical_threshold")
+
+        # Fase, período (en ticks) y deriva propios de cada sensor
+        self.phase = self.rng.uniform(0.0, 2 * np.pi, sensors)
+        self.omega = 2 * np.pi / self.rng.uniform(30.0, 120.0, sensors)
+        self.drift_rate = self.rng.normal(0.0, drift_per_tick, sensors) * self.amplitude
+
+        # Identidad de cada sensor (strings internados una sola vez)
+        seq = np.zeros(len(SENSOR_TYPES), dtype=np.int64)
+        self.sensor_ids: List[str] = []
+        for code in self.type_codes:
+            seq[code] += 1
+            self.sensor_ids.append(sys.intern(f"SENSOR_{profiles[code].prefix}_{seq[code]:05d}"))
+        self.units: List[str] = [profiles[c].unit for c in self.type_codes]
+        self.locations: List[str] = [
+            sys.intern(f"Planta-{chr(65 + (i // 5) % 4)}/Linea-{i % locations:02d}")
+            for i in range(sensors)
+        ]
+
+        # Escenarios: índices resueltos una vez
+        self.scenarios: List[Tuple[AnomalyScenario, np.ndarray]] = []
+        for scenario in scenarios or []:
+            self.add_scenario(scenario)
+        self._stuck_values = np.zeros(sensors, dtype=np.float64)
+
+        # Líneas NDJSON precomputadas hasta el timestamp
+        self._line_heads: Optional[List[str]] = None
+        # Diccionario de la trama binaria (igual en todos los ticks)
+        self._binary_dictionary: Optional[bytes] = None
+
+        self.total_readings = 0
+        self.total_anomalies = 0
+
+    def add_scenario(self, scenario: AnomalyScenario) -> np.ndarray:
+        """Programa un escenario y retorna los índices de sensores afectados."""
+        if scenario.sensor_type is not None:
+            candidates = np.flatnonzero(self.type_codes == SENSOR_TYPES.index(scenario.sensor_type))
+        else:
+            candidates = np.arange(self.size)
+        count = max(1, int(round(len(candidates) * scenario.fraction)))
+        indices = np.sort(self.rng.choice(candidates, size=min(count, len(candidates)), replace=False))
+        self.scenarios.append((scenario, indices))
+        return indices
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Generación
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def tick(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Genera una lectura por sensor.
+
+        Returns:
+            (values, anomalies): valores float64 y máscara booleana de anomalías
+        """
+        t = self.step
+        n = self.size
+        values = (
+            self.base
+            + self.amplitude * np.sin(self.omega * t + self.phase)
+            + self.drift_rate * t
+            + self.rng.standard_normal(n) * self.noise
+        )
+
+        if self.anomaly_rate > 0:
+            anomalies = self.rng.random(n) < self.anomaly_rate
+            hits = np.flatnonzero(anomalies)
+            if hits.size:
+                values[hits] = self.rng.uniform(self.anomaly_min[hits], self.anomaly_max[hits])
+        else:
+            anomalies = np.zeros(n, dtype=bool)
+
+        for scenario, idx in self.scenarios:
+            offset = t - scenario.start_tick
+            if offset < 0 or offset >= scenario.duration:
+                continue
+            if scenario.kind == "spike":
+                values[idx] = self.rng.uniform(self.anomaly_min[idx], self.anomaly_max[idx])
+            elif scenario.kind == "ramp":
+                progress = (offset + 1) / scenario.duration
+                values[idx] += (self.anomaly_max[idx] - values[idx]) * progress
+            elif scenario.kind == "stuck":
+                if offset == 0:
+                    self._stuck_values[idx] = values[idx]
+                values[idx] = self._stuck_values[idx]
+            anomalies[idx] = True
+
+        self.step += 1
+        self.total_readings += n
+        self.total_anomalies += int(anomalies.sum())
+        return values, anomalies
+
+    @property
+    def emitted_step(self) -> int:
+        """Índice del último tick generado (``_meta.step`` de sus payloads)."""
+        return self.step - 1
+
+    def statuses(self, values: np.ndarray, anomalies: np.ndarray) -> np.ndarray:
+        """Estado DataPulse por sensor (índices en STATUS_NAMES)."""
+        status = np.zeros(self.size, dtype=np.int8)
+        status[values >= self.warning] = 1
+        status[values >= self.critical] = 2
+        status[anomalies] = 3
+        return status
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Serialización
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def to_payloads(self, values: np.ndarray, anomalies: np.ndarray,
+                    timestamp: Optional[str] = None) -> List[dict]:
+        """Convierte un tick en payloads con el formato del DataPulse Agent."""
+        timestamp = timestamp or datetime.now().isoformat()
+        rounded = np.round(values, 2).tolist()
+        status = self.statuses(values, anomalies).tolist()
+        flags = anomalies.tolist()
+        step = self.emitted_step
+        return [
+            {
+                "sensor_id": sensor_id,
+                "timestamp": timestamp,
+                "value": value,
+                "unit": unit,
+                "location": location,
+                "_meta": {
+                    "status": STATUS_NAMES[st],
+                    "is_anomaly": flag,
+                    "step": step,
+                    "agent": "DataPulse-Fleet",
+                },
+            }
+            for sensor_id, unit, location, value, st, flag in zip(
+                self.sensor_ids, self.units, self.locations, rounded, status, flags
+            )
+        ]
+
+    def to_ndjson(self, values: np.ndarray, anomalies: np.ndarray,
+                  timestamp: Optional[str] = None) -> str:
+        """Serializa un tick como NDJSON (una línea por sensor)."""
+        if self._line_heads is None:
+            self._line_heads = [
+                '{"sensor_id": %s, "unit": %s, "location": %s, "timestamp": "'
+                % (json.dumps(s), json.dumps(u), json.dumps(loc))
+                for s, u, loc in zip(self.sensor_ids, self.units, self.locations)
+            ]
+        timestamp = timestamp or datetime.now().isoformat()
+        step = self.emitted_step
+        tails = [
+            '", "value": %r, "_meta": {"status": "%s", "is_anomaly": %s, "step": %d, '
+            '"agent": "DataPulse-Fleet"}}\n' % (v, STATUS_NAMES[st], "true" if f else "false", step)
+            for v, st, f in zip(np.round(values, 2).tolist(),
+                                self.statuses(values, anomalies).tolist(),
+                                anomalies.tolist())
+        ]
+        return "".join(head + timestamp + tail for head, tail in zip(self._line_heads, tails))
+
+    def to_binary(self, values: np.ndarray, anomalies: np.ndarray,
+                  timestamp_ms: Optional[int] = None) -> bytes:
+        """Serializa un tick como trama binaria (ver ``encode_binary_frame``)."""
+        from sensors.datapulse_sensor import encode_binary_frame, encode_sensor_dictionary
+
+        if self._binary_dictionary is None:
+            self._binary_dictionary = encode_sensor_dictionary(
+                list(zip(self.sensor_ids, self.units, self.locations))
+            )
+        if timestamp_ms is None:
+            timestamp_ms = time.time_ns() // 1_000_000
+        flags = (self.statuses(values, anomalies).astype(np.uint8) << 1) | anomalies
+        return encode_binary_frame(
+            self._binary_dictionary, self.size, np.arange(self.size), timestamp_ms,
+            np.round(values, 2), flags,
+        )
+
+    def iter_payloads(self, ticks: int) -> Iterator[dict]:
+        """Genera ``ticks`` ticks completos como payloads individuales."""
+        for _ in range(ticks):
+            values, anomalies = self.tick()
+            yield from self.to_payloads(values, anomalies)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "sensors": self.size,
+            "ticks": self.step,
+            "total_readings": self.total_readings,
+            "total_anomalies": self.total_anomalies,
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Destinos
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _paced_ticks(fleet: FleetSimulator, ticks: int, rate: float) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Ticks limitados a ``rate`` lecturas/s (0 = sin límite)."""
+    interval = fleet.size / rate if rate else 0.0
+    start = time.perf_counter()
+    for i in range(ticks):
+        if interval:
+            ahead = start + i * interval - time.perf_counter()
+            if ahead > 0:
+                time.sleep(ahead)
+        yield fleet.tick()
+
+
+def emit_file(fleet: FleetSimulator, path: str, ticks: int, rate: float = 0.0) -> int:
+    """Escribe la flota como NDJSON. Retorna lecturas escritas."""
+    written = 0
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        for values, anomalies in _paced_ticks(fleet, ticks, rate):
+            f.write(fleet.to_ndjson(values, anomalies))
+            written += fleet.size
+    return written
+
+
+def emit_http(fleet: FleetSimulator, endpoint: str, ticks: int, rate: float = 0.0,
+              batch_size: int = 1000) -> Dict[str, int]:
+    """Envía la flota a /api/ingest/batch mediante el BatchSender (keep-alive + spill)."""
+    from sensors.sender import BatchSender, SenderConfig
+
+    sender = BatchSender(SenderConfig(endpoint=endpoint, batch_size=batch_size,
+                                      max_queue_size=max(100_000, fleet.size * 4)))
+    with sender:
+        for values, anomalies in _paced_ticks(fleet, ticks, rate):
+            for line in fleet.to_ndjson(values, anomalies).encode().splitlines():
+                sender.send(line, block=True)
+    return sender.get_stats()
+
+
+def emit_pipeline(fleet: FleetSimulator, ticks: int) -> Dict:
+    """Alimenta el pipeline asyncio en proceso (Capa 1 → 2 → 3)."""
+    import asyncio
+    from pipeline import AsyncPipelineRunner, StageConfig
+
+    runner = AsyncPipelineRunner(stages={
+        "ingest": StageConfig(batch_size=512),
+        "notify": StageConfig(concurrency=2, offload=True),
+    })
+    return asyncio.run(runner.run(fleet.iter_payloads(ticks)))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="🏭 DataPulse Fleet - Miles de sensores virtuales por proceso",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Escenarios (--scenario, repetible):
+  kind:start:duration[:tipo[:fracción]]
+  spike:100:5                    # 1% de la flota en rango de anomalía
+  ramp:50:30:temperature:0.05    # 5% de temperaturas sube hasta anomalía
+  stuck:0:200:vibration:0.02     # 2% de vibraciones congeladas
+        """
+    )
+    parser.add_argument("--sensors", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=0.0, help="Lecturas/s (0 = máximo)")
+    parser.add_argument("--target", choices=("file", "http", "pipeline", "null"), default="file")
+    parser.add_argument("--out", default="fleet.ndjson", help="Archivo NDJSON (target=file)")
+    parser.add_argument("--endpoint", default="http://localhost:8000/api/ingest/batch")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Lecturas por POST (target=http)")
+    parser.add_argument("--anomaly-rate", type=float, default=0.001)
+    parser.add_argument("--scenario", action="append", default=[], type=AnomalyScenario.parse)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    fleet = FleetSimulator(
+        sensors=args.sensors,
+        seed=args.seed,
+        anomaly_rate=args.anomaly_rate,
+        scenarios=args.scenario,
+    )
+    start = time.perf_counter()
+
+    if args.target == "file":
+        emit_file(fleet, args.out, args.ticks, args.rate)
+        detail = f"→ {args.out}"
+    elif args.target == "http":
+        result = emit_http(fleet, args.endpoint, args.ticks, args.rate, args.batch_size)
+        detail = (f"→ enviadas {result['sent']:,} | lotes {result['batches']:,} | "
+                  f"spill {result['spilled']:,} | descartadas {result['dropped']:,}")
+    elif args.target == "pipeline":
+        result = emit_pipeline(fleet, args.ticks)
+        detail = f"→ pipeline {result['readings_per_second']:,.0f} lecturas/s"
+    else:
+        for _ in _paced_ticks(fleet, args.ticks, args.rate):
+            pass
+        detail = "→ solo generación"
+
+    elapsed = time.perf_counter() - start
+    stats = fleet.get_stats()
+    print("═" * 70)
+    print(f"🏭 Flota de {stats['sensors']:,} sensores × {stats['ticks']} ticks {detail}")
+    print("═" * 70)
+    print(f"   ├─ Lecturas:  {stats['total_readings']:,}")
+    print(f"   ├─ Anomalías: {stats['total_anomalies']:,}")
+    print(f"   └─ Tasa:      {stats['total_readings'] / elapsed:,.0f} lecturas/s ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
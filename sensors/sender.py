@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                     📡 DataPulse Batch Sender 📡                             ║
+║          Envío HTTP con pool keep-alive, lotes, reintentos y spill           ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Subsistema de envío para el DataPulse Agent, el simulador de flota y los
+gateways de campo modelados sobre ellos.
+
+- Conexiones persistentes (requests.Session con pool keep-alive, o
+  aiohttp.ClientSession en el transporte asíncrono)
+- Lotes en el cliente: se envía al llegar a ``batch_size`` lecturas o al
+  pasar ``flush_interval`` segundos desde la primera lectura del lote
+- Reintentos con backoff exponencial y jitter completo ante 5xx, errores
+  de red, 408 y 429 (respetando ``Retry-After``); el resto de los 4xx es
+  un rechazo definitivo y se cuenta aparte (``rejected_batches``)
+- Spill a disco: si el endpoint no responde, los lotes se guardan como
+  NDJSON en ``spill_dir`` y se reenvían (más antiguo primero) cuando el
+  endpoint vuelve. Por defecto es ``DATAPULSE_SPILL_DIR``; sin esa
+  variable no hay spill (los lotes fallidos se descartan y se cuentan)
+- Compresión opcional (``compression="gzip"``) para enlaces celulares que
+  pagan por megabyte; la API descomprime con DecompressionMiddleware
+
+Los lotes se envían como arreglo JSON a /api/ingest/batch.
+
+Example:
+    sender = BatchSender(SenderConfig(endpoint="http://localhost:8000/api/ingest/batch"))
+    sender.start()
+    sender.send(agent.generate_reading())
+    sender.close()
+
+Author: DataPulse Agent
+Project: Flow-Monitor (MVP Semilla Inicia)
+"""
+
+import asyncio
+import email.utils
+import gzip
+import json
+import os
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Lectura ya serializada (bytes JSON) o payload dict
+Item = Union[bytes, str, Dict[str, Any]]
+
+_STOP = object()
+
+# 4xx que sí se reintentan: timeout del servidor y rate limiting
+RETRYABLE_STATUS = frozenset({408, 429})
+
+
+@dataclass
+class SenderConfig:
+    """Configuración del sender por lotes."""
+    endpoint: str = "http://localhost:8000/api/ingest/batch"
+    batch_size: int = 500
+    flush_interval: float = 0.5  # Segundos máx. que espera un lote incompleto
+    timeout: float = 5.0
+    pool_size: int = 4  # Conexiones keep-alive por host
+
+    # Reintentos
+    max_retries: int = 4
+    backoff_base: float = 0.2
+    backoff_max: float = 10.0
+
+    # Content-Encoding de los lotes (None o "gzip")
+    compression: Optional[str] = None
+    compression_level: int = 6
+
+    # Cola local y spill a disco
+    max_queue_size: int = 100_000
+    # None = descartar al fallar; por defecto DATAPULSE_SPILL_DIR (si está definida)
+    spill_dir: Optional[str] = field(default_factory=lambda: os.getenv("DATAPULSE_SPILL_DIR"))
+
+
+def encode_item(item: Item) -> bytes:
+    """Serializa un payload a bytes JSON (sin tocar los ya serializados)."""
+    if isinstance(item, bytes):
+        return item
+    if isinstance(item, str):
+        return item.encode()
+    return json.dumps(item, separators=(",", ":")).encode()
+
+
+def build_body(items: List[bytes]) -> bytes:
+    """Arreglo JSON a partir de elementos ya serializados."""
+    return b"[" + b",".join(items) + b"]"
+
+
+def compress_body(body: bytes, compression: Optional[str], level: int = 6) -> Tuple[bytes, Dict[str, str]]:
+    """Cuerpo comprimido y headers extra según ``SenderConfig.compression``."""
+    if not compression:
+        return body, {}
+    if compression != "gzip":
+        raise ValueError(f"Unsupported compression '{compression}'")
+    # mtime=0: el mismo lote produce los mismos bytes (reintentos idempotentes)
+    return gzip.compress(body, compresslevel=level, mtime=0), {"Content-Encoding": "gzip"}
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Backoff exponencial con jitter completo: uniform(0, min(cap, base·2^n))."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Segundos pedidos por un header ``Retry-After`` (delta o fecha HTTP); None si no hay o es inválido."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def is_retryable(status_code: int) -> bool:
+    """5xx, 408 y 429 se reintentan; el resto de las respuestas es definitiva."""
+    return status_code >= 500 or status_code in RETRYABLE_STATUS
+
+
+class _SpillQueue:
+    """
+    Cola de lotes fallidos en disco (un archivo NDJSON por lote).
+
+    Los nombres usan time_ns para reenviar en orden de llegada.
+    """
+
+    def __init__(self, directory: Optional[str]):
+        self.directory = directory
+
+    def put(self, items: List[bytes]) -> bool:
+        if not self.directory:
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        name = os.path.join(self.directory, f"spill-{time.time_ns()}.ndjson")
+        tmp = name + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(b"\n".join(items))
+            f.write(b"\n")
+        os.replace(tmp, name)
+        return True
+
+    def files(self) -> List[str]:
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            os.path.join(self.directory, f)
+            for f in os.listdir(self.directory)
+            if f.startswith("spill-") and f.endswith(".ndjson")
+        )
+
+    @staticmethod
+    def read(path: str) -> List[bytes]:
+        with open(path, "rb") as f:
+            return [line for line in f.read().split(b"\n") if line]
+
+    def __len__(self) -> int:
+        return len(self.files())
+
+
+class _SenderBase:
+    """Estado y estadísticas comunes a los transportes síncrono y asíncrono."""
+
+    def __init__(self, config: Optional[SenderConfig] = None):
+        self.config = config or SenderConfig()
+        self._spill = _SpillQueue(self.config.spill_dir)
+        self._down_until = 0.0
+        # send() corre en el hilo productor y el resto en el de envío
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0,
+            "sent": 0,
+            "batches": 0,
+            "retries": 0,
+            "failed_batches": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "dropped": 0,
+            "rejected_batches": 0,
+            "rejected": 0,
+        }
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def _endpoint_down(self) -> bool:
+        return time.monotonic() < self._down_until
+
+    def _mark_down(self, seconds: Optional[float] = None) -> None:
+        self._down_until = time.monotonic() + (self.config.backoff_max if seconds is None else seconds)
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        cfg = self.config
+        if retry_after is not None:
+            return retry_after
+        return backoff_delay(attempt, cfg.backoff_base, cfg.backoff_max)
+
+    def _on_delivered(self, items: List[bytes], status_code: int) -> None:
+        with self._stats_lock:
+            if status_code >= 400:
+                # Rechazo definitivo (4xx no reintentable): reenviar no lo arregla
+                self._stats["rejected_batches"] += 1
+                self._stats["rejected"] += len(items)
+            else:
+                self._stats["batches"] += 1
+                self._stats["sent"] += len(items)
+
+    def _on_failure(self, items: List[bytes]) -> None:
+        spilled = self._spill.put(items)
+        with self._stats_lock:
+            self._stats["failed_batches"] += 1
+            self._stats["spilled" if spilled else "dropped"] += len(items)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["spill_files"] = len(self._spill)
+        return stats
+
+
+class BatchSender(_SenderBase):
+    """
+    📡 Sender por lotes en un hilo de fondo (transporte requests).
+
+    ``send()`` solo encola y no bloquea; el hilo arma lotes, los envía por
+    una sesión keep-alive y gestiona reintentos y spill.
+    """
+
+    def __init__(self, config: Optional[SenderConfig] = None):
+        super().__init__(config)
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.config.max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.config.pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Content-Type"] = "application/json"
+
+    def start(self) -> "BatchSender":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="datapulse-sender", daemon=True)
+            self._thread.start()
+        return self
+
+    def send(self, item: Item, block: bool = False) -> bool:
+        """
+        Encola una lectura.
+
+        Args:
+            item: Payload dict o JSON ya serializado
+            block: Esperar si la cola local está llena (backpressure al
+                   productor) en lugar de descartar
+
+        Returns:
+            False si la lectura se descartó por cola llena
+        """
+        try:
+            self._queue.put(item, block=block)
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("enqueued")
+        return True
+
+    def send_many(self, items: List[Item]) -> int:
+        return sum(self.send(item) for item in items)
+
+    def flush(self) -> None:
+        """Bloquea hasta que todo lo encolado se haya enviado o derramado."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Envía lo pendiente y detiene el hilo."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        self.session.close()
+
+    def __enter__(self) -> "BatchSender":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Hilo de envío
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def _run(self) -> None:
+        cfg = self.config
+        stop = False
+        while not stop:
+            try:
+                first = self._queue.get(timeout=cfg.flush_interval)
+            except queue.Empty:
+                self._replay_spill()
+                continue
+
+            batch: List[bytes] = []
+            taken = 1
+            if first is _STOP:
+                stop = True
+            else:
+                batch.append(encode_item(first))
+                deadline = time.monotonic() + cfg.flush_interval
+                while len(batch) < cfg.batch_size:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    taken += 1
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.append(encode_item(item))
+
+            if batch:
+                if self._post(batch):
+                    self._replay_spill()
+                else:
+                    self._on_failure(batch)
+            for _ in range(taken):
+                self._queue.task_done()
+
+    def _post(self, items: List[bytes]) -> bool:
+        """POST con reintentos. Retorna True si el endpoint aceptó el lote."""
+        cfg = self.config
+        if self._endpoint_down():
+            return False
+        body, headers = compress_body(build_body(items), cfg.compression, cfg.compression_level)
+        for attempt in range(cfg.max_retries + 1):
+            retry_after = None
+            try:
+                response = self.session.post(cfg.endpoint, data=body, headers=headers, timeout=cfg.timeout)
+                if not is_retryable(response.status_code):
+                    self._on_delivered(items, response.status_code)
+                    return True
+                retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+            except requests.exceptions.RequestException:
+                pass
+            if retry_after is not None and retry_after > cfg.backoff_max:
+                # El servidor pide esperar más que el backoff máximo: spill hasta entonces
+                self._mark_down(retry_after)
+                return False
+            if attempt < cfg.max_retries:
+                self._count("retries")
+                time.sleep(self._retry_delay(attempt, retry_after))
+        self._mark_down()
+        return False
+
+    def _replay_spill(self) -> None:
+        """Reenvía los lotes derramados mientras el endpoint responda."""
+        if self._endpoint_down():
+            return
+        for path in self._spill.files():
+            items = self._spill.read(path)
+            if not self._post(items):
+                return
+            os.remove(path)
+            self._count("replayed", len(items))
+
+
+class AsyncBatchSender(_SenderBase):
+    """
+    📡 Sender por lotes asyncio (transporte aiohttp, dependencia opcional).
+
+    Ejemplo:
+        async with AsyncBatchSender(config) as sender:
+            await sender.send(payload)
+    """
+
+    def __init__(self, config: Optional[SenderConfig] = None):
+        super().__init__(config)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._session = None
+
+    async def start(self) -> "AsyncBatchSender":
+        try:
+            import aiohttp
+        except ImportError as e:
+            raise ImportError("AsyncBatchSender requires aiohttp: pip install aiohttp") from e
+
+        self._aiohttp = aiohttp
+        self._queue = asyncio.Queue(maxsize=self.config.max_queue_size)
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.config.pool_size, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+            headers={"Content-Type": "application/json"},
+        )
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def send(self, item: Item) -> None:
+        """Encola una lectura; espera si la cola local está llena (backpressure)."""
+        await self._queue.put(item)
+        self._count("enqueued")
+
+    async def flush(self) -> None:
+        await self._queue.join()
+
+    async def close(self) -> None:
+        if self._task is not None:
+            await self._queue.put(_STOP)
+            await self._task
+            self._task = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncBatchSender":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _run(self) -> None:
+        cfg = self.config
+        loop = asyncio.get_running_loop()
+        stop = False
+        while not stop:
+            try:
+                first = await asyncio.wait_for(self._queue.get(), timeout=cfg.flush_interval)
+            except asyncio.TimeoutError:
+                await self._replay_spill()
+                continue
+
+            batch: List[bytes] = []
+            taken = 1
+            if first is _STOP:
+                stop = True
+            else:
+                batch.append(encode_item(first))
+                deadline = loop.time() + cfg.flush_interval
+                while len(batch) < cfg.batch_size:
+                    remaining = deadline - loop.time()
+                    try:
+                        if remaining > 0:
+                            item = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                        else:
+                            item = self._queue.get_nowait()
+                    except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                        break
+                    taken += 1
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.append(encode_item(item))
+
+            if batch:
+                if await self._post(batch):
+                    await self._replay_spill()
+                else:
+                    self._on_failure(batch)
+            for _ in range(taken):
+                self._queue.task_done()
+
+    async def _post(self, items: List[bytes]) -> bool:
+        cfg = self.config
+        if self._endpoint_down():
+            return False
+        body, headers = compress_body(build_body(items), cfg.compression, cfg.compression_level)
+        for attempt in range(cfg.max_retries + 1):
+            retry_after = None
+            try:
+                async with self._session.post(cfg.endpoint, data=body, headers=headers) as response:
+                    await response.read()
+                    if not is_retryable(response.status):
+                        self._on_delivered(items, response.status)
+                        return True
+                    retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+            except (self._aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+            if retry_after is not None and retry_after > cfg.backoff_max:
+                self._mark_down(retry_after)
+                return False
+            if attempt < cfg.max_retries:
+                self._count("retries")
+                await asyncio.sleep(self._retry_delay(attempt, retry_after))
+        self._mark_down()
+        return False
+
+    async def _replay_spill(self) -> None:
+        if self._endpoint_down():
+            return
+        for path in self._spill.files():
+            items = self._spill.read(path)
+            if not await self._post(items):
+                return
+            os.remove(path)
+            self._count("replayed", len(items))
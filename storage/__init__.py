@@ -0,0 +1,23 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                    🗄️ Storage Layer - Flow-Monitor                           ║
+║                     Persistencia histórica de lecturas                       ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Adaptadores de persistencia para lecturas normalizadas (Capa 1),
+resultados enriquecidos (Capa 2) y alertas (Capa 3).
+
+Para el MVP se usa SQLite en modo WAL como paso previo a PostgreSQL
+(ver INFRASTRUCTURE_PLAN.md).
+"""
+
+from .sqlite_store import SQLiteStore
+from .export import ColumnarExporter, export_db, export_store, iter_npz_chunks
+
+__all__ = [
+    "SQLiteStore",
+    "ColumnarExporter",
+    "export_db",
+    "export_store",
+    "iter_npz_chunks",
+]
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                  📦 Columnar Export - Flow-Monitor                           ║
+║             Storage Layer: Parquet / Arrow IPC / NumPy .npz                  ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Exporta el histórico de lecturas enriquecidas en formato columnar para
+entrenamiento de modelos.
+
+- Parquet (``.parquet``) o Arrow IPC (``.arrow``/``.feather``) si pyarrow
+  está instalado
+- NumPy ``.npz`` como fallback: un ``.npy`` por columna y por bloque,
+  escrito directamente dentro del zip
+
+Los datos se escriben por bloques de ``chunk_size`` filas, así que exportar
+100M de filas nunca las mantiene todas en memoria.
+
+Usage:
+    python -m storage.export --db flow_monitor.db --out history.parquet
+    python -m storage.export --db flow_monitor.db --out history.npz
+"""
+
+import argparse
+import os
+import pathlib
+import sqlite3
+import sys
+import zipfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depende del entorno
+    pa = None
+
+# Orden de los códigos de riesgo en el formato .npz (índice = código)
+from risk import RISK_CODES, RISK_LEVELS
+from timebase import NS_PER_SECOND, parse_timestamp
+
+from .sqlite_store import ENRICHED_COLUMNS, enriched_row, iter_enriched_rows
+
+
+# Columnas exportadas (timestamps como epoch en segundos, float64)
+EXPORT_COLUMNS = (
+    "sensor_id",
+    "unit",
+    "timestamp",
+    "value",
+    "risk_level",
+    "failure_probability",
+    "confidence",
+    "processed_at",
+)
+
+_IDX = {name: i for i, name in enumerate(ENRICHED_COLUMNS)}
+
+FORMATS = ("parquet", "arrow", "npz")
+
+
+def _to_epoch(value: Any) -> float:
+    """Convierte un timestamp ISO (o epoch) a segundos; NaN si no es parseable."""
+    try:
+        return parse_timestamp(value) / NS_PER_SECOND
+    except ValueError:
+        return float("nan")
+
+
+def _columns_from_rows(rows: Sequence[Tuple]) -> Dict[str, np.ndarray]:
+    """Transpone un bloque de filas (orden ENRICHED_COLUMNS) a arrays NumPy."""
+    cols = list(zip(*rows))
+
+    def floats(name: str) -> np.ndarray:
+        return np.array(
+            [np.nan if v is None else v for v in cols[_IDX[name]]], dtype=np.float64
+        )
+
+    return {
+        "sensor_id": np.array(cols[_IDX["sensor_id"]], dtype=object),
+        "unit": np.array([u or "" for u in cols[_IDX["unit"]]], dtype=object),
+        "timestamp": np.fromiter(
+            (_to_epoch(t) for t in cols[_IDX["timestamp"]]), np.float64, len(rows)
+        ),
+        "value": floats("value"),
+        "risk_level": np.fromiter(
+            (RISK_CODES.get(r, 0) for r in cols[_IDX["risk_level"]]), np.int8, len(rows)
+        ),
+        "failure_probability": floats("failure_probability"),
+        "confidence": floats("confidence"),
+        "processed_at": np.fromiter(
+            (_to_epoch(t) for t in cols[_IDX["processed_at"]]), np.float64, len(rows)
+        ),
+    }
+
+
+def _timestamp_array(epoch_s: np.ndarray) -> Any:
+    """Epoch en segundos (float64, NaN = nulo) → pyarrow timestamp[us]."""
+    missing = np.isnan(epoch_s)
+    micros = np.where(missing, 0, epoch_s * 1e6).astype(np.int64)
+    return pa.array(micros, type=pa.timestamp("us"), mask=missing)
+
+
+def resolve_format(path: str, fmt: str = "auto") -> str:
+    """Determina el formato de salida a partir de la extensión y de pyarrow."""
+    if fmt == "auto":
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".parquet":
+            fmt = "parquet"
+        elif ext in (".arrow", ".feather", ".ipc"):
+            fmt = "arrow"
+        else:
+            fmt = "npz"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}. Must be one of {FORMATS}")
+    if fmt != "npz" and pa is None:
+        raise ValueError(f"Format '{fmt}' requires pyarrow (pip install pyarrow); use .npz")
+    return fmt
+
+
+class ColumnarExporter:
+    """
+    📦 Escritor columnar por bloques.
+
+    Acepta filas de SQLiteStore (``write_rows``) o EnrichedData / dicts
+    (``write_enriched``) y los escribe en bloques de ``chunk_size``.
+
+    Example:
+        with ColumnarExporter("history.parquet") as exporter:
+            for rows in store.iter_enriched():
+                exporter.write_rows(rows)
+    """
+
+    def __init__(self, path: str, fmt: str = "auto", chunk_size: int = 65536):
+        self.path = path
+        self.format = resolve_format(path, fmt)
+        self.chunk_size = chunk_size
+        self.rows_written = 0
+        self.chunks_written = 0
+
+        self._pending: List[Tuple] = []
+        self._writer: Any = None
+        self._zip: Optional[zipfile.ZipFile] = None
+
+        if self.format == "npz":
+            self._zip = zipfile.ZipFile(path, "w", zipfile.ZIP_STORED, allowZip64=True)
+            self._write_npy("risk_levels", np.array(RISK_LEVELS))
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Escritura
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def write_enriched(self, items: Iterable[Any]) -> None:
+        """Agrega EnrichedData (objetos o dicts) al export."""
+        for item in items:
+            self._pending.append(enriched_row(item))
+            if len(self._pending) >= self.chunk_size:
+                self._flush_pending()
+
+    def write_rows(self, rows: Sequence[Tuple]) -> None:
+        """Escribe un bloque de filas con el orden de ENRICHED_COLUMNS."""
+        if not rows:
+            return
+        self._flush_pending()
+        for start in range(0, len(rows), self.chunk_size):
+            self._write_chunk(_columns_from_rows(rows[start:start + self.chunk_size]))
+
+    def _flush_pending(self) -> None:
+        if self._pending:
+            rows, self._pending = self._pending, []
+            self._write_chunk(_columns_from_rows(rows))
+
+    def _write_chunk(self, columns: Dict[str, np.ndarray]) -> None:
+        n = len(columns["value"])
+        if self.format == "npz":
+            for name in EXPORT_COLUMNS:
+                arr = columns[name]
+                if arr.dtype == object:
+                    arr = arr.astype(str)
+                self._write_npy(f"{name}_{self.chunks_written:06d}", arr)
+        else:
+            batch = self._record_batch(columns)
+            if self._writer is None:
+                if self.format == "parquet":
+                    self._writer = pq.ParquetWriter(self.path, batch.schema)
+                else:
+                    self._writer = pa_ipc.new_file(self.path, batch.schema)
+            if self.format == "parquet":
+                self._writer.write_table(pa.Table.from_batches([batch]))
+            else:
+                self._writer.write_batch(batch)
+        self.rows_written += n
+        self.chunks_written += 1
+
+    def _write_npy(self, name: str, arr: np.ndarray) -> None:
+        with self._zip.open(f"{name}.npy", "w", force_zip64=True) as f:
+            np.lib.format.write_array(f, arr, allow_pickle=False)
+
+    @staticmethod
+    def _record_batch(columns: Dict[str, np.ndarray]) -> Any:
+        risk = pa.DictionaryArray.from_arrays(
+            pa.array(columns["risk_level"], type=pa.int8()), pa.array(RISK_LEVELS)
+        )
+        return pa.RecordBatch.from_arrays(
+            [
+                pa.array(columns["sensor_id"], type=pa.string()),
+                pa.array(columns["unit"], type=pa.string()),
+                _timestamp_array(columns["timestamp"]),
+                pa.array(columns["value"]),
+                risk,
+                pa.array(columns["failure_probability"]),
+                pa.array(columns["confidence"]),
+                _timestamp_array(columns["processed_at"]),
+            ],
+            names=list(EXPORT_COLUMNS),
+        )
+
+    def close(self) -> None:
+        """Escribe el bloque pendiente y cierra el archivo."""
+        self._flush_pending()
+        if self._zip is not None:
+            self._write_npy("num_chunks", np.array(self.chunks_written))
+            self._zip.close()
+            self._zip = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self) -> "ColumnarExporter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def export_store(store: Any, path: str, fmt: str = "auto",
+                 since: Optional[str] = None, chunk_size: int = 65536) -> int:
+    """
+    Exporta la tabla ``enriched`` de un SQLiteStore por bloques.
+
+    Returns:
+        Número de filas exportadas
+    """
+    with ColumnarExporter(path, fmt, chunk_size) as exporter:
+        for rows in store.iter_enriched(since=since, chunk_size=chunk_size):
+            exporter.write_rows(rows)
+    return exporter.rows_written
+
+
+def export_db(db_path: str, path: str, fmt: str = "auto",
+              since: Optional[str] = None, chunk_size: int = 65536) -> int:
+    """
+    Exporta ``enriched`` directo desde un archivo SQLite, en solo lectura.
+
+    A diferencia de ``export_store`` no levanta un SQLiteStore (hilo
+    escritor, esquema): no crea el archivo si no existe ni escribe en él.
+
+    Raises:
+        sqlite3.OperationalError: El archivo no existe o no es una base SQLite
+    """
+    conn = sqlite3.connect(f"{pathlib.Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        with ColumnarExporter(path, fmt, chunk_size) as exporter:
+            for rows in iter_enriched_rows(conn, since, chunk_size):
+                exporter.write_rows(rows)
+    finally:
+        conn.close()
+    return exporter.rows_written
+
+
+def iter_npz_chunks(path: str) -> Iterator[Dict[str, np.ndarray]]:
+    """Lee un export ``.npz`` bloque a bloque (sin cargar el archivo completo)."""
+    with np.load(path, allow_pickle=False) as data:
+        for i in range(int(data["num_chunks"])):
+            yield {name: data[f"{name}_{i:06d}"] for name in EXPORT_COLUMNS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="📦 Export columnar de lecturas enriquecidas")
+    parser.add_argument("--db", default="flow_monitor.db", help="Archivo SQLite de origen")
+    parser.add_argument("--out", required=True, help="Archivo destino (.parquet, .arrow, .npz)")
+    parser.add_argument("--format", default="auto", choices=("auto",) + FORMATS)
+    parser.add_argument("--since", default=None, help="Timestamp ISO mínimo")
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    args = parser.parse_args()
+
+    try:
+        total = export_db(args.db, args.out, args.format, args.since, args.chunk_size)
+    except sqlite3.OperationalError as e:
+        sys.exit(f"❌ No se pudo leer {args.db}: {e}")
+    print(f"✅ {total:,} filas exportadas a {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,435 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                   🗄️ SQLite Store - Flow-Monitor                             ║
+║                  Storage Layer: Batched Background Writer                    ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Adaptador de persistencia SQLite para lecturas, datos enriquecidos y alertas.
+
+El path de request nunca toca la base de datos: los métodos ``save_*`` solo
+encolan el objeto (``put_nowait``) y un hilo escritor dedicado drena la cola,
+agrupa por tabla y escribe en lotes con ``executemany`` sobre sentencias
+preparadas, en una única transacción por lote.
+
+Example:
+    store = SQLiteStore("flow_monitor.db")
+    store.save_reading(normalized)
+    store.save_enriched(enriched)
+    store.flush()
+    rows = store.query_readings("SENSOR_TEMP_01", limit=10)
+    store.close()
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Esquema
+# ═══════════════════════════════════════════════════════════════════════════════
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS readings (
+    id INTEGER PRIMARY KEY,
+    sensor_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    value REAL NOT NULL,
+    unit TEXT,
+    location TEXT,
+    source TEXT,
+    reading_type TEXT,
+    metadata TEXT
+);
+
+CREATE TABLE IF NOT EXISTS enriched (
+    id INTEGER PRIMARY KEY,
+    sensor_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    value REAL NOT NULL,
+    unit TEXT,
+    location TEXT,
+    risk_level TEXT NOT NULL,
+    failure_probability REAL,
+    confidence REAL,
+    alert_message TEXT,
+    processed_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS alerts (
+    id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    sensor_id TEXT NOT NULL,
+    risk_level TEXT NOT NULL,
+    message TEXT,
+    channel TEXT,
+    status TEXT,
+    recipient TEXT,
+    error_message TEXT
+);
+
+-- Índices "covering": las consultas del dashboard se resuelven sin tocar la tabla
+CREATE INDEX IF NOT EXISTS idx_readings_sensor_ts
+    ON readings (sensor_id, timestamp, value);
+CREATE INDEX IF NOT EXISTS idx_enriched_sensor_ts
+    ON enriched (sensor_id, timestamp, value, risk_level);
+CREATE INDEX IF NOT EXISTS idx_enriched_risk_ts
+    ON enriched (risk_level, timestamp, sensor_id, value);
+CREATE INDEX IF NOT EXISTS idx_alerts_risk_ts
+    ON alerts (risk_level, timestamp, sensor_id);
+"""
+
+# Sentencias preparadas (sqlite3 las cachea por texto en cada conexión)
+INSERT_READING = (
+    "INSERT INTO readings (sensor_id, timestamp, value, unit, location, source, "
+    "reading_type, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+ENRICHED_COLUMNS = (
+    "sensor_id", "timestamp", "value", "unit", "location", "risk_level",
+    "failure_probability", "confidence", "alert_message", "processed_at",
+)
+
+INSERT_ENRICHED = (
+    "INSERT INTO enriched (sensor_id, timestamp, value, unit, location, risk_level, "
+    "failure_probability, confidence, alert_message, processed_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+INSERT_ALERT = (
+    "INSERT OR REPLACE INTO alerts (id, timestamp, sensor_id, risk_level, message, "
+    "channel, status, recipient, error_message) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+logger = logging.getLogger(__name__)
+
+KIND_READING = 0
+KIND_ENRICHED = 1
+KIND_ALERT = 2
+
+_INSERTS = {
+    KIND_READING: INSERT_READING,
+    KIND_ENRICHED: INSERT_ENRICHED,
+    KIND_ALERT: INSERT_ALERT,
+}
+
+_STOP = object()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Conversión objeto → fila (se ejecuta en el hilo escritor)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _reading_row(reading: Any) -> Tuple:
+    """Convierte un NormalizedReading (o su dict) en una fila de ``readings``."""
+    data = reading if isinstance(reading, dict) else reading.to_dict()
+    metadata = data.get("metadata")
+    return (
+        data["sensor_id"],
+        data["timestamp"],
+        data["value"],
+        data.get("unit"),
+        data.get("location"),
+        data.get("source"),
+        data.get("reading_type"),
+        json.dumps(metadata, default=str) if metadata else None,
+    )
+
+
+def enriched_row(enriched: Any) -> Tuple:
+    """Convierte un EnrichedData (o su dict) en una fila de ``enriched`` (la reusa ``storage.export``)."""
+    data = enriched if isinstance(enriched, dict) else enriched.to_dict()
+    original = data.get("data_original", {})
+    prediction = data.get("prediction_alert", {})
+    return (
+        original.get("sensor_id", "UNKNOWN"),
+        original.get("timestamp", ""),
+        original.get("value", 0.0),
+        original.get("unit"),
+        original.get("location"),
+        data.get("risk_level", "LOW"),
+        prediction.get("failure_probability"),
+        prediction.get("confidence"),
+        prediction.get("alert_message"),
+        data.get("processed_at"),
+    )
+
+
+def _alert_row(alert: Any) -> Tuple:
+    """Convierte un AlertNotification (o su dict) en una fila de ``alerts``."""
+    data = alert if isinstance(alert, dict) else alert.to_dict()
+    return (
+        data["id"],
+        data["timestamp"],
+        data["sensor_id"],
+        data["risk_level"],
+        data.get("message"),
+        data.get("channel"),
+        data.get("status"),
+        data.get("recipient"),
+        data.get("error_message"),
+    )
+
+
+_ROW_BUILDERS = {
+    KIND_READING: _reading_row,
+    KIND_ENRICHED: enriched_row,
+    KIND_ALERT: _alert_row,
+}
+
+
+def iter_enriched_rows(
+    conn: sqlite3.Connection, since: Optional[str] = None, chunk_size: int = 65536
+) -> Iterator[List[Tuple]]:
+    """Filas de ``enriched`` (columnas ENRICHED_COLUMNS) en bloques, desde una conexión abierta."""
+    cursor = conn.execute(
+        f"SELECT {', '.join(ENRICHED_COLUMNS)} FROM enriched "
+        "WHERE timestamp >= ? ORDER BY id",
+        (since or "",),
+    )
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield rows
+
+
+class SQLiteStore:
+    """
+    🗄️ Persistencia SQLite con escritor en segundo plano.
+
+    - WAL + ``synchronous=NORMAL``: los lectores no bloquean al escritor
+    - Un único hilo escritor con su propia conexión
+    - Lotes de hasta ``batch_size`` filas o ``flush_interval`` segundos
+    - Si la cola se llena, el dato se descarta y se contabiliza en
+      ``dropped`` (nunca se bloquea el request path)
+
+    Args:
+        path: Ruta del archivo SQLite
+        batch_size: Máximo de filas por transacción
+        flush_interval: Segundos máximos que un dato espera en la cola
+        max_queue_size: Capacidad de la cola de escritura
+    """
+
+    def __init__(
+        self,
+        path: str = "flow_monitor.db",
+        batch_size: int = 2000,
+        flush_interval: float = 0.2,
+        max_queue_size: int = 200_000,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+
+        # Estadísticas (solo el hilo escritor modifica written/batches; los
+        # productores de varios hilos actualizan enqueued/dropped con lock)
+        self._stats_lock = threading.Lock()
+        self._enqueued = 0
+        self._dropped = 0
+        self._written = 0
+        self._batches = 0
+
+        # Conexión de lectura compartida (protegida por lock)
+        self._read_lock = threading.Lock()
+        self._read_conn = self._connect()
+        self._read_conn.executescript(SCHEMA)
+
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._writer_loop, name="sqlite-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre una conexión con los PRAGMAs de rendimiento."""
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # API de escritura (no bloqueante)
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def _enqueue(self, kind: int, obj: Any) -> bool:
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait((kind, obj))
+        except queue.Full:
+            with self._stats_lock:
+                self._dropped += 1
+            return False
+        with self._stats_lock:
+            self._enqueued += 1
+        return True
+
+    def save_reading(self, reading: Any) -> bool:
+        """Encola un NormalizedReading para persistir."""
+        return self._enqueue(KIND_READING, reading)
+
+    def save_enriched(self, enriched: Any) -> bool:
+        """Encola un EnrichedData (objeto o dict) para persistir."""
+        return self._enqueue(KIND_ENRICHED, enriched)
+
+    def save_alert(self, alert: Any) -> bool:
+        """Encola un AlertNotification para persistir."""
+        return self._enqueue(KIND_ALERT, alert)
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Hilo escritor
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def _writer_loop(self) -> None:
+        conn = self._connect()
+        get = self._queue.get
+        get_nowait = self._queue.get_nowait
+        running = True
+
+        while running:
+            try:
+                first = get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                # Bloquear en la cola hasta el deadline (sin sondeo activo)
+                remaining = deadline - time.monotonic()
+                try:
+                    item = get(timeout=remaining) if remaining > 0 else get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+                if item is _STOP:
+                    break
+
+            rows: Dict[int, List[Tuple]] = {}
+            for item in batch:
+                if item is _STOP:
+                    running = False
+                    continue
+                kind, obj = item
+                try:
+                    rows.setdefault(kind, []).append(_ROW_BUILDERS[kind](obj))
+                except Exception:
+                    logger.exception("SQLiteStore: fila descartada")
+
+            try:
+                with conn:
+                    for kind, kind_rows in rows.items():
+                        conn.executemany(_INSERTS[kind], kind_rows)
+                        self._written += len(kind_rows)
+                self._batches += 1
+            except sqlite3.Error:
+                logger.exception("SQLiteStore: error escribiendo lote de %d filas", len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+        conn.close()
+
+    def flush(self) -> None:
+        """Bloquea hasta que todo lo encolado esté escrito."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Escribe lo pendiente y detiene el hilo escritor."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        with self._read_lock:
+            self._read_conn.close()
+
+    # ═══════════════════════════════════════════════════════════════════════════
+    # Consultas
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def _query(self, sql: str, params: Tuple) -> List[Dict[str, Any]]:
+        with self._read_lock:
+            cursor = self._read_conn.execute(sql, params)
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def query_readings(
+        self,
+        sensor_id: str,
+        since: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Últimas lecturas de un sensor (usa idx_readings_sensor_ts)."""
+        return self._query(
+            "SELECT sensor_id, timestamp, value FROM readings "
+            "WHERE sensor_id = ? AND timestamp >= ? "
+            "ORDER BY timestamp DESC LIMIT ?",
+            (sensor_id, since or "", limit),
+        )
+
+    def query_enriched_by_risk(
+        self,
+        risk_level: str,
+        since: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Últimos resultados enriquecidos por nivel de riesgo (usa idx_enriched_risk_ts)."""
+        return self._query(
+            "SELECT risk_level, timestamp, sensor_id, value FROM enriched "
+            "WHERE risk_level = ? AND timestamp >= ? "
+            "ORDER BY timestamp DESC LIMIT ?",
+            (risk_level, since or "", limit),
+        )
+
+    def query_alerts(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Últimas alertas persistidas."""
+        return self._query(
+            "SELECT * FROM alerts ORDER BY timestamp DESC LIMIT ?",
+            (limit,),
+        )
+
+    def iter_enriched(
+        self,
+        since: Optional[str] = None,
+        chunk_size: int = 65536,
+    ) -> Iterator[List[Tuple]]:
+        """
+        Recorre la tabla ``enriched`` en bloques de ``chunk_size`` filas.
+
+        Usa una conexión propia (WAL permite leer mientras el escritor
+        sigue insertando), así que nunca mantiene toda la tabla en memoria.
+
+        Yields:
+            Listas de tuplas con las columnas de ENRICHED_COLUMNS
+        """
+        conn = sqlite3.connect(self.path)
+        try:
+            yield from iter_enriched_rows(conn, since, chunk_size)
+        finally:
+            conn.close()
+
+    def count(self, table: str) -> int:
+        """Cantidad de filas en una tabla (readings, enriched, alerts)."""
+        if table not in ("readings", "enriched", "alerts"):
+            raise ValueError(f"Unknown table: {table}")
+        with self._read_lock:
+            return self._read_conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estadísticas del escritor."""
+        return {
+            "enqueued": self._enqueued,
+            "written": self._written,
+            "dropped": self._dropped,
+            "batches": self._batches,
+            "queue_depth": self._queue.qsize(),
+        }
@@ -0,0 +1,149 @@
+"""Tests de la Capa 3: modelos compactos y DataObserver."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from action_layer.data_observer import DataObserver
+from action_layer.models import DashboardReading
+from intelligence_core.models import RiskLevel
+
+
+ENRICHED = {
+    "data_original": {
+        "sensor_id": "SENSOR_TEMP_01",
+        "timestamp": "2025-12-18T01:00:00+00:00",
+        "value": 45.0,
+        "unit": "Celsius",
+        "location": "Planta-A",
+    },
+    "risk_level": "MEDIUM",
+    "prediction_alert": {"failure_probability": 0.3, "predicted_time_to_failure": "5-15 minutos"},
+    "processed_at": "2025-12-18T01:00:01+00:00",
+}
+
+
+def test_dashboard_reading_keeps_json_shape():
+    reading = DashboardReading.from_enriched_data(ENRICHED)
+    data = reading.to_dict()
+
+    assert not hasattr(reading, "__dict__")
+    assert data["timestamp"] == "2025-12-18T01:00:00+00:00"
+    assert data["processed_at"] == "2025-12-18T01:00:01+00:00"
+    assert data["risk_level"] == "MEDIUM"
+    assert data["risk_emoji"] == "🟡"
+    assert data["prediction"]["time_to_failure"] == "5-15 minutos"
+    assert data["id"] != DashboardReading.from_enriched_data(ENRICHED).id
+
+    # Sin timestamp se usa 'ahora'; uno ilegible se rechaza en vez de reemplazarse
+    data_original = {k: v for k, v in ENRICHED["data_original"].items() if k != "timestamp"}
+    assert DashboardReading.from_enriched_data({**ENRICHED, "data_original": data_original}).ts > 0
+    with pytest.raises(ValueError):
+        DashboardReading.from_enriched_data({**ENRICHED, "data_original": {**data_original, "timestamp": "ayer"}})
+
+
+def test_risk_level_codes_roundtrip():
+    for level in RiskLevel:
+        assert RiskLevel.from_code(level.code) is level
+
+
+def test_observer_history():
+    observer = DataObserver(max_buffer_size=3, history_size=5)
+    for i in range(8):
+        data = dict(ENRICHED, data_original=dict(ENRICHED["data_original"], value=float(i)))
+        observer.process(data)
+
+    assert len(observer.get_readings()) == 3
+    history = observer.get_history(limit=100)
+    assert [r["value"] for r in history] == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert history[-1]["timestamp"] == ENRICHED["data_original"]["timestamp"]
+    assert observer.get_history(sensor_id="OTHER") == []
+    assert len(observer.get_readings_by_risk("MEDIUM")) == 3
+
+
+def test_typed_pipeline_matches_dict_pipeline():
+    from ingestion.plugins.http_json_plugin import HttpJsonPlugin
+    from intelligence_core import IntelligenceService
+
+    raw = dict(ENRICHED["data_original"], value=95.0)
+    normalized = HttpJsonPlugin().normalize_data(raw)
+    service = IntelligenceService()
+
+    typed = DataObserver().process_enriched(service.process_reading(normalized))
+    legacy = DataObserver().process(service.process(raw).to_dict())
+
+    assert typed.risk_level == legacy.risk_level == "CRITICAL"
+    assert typed.timestamp == legacy.timestamp
+    assert typed.to_dict().keys() == legacy.to_dict().keys()
+
+
+def _publish_readings(path, count, risk_level):
+    from action_layer.shared_state import SharedState
+
+    observer = DataObserver(shared=SharedState(path, capacity=64))
+    for i in range(count):
+        observer.process(dict(ENRICHED, risk_level=risk_level,
+                              data_original=dict(ENRICHED["data_original"], value=float(i))))
+
+
+def test_shared_state_across_worker_processes(tmp_path):
+    import multiprocessing
+
+    from action_layer.shared_state import SharedState
+
+    path = str(tmp_path / "flow-monitor.state")
+    dashboard = DataObserver(shared=SharedState(path, capacity=64))
+    cursor = dashboard.shared.reading_seq
+
+    levels = ["LOW", "MEDIUM", "HIGH", "LOW"]
+    workers = [multiprocessing.Process(target=_publish_readings, args=(path, 200, level))
+               for level in levels]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+        assert w.exitcode == 0
+
+    stats = dashboard.get_stats()
+    assert stats["total_readings"] == 800
+    assert stats["readings_by_risk"] == {"LOW": 400, "MEDIUM": 200, "HIGH": 200, "CRITICAL": 0}
+    assert len(dashboard.get_readings(limit=500)) == 64
+    assert all(r["risk_level"] == "HIGH" for r in dashboard.get_readings_by_risk("HIGH"))
+
+    # Un cliente SSE atrasado salta a lo más antiguo aún en el ring
+    cursor, events = dashboard.shared.tail(cursor)
+    assert cursor == 800 and len(events) == 64
+    assert dashboard.shared.tail(cursor) == (800, [])
+
+    dashboard.clear()
+    assert dashboard.get_readings() == [] and dashboard.get_stats()["total_readings"] == 0
+
+
+def test_shared_state_refuses_other_geometry(tmp_path):
+    from action_layer.shared_state import SharedState
+
+    path = str(tmp_path / "flow-monitor.state")
+    shared = SharedState(path, capacity=64)
+    size = os.path.getsize(path)
+    # Truncar un archivo que otro worker tiene mapeado le daría SIGBUS
+    with pytest.raises(ValueError, match="geometry"):
+        SharedState(path, capacity=128)
+    assert os.path.getsize(path) == size and shared.stats()["total_readings"] == 0
+    shared.close()
+
+
+def test_dispatcher_counts_exactly_from_several_threads():
+    """La etapa notify despacha desde varios hilos del executor."""
+    from action_layer.notification_dispatcher import NotificationDispatcher
+
+    dispatcher = NotificationDispatcher()
+    critical = {**ENRICHED, "risk_level": "CRITICAL"}
+    high = {**ENRICHED, "risk_level": "HIGH"}
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(dispatcher.dispatch, [critical, high] * 500))
+
+    stats = dispatcher.get_stats()
+    assert stats["total_dispatched"] == 1000
+    assert (stats["whatsapp_sent"], stats["email_sent"]) == (500, 1000)
+    assert len(dispatcher.get_notifications(limit=2000)) == 1000
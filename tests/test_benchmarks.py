@@ -0,0 +1,16 @@
+"""Tests de la comparación contra baseline de la suite de benchmarks."""
+
+from benchmarks.suite import HIGHER, LOWER, compare
+
+
+def _doc(**metrics):
+    return {"metrics": {name: {"value": v, "unit": "", "better": b} for name, (v, b) in metrics.items()}}
+
+
+def test_compare_respects_direction_and_tolerance():
+    baseline = _doc(lat=(10.0, LOWER), rps=(1000.0, HIGHER), drop=(0.0, LOWER), same=(5.0, LOWER))
+    current = _doc(lat=(12.0, LOWER), rps=(1300.0, HIGHER), drop=(3.0, LOWER), same=(5.2, LOWER),
+                   new=(1.0, LOWER))
+
+    status = {row["name"]: row["status"] for row in compare(current, baseline, tolerance=0.1)}
+    assert status == {"lat": "regression", "rps": "improved", "drop": "regression", "same": "ok"}
@@ -0,0 +1,193 @@
+"""Tests de cuerpos comprimidos: parser incremental, límites de descompresión y /api/ingest/stream."""
+
+import asyncio
+import gzip
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from ingestion.bodies import BodyDecoder, JsonStreamParser
+from ingestion.models import RejectedPayload
+from timebase import parse_timestamp
+
+
+def _payload(i):
+    return {"sensor_id": f"S{i % 7}", "timestamp": "2025-12-18T01:00:00", "value": i + 0.5,
+            "unit": "Celsius", "location": "Planta-ñ"}
+
+
+def _parse(body, size, **kwargs):
+    parser = JsonStreamParser(**kwargs)
+    items = []
+    for i in range(0, len(body), size):
+        items.extend(parser.feed(body[i:i + size]))
+    return items + parser.close()
+
+
+def test_parser_handles_any_chunk_boundary():
+    payloads = [_payload(i) for i in range(20)] + [123, -4.5e3, "x,]", None]
+    array = json.dumps(payloads, indent=1).encode()
+    ndjson = b"\n".join(json.dumps(p).encode() for p in payloads) + b"\n"
+    for size in (1, 2, 3, 7, 64, len(array)):
+        assert _parse(array, size) == payloads
+        assert _parse(ndjson, size) == payloads
+
+    items = _parse(b'{"a": 1}\n{bad\n\n{"a": 2}', 5, ndjson=True)
+    assert items[0] == {"a": 1} and items[2] == {"a": 2}
+    assert isinstance(items[1], RejectedPayload) and items[1].index == 1
+    # Líneas inválidas que juntas formarían JSON válido se rechazan una por una
+    items = _parse(b'{"a":1},{"b":2}\n[{"c":1}\n{"d":1}]\n{"e":1}\n', 4, ndjson=True)
+    assert [i.index for i in items[:3]] == [0, 1, 2] and items[3] == {"e": 1}
+    for broken in (b"[1, 2", b"[1 2]", b'[{"a": }]', b"[1] 2"):
+        with pytest.raises(ValueError):
+            _parse(broken, 2)
+    with pytest.raises(ValueError):
+        _parse(b'{"a": "' + b"x" * 100, 10, max_item_bytes=50)
+
+
+def test_decoder_bounds_output_and_rejects_bombs():
+    body = b"\n".join(json.dumps(_payload(i)).encode() for i in range(5000))
+    decoder = BodyDecoder("gzip", chunk_bytes=4096)
+    out, sizes = [], []
+    for i in range(0, len(compressed := gzip.compress(body)), 1000):
+        piece = decoder.feed(compressed[i:i + 1000])
+        sizes.append(len(piece))
+        out.append(piece)
+        while decoder.pending:
+            out.append(decoder.feed(b""))
+            sizes.append(len(out[-1]))
+    out.append(decoder.flush())
+    assert b"".join(out) == body and max(sizes) <= 4096
+
+    bomb = gzip.compress(b"\0" * (50 << 20))
+    with pytest.raises(HTTPException) as exc:
+        decoder = BodyDecoder("gzip")
+        decoder.feed(bomb)
+        while decoder.pending:
+            decoder.feed(b"")
+    assert exc.value.status_code == 413 and decoder.bytes_out <= (2 << 20)
+
+    with pytest.raises(HTTPException) as exc:
+        small = BodyDecoder("gzip", max_bytes=1000, max_ratio=1e9)
+        small.feed(gzip.compress(body))
+    assert exc.value.status_code == 413
+    with pytest.raises(HTTPException) as exc:
+        BodyDecoder("br")
+    assert exc.value.status_code == 415
+    with pytest.raises(HTTPException) as exc:
+        truncated = BodyDecoder("gzip")
+        truncated.feed(gzip.compress(body)[:500])
+        truncated.flush()
+    assert exc.value.status_code == 400
+
+
+def test_decoder_bounds_zstd_bombs():
+    zstandard = pytest.importorskip("zstandard")
+    body = b"\n".join(json.dumps(_payload(i)).encode() for i in range(5000))
+    decoder = BodyDecoder("zstd", chunk_bytes=4096)
+    out = [decoder.feed(zstandard.ZstdCompressor().compress(body))]
+    while decoder.pending:
+        out.append(decoder.feed(b""))
+    assert b"".join(out) == body
+
+    # ~32000:1 (bloques RLE de 128 KiB): ni la relación ni el tamaño dejan pasar más de un bloque
+    bomb = zstandard.ZstdCompressor().compress(b"\0" * (200 << 20))
+    with pytest.raises(HTTPException) as exc:
+        decoder = BodyDecoder("zstd")
+        decoder.feed(bomb)
+        while decoder.pending:
+            decoder.feed(b"")
+    assert exc.value.status_code == 413 and decoder.bytes_out <= (2 << 20)
+    with pytest.raises(HTTPException) as exc:
+        decoder = BodyDecoder("zstd", max_bytes=1 << 20, max_ratio=1e9)
+        decoder.feed(bomb)
+        while decoder.pending:
+            decoder.feed(b"")
+    assert exc.value.status_code == 413 and decoder.bytes_out <= (1 << 20) + (128 << 10)
+
+
+def _call(app, path, body, headers, chunk=16 * 1024):
+    """POST directo a la app ASGI, con el cuerpo en trozos como los entrega el servidor."""
+    chunks = [body[i:i + chunk] for i in range(0, len(body), chunk)] or [b""]
+    received = []
+
+    async def receive():
+        if chunks:
+            data = chunks.pop(0)
+            return {"type": "http.request", "body": data, "more_body": bool(chunks)}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        received.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "server": ("test", 80), "client": ("127.0.0.1", 1),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+    asyncio.run(app(scope, receive, send))
+    status = next(m["status"] for m in received if m["type"] == "http.response.start")
+    payload = b"".join(m.get("body", b"") for m in received if m["type"] == "http.response.body")
+    return status, json.loads(payload) if payload else None
+
+
+def test_stream_route_ingests_gzip_ndjson_and_arrays():
+    from ingestion import api
+
+    api.readings_buffer.clear()
+    payloads = [_payload(i) for i in range(2500)]
+    ndjson = b"\n".join(json.dumps(p).encode() for p in payloads)
+    ndjson = ndjson.replace(b'"value": 7.5', b'"value": "bad"')
+
+    status, result = _call(api.app, "/api/ingest/stream", gzip.compress(ndjson),
+                           {"Content-Encoding": "gzip", "Content-Type": "application/x-ndjson"})
+    assert status == 200
+    assert (result["accepted"], result["rejected"]) == (2499, 1)
+    assert result["errors"][0]["index"] == 7
+
+    status, result = _call(api.app, "/api/ingest/batch", gzip.compress(json.dumps(payloads).encode()),
+                           {"Content-Encoding": "gzip", "Content-Type": "application/json"})
+    assert status == 200 and result["accepted"] == 2500
+
+    status, result = _call(api.app, "/api/ingest/stream", gzip.compress(b"[" + b" " * (30 << 20) + b"]"),
+                           {"Content-Encoding": "gzip"})
+    assert status == 413
+    api.readings_buffer.clear()
+
+
+def test_fast_route_validates_once_and_returns_prebuilt_bodies():
+    from ingestion import api
+
+    api.readings_buffer.clear()
+    payload = _payload(1)
+    status, result = _call(api.app, "/api/ingest/fast", json.dumps(payload).encode(),
+                           {"Content-Type": "application/json"})
+    assert (status, result) == (202, {"success": True, "accepted": 1, "rejected": 0})
+    assert parse_timestamp(api.readings_buffer[-1].to_dict()["timestamp"]) == parse_timestamp(payload["timestamp"])
+    # Mismo camino en proceso, sin request HTTP
+    assert api.ingest_payload(payload).normalized_data == api.readings_buffer.pop().to_dict()
+    # Campos con otro tipo: 400, no 500, por /api/ingest y por /api/ingest/fast
+    for field in ("sensor_id", "location"):
+        with pytest.raises(HTTPException) as exc:
+            api.ingest_payload({**payload, field: 5})
+        assert exc.value.status_code == 400 and f"{field} must be a string" in exc.value.detail
+    for bad in ({"_meta": "x"}, {"unit": 7}):
+        with pytest.raises(HTTPException) as exc:
+            api.ingest_payload({**payload, **bad})
+        assert exc.value.status_code == 400
+        assert _call(api.app, "/api/ingest/fast", json.dumps({**payload, **bad}).encode(), {})[0] == 400
+
+    status, result = _call(api.app, "/api/ingest/fast", json.dumps([payload, {"value": 1}]).encode(),
+                           {"Content-Type": "application/json"})
+    assert (status, result) == (202, {"success": False, "accepted": 1, "rejected": 1})
+    status, result = _call(api.app, "/api/ingest/fast", json.dumps(payload).encode(),
+                           {"Content-Type": "application/json", "Prefer": "return=minimal"})
+    assert (status, result) == (204, None)
+
+    assert _call(api.app, "/api/ingest/fast", b"{nope", {})[0] == 400
+    status, result = _call(api.app, "/api/ingest/fast", json.dumps({**payload, "value": "x"}).encode(), {})
+    assert status == 400 and "Invalid payload" in result["detail"]
+    assert len(api.readings_buffer) == 3
+    api.readings_buffer.clear()
@@ -0,0 +1,95 @@
+"""Tests de grabación y replay de tráfico (.fmcap)."""
+
+import json
+import time
+
+import numpy as np
+import pytest
+
+from ingestion.plugins.http_json_plugin import HttpJsonPlugin
+from intelligence_core import IntelligenceService
+from sensors.capture import CaptureReader, CaptureWriter
+from sensors.fleet import FleetSimulator
+
+
+def _payload(i):
+    return {
+        "sensor_id": f"SENSOR_TEMP_{i % 3:02d}",
+        "timestamp": f"2025-12-18T01:00:{i:02d}",
+        "value": 20.5 + i,
+        "unit": "Celsius",
+        "location": "Planta-A",
+        "_meta": {"is_anomaly": i == 7},
+    }
+
+
+def test_roundtrip_ingest_format(tmp_path):
+    path = str(tmp_path / "t.fmcap")
+    plugin = HttpJsonPlugin()
+    with CaptureWriter(path, chunk_size=4) as capture:
+        for i in range(10):
+            capture.record(_payload(i), at=i * 0.5)
+
+    reader = CaptureReader(path)
+    assert len(reader) == 10 and len(reader.sensors) == 3
+    assert reader.duration == 4.5
+
+    for i, body in enumerate(reader.iter_json("ingest")):
+        reading = plugin.normalize_data(json.loads(body))
+        original = plugin.normalize_data(_payload(i))
+        assert (reading.sensor_id, reading.timestamp, reading.value) == \
+               (original.sensor_id, original.timestamp, original.value)
+        assert reading.metadata["is_anomaly"] == (i == 7)
+    # El replay emite el mismo texto UTC que la API
+    assert json.loads(next(reader.iter_json("ingest")))["timestamp"] == \
+           plugin.normalize_data(_payload(0)).to_dict()["timestamp"]
+
+
+def test_unparseable_timestamp_is_rejected_not_replaced(tmp_path):
+    from sensors.capture import _record_ndjson
+
+    with CaptureWriter(str(tmp_path / "x.fmcap")) as capture:
+        with pytest.raises(ValueError):
+            capture.record({**_payload(0), "timestamp": "ayer"})
+    assert capture.count == 0
+
+    source = tmp_path / "in.ndjson"
+    source.write_text("\n".join(json.dumps(p) for p in
+                                (_payload(0), {**_payload(1), "timestamp": "ayer"}, _payload(2))))
+
+    class Args:
+        out, from_ndjson, enrich = str(tmp_path / "n.fmcap"), str(source), False
+
+    writer = _record_ndjson(Args)
+    writer.close()
+    assert (writer.count, writer.skipped) == (2, 1)
+    assert CaptureReader(Args.out).duration == 2.0
+
+
+def test_dashboard_format_keeps_enriched_risk(tmp_path):
+    path = str(tmp_path / "e.fmcap")
+    service = IntelligenceService()
+    with CaptureWriter(path) as capture:
+        for value in (25.0, 95.0):
+            enriched = service.process({**_payload(0), "value": value})
+            capture.record_enriched(enriched)
+
+    bodies = [json.loads(b) for b in CaptureReader(path).materialize("dashboard")]
+    assert [b["risk_level"] for b in bodies] == ["LOW", "CRITICAL"]
+    assert bodies[1]["data_original"]["value"] == 95.0
+
+
+def test_fleet_block_and_paced_replay(tmp_path):
+    path = str(tmp_path / "f.fmcap")
+    fleet = FleetSimulator(sensors=50, seed=5)
+    with CaptureWriter(path) as capture:
+        codes = np.array([capture.sensor_code(s, u, loc) for s, u, loc in
+                          zip(fleet.sensor_ids, fleet.units, fleet.locations)])
+        for tick in range(3):
+            values, anomalies = fleet.tick()
+            capture.record_block(codes, 1_700_000_000.0 + tick, values, at=tick * 0.1, flags=anomalies)
+
+    reader = CaptureReader(path)
+    start = time.perf_counter()
+    assert sum(1 for _ in reader.iter_json(speed=1.0)) == 150
+    assert time.perf_counter() - start >= 0.19
@@ -0,0 +1,50 @@
+"""Tests del simulador de flota DataPulse."""
+
+import json
+
+import numpy as np
+
+from ingestion.plugins.http_json_plugin import HttpJsonPlugin
+from sensors.fleet import AnomalyScenario, FleetSimulator
+
+
+def test_fleet_is_deterministic_with_seed():
+    a = FleetSimulator(sensors=500, seed=7, anomaly_rate=0.01)
+    b = FleetSimulator(sensors=500, seed=7, anomaly_rate=0.01)
+    for _ in range(5):
+        va, ma = a.tick()
+        vb, mb = b.tick()
+        assert np.array_equal(va, vb) and np.array_equal(ma, mb)
+    assert {s.split("_")[1] for s in a.sensor_ids} == {"TEMP", "VIB", "FLOW", "PRESS"}
+
+
+def test_scenarios_mark_selected_sensors():
+    fleet = FleetSimulator(sensors=1000, seed=1)
+    stuck = fleet.add_scenario(AnomalyScenario.parse("stuck:2:3:vibration:0.1"))
+    spike = fleet.add_scenario(AnomalyScenario("spike", 0, 1, "temperature", 0.05))
+
+    values, anomalies = fleet.tick()
+    assert anomalies.sum() == len(spike)
+    assert (values[spike] >= fleet.anomaly_min[spike]).all()
+
+    fleet.tick()
+    frozen, _ = fleet.tick()
+    later, anomalies = fleet.tick()
+    assert anomalies[stuck].all()
+    assert np.array_equal(frozen[stuck], later[stuck])
+
+
+def test_payloads_and_ndjson_normalize():
+    plugin = HttpJsonPlugin()
+    fleet = FleetSimulator(sensors=200, seed=3)
+    values, anomalies = fleet.tick()
+
+    payloads = fleet.to_payloads(values, anomalies)
+    lines = fleet.to_ndjson(values, anomalies).splitlines()
+    assert len(payloads) == len(lines) == 200
+    assert payloads[0]["_meta"]["step"] == json.loads(lines[0])["_meta"]["step"] == 0
+
+    for payload, line in zip(payloads[::37], lines[::37]):
+        reading = plugin.normalize_data(json.loads(line))
+        assert reading.sensor_id == payload["sensor_id"]
+        assert reading.value == payload["value"]
@@ -0,0 +1,50 @@
+"""Tests del histograma de latencias compartido por las herramientas de carga."""
+
+import random
+
+from benchmarks.histogram import LatencyHistogram, OpenLoopSchedule
+
+
+def test_percentiles_within_relative_error_and_merge_matches():
+    rng = random.Random(7)
+    values = sorted(int(rng.lognormvariate(8, 1.5)) for _ in range(20000))
+    whole, left, right = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i, v in enumerate(values):
+        whole.record_us(v)
+        (left if i % 2 else right).record_us(v)
+
+    for q in (50, 90, 99, 99.9):
+        exact = values[int(len(values) * q / 100 + 0.5) - 1] / 1000
+        assert abs(whole.percentile(q) - exact) <= exact * 0.02 + 0.001
+    assert whole.summary()["max"] == values[-1] / 1000
+
+    merged = LatencyHistogram.from_bytes(left.to_bytes()).merge(right)
+    assert merged.summary() == whole.summary()
+
+
+def test_open_loop_schedule_is_drift_free():
+    schedule = OpenLoopSchedule(rate=1000, start=100.0)
+    assert schedule.intended(0) == 100.0
+    assert abs(schedule.intended(5000) - 105.0) < 1e-9
+
+
+def test_load_hard_results_merge_per_worker_parts():
+    from load_hard_test import LoadTestResults
+
+    parts = [LoadTestResults() for _ in range(4)]
+    for i, part in enumerate(parts):
+        for j in range(100):
+            part.total_requests += 1
+            part.latency.record_us(1000 + j)
+            if j % 10:
+                part.successful += 1
+            else:
+                part.failed += 1
+                part.errors["TIMEOUT"] = part.errors.get("TIMEOUT", 0) + 1
+
+    total = LoadTestResults()
+    for part in parts:
+        total.merge(part)
+    assert (total.total_requests, total.successful, total.failed) == (400, 360, 40)
+    assert total.errors == {"TIMEOUT": 40}
+    assert total.latency.count == 400
@@ -0,0 +1,126 @@
+"""Tests de las métricas Prometheus en proceso (observability.metrics)."""
+
+import threading
+
+import pytest
+
+from observability import Registry
+
+
+def test_histogram_and_counter_render_exposition_format():
+    registry = Registry()
+    latency = registry.histogram("flow_stage_seconds", "Etapa", ["stage"], buckets=(0.001, 0.01))
+    readings = registry.counter("flow_readings", "Lecturas")
+    registry.gauge("flow_depth", "Profundidad", function=lambda: 7)
+
+    rules = latency.labels("rules")
+    for value in (0.0005, 0.005, 0.5):
+        rules.observe(value)
+    readings.inc(3)
+
+    text = registry.render()
+    assert "# TYPE flow_stage_seconds histogram" in text
+    assert 'flow_stage_seconds_bucket{stage="rules",le="0.001"} 1' in text
+    assert 'flow_stage_seconds_bucket{stage="rules",le="0.01"} 2' in text
+    assert 'flow_stage_seconds_bucket{stage="rules",le="+Inf"} 3' in text
+    assert 'flow_stage_seconds_count{stage="rules"} 3' in text
+    # HELP/TYPE con el mismo nombre que las muestras (si no, Prometheus las toma como untyped)
+    assert "# HELP flow_readings_total Lecturas\n# TYPE flow_readings_total counter\nflow_readings_total 3" in text
+    assert "flow_depth 7" in text
+
+
+def test_per_thread_cells_sum_exactly():
+    registry = Registry()
+    counter = registry.counter("flow_events", "Eventos")
+    histogram = registry.histogram("flow_lat_seconds", "Latencia")
+
+    def work():
+        for _ in range(5000):
+            counter.inc()
+            histogram.observe(1e-4)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert counter.value == 40000
+    assert histogram.count == 40000
+    assert registry.counter("flow_events", "Eventos") is counter
+
+
+def test_sampling_profiler_sees_busy_thread():
+    from observability.profiler import SamplingProfiler
+
+    stop = threading.Event()
+
+    def busy_stage_for_profiler():
+        while not stop.is_set():
+            sum(range(1000))
+
+    worker = threading.Thread(target=busy_stage_for_profiler, name="busy")
+    worker.start()
+    try:
+        profiler = SamplingProfiler(interval=0.002)
+        folded = profiler.collapsed(profiler.run(0.2))
+    finally:
+        stop.set()
+        worker.join()
+
+    busy = [line for line in folded.splitlines() if line.startswith("busy;")]
+    assert busy and all("busy_stage_for_profiler" in line for line in busy)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in busy) > 10
+
+
+def test_spans_are_identity_when_disabled():
+    from observability import spans
+
+    def normalize(x):
+        return x + 1
+
+    assert spans.stage("normalize", enabled=False)(normalize) is normalize
+    timed = spans.stage("test_stage", enabled=True)(normalize)
+    assert timed(1) == 2
+    assert spans.SPAN_SECONDS.labels("test_stage").count == 1
+
+
+def test_admin_endpoints_require_configured_token(monkeypatch):
+    from fastapi import HTTPException
+
+    from observability.admin import _check_token
+
+    monkeypatch.delenv("FLOW_MONITOR_ADMIN_TOKEN", raising=False)
+    for token in (None, "", "x"):
+        with pytest.raises(HTTPException) as exc:
+            _check_token(token)
+        assert exc.value.status_code == 403
+
+    monkeypatch.setenv("FLOW_MONITOR_ADMIN_TOKEN", "s3cret")
+    _check_token("s3cret")
+    for token in (None, "s3cre", "s3cretx", "ñ"):
+        with pytest.raises(HTTPException):
+            _check_token(token)
+
+
+def test_sampled_logger_and_json_queue_output():
+    import io
+    import json
+    import logging
+
+    from observability.logs import SampledLogger, configure_logging, shutdown_logging
+
+    stream = io.StringIO()
+    configure_logging(level="INFO", fmt="json", stream=stream)
+    try:
+        log = SampledLogger(logging.getLogger("flow.test.sampled"), every=10)
+        for i in range(30):
+            log.reading("reading %d", i)
+        log.anomaly("anomaly %s", "S-1")
+    finally:
+        shutdown_logging()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    ours = [entry for entry in lines if entry["logger"] == "flow.test.sampled"]
+    assert [entry["msg"] for entry in ours] == ["reading 9", "reading 19", "reading 29", "anomaly S-1"]
+    assert ours[-1]["level"] == "WARNING"
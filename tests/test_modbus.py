@@ -0,0 +1,160 @@
+"""Tests del PollingScheduler, el poller Modbus-TCP y ModbusTcpPlugin contra el simulador."""
+
+import asyncio
+
+import pytest
+
+from ingestion.modbus import (
+    DeviceProfile, ModbusDevice, ModbusError, ModbusPoller, ModbusSimulator, ModbusTcpClient,
+    RegisterPoint, load_devices,
+)
+from ingestion.models import ReadingType
+from ingestion.plugins.modbus_plugin import ModbusTcpPlugin
+from ingestion.polling import PollingScheduler
+
+
+PUMP = DeviceProfile("pump-v2", [
+    RegisterPoint("pressure", 2, "uint16", unit="bar", scale=0.1),
+    RegisterPoint("temp", 0, "float32", unit="Celsius"),
+    RegisterPoint("delta", 3, "int16"),
+    RegisterPoint("flow", 10, "float32", unit="L/min"),   # hueco de 6 → mismo bloque
+    RegisterPoint("hours", 60, "uint32"),                 # lejos → bloque aparte
+    RegisterPoint("vib", 0, "float32", table="input", unit="mm/s"),
+])
+
+
+def test_read_planning_coalesces_contiguous_registers():
+    blocks = [(b.table, b.start, b.count, [p.name for p in b.points]) for b in PUMP.blocks]
+    assert blocks == [
+        ("holding", 0, 12, ["temp", "pressure", "delta", "flow"]),
+        ("holding", 60, 2, ["hours"]),
+        ("input", 0, 2, ["vib"]),
+    ]
+    data = b"\x41\xac\x00\x00" + b"\x27\x10" + b"\xff\xfe" + b"\x00" * 12 + b"\x42\x48\x00\x00"
+    assert PUMP.blocks[0].decode(data) == pytest.approx([21.5, 1000.0, -2.0, 50.0])
+    assert PUMP.blocks[0].decode_many([data] * 3).tolist() == [pytest.approx([21.5, 1000.0, -2.0, 50.0])] * 3
+
+    with pytest.raises(ValueError):
+        DeviceProfile("bad", [RegisterPoint("a", 0, "float32"), RegisterPoint("b", 1)])
+    devices = load_devices({
+        "profiles": {"p": {"points": [{"name": "t", "address": 4, "dtype": "int32"}]}},
+        "devices": [{"device_id": "D1", "host": "127.0.0.1", "profile": "p", "interval": 1}],
+    })
+    assert devices[0].profile.blocks[0].start == 4
+
+
+def test_poller_reads_simulated_devices_and_plugin_decodes_in_bulk():
+    plugin = ModbusTcpPlugin()
+
+    async def scenario():
+        async with ModbusSimulator() as sim:
+            devices = []
+            for unit_id in range(1, 41):
+                sim.add_unit(unit_id)
+                sim.set_value(unit_id, "holding", 0, 20.0 + unit_id, "float32")
+                sim.set_value(unit_id, "holding", 2, 1000 + unit_id, "uint16")
+                sim.set_value(unit_id, "holding", 3, -unit_id, "int16")
+                sim.set_value(unit_id, "holding", 10, 2.5, "float32")
+                sim.set_value(unit_id, "holding", 60, 70000 + unit_id, "uint32")
+                sim.set_value(unit_id, "input", 0, 0.5, "float32")
+                devices.append(ModbusDevice(f"PUMP_{unit_id:03d}", "127.0.0.1", PUMP, port=sim.port,
+                                            unit_id=unit_id, interval=0.1, timeout=0.5, location="Planta-A"))
+            # Unit id sin banco (excepción Modbus) y uno lento (timeout)
+            devices.append(ModbusDevice("GHOST", "127.0.0.1", PUMP, port=sim.port, unit_id=99, interval=0.1))
+            sim.add_unit(77)
+            sim.delays[77] = 1.0
+            devices.append(ModbusDevice("SLOW", "127.0.0.1", PUMP, port=sim.port, unit_id=77,
+                                        interval=0.1, timeout=0.05))
+
+            batches = []
+            poller = ModbusPoller(devices, sink=batches.append, concurrency=8, flush_interval=0.1, seed=1)
+            stats = await poller.run(duration=0.55)
+            return batches, stats, sim.requests
+
+    batches, stats, requests = asyncio.run(scenario())
+    reads = [read for batch in batches for read in batch]
+    assert stats.max_in_flight <= 8
+    assert stats.errors >= 1 and stats.timeouts >= 1
+    # Ciclos de 40 dispositivos: 3 lecturas coalescidas por ciclo (no 6 puntos)
+    assert stats.results == len(reads) and len(reads) % 3 == 0
+    assert requests < stats.polls * 3 + 10
+
+    batch = plugin.normalize_batch(reads)
+    assert not batch.rejected and len(batch.readings) == len(reads) // 3 * 6
+    by_sensor = {r.sensor_id: r for r in batch.readings}
+    assert by_sensor["PUMP_007_temp"].value == pytest.approx(27.0)
+    assert by_sensor["PUMP_007_temp"].reading_type == ReadingType.TEMPERATURE
+    assert by_sensor["PUMP_007_pressure"].value == pytest.approx(100.7)
+    assert by_sensor["PUMP_007_delta"].value == -7
+    assert by_sensor["PUMP_007_hours"].value == 70007
+    assert by_sensor["PUMP_040_vib"].location == "Planta-A"
+    assert plugin.normalize_batch(["nope"]).rejected[0].index == 0
+
+
+def test_scheduler_jitter_bounds_and_skips_busy_targets():
+    started = []
+
+    async def poll(target):
+        started.append((target, asyncio.get_running_loop().time()))
+        await asyncio.sleep(0.25 if target == "stuck" else 0)
+        return [target]
+
+    async def scenario():
+        scheduler = PollingScheduler(poll, sink=lambda batch: None, concurrency=50, seed=3)
+        for i in range(20):
+            scheduler.add(f"dev-{i}", interval=0.2, timeout=1.0)
+        scheduler.add("stuck", interval=0.05, timeout=1.0)
+        start = asyncio.get_running_loop().time()
+        stats = await scheduler.run(duration=0.3)
+        return start, stats
+
+    start, stats = asyncio.run(scenario())
+    first = {}
+    for target, t in started:
+        first.setdefault(target, t - start)
+    # Primeros vencimientos repartidos dentro del intervalo, no todos juntos
+    offsets = sorted(v for k, v in first.items() if k != "stuck")
+    assert offsets[-1] - offsets[0] > 0.05 and offsets[-1] < 0.25
+    # "stuck" nunca tiene dos consultas en vuelo
+    assert sum(1 for target, _ in started if target == "stuck") <= 2
+    assert stats.skipped >= 2
+
+
+def test_scheduler_keeps_flushing_while_slots_are_busy():
+    flushed = []
+
+    async def poll(target):
+        await asyncio.sleep(0.4 if target == "slow" else 0)
+        return [target]
+
+    async def scenario():
+        scheduler = PollingScheduler(poll, sink=lambda batch: flushed.append(
+            (asyncio.get_running_loop().time(), batch)), concurrency=1,
+            flush_interval=0.1, jitter=0.0, seed=1)
+        scheduler.add("fast", interval=0.05, timeout=1.0)
+        scheduler.add("slow", interval=0.05, timeout=1.0)
+        start = asyncio.get_running_loop().time()
+        stats = await scheduler.run(duration=0.5)
+        return start, stats
+
+    start, stats = asyncio.run(scenario())
+    # Con el único cupo tomado por "slow", la lectura de "fast" se entrega en el
+    # primer flush y no cuando se libera el semáforo
+    assert flushed[0][1] == ["fast"] and flushed[0][0] - start < 0.2
+    assert stats.max_in_flight == 1
+
+
+def test_client_surfaces_modbus_exceptions():
+    async def scenario():
+        async with ModbusSimulator(registers=16) as sim:
+            sim.add_unit(1)
+            client = ModbusTcpClient("127.0.0.1", sim.port)
+            try:
+                with pytest.raises(ModbusError) as exc:
+                    await client.read_registers(1, "holding", 10, 10)
+                assert exc.value.code == 2
+                assert await client.read_registers(1, "input", 0, 2) == b"\x00" * 4
+            finally:
+                await client.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,107 @@
+"""Tests del suscriptor MQTT y MqttJsonPlugin contra el broker en proceso."""
+
+import asyncio
+import json
+
+import pytest
+
+from ingestion.mqtt import MiniBroker, MqttClient, MqttMessage, MqttSubscriber, topic_matches
+from ingestion.mqtt.protocol import MqttError, PacketParser, encode_length, publish_packet
+from ingestion.plugins.mqtt_plugin import MqttJsonPlugin
+
+
+def test_topic_wildcards_and_incremental_parser():
+    assert topic_matches("flowmonitor/+/+", "flowmonitor/Planta-A/S01")
+    assert not topic_matches("flowmonitor/+", "flowmonitor/Planta-A/S01")
+    assert topic_matches("flowmonitor/#", "flowmonitor/Planta-A/S01")
+    assert not topic_matches("plant/#", "flowmonitor/x")
+
+    big = b"x" * 300  # Remaining Length de 2 bytes
+    assert encode_length(321) == b"\xc1\x02"
+    stream = publish_packet("a/b", b"{}") + publish_packet("a/c", big, qos=1, packet_id=7)
+    parser = PacketParser()
+    packets = parser.feed(stream[:5]) + parser.feed(stream[5:160]) + parser.feed(stream[160:])
+    assert [p[0] for p in packets] == [3, 3]
+    assert packets[1][2].endswith(big)
+
+    # Paquete grande en bloques de 1 byte; uno mayor que el límite se rechaza por su encabezado
+    parser = PacketParser(max_packet_size=4096)
+    packet = publish_packet("a/b", b"y" * 4000)
+    packets = [p for i in range(len(packet)) for p in parser.feed(packet[i:i + 1])]
+    assert len(packets) == 1 and packets[0][2].endswith(b"y" * 4000) and not parser._buffer
+    with pytest.raises(MqttError, match="exceeds"):
+        parser.feed(publish_packet("a/b", b"z" * 5000)[:4])
+
+
+def test_subscriber_batches_feed_plugin_through_broker():
+    plugin = MqttJsonPlugin()
+    sensors = 200
+
+    async def scenario():
+        async with MiniBroker() as broker:
+            subscriber = MqttSubscriber("127.0.0.1", broker.port, [plugin.subscription],
+                                        batch_size=128, max_delay=0.02)
+            await subscriber.connect()
+            publisher = MqttClient("127.0.0.1", broker.port)
+            await publisher.connect()
+            for i in range(1000):
+                payload = {"timestamp": "2025-12-18T01:00:00", "value": float(i), "unit": "Celsius"}
+                publisher.publish(f"flowmonitor/Planta-A/SENSOR_{i % sensors:03d}",
+                                  json.dumps(payload).encode(), qos=i % 2)
+            publisher.publish("flowmonitor/Planta-A/BAD", b"{not json")
+            publisher.publish("other/topic", b"{}")
+            await publisher.drain()
+
+            readings, rejected, sizes = [], 0, []
+            async for batch in subscriber.batches():
+                sizes.append(len(batch))
+                normalized = plugin.normalize_batch(batch)
+                readings.extend(normalized.readings)
+                rejected += len(normalized.rejected)
+                if len(readings) + rejected >= 1001:
+                    break
+            await publisher.close()
+            await subscriber.close()
+            return readings, rejected, sizes
+
+    readings, rejected, sizes = asyncio.run(scenario())
+    assert len(readings) == 1000 and rejected == 1
+    assert max(sizes) <= 128 and len(sizes) < 100
+    assert len({r.sensor_id for r in readings}) == sensors
+    assert readings[0].location == "Planta-A" and readings[0].source == "mqtt-json-plugin"
+    assert [r.value for r in readings] == [float(i) for i in range(1000)]
+
+
+def test_plugin_batch_decode_isolates_bad_payloads():
+    plugin = MqttJsonPlugin("site/{location}/{sensor_id}")
+    good = json.dumps({"timestamp": "2025-12-18T01:00:00", "value": 1, "unit": "bar"}).encode()
+    messages = [
+        MqttMessage("site/L1/S1", good),
+        MqttMessage("site/L1/S2", b"[1, 2]"),
+        MqttMessage("site/L1/S3", b""),
+        MqttMessage("site/L2/S4", good),
+    ]
+    batch = plugin.normalize_batch(messages)
+    assert [r.sensor_id for r in batch.readings] == ["S1", "S4"]
+    assert [r.index for r in batch.rejected] == [1, 2]
+    assert plugin.normalize_data(messages[3]).location == "L2"
+
+    # Lote mixto: cada elemento se valida en su índice
+    mixed = plugin.normalize_batch([messages[0], {"sensor_id": "S9", "timestamp": "2025-12-18T01:00:00",
+                                                  "value": 2, "unit": "bar"}, b"raw", None])
+    assert [r.sensor_id for r in mixed.readings] == ["S1", "S9"]
+    assert [r.index for r in mixed.rejected] == [2, 3]
+
+
+def test_plugin_batch_decode_rejects_payloads_that_only_balance_together():
+    plugin = MqttJsonPlugin()
+    reading = {"timestamp": "2025-12-18T01:00:00", "unit": "bar"}
+    pair = json.dumps({**reading, "value": 1}) + "," + json.dumps({**reading, "value": 99})
+    messages = [
+        MqttMessage("flowmonitor/A/S1", pair.encode()),
+        MqttMessage("flowmonitor/B/S2", b"[1"),
+        MqttMessage("flowmonitor/C/S3", b"2]"),
+    ]
+    batch = plugin.normalize_batch(messages)
+    assert batch.readings == []
+    assert [r.index for r in batch.rejected] == [0, 1, 2]
@@ -0,0 +1,37 @@
+"""Tests del runner asyncio del pipeline."""
+
+import asyncio
+
+from action_layer.data_observer import DataObserver
+from pipeline import AsyncPipelineRunner, StageConfig
+
+
+def _payloads(n):
+    for i in range(n):
+        yield {
+            "sensor_id": f"SENSOR_TEMP_{i % 5:02d}",
+            "timestamp": f"2025-12-18T01:00:{i % 60:02d}",
+            "value": 95.0 if i % 50 == 0 else 25.0,
+            "unit": "Celsius",
+            "location": "Planta-A",
+        }
+    yield {"sensor_id": "BAD"}
+
+
+def test_runner_processes_all_stages():
+    observer = DataObserver(max_buffer_size=1000)
+    runner = AsyncPipelineRunner(observer=observer, stages={
+        "ingest": StageConfig(batch_size=32),
+        "evaluate": StageConfig(concurrency=2, batch_size=64, queue_size=2),
+        "notify": StageConfig(concurrency=2, offload=True),
+    })
+    stats = asyncio.run(runner.run(_payloads(500)))
+
+    stages = stats["stages"]
+    assert stages["ingest"]["processed"] == 501
+    assert stages["normalize"]["errors"] == 1
+    assert stages["observe"]["processed"] == 500
+    assert stages["notify"]["processed"] == 10
+    assert stages["evaluate"]["max_queue_depth"] <= 2
+    assert observer.get_stats()["total_readings"] == 500
+    assert len(observer.get_alerts()) == 10
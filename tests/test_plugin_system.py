@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 """Test del sistema de plugins Layer 1."""
+import json
+import pytest
 import sys
 sys.path.insert(0, '/home/falcon/Documentos/flow-monitor')
 
@@ -75,6 +77,143 @@ def test_invalid_payload():
     
     print("✅ HttpJsonPlugin: validación de payloads inválidos funciona")
 
+def test_normalize_batch_matches_per_record():
+    """normalize_batch rápido == normalize_data por registro, con rechazos por índice."""
+    from ingestion.plugins.base import SensorPlugin
+    
+    plugin = HttpJsonPlugin()
+    payloads = [
+        {"sensor_id": "S01", "timestamp": "2025-12-18T00:53:11Z", "value": 35, "unit": "Celsius",
+         "location": "Planta-A", "_meta": {"status": "NORMAL", "is_anomaly": True, "step": 1}},
+        {"sensor_id": "S01"},
+        {"sensor_id": "S02", "timestamp": "2025-12-18T00:53:12", "value": 2.5, "unit": "bar",
+         "firmware": "1.2", "extra": None},
+        "no-es-un-objeto",
+        {"sensor_id": "S03", "timestamp": "2025-12-18T00:53:13", "value": "x", "unit": "Hz"},
+        {"sensor_id": "S04", "timestamp": "2025-12-18T00:53:14", "value": 1.0, "unit": "m/s"},
+    ]
+    
+    fast = plugin.normalize_batch(payloads)
+    generic = SensorPlugin.normalize_batch(plugin, payloads)
+    
+    assert [r.to_dict() for r in fast.readings] == [r.to_dict() for r in generic.readings]
+    assert [r.index for r in fast.rejected] == [r.index for r in generic.rejected] == [1, 3, 4]
+    assert [r.reading_type for r in fast.readings] == [
+        ReadingType.TEMPERATURE, ReadingType.PRESSURE, ReadingType.GENERIC
+    ]
+    assert fast.readings[1].metadata == {"is_anomaly": False, "firmware": "1.2"}
+
+def test_registry_routes_by_header_content_type_and_signature():
+    """Tabla de ruteo: header explícito > Content-Type > header de gateway > firma > default."""
+    import pytest
+    from ingestion.registry import PluginNotFoundError, get_default_registry
+    
+    class VendorPlugin(HttpJsonPlugin):
+        content_types = ("application/vnd.acme+json",)
+        route_headers = (("X-Gateway-Vendor", "ACME"),)
+        signature_keys = ("acme_device",)
+        
+        @property
+        def name(self) -> str:
+            return "acme-plugin"
+    
+    class ClashPlugin(VendorPlugin):
+        @property
+        def name(self) -> str:
+            return "clash-plugin"
+    
+    registry = PluginRegistry()
+    registry.clear()
+    try:
+        default, vendor = HttpJsonPlugin(), VendorPlugin()
+        registry.register(default)
+        registry.register(vendor)
+        registry.set_default("http-json-plugin")
+        
+        assert registry.resolve(payload={"sensor_id": "S01"}) is default
+        assert registry.resolve(payload={"acme_device": 7, "v": 1}) is vendor
+        assert registry.resolve("application/vnd.acme+json; charset=utf-8") is vendor
+        assert registry.resolve(headers={"x-gateway-vendor": "acme"}) is vendor
+        assert registry.resolve("application/vnd.acme+json",
+                                headers={"x-flow-plugin": "http-json-plugin"}) is default
+        with pytest.raises(PluginNotFoundError):
+            registry.resolve(headers={"x-flow-plugin": "missing"})
+        
+        # Rutas repetidas se rechazan al registrar, sin tocar la tabla vigente
+        with pytest.raises(ValueError):
+            registry.register(ClashPlugin())
+        assert "clash-plugin" not in registry
+        assert registry.resolve(payload={"acme_device": 1}) is vendor
+        
+        # Dos firmas en el mismo payload: gana la registrada primero, no la
+        # primera clave que mandó el sensor
+        class OtherPlugin(HttpJsonPlugin):
+            content_types = ()
+            route_headers = ()
+            signature_keys = ("other_device",)
+            
+            @property
+            def name(self) -> str:
+                return "other-plugin"
+        
+        registry.register(OtherPlugin())
+        assert registry.resolve(payload={"other_device": 1, "acme_device": 1}) is vendor
+        assert registry.resolve(payload={"acme_device": 1, "other_device": 1}) is vendor
+        
+        # Quitar el plugin por defecto no deja un default colgado
+        registry.unregister("http-json-plugin")
+        with pytest.raises(PluginNotFoundError):
+            registry.resolve(payload={"sensor_id": "S01"})
+        registry.register(default)
+        with pytest.raises(PluginNotFoundError):
+            registry.resolve(payload={"sensor_id": "S01"})
+    finally:
+        registry.clear()
+        get_default_registry()
+
+def test_binary_frames_round_trip_and_reject_corruption():
+    """Trama binaria del DataPulse → mismas lecturas que el JSON; tramas dañadas se rechazan."""
+    from ingestion.plugins.binary_plugin import BinaryWirePlugin, decode_frame
+    from sensors.datapulse_sensor import DataPulseAgent, encode_binary
+    from sensors.fleet import FleetSimulator
+    
+    agent = DataPulseAgent()
+    payloads = [agent.generate_reading() for _ in range(50)]
+    payloads[3]["_meta"].update(status="ANOMALY_INJECTED", is_anomaly=True)
+    frame = encode_binary(payloads)
+    assert len(frame) < len(json.dumps(payloads)) / 5
+    
+    plugin = BinaryWirePlugin()
+    batch = plugin.normalize_batch([frame])
+    reference = HttpJsonPlugin().normalize_batch(payloads).readings
+    assert len(batch.readings) == 50 and not batch.rejected
+    for got, want in zip(batch.readings, reference):
+        assert (got.sensor_id, got.value, got.unit, got.location, got.reading_type) == \
+            (want.sensor_id, want.value, want.unit, want.location, want.reading_type)
+        assert abs(got.timestamp - want.timestamp) < 1_000_000  # ns: misma marca al ms
+    assert batch.readings[3].metadata == {"raw_status": "ANOMALY_INJECTED", "is_anomaly": True}
+    
+    # Registros sin copia: la vista apunta al buffer de la trama
+    records = decode_frame(frame).records
+    assert not records.flags.owndata and records.base is not None
+    
+    fleet = FleetSimulator(sensors=300, seed=5, anomaly_rate=0.05)
+    values, anomalies = fleet.tick()
+    fleet_batch = plugin.normalize_batch([fleet.to_binary(values, anomalies)])
+    assert [r.sensor_id for r in fleet_batch.readings] == fleet.sensor_ids
+    assert sum(r.metadata["is_anomaly"] for r in fleet_batch.readings) == int(anomalies.sum())
+    
+    corrupt = plugin.normalize_batch([frame[:-5], b"JSON", frame[:4] + b"\x09" + frame[5:], frame])
+    assert [r.index for r in corrupt.rejected] == [0, 1, 2]
+    assert len(corrupt.readings) == 50
+    
+    # Timestamp epoch numérico, y uno que en ns no cabe en int64
+    epoch = [{**payloads[0], "timestamp": 1766019600.25}]
+    assert plugin.normalize_batch([encode_binary(epoch)]).readings[0].timestamp == 1766019600_250_000_000
+    overflow = bytearray(encode_binary(epoch))
+    overflow[-17:-9] = (2**62).to_bytes(8, "little")
+    assert plugin.normalize_batch([bytes(overflow)]).rejected[0].error.endswith("timestamp out of range")
+
 if __name__ == "__main__":
     print("\n" + "="*60)
     print("🧪 Testing Flow-Monitor Layer 1 Plugin System")
@@ -83,7 +222,131 @@ if __name__ == "__main__":
     test_http_json_plugin()
     test_plugin_registry()
     test_invalid_payload()
+    test_normalize_batch_matches_per_record()
+    test_registry_routes_by_header_content_type_and_signature()
+    test_binary_frames_round_trip_and_reject_corruption()
     
     print("\n" + "="*60)
     print("✅ ALL TESTS PASSED!")
     print("="*60 + "\n")
+
+
+def test_mapping_plugin_matches_hand_written_datapulse_plugin():
+    """Un mapeo declarativo del formato DataPulse produce lo mismo que HttpJsonPlugin."""
+    from ingestion.plugins.mapping_plugin import DATAPULSE_MAPPING, MappingPlugin
+    
+    mapping, plugin = MappingPlugin(DATAPULSE_MAPPING), HttpJsonPlugin()
+    payloads = [
+        {"sensor_id": "S1", "timestamp": "2025-12-18T00:53:11", "value": 35.5, "unit": "Celsius",
+         "location": "Planta-A", "_meta": {"status": "NORMAL", "is_anomaly": True, "step": 3}},
+        {"sensor_id": "S2", "timestamp": "2025-12-18T00:53:11", "value": 2, "unit": "bar"},
+        {"sensor_id": "S3", "timestamp": "2025-12-18T00:53:12", "unit": "bar"},
+        {"sensor_id": "S4", "timestamp": "ayer", "value": 1.0, "unit": "bar"},
+    ]
+    got, want = mapping.normalize_batch(payloads), plugin.normalize_batch(payloads)
+    strip = lambda r: {**r.to_dict(), "source": None}
+    assert [strip(r) for r in got.readings] == [strip(r) for r in want.readings]
+    assert [r.index for r in got.rejected] == [2, 3]
+    assert "'value'" in got.rejected[0].error
+    assert mapping.normalize_data(payloads[1]).reading_type == ReadingType.PRESSURE
+
+
+def test_mapping_plugin_fans_out_converts_units_and_validates_config():
+    """each + plantillas + conversión de unidades; errores de configuración al compilar."""
+    import pytest
+    from ingestion.plugins.mapping_plugin import MappingPlugin, load_mapping_plugins
+    from ingestion.registry import RoutingTable
+    
+    spec = {
+        "name": "acme-json",
+        "content_types": ["application/vnd.acme+json"],
+        "each": "readings",
+        "sensor_id": {"template": "{device.serial}_{@.channel}"},
+        "timestamp": {"path": "ts", "epoch": "ms"},
+        "value": {"path": "@.v", "scale": 0.1, "from_unit": "Fahrenheit"},
+        "unit": {"const": "Celsius"},
+        "location": {"path": "site", "default": "Planta-X"},
+        "metadata": {"battery": "device.battery", "vendor": {"const": "acme"}, "quality": "@.q"},
+    }
+    (plugin,) = load_mapping_plugins({"mappings": [spec]})
+    payload = {"device": {"serial": "AC7", "battery": 88}, "ts": 1766019600123,
+               "readings": [{"channel": 1, "v": 320}, {"channel": 2, "v": 2120, "q": "ok"}]}
+    broken = {"device": {"serial": "AC8"}, "ts": 1766019600123,
+              "readings": [{"channel": 1, "v": 320}, {"channel": 2}]}
+    boolean = {**payload, "readings": [{"channel": 3, "v": True}]}
+    batch = plugin.normalize_batch([payload, broken, {"readings": []}, boolean])
+    
+    assert [(r.sensor_id, round(r.value, 6)) for r in batch.readings] == [("AC7_1", 0.0), ("AC7_2", 100.0)]
+    first = batch.readings[0]
+    assert first.timestamp == 1766019600_123_000_000 and first.location == "Planta-X"
+    assert first.reading_type == ReadingType.TEMPERATURE
+    assert first.metadata == {"battery": 88, "vendor": "acme"}
+    assert batch.readings[1].metadata["quality"] == "ok" and "quality" not in first.metadata
+    # Un elemento inválido descarta todo su payload
+    assert [r.index for r in batch.rejected] == [1, 2, 3]
+    assert "boolean" in batch.rejected[2].error
+    assert plugin.validate(payload) and not plugin.validate({"readings": []})
+    with pytest.raises(ValueError):
+        plugin.normalize_data(payload)   # dos lecturas: usar normalize_batch
+    
+    routes = RoutingTable()
+    routes.add(plugin)
+    assert routes.content_types["application/vnd.acme+json"] is plugin
+    
+    for bad in (
+        {**spec, "colour": "red"},
+        {**spec, "value": {"path": "@.v", "from_unit": "parsecs"}},
+        {**spec, "each": None},                        # '@' sin each
+        {**spec, "timestamp": {"path": "ts", "epoch": "days"}},
+        {**spec, "sensor_id": {"path": "a", "const": "b"}},
+        {key: value for key, value in spec.items() if key != "unit"},
+        {**spec, "value": {"path": "@.v", "scale": "inf"}},
+        {**spec, "value": {"path": "@.v", "offset": float("nan")}},
+        {**spec, "value": {"path": "@.v", "scale": "x"}},
+        {**spec, "sensor_id": {"template": "{device.serial!r:>10}"}},
+        {**spec, "sensor_id": {"template": "{device.serial:>10}"}},
+    ):
+        with pytest.raises(ValueError):
+            MappingPlugin(bad)
+    with pytest.raises(ValueError):
+        load_mapping_plugins([spec, spec])
+
+def test_multichannel_messages_expand_in_batch():
+    """Un mensaje multicanal → una lectura por canal, con la cabecera parseada una vez."""
+    plugin = HttpJsonPlugin()
+    header = {"sensor_id": "GW_07", "timestamp": "2025-12-18T00:53:11", "unit": "mm/s",
+              "location": "Planta-A", "_meta": {"status": "NORMAL"}, "site": "norte"}
+    messages = [
+        {**header, "channels": {"x": 1.2, "y": 0, "temp": {"value": 45.2, "unit": "Celsius"}}},
+        {**header, "channels": [{"name": "z", "value": 2.1}]},
+        {**header, "channels": {"x": 1.0, "y": "alto"}},
+        {**header, "channels": {}},
+        {"sensor_id": "S01", "timestamp": "2025-12-18T00:53:12", "value": 35, "unit": "Celsius"},
+    ]
+    
+    assert plugin.validate(messages[0]) and plugin.validate(messages[1])
+    assert not plugin.validate(messages[3])
+    try:
+        plugin.normalize_data(messages[0])
+        assert False, "normalize_data no debe aceptar mensajes multicanal"
+    except ValueError as exc:
+        assert "normalize_batch" in str(exc)
+    
+    batch = plugin.normalize_batch(messages)
+    assert [r.sensor_id for r in batch.readings] == ["GW_07_x", "GW_07_y", "GW_07_temp", "GW_07_z", "S01"]
+    assert [r.index for r in batch.rejected] == [2, 3]
+    x, y, temp, z = batch.readings[:4]
+    assert (x.unit, temp.unit, y.value) == ("mm/s", "Celsius", 0.0)
+    assert (x.reading_type, temp.reading_type) == (ReadingType.VIBRATION, ReadingType.TEMPERATURE)
+    assert len({r.timestamp for r in batch.readings[:4]}) == 1
+    assert x.metadata == {"raw_status": "NORMAL", "is_anomaly": False, "site": "norte",
+                          "device_id": "GW_07", "channel": "x"}
+    assert z.location == "Planta-A" and z.metadata["channel"] == "z"
+    
+    # value y channels juntos, o un bool como valor: rechazados igual por ambos caminos
+    ambiguous = {**messages[4], "channels": {"x": 1.0}}
+    for bad in (ambiguous, {**messages[4], "value": True}):
+        assert not plugin.validate(bad)
+        with pytest.raises(ValueError):
+            plugin.normalize_data(bad)
+    assert [r.index for r in plugin.normalize_batch([ambiguous, {**messages[4], "value": True}]).rejected] == [0, 1]
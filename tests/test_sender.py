@@ -0,0 +1,147 @@
+"""Tests del sender por lotes del DataPulse."""
+
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from sensors.sender import BatchSender, SenderConfig
+
+
+class _Collector(BaseHTTPRequestHandler):
+    batches = []
+    encodings = []
+    fail = False
+    # Respuestas (status, Retry-After) a devolver antes de aceptar
+    responses = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        _Collector.encodings.append(self.headers.get("Content-Encoding"))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        if _Collector.responses:
+            code, retry_after = _Collector.responses.pop(0)
+            self.send_response(code)
+            if retry_after is not None:
+                self.send_header("Retry-After", retry_after)
+        elif _Collector.fail:
+            self.send_response(503)
+        else:
+            _Collector.batches.append(json.loads(body))
+            self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Collector.batches = []
+    _Collector.encodings = []
+    _Collector.fail = False
+    _Collector.responses = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Collector)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}/api/ingest/batch"
+    httpd.shutdown()
+
+
+def _reading(i):
+    return {"sensor_id": "S", "timestamp": "2025-12-18T01:00:00", "value": float(i), "unit": "Celsius"}
+
+
+def test_batches_by_size(server, tmp_path):
+    config = SenderConfig(endpoint=server, batch_size=10, flush_interval=0.2, spill_dir=str(tmp_path))
+    with BatchSender(config) as sender:
+        for i in range(25):
+            sender.send(_reading(i))
+        sender.flush()
+
+    assert [len(b) for b in _Collector.batches] == [10, 10, 5]
+    assert sender.get_stats()["sent"] == 25
+
+
+def test_spill_and_replay(server, tmp_path):
+    config = SenderConfig(endpoint=server, batch_size=5, flush_interval=0.05, max_retries=1,
+                          backoff_base=0.01, backoff_max=0.1, spill_dir=str(tmp_path))
+    with BatchSender(config) as sender:
+        _Collector.fail = True
+        for i in range(5):
+            sender.send(_reading(i))
+        sender.flush()
+        stats = sender.get_stats()
+        assert stats["spilled"] == 5 and stats["spill_files"] == 1
+
+        _Collector.fail = False
+        time.sleep(0.15)  # Fin de la ventana de endpoint caído
+        sender.send(_reading(99))
+        sender.flush()
+
+    values = sorted(r["value"] for b in _Collector.batches for r in b)
+    assert values == [0.0, 1.0, 2.0, 3.0, 4.0, 99.0]
+    assert sender.get_stats()["spill_files"] == 0
+
+
+def test_gzip_compressed_batches(server, tmp_path):
+    config = SenderConfig(endpoint=server, batch_size=50, flush_interval=0.2,
+                          compression="gzip", spill_dir=str(tmp_path))
+    with BatchSender(config) as sender:
+        for i in range(100):
+            sender.send(_reading(i))
+        sender.flush()
+
+    assert _Collector.encodings == ["gzip", "gzip"]
+    assert sum(len(b) for b in _Collector.batches) == 100
+
+
+def test_rate_limits_retry_and_other_4xx_are_rejected(server, tmp_path):
+    config = SenderConfig(endpoint=server, batch_size=5, flush_interval=0.05, max_retries=2,
+                          backoff_base=0.01, backoff_max=0.5, spill_dir=str(tmp_path))
+    with BatchSender(config) as sender:
+        # 429 y 408 se reintentan (Retry-After en segundos) y el lote llega
+        _Collector.responses = [(429, "0"), (408, None)]
+        for i in range(5):
+            sender.send(_reading(i))
+        sender.flush()
+        assert [len(b) for b in _Collector.batches] == [5]
+
+        # Otro 4xx es definitivo: no se reintenta ni se derrama
+        _Collector.responses = [(413, None)]
+        for i in range(5):
+            sender.send(_reading(i))
+        sender.flush()
+
+        # Retry-After mayor que backoff_max: spill sin esperar
+        _Collector.responses = [(503, "30")]
+        for i in range(5):
+            sender.send(_reading(i))
+        sender.flush()
+
+    stats = sender.get_stats()
+    assert (stats["sent"], stats["retries"]) == (5, 2)
+    assert (stats["rejected_batches"], stats["rejected"]) == (1, 5)
+    assert (stats["spilled"], stats["spill_files"]) == (5, 1)
+
+
+def test_retry_after_header_forms():
+    from email.utils import formatdate
+
+    from sensors.sender import retry_after_seconds
+
+    assert retry_after_seconds("7") == 7.0
+    assert retry_after_seconds(None) is None and retry_after_seconds("pronto") is None
+    assert 50 < retry_after_seconds(formatdate(time.time() + 60, usegmt=True)) <= 60
+
+
+def test_spill_dir_comes_from_environment(monkeypatch, tmp_path):
+    monkeypatch.delenv("DATAPULSE_SPILL_DIR", raising=False)
+    assert SenderConfig().spill_dir is None
+    monkeypatch.setenv("DATAPULSE_SPILL_DIR", str(tmp_path))
+    assert SenderConfig().spill_dir == str(tmp_path)
@@ -0,0 +1,132 @@
+"""Tests del adaptador de persistencia SQLite."""
+
+from datetime import datetime
+
+import pytest
+
+from ingestion.models import NormalizedReading
+from intelligence_core import IntelligenceService
+from action_layer.models import AlertNotification, NotificationChannel
+from storage import SQLiteStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = SQLiteStore(str(tmp_path / "test.db"), batch_size=50, flush_interval=0.05)
+    yield s
+    s.close()
+
+
+def test_wal_mode_enabled(store):
+    mode = store._read_conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode.lower() == "wal"
+
+
+def test_readings_are_batched_and_queryable(store):
+    for i in range(120):
+        store.save_reading(NormalizedReading(
+            sensor_id=f"S{i % 3}",
+            timestamp=datetime(2025, 12, 18, 1, 0, i % 60),
+            value=float(i),
+            unit="Celsius",
+            source="test",
+        ))
+    store.flush()
+
+    assert store.count("readings") == 120
+    assert store.get_stats()["batches"] < 120
+    rows = store.query_readings("S0", limit=5)
+    assert len(rows) == 5
+    assert all(r["sensor_id"] == "S0" for r in rows)
+
+
+def test_enriched_and_alerts(store):
+    service = IntelligenceService()
+    enriched = service.process({
+        "sensor_id": "SENSOR_TEMP_01", "timestamp": "2025-12-18T01:00:00",
+        "value": 95.0, "unit": "Celsius", "location": "A",
+    })
+    store.save_enriched(enriched)
+    store.save_enriched(enriched.to_dict())
+    store.save_alert(AlertNotification.create(
+        "SENSOR_TEMP_01", "CRITICAL", "test", NotificationChannel.WHATSAPP
+    ))
+    store.flush()
+
+    rows = store.query_enriched_by_risk("CRITICAL")
+    assert len(rows) == 2
+    assert store.query_alerts()[0]["sensor_id"] == "SENSOR_TEMP_01"
+
+
+def test_index_covers_sensor_query(store):
+    plan = store._read_conn.execute(
+        "EXPLAIN QUERY PLAN SELECT sensor_id, timestamp, value FROM readings "
+        "WHERE sensor_id = ? AND timestamp >= ? ORDER BY timestamp DESC",
+        ("S0", ""),
+    ).fetchall()
+    assert "COVERING INDEX idx_readings_sensor_ts" in str(plan)
+
+
+def test_close_drains_queue(tmp_path):
+    s = SQLiteStore(str(tmp_path / "drain.db"))
+    for i in range(10):
+        s.save_reading({"sensor_id": "S", "timestamp": str(i), "value": 1.0})
+    s.close()
+    assert s.get_stats()["written"] == 10
+    assert not s.save_reading({"sensor_id": "S", "timestamp": "x", "value": 1.0})
+
+
+def _fill_enriched(store, n):
+    service = IntelligenceService()
+    for i in range(n):
+        store.save_enriched(service.process({
+            "sensor_id": f"S{i % 4}", "timestamp": f"2025-12-18T01:00:{i % 60:02d}",
+            "value": float(20 + i % 80), "unit": "Celsius", "location": "A",
+        }))
+    store.flush()
+
+
+def test_export_npz_in_chunks(store, tmp_path):
+    from storage import export_store, iter_npz_chunks
+
+    _fill_enriched(store, 250)
+    out = str(tmp_path / "history.npz")
+    assert export_store(store, out, chunk_size=100) == 250
+
+    chunks = list(iter_npz_chunks(out))
+    assert [len(c["value"]) for c in chunks] == [100, 100, 50]
+    assert chunks[0]["risk_level"].dtype.name == "int8"
+    assert chunks[0]["timestamp"][0] > 0
+
+
+def test_export_db_is_read_only(store, tmp_path):
+    import sqlite3
+    from storage import export_db, iter_npz_chunks
+
+    _fill_enriched(store, 30)
+    out = str(tmp_path / "history.npz")
+    assert export_db(store.path, out, chunk_size=20) == 30
+    assert sum(len(c["value"]) for c in iter_npz_chunks(out)) == 30
+
+    missing = tmp_path / "missing.db"
+    with pytest.raises(sqlite3.OperationalError):
+        export_db(str(missing), str(tmp_path / "none.npz"))
+    assert not missing.exists()
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+def test_export_pyarrow_formats(store, tmp_path, suffix):
+    pa = pytest.importorskip("pyarrow")
+    from storage import export_store
+
+    _fill_enriched(store, 120)
+    out = str(tmp_path / f"history{suffix}")
+    export_store(store, out, chunk_size=50)
+
+    if suffix == ".parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(out)
+    else:
+        table = pa.ipc.open_file(out).read_all()
+    assert table.num_rows == 120
+    assert set(table.column("risk_level").to_pylist()) <= {"LOW", "MEDIUM", "HIGH", "CRITICAL"}
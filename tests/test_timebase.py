@@ -0,0 +1,61 @@
+"""Tests de timebase: parseo a epoch-ns, formateo ISO y su uso en los modelos."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from ingestion.models import NormalizedReading
+from ingestion.plugins.http_json_plugin import HttpJsonPlugin
+from intelligence_core.models import SensorData
+from timebase import format_iso, format_seconds, from_datetime, parse_timestamp
+
+
+def test_parse_accepts_iso_epoch_and_datetime():
+    local = datetime(2025, 12, 18, 1, 0, 7, 123456)
+    ns = from_datetime(local)
+    assert ns == int(local.replace(microsecond=0).timestamp()) * 10**9 + 123456000
+    for text in ("2025-12-18T01:00:07.123456", "2025-12-18 01:00:07.123456", local):
+        assert parse_timestamp(text) == ns
+    # Caché por minuto: segundos distintos del mismo minuto
+    for second in (0, 59, 7):
+        assert parse_timestamp(f"2025-12-18T01:00:{second:02d}") == from_datetime(local.replace(second=second, microsecond=0))
+
+    utc = datetime(2025, 12, 18, 1, 0, 0, tzinfo=timezone.utc)
+    assert parse_timestamp("2025-12-18T01:00:00Z") == parse_timestamp("2025-12-18T06:30:00+05:30") \
+        == int(utc.timestamp()) * 10**9
+    epoch = 1766019600
+    for value in (epoch, epoch * 1000, epoch * 10**6, epoch * 10**9, str(epoch), float(epoch)):
+        assert parse_timestamp(value) == epoch * 10**9
+    assert parse_timestamp(1766019600.25) == 1766019600_250000000
+
+    for bad in ("", "ayer", "2025-12-18T01:00:60", None, True, float("nan"), "inf"):
+        with pytest.raises(ValueError):
+            parse_timestamp(bad)
+
+
+def test_format_matches_isoformat_and_models_keep_ns():
+    base = datetime(2025, 12, 18, 1, 0, 0)
+    for offset in (timedelta(0), timedelta(microseconds=5), timedelta(seconds=61, microseconds=999999)):
+        moment = base + offset
+        assert format_iso(from_datetime(moment)) == moment.astimezone(timezone.utc).isoformat()
+    # Con zona: se conserva el instante, con offset explícito
+    for text in ("2025-12-18T01:00:00Z", "2025-12-18T06:30:00+05:30", "2025-12-17T22:00:00-03:00"):
+        assert format_iso(parse_timestamp(text)) == "2025-12-18T01:00:00+00:00"
+    # Segundos float (historial, capture, logs): mismo texto, redondeado al µs
+    ns = parse_timestamp("2025-12-18T01:00:00.123457+00:00")
+    assert format_seconds(ns / 10**9) == "2025-12-18T01:00:00.123457+00:00"
+
+    payload = {"sensor_id": "S1", "timestamp": "2025-12-18T01:00:00.500000+00:00", "value": 1.0, "unit": "bar"}
+    reading = HttpJsonPlugin().normalize_data(payload)
+    assert type(reading.timestamp) is int
+    assert reading.to_dict()["timestamp"] == payload["timestamp"]
+    assert NormalizedReading.from_dict(reading.to_dict()).timestamp == reading.timestamp
+
+    batch = HttpJsonPlugin().normalize_batch([payload, {**payload, "timestamp": reading.timestamp}, {**payload, "timestamp": "?"}])
+    assert [r.timestamp for r in batch.readings] == [reading.timestamp] * 2
+    assert batch.rejected[0].index == 2
+
+    sensor = SensorData.from_normalized(reading)
+    assert sensor.timestamp == reading.timestamp
+    assert sensor.to_dict()["timestamp"] == payload["timestamp"]
+    assert SensorData("S1", payload["timestamp"], 1.0, "bar", "").timestamp == reading.timestamp
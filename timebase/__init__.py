@@ -0,0 +1,34 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                       ⏱️  Timebase - Flow-Monitor                            ║
+║            Timestamps como epoch-ns internos, ISO en los bordes              ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+from .epoch import (
+    NS_PER_MS,
+    NS_PER_SECOND,
+    NS_PER_US,
+    format_iso,
+    format_seconds,
+    from_datetime,
+    from_epoch,
+    now_ns,
+    parse_timestamp,
+    to_datetime,
+    to_seconds,
+)
+
+__all__ = [
+    "NS_PER_MS",
+    "NS_PER_SECOND",
+    "NS_PER_US",
+    "format_iso",
+    "format_seconds",
+    "from_datetime",
+    "from_epoch",
+    "now_ns",
+    "parse_timestamp",
+    "to_datetime",
+    "to_seconds",
+]
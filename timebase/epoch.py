@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                     ⏱️  Epoch Timestamps - Flow-Monitor                       ║
+║          Parseo rápido a epoch-ns y formateo ISO solo en los bordes          ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Internamente un timestamp es un ``int`` de nanosegundos desde epoch: no
+se crean ``datetime`` por lectura y comparar o restar es aritmética
+entera. Se convierte a texto ISO solo al serializar (``to_dict`` / API).
+
+``parse_timestamp`` acepta:
+
+- Texto ISO (resolución de microsegundos). Las horas sin zona se pasan
+  a epoch con el minuto en caché: una flota reporta miles de lecturas
+  del mismo minuto y la conversión hora local → epoch corre una vez por
+  minuto distinto.
+- Números epoch (o texto numérico) en s, ms, µs o ns, inferidos por magnitud.
+- ``datetime``.
+
+Las horas sin zona se interpretan como hora local (igual que
+``datetime.timestamp()``). ``format_iso`` produce UTC con offset
+explícito (``+00:00``): el instante se conserva venga la entrada con
+``Z``, con ``±hh:mm`` o sin zona, y lo interpreta igual cualquier cliente.
+Todo timestamp que sale por una API o un log pasa por ``format_iso``
+(``format_seconds`` para los guardados como segundos float).
+
+Author: Flow-Monitor Team
+Project: Flow-Monitor (MVP Semilla Inicia)
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_MS = 1_000_000
+NS_PER_US = 1_000
+
+# Entradas por caché antes de vaciarla (acota memoria con timestamps arbitrarios)
+CACHE_LIMIT = 4096
+
+# Magnitud → escala a ns (|epoch| < 1e11 s llega al año 5138)
+_EPOCH_SCALES = ((1e11, NS_PER_SECOND), (1e14, NS_PER_MS), (1e17, NS_PER_US))
+
+# "YYYY-MM-DDTHH:MM" local → segundos epoch del minuto
+_MINUTES: Dict[str, int] = {}
+
+_fromisoformat = datetime.fromisoformat
+
+# Segundos epoch → "YYYY-MM-DDTHH:MM:SS" en UTC
+_ISO_PREFIX: Dict[int, str] = {}
+
+
+def now_ns() -> int:
+    """Ahora, en nanosegundos epoch."""
+    return time.time_ns()
+
+
+def from_epoch(value: float) -> int:
+    """
+    Número epoch → ns; la unidad (s, ms, µs, ns) se infiere por magnitud.
+
+    Raises:
+        ValueError: Si no es un número finito
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+        raise ValueError(f"Invalid epoch timestamp: {value!r}")
+    magnitude = abs(value)
+    for limit, scale in _EPOCH_SCALES:
+        if magnitude < limit:
+            if isinstance(value, int):
+                return value * scale
+            # Parte entera y fracción por separado: value * 1e9 pierde los ns
+            whole = int(value)
+            return whole * scale + round((value - whole) * scale)
+    if magnitude == float("inf"):
+        raise ValueError(f"Invalid epoch timestamp: {value!r}")
+    return int(value)
+
+
+def from_datetime(value: datetime) -> int:
+    """``datetime`` → ns (sin zona = hora local), sin pérdida de microsegundos."""
+    seconds = int(value.replace(microsecond=0).timestamp())
+    return seconds * NS_PER_SECOND + value.microsecond * NS_PER_US
+
+
+def _cache_minute(key: str, value: datetime) -> int:
+    if len(_MINUTES) >= CACHE_LIMIT:
+        _MINUTES.clear()
+    minute = _MINUTES[key] = int(value.replace(second=0, microsecond=0).timestamp())
+    return minute
+
+
+def parse_timestamp(value: Any) -> int:
+    """
+    Timestamp en cualquier forma aceptada (ISO, epoch numérico o texto
+    numérico, ``datetime``) → ns epoch.
+
+    El texto ISO lo valida y separa ``datetime.fromisoformat`` (en C); lo
+    caro es pasar una hora local a epoch (``timestamp()``), que se hace una
+    vez por minuto distinto: los primeros 16 caracteres (hasta el minuto
+    en las formas ISO) son la clave de la caché.
+
+    Raises:
+        ValueError: Si el valor no es un timestamp reconocible
+    """
+    if type(value) is str:
+        try:
+            parsed = _fromisoformat(value)
+        except ValueError:
+            return _parse_text(value)
+        if parsed.tzinfo is None:
+            minute = _MINUTES.get(value[:16])
+            if minute is None:
+                minute = _cache_minute(value[:16], parsed)
+            return (minute + parsed.second) * NS_PER_SECOND + parsed.microsecond * NS_PER_US
+        return from_datetime(parsed)
+    if isinstance(value, datetime):
+        return from_datetime(value)
+    return from_epoch(value)
+
+
+def _parse_text(text: str) -> int:
+    """Texto que ``fromisoformat`` no acepta: sufijo ``Z`` (Python < 3.11) o epoch numérico."""
+    if text.endswith("Z"):
+        try:
+            return from_datetime(_fromisoformat(text[:-1] + "+00:00"))
+        except ValueError:
+            pass
+    try:
+        number = int(text) if text.lstrip("-").isdigit() else float(text)
+    except ValueError:
+        raise ValueError(f"Invalid timestamp: {text!r}") from None
+    return from_epoch(number)
+
+
+def format_iso(ns: int) -> str:
+    """ns epoch → ISO en UTC con offset (mismo texto que ``datetime.isoformat()`` en UTC)."""
+    seconds, rest = divmod(ns, NS_PER_SECOND)
+    prefix = _ISO_PREFIX.get(seconds)
+    if prefix is None:
+        if len(_ISO_PREFIX) >= CACHE_LIMIT:
+            _ISO_PREFIX.clear()
+        prefix = _ISO_PREFIX[seconds] = (
+            datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None).isoformat()
+        )
+    micros = rest // NS_PER_US
+    return f"{prefix}.{micros:06d}+00:00" if micros else f"{prefix}+00:00"
+
+
+def format_seconds(seconds: float) -> str:
+    """Segundos epoch float → mismo texto que ``format_iso`` (redondeado al µs)."""
+    return format_iso(round(seconds * 1_000_000) * NS_PER_US)
+
+
+def to_datetime(ns: int) -> datetime:
+    """ns epoch → ``datetime`` local sin zona (para código que necesita el objeto)."""
+    seconds, rest = divmod(ns, NS_PER_SECOND)
+    return datetime.fromtimestamp(seconds).replace(microsecond=rest // NS_PER_US)
+
+
+def to_seconds(ns: int) -> float:
+    """ns epoch → segundos float (para arrays NumPy y almacenamiento)."""
+    return ns / NS_PER_SECOND